@@ -0,0 +1,18 @@
+"""
+End-to-end benchmarks of didcomm-python.
+
+Run the suite and compare two result files with::
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+
+Import time of the library is measured separately (and compared the same way) with::
+
+    python -m benchmarks startup --output startup.json
+
+The algorithm matrix (every encryption and signature algorithm with every key curve) is run with::
+
+    python -m benchmarks matrix --output matrix.json
+
+See `docs/testing.md` for details.
+"""
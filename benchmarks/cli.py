@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import didcomm
+from didcomm import get_crypto_backend, set_crypto_backend
+from benchmarks.compare import DEFAULT_THRESHOLD_PCT, compare_results
+from benchmarks.matrix import (
+    KEY_AGREEMENT_CURVES,
+    QUICK_MATRIX_PAYLOAD_SIZES,
+    build_matrix,
+    format_table,
+)
+from benchmarks.runner import BenchmarkResult, RunConfig
+from benchmarks.startup import DEFAULT_STARTUP_RUNS, measure_startup
+from benchmarks.suite import (
+    QUICK_FORWARD_DEPTHS,
+    QUICK_PAYLOAD_SIZES,
+    QUICK_RECIPIENT_KEYS_COUNTS,
+    build_suite,
+    run_suite,
+)
+
+QUICK_RUN_CONFIG = RunConfig(iterations=20, min_iterations=3, warmup=1, max_time_s=0.5)
+CRYPTO_BACKENDS = ["authlib", "cryptography"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    return args.command(args)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="didcomm-python benchmarks"
+    )
+    subparsers = parser.add_subparsers(required=True, dest="command_name")
+
+    run = subparsers.add_parser("run", help="run the benchmarks")
+    run.set_defaults(command=_run)
+    run.add_argument("-o", "--output", help="JSON file to write the results to")
+    run.add_argument(
+        "-k",
+        "--filter",
+        help="regular expression, only benchmarks with matching ids are run",
+    )
+    run.add_argument(
+        "--quick",
+        action="store_true",
+        help="run a reduced set of parameters with fewer samples",
+    )
+    run.add_argument("--iterations", type=int, help="maximum samples per benchmark")
+    run.add_argument("--max-time", type=float, help="time budget per benchmark, s")
+    run.add_argument("--payload-sizes", type=_int_list, help="e.g. 100,1000")
+    run.add_argument("--recipient-keys", type=_int_list, help="e.g. 1,10,100")
+    run.add_argument("--forward-depths", type=_int_list, help="e.g. 1,2,3")
+    run.add_argument(
+        "--resolver-latency-ms",
+        type=float,
+        default=0,
+        help="simulated latency of every DID resolution, ms (default: 0)",
+    )
+    _add_crypto_backend_argument(run)
+
+    matrix = subparsers.add_parser(
+        "matrix",
+        help="measure every encryption and signature algorithm with every key curve",
+    )
+    matrix.set_defaults(command=_matrix)
+    matrix.add_argument("-o", "--output", help="JSON file to write the results to")
+    matrix.add_argument(
+        "-k",
+        "--filter",
+        help="regular expression, only benchmarks with matching ids are run",
+    )
+    matrix.add_argument(
+        "--quick",
+        action="store_true",
+        help="run a reduced set of payload sizes with fewer samples",
+    )
+    matrix.add_argument("--iterations", type=int, help="maximum samples per benchmark")
+    matrix.add_argument("--max-time", type=float, help="time budget per benchmark, s")
+    matrix.add_argument("--payload-sizes", type=_int_list, help="e.g. 100,1000")
+    matrix.add_argument(
+        "--curves",
+        type=_str_list,
+        help=f"key agreement curves (default: {','.join(KEY_AGREEMENT_CURVES)})",
+    )
+    _add_crypto_backend_argument(matrix)
+
+    startup = subparsers.add_parser(
+        "startup", help="measure import time of the library (python -X importtime)"
+    )
+    startup.set_defaults(command=_startup)
+    startup.add_argument("-o", "--output", help="JSON file to write the results to")
+    startup.add_argument(
+        "--runs",
+        type=int,
+        default=DEFAULT_STARTUP_RUNS,
+        help=f"fresh interpreters per measurement (default: {DEFAULT_STARTUP_RUNS})",
+    )
+
+    compare = subparsers.add_parser(
+        "compare", help="compare two result files and flag regressions"
+    )
+    compare.set_defaults(command=_compare)
+    compare.add_argument("baseline", help="baseline results JSON file")
+    compare.add_argument("current", help="current results JSON file")
+    compare.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PCT,
+        help="latency increase in percent considered a regression"
+        f" (default: {DEFAULT_THRESHOLD_PCT})",
+    )
+    return parser
+
+
+def _add_crypto_backend_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--crypto-backend",
+        choices=CRYPTO_BACKENDS,
+        help="crypto backend to pack and unpack with (default: the library default)",
+    )
+
+
+@contextmanager
+def _crypto_backend(name: Optional[str]):
+    previous = get_crypto_backend()
+    if name:
+        set_crypto_backend(name)
+    try:
+        yield
+    finally:
+        set_crypto_backend(previous)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _str_list(value: str) -> List[str]:
+    return [v for v in value.split(",") if v]
+
+
+def _run_config(args) -> RunConfig:
+    run_config = QUICK_RUN_CONFIG if args.quick else RunConfig()
+    if args.iterations:
+        run_config = replace(
+            run_config,
+            iterations=args.iterations,
+            min_iterations=min(run_config.min_iterations, args.iterations),
+        )
+    if args.max_time:
+        run_config = replace(run_config, max_time_s=args.max_time)
+    return run_config
+
+
+def _run(args) -> int:
+    run_config = _run_config(args)
+
+    suite = build_suite(
+        payload_sizes=args.payload_sizes
+        or (QUICK_PAYLOAD_SIZES if args.quick else None),
+        recipient_keys_counts=args.recipient_keys
+        or (QUICK_RECIPIENT_KEYS_COUNTS if args.quick else None),
+        forward_depths=args.forward_depths
+        or (QUICK_FORWARD_DEPTHS if args.quick else None),
+        resolver_latency_ms=args.resolver_latency_ms,
+    )
+    with _crypto_backend(args.crypto_backend):
+        results = asyncio.get_event_loop().run_until_complete(
+            run_suite(suite, run_config, args.filter, on_result=_print_result)
+        )
+        _print_failed(results)
+        _write_results(args.output, results)
+    return 0
+
+
+def _matrix(args) -> int:
+    suite = build_matrix(
+        payload_sizes=args.payload_sizes
+        or (QUICK_MATRIX_PAYLOAD_SIZES if args.quick else None),
+        curves=args.curves,
+    )
+    with _crypto_backend(args.crypto_backend):
+        results = asyncio.get_event_loop().run_until_complete(
+            run_suite(suite, _run_config(args), args.filter, on_result=_print_result)
+        )
+        print()
+        print(format_table(results))
+        _print_failed(results)
+        _write_results(args.output, results)
+    return 0
+
+
+def _startup(args) -> int:
+    results = measure_startup(runs=args.runs)
+    for result in results:
+        _print_result(result)
+    _write_results(args.output, results)
+    return 0
+
+
+def _write_results(path: Optional[str], results: List[BenchmarkResult]):
+    if path:
+        with open(path, "w") as f:
+            json.dump(results_to_dict(results), f, indent=2)
+        print(f"\nresults written to {path}")
+
+
+def _compare(args) -> int:
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    comparisons, missing, new = compare_results(baseline, current, args.threshold)
+
+    regressions = [c for c in comparisons if c.regression]
+    for c in comparisons:
+        mark = "REGRESSION" if c.regression else ""
+        print(
+            f"{c.id:70} {c.metric:7} {c.baseline:10.3f} -> {c.current:10.3f} ms"
+            f" {c.change_pct:+8.1f}% {mark}"
+        )
+    for result_id in missing:
+        print(f"{result_id:70} missing in {args.current}")
+    for result_id in new:
+        print(f"{result_id:70} new in {args.current}")
+
+    print(
+        f"\n{len(regressions)} regression(s) above {args.threshold}%"
+        f" in {len(comparisons)} compared metric(s)"
+    )
+    return 1 if regressions else 0
+
+
+def _print_result(result: BenchmarkResult):
+    if result.failed:
+        print(f"{result.id:70} FAILED: {result.error}", flush=True)
+        return
+    print(
+        f"{result.id:70} p50 {result.p50_ms:10.3f} ms, p99 {result.p99_ms:10.3f} ms,"
+        f" {result.ops_per_sec:10.1f} ops/s ({result.samples} samples)",
+        flush=True,
+    )
+
+
+def _print_failed(results: List[BenchmarkResult]):
+    failed = [r for r in results if r.failed]
+    if failed:
+        print(f"\n{len(failed)} of {len(results)} benchmark(s) failed")
+
+
+def results_to_dict(results: List[BenchmarkResult]) -> dict:
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "didcomm_version": didcomm.__version__,
+            "crypto_backend": get_crypto_backend().name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [r.as_dict() for r in results],
+    }
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    with open(path) as f:
+        return [BenchmarkResult.from_dict(r) for r in json.load(f)["results"]]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from benchmarks.runner import BenchmarkResult
+
+# latency metrics compared between runs, higher is worse
+COMPARED_METRICS = ("p50_ms", "p99_ms")
+DEFAULT_THRESHOLD_PCT = 10.0
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    Change of a single metric of a benchmark between two runs.
+
+    Attributes:
+        id (str): benchmark id
+        metric (str): compared metric
+        baseline (float): metric value in the baseline run
+        current (float): metric value in the current run
+        regression (bool): whether the metric got worse by more than the threshold
+    """
+
+    id: str
+    metric: str
+    baseline: float
+    current: float
+    regression: bool
+
+    @property
+    def change_pct(self) -> float:
+        if not self.baseline:
+            return 0.0
+        return (self.current - self.baseline) / self.baseline * 100
+
+
+def compare_results(
+    baseline: List[BenchmarkResult],
+    current: List[BenchmarkResult],
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+) -> Tuple[List[Comparison], List[str], List[str]]:
+    """
+    Compares latencies of the benchmarks present and not failed in both runs.
+
+    :param baseline: results of the baseline run
+    :param current: results of the current run
+    :param threshold_pct: a latency increase above this percentage is a regression
+    :return: comparisons, ids of the benchmarks missing in the current run,
+        ids of the benchmarks new in the current run
+    """
+    baseline_by_id = {r.id: r for r in baseline}
+    current_by_id = {r.id: r for r in current}
+
+    comparisons = []
+    for result_id, base in baseline_by_id.items():
+        cur = current_by_id.get(result_id)
+        # failed benchmarks have no latencies to compare
+        if cur is None or cur.failed or base.failed:
+            continue
+        for metric in COMPARED_METRICS:
+            base_value = getattr(base, metric)
+            cur_value = getattr(cur, metric)
+            comparisons.append(
+                Comparison(
+                    id=result_id,
+                    metric=metric,
+                    baseline=base_value,
+                    current=cur_value,
+                    regression=cur_value > base_value * (1 + threshold_pct / 100),
+                )
+            )
+
+    missing = [i for i in baseline_by_id if i not in current_by_id]
+    new = [i for i in current_by_id if i not in baseline_by_id]
+    return comparisons, missing, new
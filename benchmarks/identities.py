@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from authlib.jose import ECKey
+from didcomm import (
+    DIDDoc,
+    DIDResolver,
+    DIDResolverInMemory,
+    ResolversConfig,
+    Secret,
+    SecretsResolverInMemory,
+    VerificationMethod,
+    VerificationMethodType,
+)
+from didcomm.common.types import DID
+from didcomm.did_doc.did_doc_compact import DIDDocCompact
+from didcomm.secrets.secrets_util import (
+    generate_ed25519_keys_as_jwk_dict,
+    generate_x25519_keys_as_jwk_dict,
+    jwk_to_secret,
+)
+
+
+@dataclass(frozen=True)
+class Identity:
+    """
+    A generated DID with its DID Doc and secrets.
+    """
+
+    did: DID
+    did_doc: DIDDoc
+    secrets: List[Secret]
+
+
+def generate_keys(crv: str) -> Tuple[dict, dict]:
+    """
+    Generates private and public keys of the curve as JWK dicts.
+
+    :param crv: Ed25519, X25519 or an EC curve (P-256, P-384, P-521, secp256k1)
+    :return: private and public keys as JWK dicts
+    """
+    if crv == "Ed25519":
+        return generate_ed25519_keys_as_jwk_dict()
+    if crv == "X25519":
+        return generate_x25519_keys_as_jwk_dict()
+    key = ECKey.generate_key(crv, is_private=True)
+    return key.as_dict(is_private=True), key.as_dict()
+
+
+def generate_identity(
+    did: DID,
+    key_agreement_keys_count: int = 1,
+    key_agreement_crv: str = "X25519",
+    authentication_crv: str = "Ed25519",
+) -> Identity:
+    """
+    Generates an identity with one authentication key
+    and the given number of key agreement keys.
+
+    :param did: DID of the identity
+    :param key_agreement_keys_count: number of key agreement keys
+    :param key_agreement_crv: curve of the key agreement keys, X25519 by default
+    :param authentication_crv: curve of the authentication key, Ed25519 by default
+    :return: the identity
+    """
+    verification_methods = []
+    secrets = []
+
+    def add_key(kid, private_jwk, public_jwk):
+        verification_methods.append(
+            VerificationMethod(
+                id=kid,
+                controller=did,
+                type=VerificationMethodType.JSON_WEB_KEY_2020,
+                public_key_jwk=public_jwk,
+            )
+        )
+        secrets.append(jwk_to_secret(dict(private_jwk, kid=kid)))
+        return kid
+
+    authentication = [
+        add_key(
+            f"{did}#{_key_id(authentication_crv)}-1", *generate_keys(authentication_crv)
+        )
+    ]
+    key_agreement = [
+        add_key(
+            f"{did}#{_key_id(key_agreement_crv)}-{i}", *generate_keys(key_agreement_crv)
+        )
+        for i in range(1, key_agreement_keys_count + 1)
+    ]
+
+    did_doc = DIDDoc(
+        id=did,
+        verification_method=verification_methods,
+        authentication=authentication,
+        key_agreement=key_agreement,
+        service=[],
+    )
+    return Identity(did=did, did_doc=did_doc, secrets=secrets)
+
+
+class LatencyDIDResolver(DIDResolver):
+    """
+    Simulates a remote DID resolver: every resolution is delayed by the given latency.
+    """
+
+    def __init__(self, did_resolver: DIDResolver, latency_s: float):
+        self.did_resolver = did_resolver
+        self.latency_s = latency_s
+
+    async def resolve(self, did: DID) -> Optional[Union[DIDDoc, DIDDocCompact]]:
+        await asyncio.sleep(self.latency_s)
+        return await self.did_resolver.resolve(did)
+
+
+def resolvers_config(
+    secrets_owner: Identity, *known: Identity, resolver_latency_s: float = 0
+) -> ResolversConfig:
+    """
+    Builds resolvers config with the secrets of `secrets_owner`
+    and DID Docs of all the given identities.
+
+    If `resolver_latency_s` is set, every DID resolution is delayed by it (see `LatencyDIDResolver`).
+    """
+    did_resolver = DIDResolverInMemory(
+        [secrets_owner.did_doc] + [identity.did_doc for identity in known]
+    )
+    if resolver_latency_s:
+        did_resolver = LatencyDIDResolver(did_resolver, resolver_latency_s)
+    return ResolversConfig(
+        secrets_resolver=SecretsResolverInMemory(secrets_owner.secrets),
+        did_resolver=did_resolver,
+    )
+
+
+def _key_id(crv: str) -> str:
+    # key-x25519, key-p256, key-secp256k1, etc.
+    return "key-" + crv.lower().replace("-", "")
@@ -0,0 +1,225 @@
+"""
+Performance matrix of the cryptographic algorithms.
+
+Every `AnonCryptAlg` and `AuthCryptAlg` is measured with key agreement keys of every supported curve,
+and every `SignAlg` with its signing key, across payload sizes.
+Besides pack and unpack latency and throughput, the size of the packed message
+and its overhead over the plaintext message are reported.
+
+Run the matrix, print it as a table and store it as JSON (comparable by `compare` as the suite results)::
+
+    python -m benchmarks matrix --output matrix.json
+
+Authlib can't unpack 1 MB payloads, these entries are reported as failed unless
+another backend is selected with `--crypto-backend cryptography`.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from didcomm import (
+    AnonCryptAlg,
+    AuthCryptAlg,
+    PackEncryptedConfig,
+    SignAlg,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+)
+
+from benchmarks.identities import Identity, generate_identity, resolvers_config
+from benchmarks.runner import BenchmarkResult
+from benchmarks.suite import RECIPIENT_DID, SENDER_DID, Benchmark, build_message
+
+KEY_AGREEMENT_CURVES = ["X25519", "P-256", "P-384", "P-521", "secp256k1"]
+# signing key curve of every signature algorithm
+SIGN_ALG_CURVES = {
+    SignAlg.ED25519: "Ed25519",
+    SignAlg.ES256: "P-256",
+    SignAlg.ES256K: "secp256k1",
+}
+MATRIX_PAYLOAD_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+QUICK_MATRIX_PAYLOAD_SIZES = [100, 10_000]
+
+_TABLE_COLUMNS = [
+    # header, width
+    ("operation", 16),
+    ("alg", 16),
+    ("enc", 14),
+    ("curve", 10),
+    ("payload B", 10),
+    ("p50 ms", 10),
+    ("p99 ms", 10),
+    ("ops/s", 10),
+    ("packed B", 10),
+    ("overhead B", 11),
+    ("overhead %", 11),
+]
+
+
+class _Identities:
+    # sender and recipient per key agreement curve, signer per signing curve
+    def __init__(self):
+        self._pairs: Dict[str, Tuple[Identity, Identity]] = {}
+        self._signers: Dict[str, Identity] = {}
+
+    def pair(self, crv: str) -> Tuple[Identity, Identity]:
+        if crv not in self._pairs:
+            self._pairs[crv] = (
+                generate_identity(SENDER_DID, key_agreement_crv=crv),
+                generate_identity(RECIPIENT_DID, key_agreement_crv=crv),
+            )
+        return self._pairs[crv]
+
+    def signer(self, crv: str) -> Identity:
+        if crv not in self._signers:
+            self._signers[crv] = generate_identity(SENDER_DID, authentication_crv=crv)
+        return self._signers[crv]
+
+
+def build_matrix(
+    payload_sizes: Optional[List[int]] = None, curves: Optional[List[str]] = None
+) -> List[Benchmark]:
+    """
+    Builds pack and unpack benchmarks of every algorithm, key curve and payload size.
+
+    :param payload_sizes: payload sizes in bytes, `MATRIX_PAYLOAD_SIZES` by default
+    :param curves: key agreement curves, `KEY_AGREEMENT_CURVES` by default;
+        signature algorithms are measured with their own curves
+    :return: benchmarks
+    """
+    payload_sizes = payload_sizes or MATRIX_PAYLOAD_SIZES
+    curves = curves or KEY_AGREEMENT_CURVES
+    identities = _Identities()
+
+    matrix = []
+    for alg in list(AnonCryptAlg) + list(AuthCryptAlg):
+        for crv in curves:
+            for payload_size in payload_sizes:
+                matrix.append(_encrypted(identities, "pack", alg, crv, payload_size))
+                matrix.append(_encrypted(identities, "unpack", alg, crv, payload_size))
+    for alg in SignAlg:
+        for payload_size in payload_sizes:
+            matrix.append(_signed(identities, "pack", alg, payload_size))
+            matrix.append(_signed(identities, "unpack", alg, payload_size))
+    return matrix
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """
+    Formats matrix results as a text table, one row per benchmark.
+    Failed benchmarks are listed with `failed` instead of the measurements.
+    """
+    lines = [" ".join(f"{header:>{width}}" for header, width in _TABLE_COLUMNS)]
+    for r in results:
+        values = [
+            r.name,
+            r.params.get("alg", ""),
+            r.params.get("enc", ""),
+            r.params.get("curve", ""),
+            r.params.get("payload_bytes", ""),
+        ]
+        if r.failed:
+            values.append("failed")
+        else:
+            plaintext_bytes = r.sizes.get("plaintext_bytes", 0)
+            overhead_bytes = r.sizes.get("overhead_bytes", 0)
+            overhead_pct = (
+                overhead_bytes / plaintext_bytes * 100 if plaintext_bytes else 0
+            )
+            values += [
+                f"{r.p50_ms:.3f}",
+                f"{r.p99_ms:.3f}",
+                f"{r.ops_per_sec:.1f}",
+                r.sizes.get("packed_bytes", ""),
+                overhead_bytes,
+                f"{overhead_pct:.1f}",
+            ]
+        lines.append(
+            " ".join(
+                f"{value:>{width}}" for value, (_, width) in zip(values, _TABLE_COLUMNS)
+            )
+        )
+    return "\n".join(lines)
+
+
+def _record_sizes(benchmark: Benchmark, packed_msg: str, plaintext_msg: str):
+    packed_bytes = len(packed_msg.encode())
+    plaintext_bytes = len(plaintext_msg.encode())
+    benchmark.sizes.update(
+        packed_bytes=packed_bytes,
+        plaintext_bytes=plaintext_bytes,
+        overhead_bytes=packed_bytes - plaintext_bytes,
+    )
+
+
+def _encrypted(
+    identities: _Identities, operation: str, alg, crv: str, payload_size: int
+) -> Benchmark:
+    authcrypt = isinstance(alg, AuthCryptAlg)
+
+    async def setup():
+        sender, recipient = identities.pair(crv)
+        sender_config = resolvers_config(sender, recipient)
+        message = build_message(payload_size)
+        pack_config = PackEncryptedConfig(
+            forward=False, **{"enc_alg_auth" if authcrypt else "enc_alg_anon": alg}
+        )
+
+        def pack():
+            return pack_encrypted(
+                sender_config,
+                message,
+                to=RECIPIENT_DID,
+                frm=SENDER_DID if authcrypt else None,
+                pack_config=pack_config,
+            )
+
+        packed = await pack()
+        plaintext = await pack_plaintext(sender_config, message)
+        _record_sizes(benchmark, packed.packed_msg, plaintext.packed_msg)
+        if operation == "pack":
+            return pack
+        recipient_config = resolvers_config(recipient, sender)
+        return lambda: unpack(recipient_config, packed.packed_msg)
+
+    benchmark = Benchmark(
+        f"{operation}_encrypted",
+        {
+            "alg": alg.value.alg,
+            "enc": alg.value.enc,
+            "curve": crv,
+            "payload_bytes": payload_size,
+        },
+        setup,
+    )
+    return benchmark
+
+
+def _signed(
+    identities: _Identities, operation: str, alg: SignAlg, payload_size: int
+) -> Benchmark:
+    crv = SIGN_ALG_CURVES[alg]
+
+    async def setup():
+        config = resolvers_config(identities.signer(crv))
+        message = build_message(payload_size)
+
+        def pack():
+            return pack_signed(config, message, sign_frm=SENDER_DID)
+
+        packed = await pack()
+        plaintext = await pack_plaintext(config, message)
+        _record_sizes(benchmark, packed.packed_msg, plaintext.packed_msg)
+        if operation == "pack":
+            return pack
+        return lambda: unpack(config, packed.packed_msg)
+
+    benchmark = Benchmark(
+        f"{operation}_signed",
+        {"alg": alg.value, "curve": crv, "payload_bytes": payload_size},
+        setup,
+    )
+    return benchmark
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+Sampler = Callable[[], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    Controls how many times every benchmark is sampled.
+
+    Attributes:
+        iterations (int): maximum number of measured samples per benchmark
+        min_iterations (int): minimum number of measured samples per benchmark
+        warmup (int): number of samples run before measuring
+        max_time_s (float): a benchmark stops sampling after this time
+            once `min_iterations` samples are collected
+    """
+
+    iterations: int = 200
+    min_iterations: int = 5
+    warmup: int = 3
+    max_time_s: float = 5.0
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    Latency statistics of a single benchmark.
+
+    Attributes:
+        name (str): benchmark name, unique within a suite run
+        params (Dict[str, Any]): benchmark parameters (payload size, number of keys, etc.)
+        samples (int): number of measured samples
+        p50_ms (float): median latency in milliseconds
+        p99_ms (float): 99th percentile latency in milliseconds
+        mean_ms (float): mean latency in milliseconds
+        ops_per_sec (float): throughput derived from the mean latency
+        sizes (Dict[str, int]): sizes in bytes reported by the benchmark (packed message size, etc.)
+        error (Optional[str]): set if the benchmark failed, no samples are reported then
+    """
+
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    samples: int = 0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    mean_ms: float = 0.0
+    ops_per_sec: float = 0.0
+    sizes: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @staticmethod
+    def from_samples(
+        name: str,
+        params: Dict[str, Any],
+        samples_ns: List[int],
+        sizes: Optional[Dict[str, int]] = None,
+    ) -> BenchmarkResult:
+        samples_ms = sorted(s / 1_000_000 for s in samples_ns)
+        mean_ms = sum(samples_ms) / len(samples_ms)
+        return BenchmarkResult(
+            name=name,
+            params=params,
+            samples=len(samples_ms),
+            p50_ms=percentile(samples_ms, 50),
+            p99_ms=percentile(samples_ms, 99),
+            mean_ms=mean_ms,
+            ops_per_sec=1000 / mean_ms if mean_ms else math.inf,
+            sizes=dict(sizes or {}),
+        )
+
+    @staticmethod
+    def from_error(
+        name: str, params: Dict[str, Any], error: Exception
+    ) -> BenchmarkResult:
+        message = f"{type(error).__name__}: {error}"
+        cause = error.__cause__ or error.__context__
+        if cause is not None:
+            message += f" ({type(cause).__name__}: {cause})"
+        return BenchmarkResult(name=name, params=params, error=message)
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    @property
+    def id(self) -> str:
+        """
+        Identifies the benchmark across runs: the name followed by the parameters.
+        """
+        return benchmark_id(self.name, self.params)
+
+    def as_dict(self) -> dict:
+        d = {
+            "name": self.name,
+            "params": self.params,
+            "samples": self.samples,
+            "p50_ms": self.p50_ms,
+            "p99_ms": self.p99_ms,
+            "mean_ms": self.mean_ms,
+            "ops_per_sec": self.ops_per_sec,
+        }
+        if self.sizes:
+            d["sizes"] = self.sizes
+        if self.error is not None:
+            d["error"] = self.error
+        return d
+
+    @staticmethod
+    def from_dict(d: dict) -> BenchmarkResult:
+        return BenchmarkResult(
+            name=d["name"],
+            params=d.get("params", {}),
+            samples=d["samples"],
+            p50_ms=d["p50_ms"],
+            p99_ms=d["p99_ms"],
+            mean_ms=d["mean_ms"],
+            ops_per_sec=d["ops_per_sec"],
+            sizes=d.get("sizes", {}),
+            error=d.get("error"),
+        )
+
+
+def benchmark_id(name: str, params: Dict[str, Any]) -> str:
+    if not params:
+        return name
+    return name + "[" + ",".join(f"{k}={v}" for k, v in sorted(params.items())) + "]"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        raise ValueError("no values")
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+async def measure(
+    name: str,
+    params: Dict[str, Any],
+    sampler: Sampler,
+    run_config: RunConfig,
+    sizes: Optional[Dict[str, int]] = None,
+) -> BenchmarkResult:
+    """
+    Runs the sampler repeatedly and collects per-call latencies.
+
+    :param name: benchmark name
+    :param params: benchmark parameters to be reported
+    :param sampler: an async callable doing a single operation
+    :param run_config: sampling settings
+    :param sizes: optional sizes in bytes to be reported
+    :return: latency statistics
+    """
+    for _ in range(run_config.warmup):
+        await sampler()
+
+    max_time_ns = run_config.max_time_s * 1_000_000_000
+    samples_ns = []
+    total_ns = 0
+    while len(samples_ns) < run_config.iterations:
+        start = perf_counter_ns()
+        await sampler()
+        elapsed = perf_counter_ns() - start
+        samples_ns.append(elapsed)
+        total_ns += elapsed
+        if len(samples_ns) >= run_config.min_iterations and total_ns >= max_time_ns:
+            break
+
+    return BenchmarkResult.from_samples(name, params, samples_ns, sizes)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict, List, Set
+
+from benchmarks.runner import BenchmarkResult
+
+# benchmark target -> statement run in a fresh interpreter
+STARTUP_STATEMENTS = {
+    "import_didcomm": "import didcomm",
+    "message": "from didcomm import Message",
+    "pack_encrypted": "from didcomm import pack_encrypted",
+    "unpack": "from didcomm import unpack",
+    "all_exports": "import didcomm; [getattr(didcomm, n) for n in didcomm.__all__]",
+}
+DEFAULT_STARTUP_RUNS = 10
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """
+    Runs the statement in a fresh interpreter with `-X importtime`.
+
+    :param statement: Python statement
+    :return: cumulative import time in microseconds of every top-level import
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # nested imports are indented by two spaces per level
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def loaded_modules(statement: str) -> Set[str]:
+    """
+    :param statement: Python statement
+    :return: names of the modules imported by the statement in a fresh interpreter
+    """
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; before = set(sys.modules)\n"
+            f"{statement}\n"
+            "print('\\n'.join(sorted(set(sys.modules) - before)))",
+        ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return set(completed.stdout.split())
+
+
+def measure_startup(
+    statements: Dict[str, str] = None, runs: int = DEFAULT_STARTUP_RUNS
+) -> List[BenchmarkResult]:
+    """
+    Measures import time of the statements, the interpreter startup is excluded.
+
+    :param statements: benchmark target -> Python statement, `STARTUP_STATEMENTS` by default
+    :param runs: number of fresh interpreters per statement
+    :return: results named `startup` with the target as a parameter
+    """
+    statements = statements or STARTUP_STATEMENTS
+    interpreter_imports = set(import_times("pass"))
+    results = []
+    for target, statement in statements.items():
+        samples_ns = []
+        for _ in range(runs):
+            times = import_times(statement)
+            samples_ns.append(
+                1000
+                * sum(t for name, t in times.items() if name not in interpreter_imports)
+            )
+        results.append(
+            BenchmarkResult.from_samples("startup", {"target": target}, samples_ns)
+        )
+    return results
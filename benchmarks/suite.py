@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from didcomm import (
+    Message,
+    PackEncryptedConfig,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    peek,
+    unpack,
+    unpack_forward,
+    wrap_in_forward,
+)
+from didcomm.core.serialization import json_str_to_dict
+
+from benchmarks.identities import Identity, generate_identity, resolvers_config
+from benchmarks.runner import BenchmarkResult, RunConfig, Sampler, benchmark_id, measure
+
+PAYLOAD_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+RECIPIENT_KEYS_COUNTS = [1, 10, 100]
+FORWARD_DEPTHS = [1, 2, 3, 5]
+# payload size used by the benchmarks sweeping other parameters
+DEFAULT_PAYLOAD_SIZE = 1_000
+
+QUICK_PAYLOAD_SIZES = [100, 10_000]
+QUICK_RECIPIENT_KEYS_COUNTS = [1, 10]
+QUICK_FORWARD_DEPTHS = [1, 2]
+
+SENDER_DID = "did:example:bench-sender"
+RECIPIENT_DID = "did:example:bench-recipient"
+MEDIATOR_DID = "did:example:bench-mediator{}"
+
+# variants of pack_encrypted: name -> (authcrypt, sign, protect_sender_id)
+ENCRYPTED_VARIANTS = {
+    "anon": (False, False, False),
+    "auth": (True, False, False),
+    "auth_protected": (True, False, True),
+    "anon_signed": (False, True, False),
+    "auth_signed": (True, True, False),
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A single benchmark of the suite.
+
+    Attributes:
+        name (str): operation being measured
+        params (Dict[str, Any]): benchmark parameters
+        setup (Callable[[], Awaitable[Sampler]]): prepares the data
+            (not measured) and returns a sampler doing the measured operation
+        sizes (Dict[str, int]): sizes in bytes filled by `setup` (packed message size, etc.),
+            they are reported with the result
+    """
+
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    setup: Callable[[], Awaitable[Sampler]] = None
+    sizes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def id(self) -> str:
+        return benchmark_id(self.name, self.params)
+
+
+class _Identities:
+    # key generation is relatively slow, so identities are shared by the benchmarks
+    def __init__(self, resolver_latency_ms: float = 0):
+        self._recipients = {}
+        self._mediators = []
+        self._resolver_latency_s = resolver_latency_ms / 1000
+        self.sender = generate_identity(SENDER_DID)
+
+    def resolvers_config(self, secrets_owner: Identity, *known: Identity):
+        return resolvers_config(
+            secrets_owner, *known, resolver_latency_s=self._resolver_latency_s
+        )
+
+    def recipient(self, keys_count: int) -> Identity:
+        if keys_count not in self._recipients:
+            self._recipients[keys_count] = generate_identity(RECIPIENT_DID, keys_count)
+        return self._recipients[keys_count]
+
+    def mediators(self, count: int) -> List[Identity]:
+        while len(self._mediators) < count:
+            self._mediators.append(
+                generate_identity(MEDIATOR_DID.format(len(self._mediators) + 1))
+            )
+        return self._mediators[:count]
+
+
+def build_message(payload_size: int) -> Message:
+    return Message(
+        id="1234567890",
+        type="http://example.com/protocols/benchmark/1.0/payload",
+        frm=SENDER_DID,
+        to=[RECIPIENT_DID],
+        body={"payload": "a" * payload_size},
+    )
+
+
+def build_suite(
+    payload_sizes: List[int] = None,
+    recipient_keys_counts: List[int] = None,
+    forward_depths: List[int] = None,
+    resolver_latency_ms: float = 0,
+) -> List[Benchmark]:
+    """
+    Builds the list of benchmarks.
+
+    Payload sizes are swept with a single recipient key,
+    recipient keys counts and forward depths are swept with `DEFAULT_PAYLOAD_SIZE` payload.
+
+    With `resolver_latency_ms` every DID resolution is delayed to simulate a remote DID resolver,
+    so the benchmarks show how well the resolver latency is hidden by concurrent resolution.
+
+    :param payload_sizes: payload sizes in bytes, `PAYLOAD_SIZES` by default
+    :param recipient_keys_counts: numbers of recipient's key agreement keys,
+        `RECIPIENT_KEYS_COUNTS` by default
+    :param forward_depths: numbers of routing keys, `FORWARD_DEPTHS` by default
+    :param resolver_latency_ms: simulated latency of every DID resolution in milliseconds, 0 by default;
+        if set, it's added to the parameters of every benchmark
+    :return: benchmarks
+    """
+    payload_sizes = payload_sizes or PAYLOAD_SIZES
+    recipient_keys_counts = recipient_keys_counts or RECIPIENT_KEYS_COUNTS
+    forward_depths = forward_depths or FORWARD_DEPTHS
+    identities = _Identities(resolver_latency_ms)
+
+    suite = []
+    for payload_size in payload_sizes:
+        suite.append(_pack_plaintext(identities, payload_size))
+        suite.append(_unpack_plaintext(identities, payload_size))
+        suite.append(_pack_signed(identities, payload_size))
+        suite.append(_unpack_signed(identities, payload_size))
+
+    encrypted_params = [(payload_size, 1) for payload_size in payload_sizes] + [
+        (DEFAULT_PAYLOAD_SIZE, keys_count)
+        for keys_count in recipient_keys_counts
+        if keys_count != 1 or DEFAULT_PAYLOAD_SIZE not in payload_sizes
+    ]
+    for variant in ENCRYPTED_VARIANTS:
+        for payload_size, keys_count in encrypted_params:
+            suite.append(_pack_encrypted(identities, variant, payload_size, keys_count))
+            suite.append(
+                _unpack_encrypted(identities, variant, payload_size, keys_count)
+            )
+            suite.append(_peek_encrypted(identities, variant, payload_size, keys_count))
+
+    for depth in forward_depths:
+        suite.append(_wrap_in_forward(identities, depth))
+        suite.append(_unpack_forward(identities, depth))
+
+    if resolver_latency_ms:
+        suite = [
+            replace(
+                benchmark,
+                params=dict(benchmark.params, resolver_latency_ms=resolver_latency_ms),
+            )
+            for benchmark in suite
+        ]
+    return suite
+
+
+async def run_suite(
+    suite: List[Benchmark],
+    run_config: RunConfig,
+    filter_pattern: Optional[str] = None,
+    on_result: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> List[BenchmarkResult]:
+    """
+    Runs the benchmarks one by one.
+
+    :param suite: benchmarks to run
+    :param run_config: sampling settings
+    :param filter_pattern: optional regular expression, only benchmarks with matching ids are run
+    :param on_result: optional callback called after every benchmark
+    :return: results in the order of the suite, a benchmark raising an exception
+        (e.g. a payload size not supported by the crypto backend) is reported as a failed result
+        and doesn't stop the run
+    """
+    results = []
+    for benchmark in suite:
+        if filter_pattern and not re.search(filter_pattern, benchmark.id):
+            continue
+        try:
+            sampler = await benchmark.setup()
+            result = await measure(
+                benchmark.name, benchmark.params, sampler, run_config, benchmark.sizes
+            )
+        except Exception as e:
+            result = BenchmarkResult.from_error(benchmark.name, benchmark.params, e)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def _pack_plaintext(identities: _Identities, payload_size: int) -> Benchmark:
+    async def setup():
+        config = identities.resolvers_config(identities.sender)
+        message = build_message(payload_size)
+        return lambda: pack_plaintext(config, message)
+
+    return Benchmark("pack_plaintext", {"payload_bytes": payload_size}, setup)
+
+
+def _unpack_plaintext(identities: _Identities, payload_size: int) -> Benchmark:
+    async def setup():
+        config = identities.resolvers_config(identities.sender)
+        packed = await pack_plaintext(config, build_message(payload_size))
+        return lambda: unpack(config, packed.packed_msg)
+
+    return Benchmark("unpack_plaintext", {"payload_bytes": payload_size}, setup)
+
+
+def _pack_signed(identities: _Identities, payload_size: int) -> Benchmark:
+    async def setup():
+        config = identities.resolvers_config(identities.sender)
+        message = build_message(payload_size)
+        return lambda: pack_signed(config, message, sign_frm=SENDER_DID)
+
+    return Benchmark("pack_signed", {"payload_bytes": payload_size}, setup)
+
+
+def _unpack_signed(identities: _Identities, payload_size: int) -> Benchmark:
+    async def setup():
+        config = identities.resolvers_config(identities.sender)
+        packed = await pack_signed(
+            config, build_message(payload_size), sign_frm=SENDER_DID
+        )
+        return lambda: unpack(config, packed.packed_msg)
+
+    return Benchmark("unpack_signed", {"payload_bytes": payload_size}, setup)
+
+
+def _pack_encrypted_sampler(
+    identities: _Identities, variant: str, payload_size: int, keys_count: int
+) -> Sampler:
+    authcrypt, sign, protect_sender_id = ENCRYPTED_VARIANTS[variant]
+    recipient = identities.recipient(keys_count)
+    config = identities.resolvers_config(identities.sender, recipient)
+    message = build_message(payload_size)
+    pack_config = PackEncryptedConfig(protect_sender_id=protect_sender_id)
+
+    return lambda: pack_encrypted(
+        config,
+        message,
+        to=RECIPIENT_DID,
+        frm=SENDER_DID if authcrypt else None,
+        sign_frm=SENDER_DID if sign else None,
+        pack_config=pack_config,
+    )
+
+
+def _pack_encrypted(
+    identities: _Identities, variant: str, payload_size: int, keys_count: int
+) -> Benchmark:
+    async def setup():
+        return _pack_encrypted_sampler(identities, variant, payload_size, keys_count)
+
+    return Benchmark(
+        f"pack_encrypted_{variant}",
+        {"payload_bytes": payload_size, "recipient_keys": keys_count},
+        setup,
+    )
+
+
+def _unpack_encrypted(
+    identities: _Identities, variant: str, payload_size: int, keys_count: int
+) -> Benchmark:
+    async def setup():
+        pack = _pack_encrypted_sampler(identities, variant, payload_size, keys_count)
+        packed = await pack()
+        recipient = identities.recipient(keys_count)
+        config = identities.resolvers_config(recipient, identities.sender)
+        return lambda: unpack(config, packed.packed_msg)
+
+    return Benchmark(
+        f"unpack_encrypted_{variant}",
+        {"payload_bytes": payload_size, "recipient_keys": keys_count},
+        setup,
+    )
+
+
+def _peek_encrypted(
+    identities: _Identities, variant: str, payload_size: int, keys_count: int
+) -> Benchmark:
+    async def setup():
+        pack = _pack_encrypted_sampler(identities, variant, payload_size, keys_count)
+        packed = await pack()
+
+        async def sample():
+            return peek(packed.packed_msg)
+
+        return sample
+
+    return Benchmark(
+        f"peek_encrypted_{variant}",
+        {"payload_bytes": payload_size, "recipient_keys": keys_count},
+        setup,
+    )
+
+
+async def _pack_for_forward(identities: _Identities, depth: int):
+    mediators = identities.mediators(depth)
+    recipient = identities.recipient(1)
+    config = identities.resolvers_config(identities.sender, recipient, *mediators)
+    packed = await pack_encrypted(
+        config,
+        build_message(DEFAULT_PAYLOAD_SIZE),
+        to=RECIPIENT_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    # the first routing key is the outermost one
+    routing_keys = [mediator.did_doc.key_agreement[0] for mediator in mediators]
+    return config, json_str_to_dict(packed.packed_msg), routing_keys, mediators
+
+
+def _wrap_in_forward(identities: _Identities, depth: int) -> Benchmark:
+    async def setup():
+        config, packed_msg, routing_keys, _ = await _pack_for_forward(identities, depth)
+        return lambda: wrap_in_forward(
+            config, packed_msg, to=RECIPIENT_DID, routing_keys=routing_keys
+        )
+
+    return Benchmark(
+        "wrap_in_forward",
+        {"payload_bytes": DEFAULT_PAYLOAD_SIZE, "depth": depth},
+        setup,
+    )
+
+
+def _unpack_forward(identities: _Identities, depth: int) -> Benchmark:
+    async def setup():
+        config, packed_msg, routing_keys, mediators = await _pack_for_forward(
+            identities, depth
+        )
+        wrapped = await wrap_in_forward(
+            config, packed_msg, to=RECIPIENT_DID, routing_keys=routing_keys
+        )
+        mediator_configs = [
+            identities.resolvers_config(mediator, identities.sender)
+            for mediator in mediators
+        ]
+
+        async def sample():
+            msg = wrapped.msg_encrypted.msg
+            for mediator_config in mediator_configs:
+                msg = (await unpack_forward(mediator_config, msg, False)).forwarded_msg
+            return msg
+
+        return sample
+
+    return Benchmark(
+        "unpack_forward",
+        {"payload_bytes": DEFAULT_PAYLOAD_SIZE, "depth": depth},
+        setup,
+    )
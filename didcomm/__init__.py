@@ -1,113 +1,233 @@
+"""
+Public API of the library.
+
+Names are imported from their modules on first access (PEP 562),
+so `import didcomm` does not load Authlib, pydid and other dependencies until they are needed.
+"""
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING
+
 __version__ = "0.3.1"
 
-from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg, SignAlg
-from didcomm.common.resolvers import ResolversConfig
-from didcomm.common.types import (
-    DIDCommMessageMediaTypes,
-    DIDCommMessageProtocolTypes,
-    DIDCommMessageTypes,
-    DIDDocServiceTypes,
-    VerificationMethodType,
-    VerificationMaterial,
-    VerificationMaterialFormat,
-)
-from didcomm.did_doc.did_doc import DIDDoc, DIDCommService, VerificationMethod
-from didcomm.did_doc.did_resolver import DIDResolver
-from didcomm.did_doc.did_resolver_in_memory import DIDResolverInMemory
-from didcomm.message import (
-    Attachment,
-    AttachmentDataBase64,
-    AttachmentDataJson,
-    AttachmentDataLinks,
-    FromPrior,
-    GenericMessage,
-    Message,
-)
-from didcomm.pack_encrypted import (
-    pack_encrypted,
-    PackEncryptedConfig,
-    PackEncryptedParameters,
-    PackEncryptedResult,
-)
-from didcomm.pack_plaintext import (
-    pack_plaintext,
-    PackPlaintextParameters,
-    PackPlaintextResult,
-)
-from didcomm.pack_signed import pack_signed, PackSignedParameters, PackSignedResult
-from didcomm.protocols.routing.forward import (
-    is_forward,
-    unpack_forward,
-    wrap_in_forward,
-    ForwardBody,
-    ForwardMessage,
-    ForwardPackResult,
-    ForwardResult,
-)
-from didcomm.unpack import unpack, Metadata, UnpackConfig, UnpackResult
-from didcomm.secrets.secrets_resolver import Secret, SecretsResolver
-from didcomm.secrets.secrets_resolver_in_memory import SecretsResolverInMemory
+if TYPE_CHECKING:
+    from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg, SignAlg
+    from didcomm.common.resolvers import ResolversConfig
+    from didcomm.common.types import (
+        DIDCommMessageMediaTypes,
+        DIDCommMessageProtocolTypes,
+        DIDCommMessageTypes,
+        DIDDocServiceTypes,
+        VerificationMethodType,
+        VerificationMaterial,
+        VerificationMaterialFormat,
+    )
+    from didcomm.core.crypto.backend import (
+        CryptoBackend,
+        get_crypto_backend,
+        set_crypto_backend,
+    )
+    from didcomm.core.from_prior_cache import (
+        FromPriorJwtCache,
+        VerifiedFromPriorCache,
+        disable_from_prior_jwt_cache,
+        disable_verified_from_prior_cache,
+        enable_from_prior_jwt_cache,
+        enable_verified_from_prior_cache,
+    )
+    from didcomm.core.ephemeral_keys import (
+        EphemeralKeyPool,
+        disable_ephemeral_key_pool,
+        enable_ephemeral_key_pool,
+    )
+    from didcomm.did_doc.did_doc import DIDDoc, DIDCommService, VerificationMethod
+    from didcomm.did_doc.did_doc_compact import (
+        DIDDocCompact,
+        DIDCommServiceCompact,
+        VerificationMethodCompact,
+    )
+    from didcomm.did_doc.did_resolver import DIDResolver
+    from didcomm.did_doc.did_resolver_in_memory import DIDResolverInMemory
+    from didcomm.did_doc.did_resolver_key import DIDResolverKey
+    from didcomm.did_doc.did_resolver_peer import DIDResolverPeer
+    from didcomm.message import (
+        Attachment,
+        AttachmentDataBase64,
+        AttachmentDataJson,
+        AttachmentDataLinks,
+        FromPrior,
+        GenericMessage,
+        Message,
+    )
+    from didcomm.pack_encrypted import (
+        pack_encrypted,
+        pack_encrypted_to_many,
+        PackEncryptedConfig,
+        PackEncryptedParameters,
+        PackEncryptedResult,
+    )
+    from didcomm.pack_plaintext import (
+        pack_plaintext,
+        PackPlaintextParameters,
+        PackPlaintextResult,
+    )
+    from didcomm.pack_signed import pack_signed, PackSignedParameters, PackSignedResult
+    from didcomm.peek import peek, PeekResult
+    from didcomm.protocols.routing.forward import (
+        is_forward,
+        unpack_forward,
+        wrap_in_forward,
+        ForwardBody,
+        ForwardMessage,
+        ForwardPackResult,
+        ForwardResult,
+    )
+    from didcomm.unpack import (
+        unpack,
+        Metadata,
+        UnpackConfig,
+        UnpackLimits,
+        UnpackResult,
+    )
+    from didcomm.secrets.secrets_resolver import Secret, SecretsResolver
+    from didcomm.secrets.secrets_resolver_in_memory import SecretsResolverInMemory
+    from didcomm.secrets.secrets_resolver_router import SecretsResolverRouter
+    from didcomm.duplicates import DuplicateMessageGuard
+    from didcomm.metrics import (
+        MetricsRegistry,
+        MetricsSnapshot,
+        disable_metrics,
+        enable_metrics,
+        format_prometheus,
+    )
+    from didcomm.profiling import (
+        HotFunction,
+        SamplingProfiler,
+        disable_profiling,
+        enable_profiling,
+    )
+    from didcomm.tracing import (
+        InMemoryTracer,
+        OpenTelemetryTracer,
+        Span,
+        Tracer,
+        use_tracer,
+    )
+
+# public name -> module it's imported from
+_EXPORTS = {
+    "AnonCryptAlg": "didcomm.common.algorithms",
+    "AuthCryptAlg": "didcomm.common.algorithms",
+    "SignAlg": "didcomm.common.algorithms",
+    "ResolversConfig": "didcomm.common.resolvers",
+    "DIDCommMessageMediaTypes": "didcomm.common.types",
+    "DIDCommMessageProtocolTypes": "didcomm.common.types",
+    "DIDCommMessageTypes": "didcomm.common.types",
+    "DIDDocServiceTypes": "didcomm.common.types",
+    "VerificationMethodType": "didcomm.common.types",
+    "VerificationMaterial": "didcomm.common.types",
+    "VerificationMaterialFormat": "didcomm.common.types",
+    "CryptoBackend": "didcomm.core.crypto.backend",
+    "get_crypto_backend": "didcomm.core.crypto.backend",
+    "set_crypto_backend": "didcomm.core.crypto.backend",
+    "FromPriorJwtCache": "didcomm.core.from_prior_cache",
+    "disable_from_prior_jwt_cache": "didcomm.core.from_prior_cache",
+    "enable_from_prior_jwt_cache": "didcomm.core.from_prior_cache",
+    "VerifiedFromPriorCache": "didcomm.core.from_prior_cache",
+    "disable_verified_from_prior_cache": "didcomm.core.from_prior_cache",
+    "enable_verified_from_prior_cache": "didcomm.core.from_prior_cache",
+    "EphemeralKeyPool": "didcomm.core.ephemeral_keys",
+    "disable_ephemeral_key_pool": "didcomm.core.ephemeral_keys",
+    "enable_ephemeral_key_pool": "didcomm.core.ephemeral_keys",
+    "DIDDoc": "didcomm.did_doc.did_doc",
+    "DIDCommService": "didcomm.did_doc.did_doc",
+    "VerificationMethod": "didcomm.did_doc.did_doc",
+    "DIDDocCompact": "didcomm.did_doc.did_doc_compact",
+    "DIDCommServiceCompact": "didcomm.did_doc.did_doc_compact",
+    "VerificationMethodCompact": "didcomm.did_doc.did_doc_compact",
+    "DIDResolver": "didcomm.did_doc.did_resolver",
+    "DIDResolverInMemory": "didcomm.did_doc.did_resolver_in_memory",
+    "DIDResolverKey": "didcomm.did_doc.did_resolver_key",
+    "DIDResolverPeer": "didcomm.did_doc.did_resolver_peer",
+    "Attachment": "didcomm.message",
+    "AttachmentDataBase64": "didcomm.message",
+    "AttachmentDataJson": "didcomm.message",
+    "AttachmentDataLinks": "didcomm.message",
+    "FromPrior": "didcomm.message",
+    "GenericMessage": "didcomm.message",
+    "Message": "didcomm.message",
+    "pack_encrypted": "didcomm.pack_encrypted",
+    "pack_encrypted_to_many": "didcomm.pack_encrypted",
+    "PackEncryptedConfig": "didcomm.pack_encrypted",
+    "PackEncryptedParameters": "didcomm.pack_encrypted",
+    "PackEncryptedResult": "didcomm.pack_encrypted",
+    "pack_plaintext": "didcomm.pack_plaintext",
+    "PackPlaintextParameters": "didcomm.pack_plaintext",
+    "PackPlaintextResult": "didcomm.pack_plaintext",
+    "pack_signed": "didcomm.pack_signed",
+    "PackSignedParameters": "didcomm.pack_signed",
+    "PackSignedResult": "didcomm.pack_signed",
+    "peek": "didcomm.peek",
+    "PeekResult": "didcomm.peek",
+    "is_forward": "didcomm.protocols.routing.forward",
+    "unpack_forward": "didcomm.protocols.routing.forward",
+    "wrap_in_forward": "didcomm.protocols.routing.forward",
+    "ForwardBody": "didcomm.protocols.routing.forward",
+    "ForwardMessage": "didcomm.protocols.routing.forward",
+    "ForwardPackResult": "didcomm.protocols.routing.forward",
+    "ForwardResult": "didcomm.protocols.routing.forward",
+    "unpack": "didcomm.unpack",
+    "Metadata": "didcomm.unpack",
+    "UnpackConfig": "didcomm.unpack",
+    "UnpackLimits": "didcomm.unpack",
+    "UnpackResult": "didcomm.unpack",
+    "Secret": "didcomm.secrets.secrets_resolver",
+    "SecretsResolver": "didcomm.secrets.secrets_resolver",
+    "SecretsResolverInMemory": "didcomm.secrets.secrets_resolver_in_memory",
+    "SecretsResolverRouter": "didcomm.secrets.secrets_resolver_router",
+    "DuplicateMessageGuard": "didcomm.duplicates",
+    "MetricsRegistry": "didcomm.metrics",
+    "MetricsSnapshot": "didcomm.metrics",
+    "disable_metrics": "didcomm.metrics",
+    "enable_metrics": "didcomm.metrics",
+    "format_prometheus": "didcomm.metrics",
+    "HotFunction": "didcomm.profiling",
+    "SamplingProfiler": "didcomm.profiling",
+    "disable_profiling": "didcomm.profiling",
+    "enable_profiling": "didcomm.profiling",
+    "InMemoryTracer": "didcomm.tracing",
+    "OpenTelemetryTracer": "didcomm.tracing",
+    "Span": "didcomm.tracing",
+    "Tracer": "didcomm.tracing",
+    "use_tracer": "didcomm.tracing",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # cache the value, so the next access does not call `__getattr__`
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _PackageModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to the package attribute with the same name.
+        # For submodules named like the function they export (for example `didcomm.unpack`)
+        # the function is bound instead, as it was done by eager imports.
+        if isinstance(value, types.ModuleType) and _EXPORTS.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
 
-__all__ = [
-    # didcomm.common.algorithms
-    "AnonCryptAlg",
-    "AuthCryptAlg",
-    "SignAlg",
-    # didcomm.common.resolvers
-    "ResolversConfig",
-    # didcomm.common.types
-    "DIDCommMessageMediaTypes",
-    "DIDCommMessageProtocolTypes",
-    "DIDCommMessageTypes",
-    "DIDDocServiceTypes",
-    "VerificationMethodType",
-    "VerificationMaterial",
-    "VerificationMaterialFormat",
-    # didcomm.did_doc.did_doc
-    "DIDDoc",
-    "DIDCommService",
-    "VerificationMethod",
-    # didcomm.did_doc.did_resolver
-    "DIDResolver",
-    # did_resolver_in_memory
-    "DIDResolverInMemory",
-    # didcomm.message
-    "Attachment",
-    "AttachmentDataBase64",
-    "AttachmentDataJson",
-    "AttachmentDataLinks",
-    "FromPrior",
-    "GenericMessage",
-    "Message",
-    # didcomm.pack_encrypted
-    "pack_encrypted",
-    "PackEncryptedConfig",
-    "PackEncryptedParameters",
-    "PackEncryptedResult",
-    # didcomm.pack_plaintext
-    "pack_plaintext",
-    "PackPlaintextParameters",
-    "PackPlaintextResult",
-    # didcomm.pack_signed
-    "pack_signed",
-    "PackSignedParameters",
-    "PackSignedResult",
-    # didcomm.protocols.routing.forward
-    "is_forward",
-    "unpack_forward",
-    "wrap_in_forward",
-    "ForwardBody",
-    "ForwardMessage",
-    "ForwardPackResult",
-    "ForwardResult",
-    # didcomm.unpack
-    "unpack",
-    "Metadata",
-    "UnpackConfig",
-    "UnpackResult",
-    # didcomm.secrets.secrets_resolver
-    "Secret",
-    "SecretsResolver",
-    # didcomm.secrets.secrets_resolver_in_memory
-    "SecretsResolverInMemory",
-]
+sys.modules[__name__].__class__ = _PackageModule
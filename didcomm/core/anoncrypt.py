@@ -1,19 +1,21 @@
-from typing import List
-
-from authlib.jose import JsonWebEncryption
+from typing import List, Optional, Union
 
 from didcomm.common.algorithms import AnonCryptAlg, Algs
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DIDCommMessageTypes
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.crypto.backend import get_crypto_backend
+from didcomm.core.jwe import ZIP_DEFLATE
 from didcomm.core.keys.anoncrypt_keys_selector import (
     find_anoncrypt_pack_recipient_public_keys,
     find_anoncrypt_unpack_recipient_private_keys,
 )
-from didcomm.core.serialization import dict_to_json_bytes
+from didcomm.core.serialization import dict_to_json_bytes, jwe_to_json_bytes
 from didcomm.core.types import EncryptResult, UnpackAnoncryptResult, Key
 from didcomm.core.utils import extract_key, get_jwe_alg, calculate_apv
 from didcomm.core.validation import validate_anoncrypt_jwe
 from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from didcomm.tracing import span
 
 
 def is_anoncrypted(msg: dict) -> bool:
@@ -25,34 +27,75 @@ def is_anoncrypted(msg: dict) -> bool:
     return alg.startswith("ECDH-ES")
 
 
-def anoncrypt(msg: dict, to: List[Key], alg: AnonCryptAlg) -> EncryptResult:
-    msg = dict_to_json_bytes(msg)
+def anoncrypt(
+    msg: Union[dict, bytes],
+    to: List[Key],
+    alg: AnonCryptAlg,
+    compress_min_size: Optional[int] = None,
+) -> EncryptResult:
+    if isinstance(msg, dict):
+        msg = dict_to_json_bytes(msg)
 
     kids = [to_key.kid for to_key in to]
-    keys = [to_key.key for to_key in to]
 
-    header_obj = _build_header(to=to, alg=alg)
+    protected = _build_protected_header(
+        to=to,
+        alg=alg,
+        compress=compress_min_size is not None and len(msg) >= compress_min_size,
+    )
 
-    jwe = JsonWebEncryption()
-    res = jwe.serialize_json(header_obj, msg, keys)
+    with span("jwe.encrypt", alg=alg.value.alg, recipients=len(to), size=len(msg)):
+        res = get_crypto_backend().encrypt(protected, to, msg)
 
     return EncryptResult(msg=res, to_kids=kids, to_keys=to)
 
 
-async def find_keys_and_anoncrypt(
-    msg: dict, to: DID_OR_DID_URL, alg: AnonCryptAlg, resolvers_config: ResolversConfig
+def anoncrypt_authcrypted(
+    authcrypt_result: EncryptResult,
+    alg: AnonCryptAlg,
+    compress_min_size: Optional[int] = None,
 ) -> EncryptResult:
+    """
+    Protects the sender ID of an authcrypted message by anoncrypting it to the same recipients.
+
+    The recipient keys resolved and parsed for authcrypt are reused,
+    and the authcrypted JWE is serialized directly into the plaintext of the anoncrypted one.
+    """
+    return anoncrypt(
+        jwe_to_json_bytes(authcrypt_result.msg),
+        authcrypt_result.to_keys,
+        alg,
+        compress_min_size,
+    )
+
+
+async def find_anoncrypt_keys(
+    to: DID_OR_DID_URL, resolvers_config: ResolversConfig
+) -> List[Key]:
     to_verification_methods = await find_anoncrypt_pack_recipient_public_keys(
         to, resolvers_config
     )
-    to_public_keys = [
+    return [
         Key(kid=to_vm.id, key=extract_key(to_vm)) for to_vm in to_verification_methods
     ]
-    return anoncrypt(msg, to_public_keys, alg)
+
+
+async def find_keys_and_anoncrypt(
+    msg: dict,
+    to: DID_OR_DID_URL,
+    alg: AnonCryptAlg,
+    resolvers_config: ResolversConfig,
+    compress_min_size: Optional[int] = None,
+) -> EncryptResult:
+    to_public_keys = await find_anoncrypt_keys(to, resolvers_config)
+    return anoncrypt(msg, to_public_keys, alg, compress_min_size)
 
 
 async def unpack_anoncrypt(
-    msg: dict, resolvers_config: ResolversConfig, decrypt_by_all_keys: bool
+    msg: dict,
+    resolvers_config: ResolversConfig,
+    decrypt_by_all_keys: bool,
+    max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
 ) -> UnpackAnoncryptResult:
     validate_anoncrypt_jwe(msg)
 
@@ -62,10 +105,14 @@ async def unpack_anoncrypt(
     async for to_secret in find_anoncrypt_unpack_recipient_private_keys(
         to_kids, resolvers_config
     ):
-        to_private_kid_and_key = (to_secret.kid, extract_key(to_secret))
+        to_private_key = Key(kid=to_secret.kid, key=extract_key(to_secret))
         try:
-            jwe = JsonWebEncryption()
-            res = jwe.deserialize_json(msg, to_private_kid_and_key)
+            with span("jwe.decrypt", kid=to_secret.kid):
+                payload, protected = get_crypto_backend().decrypt(
+                    msg, to_private_key, max_decompressed_size=max_decompressed_size
+                )
+        except MalformedMessageError:
+            raise
         except Exception as exc:
             if decrypt_by_all_keys:
                 raise MalformedMessageError(
@@ -73,16 +120,11 @@ async def unpack_anoncrypt(
                 ) from exc
             continue
 
-        if "payload" not in res:
-            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
-        if "header" not in res or "protected" not in res["header"]:
-            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
-        protected = res["header"]["protected"]
         if "alg" not in protected or "enc" not in protected:
             raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
         alg = AnonCryptAlg(Algs(alg=protected["alg"], enc=protected["enc"]))
 
-        unpack_res = UnpackAnoncryptResult(msg=res["payload"], to_kids=to_kids, alg=alg)
+        unpack_res = UnpackAnoncryptResult(msg=payload, to_kids=to_kids, alg=alg)
         if not decrypt_by_all_keys:
             return unpack_res
 
@@ -91,14 +133,14 @@ async def unpack_anoncrypt(
     return unpack_res
 
 
-def _build_header(to: List[Key], alg: AnonCryptAlg):
-    kids = [to_key.kid for to_key in to]
-    apv = calculate_apv(kids)
+def _build_protected_header(to: List[Key], alg: AnonCryptAlg, compress: bool = False):
+    apv = calculate_apv([to_key.kid for to_key in to])
     protected = {
         "typ": DIDCommMessageTypes.ENCRYPTED.value,
         "alg": alg.value.alg,
         "enc": alg.value.enc,
         "apv": apv,
     }
-    recipients = [{"header": {"kid": kid}} for kid in kids]
-    return {"protected": protected, "recipients": recipients}
+    if compress:
+        protected["zip"] = ZIP_DEFLATE
+    return protected
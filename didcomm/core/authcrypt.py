@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from authlib.common.encoding import (
     to_bytes,
@@ -6,20 +6,24 @@ from authlib.common.encoding import (
     urlsafe_b64encode,
     urlsafe_b64decode,
 )
-from authlib.jose import JsonWebEncryption
 
 from didcomm.common.algorithms import AuthCryptAlg, Algs
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DIDCommMessageTypes
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.crypto.backend import get_crypto_backend
+from didcomm.core.jwe import ZIP_DEFLATE
 from didcomm.core.keys.authcrypt_keys_selector import (
     find_authcrypt_pack_sender_and_recipient_keys,
     find_authcrypt_unpack_sender_and_recipient_keys,
 )
+from didcomm.core.resolvers import prefetch_did_doc
 from didcomm.core.serialization import dict_to_json_bytes
 from didcomm.core.types import EncryptResult, UnpackAuthcryptResult, Key
-from didcomm.core.utils import extract_key, get_jwe_alg, calculate_apv
+from didcomm.core.utils import extract_key, get_jwe_alg, calculate_apv, get_did
 from didcomm.core.validation import validate_authcrypt_jwe
 from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from didcomm.tracing import span
 
 
 def is_authcrypted(msg: dict) -> bool:
@@ -31,27 +35,33 @@ def is_authcrypted(msg: dict) -> bool:
     return alg.startswith("ECDH-1PU")
 
 
-def authcrypt(msg: dict, to: List[Key], frm: Key, alg: AuthCryptAlg) -> EncryptResult:
+def authcrypt(
+    msg: dict,
+    to: List[Key],
+    frm: Key,
+    alg: AuthCryptAlg,
+    compress_min_size: Optional[int] = None,
+) -> EncryptResult:
     msg = dict_to_json_bytes(msg)
 
     skid = frm.kid
     kids = [to_key.kid for to_key in to]
-    to_keys = [to_key.key for to_key in to]
 
-    header_obj = _build_header(to=to, frm=frm, alg=alg)
-    jwe = JsonWebEncryption()
-    res = jwe.serialize_json(header_obj, msg, to_keys, sender_key=frm.key)
+    protected = _build_protected_header(
+        to=to,
+        frm=frm,
+        alg=alg,
+        compress=compress_min_size is not None and len(msg) >= compress_min_size,
+    )
+    with span("jwe.encrypt", alg=alg.value.alg, recipients=len(to), size=len(msg)):
+        res = get_crypto_backend().encrypt(protected, to, msg, sender=frm)
 
     return EncryptResult(msg=res, to_kids=kids, to_keys=to, from_kid=skid)
 
 
-async def find_keys_and_authcrypt(
-    msg: dict,
-    to: DID_OR_DID_URL,
-    frm: DID_OR_DID_URL,
-    alg: AuthCryptAlg,
-    resolvers_config: ResolversConfig,
-) -> EncryptResult:
+async def find_authcrypt_keys(
+    to: DID_OR_DID_URL, frm: DID_OR_DID_URL, resolvers_config: ResolversConfig
+) -> Tuple[Key, List[Key]]:
     pack_keys = await find_authcrypt_pack_sender_and_recipient_keys(
         frm, to, resolvers_config
     )
@@ -63,11 +73,28 @@ async def find_keys_and_authcrypt(
         Key(kid=to_key.id, key=extract_key(to_key))
         for to_key in pack_keys.recipient_public_keys
     ]
-    return authcrypt(msg, to_public_keys, frm_private_key, alg)
+    return frm_private_key, to_public_keys
+
+
+async def find_keys_and_authcrypt(
+    msg: dict,
+    to: DID_OR_DID_URL,
+    frm: DID_OR_DID_URL,
+    alg: AuthCryptAlg,
+    resolvers_config: ResolversConfig,
+    compress_min_size: Optional[int] = None,
+) -> EncryptResult:
+    frm_private_key, to_public_keys = await find_authcrypt_keys(
+        to, frm, resolvers_config
+    )
+    return authcrypt(msg, to_public_keys, frm_private_key, alg, compress_min_size)
 
 
 async def unpack_authcrypt(
-    msg: dict, resolvers_config: ResolversConfig, decrypt_by_all_keys: bool
+    msg: dict,
+    resolvers_config: ResolversConfig,
+    decrypt_by_all_keys: bool,
+    max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
 ) -> UnpackAuthcryptResult:
     protected = validate_authcrypt_jwe(msg)
 
@@ -77,20 +104,28 @@ async def unpack_authcrypt(
 
     to_kids = [r["header"]["kid"] for r in msg["recipients"]]
 
+    # the sender DID Doc is resolved while the recipient secrets are looked up
+    prefetch_did_doc(resolvers_config, get_did(frm_kid))
+
     unpack_res = None
     async for unpack_keys in find_authcrypt_unpack_sender_and_recipient_keys(
         frm_kid, to_kids, resolvers_config
     ):
         frm_public_key = extract_key(unpack_keys.sender_public_key)
-        to_private_kid_and_key = (
-            unpack_keys.recipient_private_key.kid,
-            extract_key(unpack_keys.recipient_private_key),
+        to_private_key = Key(
+            kid=unpack_keys.recipient_private_key.kid,
+            key=extract_key(unpack_keys.recipient_private_key),
         )
         try:
-            jwe = JsonWebEncryption()
-            res = jwe.deserialize_json(
-                msg, to_private_kid_and_key, sender_key=frm_public_key
-            )
+            with span("jwe.decrypt", kid=unpack_keys.recipient_private_key.kid):
+                payload, protected = get_crypto_backend().decrypt(
+                    msg,
+                    to_private_key,
+                    sender_key=frm_public_key,
+                    max_decompressed_size=max_decompressed_size,
+                )
+        except MalformedMessageError:
+            raise
         except Exception as exc:
             if decrypt_by_all_keys:
                 raise MalformedMessageError(
@@ -98,17 +133,12 @@ async def unpack_authcrypt(
                 ) from exc
             continue
 
-        if "payload" not in res:
-            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
-        if "header" not in res or "protected" not in res["header"]:
-            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
-        protected = res["header"]["protected"]
         if "alg" not in protected or "enc" not in protected:
             raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
         alg = AuthCryptAlg(Algs(alg=protected["alg"], enc=protected["enc"]))
 
         unpack_res = UnpackAuthcryptResult(
-            msg=res["payload"], to_kids=to_kids, frm_kid=frm_kid, alg=alg
+            msg=payload, to_kids=to_kids, frm_kid=frm_kid, alg=alg
         )
         if not decrypt_by_all_keys:
             return unpack_res
@@ -118,7 +148,9 @@ async def unpack_authcrypt(
     return unpack_res
 
 
-def _build_header(to: List[Key], frm: Key, alg: AuthCryptAlg):
+def _build_protected_header(
+    to: List[Key], frm: Key, alg: AuthCryptAlg, compress: bool = False
+):
     skid = frm.kid
     kids = [to_key.kid for to_key in to]
 
@@ -132,5 +164,6 @@ def _build_header(to: List[Key], frm: Key, alg: AuthCryptAlg):
         "apv": apv,
         "skid": skid,
     }
-    recipients = [{"header": {"kid": kid}} for kid in kids]
-    return {"protected": protected, "recipients": recipients}
+    if compress:
+        protected["zip"] = ZIP_DEFLATE
+    return protected
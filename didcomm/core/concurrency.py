@@ -0,0 +1,77 @@
+"""
+Concurrent execution of independent resolver work.
+
+DID and secrets resolvers are usually I/O bound (a DID Doc is fetched from a ledger or a web server,
+a secret from a KMS), so independent lookups are awaited concurrently
+and the latency of an operation is the latency of the longest lookup chain instead of the sum of all lookups.
+
+Every awaitable is run in a task. On Python 3.12+ the overhead of tasks for resolvers which don't actually wait
+(in-memory resolvers) can be avoided by the application setting `asyncio.eager_task_factory` on its event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, List
+
+
+async def gather(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Awaits the given awaitables concurrently with `asyncio.gather`.
+
+    Unlike `asyncio.gather`, if any of them fails, the others are cancelled (and awaited)
+    before the exception is propagated, so no resolver work is left running in the background.
+
+    :param aws: coroutines or other awaitables
+    :return: results in the order of `aws`
+    """
+    futures = _ensure_futures(aws)
+    try:
+        return await asyncio.gather(*futures)
+    except BaseException:
+        await cancel(*futures)
+        raise
+
+
+async def gather_in_order(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Awaits the given awaitables concurrently, like `gather`,
+    but raises the same exception as if they were awaited one by one:
+    the results are awaited in the order of `aws`, and the first failure in that order is propagated
+    after the following awaitables are cancelled.
+
+    :param aws: coroutines or other awaitables
+    :return: results in the order of `aws`
+    """
+    futures = _ensure_futures(aws)
+    try:
+        return [await future for future in futures]
+    except BaseException:
+        await cancel(*futures)
+        raise
+
+
+async def cancel(*futures: asyncio.Future):
+    """
+    Cancels the futures and waits until they are done. Their results and exceptions are discarded.
+
+    :param futures: futures or tasks
+    """
+    for future in futures:
+        future.cancel()
+    await asyncio.gather(*futures, return_exceptions=True)
+
+
+def _ensure_futures(aws) -> List[asyncio.Future]:
+    futures = []
+    try:
+        for aw in aws:
+            futures.append(asyncio.ensure_future(aw))
+    except BaseException:
+        # not wrapped coroutines would be reported as never awaited
+        for aw in aws[len(futures) :]:
+            if asyncio.iscoroutine(aw):
+                aw.close()
+        for future in futures:
+            future.cancel()
+        raise
+    return futures
@@ -0,0 +1,9 @@
+"""
+Crypto backends performing JWE encryption and JWS signing of DIDComm messages.
+
+    set_crypto_backend("cryptography")
+
+The Authlib backend is the reference one and is used by default.
+The `cryptography` backend calls `cryptography` (and PyNaCl or pycryptodomex for XC20P) primitives directly
+for the algorithms used by DIDComm, and delegates everything else to the Authlib backend.
+"""
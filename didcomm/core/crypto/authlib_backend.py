@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from authlib.jose import JsonWebSignature
+from authlib.jose.errors import BadSignatureError
+
+from didcomm.common.types import DID_URL, JSON_OBJ
+from didcomm.core.crypto.backend import CryptoBackend
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.jwe import json_web_encryption
+from didcomm.core.types import Key
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+
+if TYPE_CHECKING:
+    from authlib.jose.rfc7517 import AsymmetricKey
+
+
+class AuthlibCryptoBackend(CryptoBackend):
+    """
+    Reference backend based on Authlib `JsonWebEncryption` and `JsonWebSignature`.
+    """
+
+    name = "authlib"
+
+    def encrypt(
+        self,
+        protected: dict,
+        to: List[Key],
+        payload: bytes,
+        sender: Optional[Key] = None,
+    ) -> JSON_OBJ:
+        header_obj = {
+            "protected": protected,
+            "recipients": [{"header": {"kid": to_key.kid}} for to_key in to],
+        }
+        return json_web_encryption().serialize_json(
+            header_obj,
+            payload,
+            [to_key.key for to_key in to],
+            sender_key=sender.key if sender is not None else None,
+        )
+
+    def decrypt(
+        self,
+        jwe: JSON_OBJ,
+        to: Key,
+        sender_key: Optional[AsymmetricKey] = None,
+        max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
+    ) -> Tuple[bytes, dict]:
+        res = json_web_encryption(max_decompressed_size).deserialize_json(
+            jwe, (to.kid, to.key), sender_key=sender_key
+        )
+        if "payload" not in res:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+        if "header" not in res or "protected" not in res["header"]:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+        return res["payload"], res["header"]["protected"]
+
+    def sign(
+        self, protected: dict, kid: DID_URL, payload: bytes, key: AsymmetricKey
+    ) -> JSON_OBJ:
+        header_objs = [{"protected": protected, "header": {"kid": kid}}]
+        return JsonWebSignature().serialize_json(header_objs, payload, key)
+
+    def verify(self, jws: JSON_OBJ, key: AsymmetricKey) -> bytes:
+        try:
+            return JsonWebSignature().deserialize_json(jws, key).payload
+        except BadSignatureError as exc:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_SIGNATURE) from exc
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import importlib
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+from didcomm.common.types import DID_URL, JSON_OBJ
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.types import Key
+
+if TYPE_CHECKING:
+    from authlib.jose.rfc7517 import AsymmetricKey
+
+# backend name -> (module, class)
+_BACKENDS = {
+    "authlib": ("didcomm.core.crypto.authlib_backend", "AuthlibCryptoBackend"),
+    "cryptography": (
+        "didcomm.core.crypto.cryptography_backend",
+        "CryptographyCryptoBackend",
+    ),
+}
+DEFAULT_BACKEND = "authlib"
+
+_backend: Optional[CryptoBackend] = None
+
+
+class CryptoBackend(ABC):
+    """
+    Performs JWE encryption and decryption and JWS signing and verification.
+
+    Keys are Authlib JOSE keys as extracted from verification methods and secrets.
+    """
+
+    name: str
+
+    @abstractmethod
+    def encrypt(
+        self,
+        protected: dict,
+        to: List[Key],
+        payload: bytes,
+        sender: Optional[Key] = None,
+    ) -> JSON_OBJ:
+        """
+        Encrypts the payload for the recipients.
+
+        :param protected: protected header (`alg`, `enc` and optionally `zip`, `apu`, `apv`, `skid`),
+            `epk` is added by the backend
+        :param to: recipient public keys, their IDs are put into per-recipient `kid` headers
+        :param payload: plaintext
+        :param sender: sender private key for ECDH-1PU key agreement
+        :return: JWE in the general JSON serialization with `protected`, `recipients`, `iv`, `ciphertext`
+            and `tag` members
+        """
+
+    @abstractmethod
+    def decrypt(
+        self,
+        jwe: JSON_OBJ,
+        to: Key,
+        sender_key: Optional[AsymmetricKey] = None,
+        max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
+    ) -> Tuple[bytes, dict]:
+        """
+        Decrypts the JWE.
+
+        :param jwe: JWE in the general JSON serialization
+        :param to: recipient private key and its ID
+        :param sender_key: sender public key for ECDH-1PU key agreement
+        :param max_decompressed_size: max size of a decompressed (`"zip": "DEF"`) plaintext
+
+        :raises MalformedMessageError: with `DECOMPRESSED_TOO_LARGE` code if the decompressed plaintext is too large
+        :raises Exception: if the JWE can not be decrypted
+
+        :return: plaintext and the protected header
+        """
+
+    @abstractmethod
+    def sign(
+        self, protected: dict, kid: DID_URL, payload: bytes, key: AsymmetricKey
+    ) -> JSON_OBJ:
+        """
+        Signs the payload.
+
+        :param protected: protected header (`typ` and `alg`)
+        :param kid: ID of the signing key put into the unprotected header
+        :param payload: payload
+        :param key: signing private key
+        :return: JWS in the general JSON serialization
+        """
+
+    @abstractmethod
+    def verify(self, jws: JSON_OBJ, key: AsymmetricKey) -> bytes:
+        """
+        Verifies all signatures of the JWS by the key.
+
+        :param jws: JWS in the general JSON serialization
+        :param key: verification public key
+
+        :raises MalformedMessageError: with `INVALID_SIGNATURE` code if a signature is invalid
+        :raises Exception: if the JWS is invalid
+
+        :return: payload
+        """
+
+
+def get_crypto_backend() -> CryptoBackend:
+    """
+    :return: the backend used for packing and unpacking
+    """
+    global _backend
+    if _backend is None:
+        _backend = create_crypto_backend(DEFAULT_BACKEND)
+    return _backend
+
+
+def set_crypto_backend(
+    backend: Union[CryptoBackend, str, None] = None
+) -> CryptoBackend:
+    """
+    Sets the backend used for packing and unpacking.
+
+    :param backend: backend or name of a built-in backend (`authlib` or `cryptography`),
+        the default (`authlib`) backend is set if not specified
+    :raises DIDCommValueError: if there is no built-in backend with the name
+    :return: the backend set
+    """
+    global _backend
+    if not isinstance(backend, CryptoBackend):
+        backend = create_crypto_backend(backend or DEFAULT_BACKEND)
+    _backend = backend
+    return backend
+
+
+def create_crypto_backend(name: str) -> CryptoBackend:
+    """
+    :param name: name of a built-in backend (`authlib` or `cryptography`)
+    :raises DIDCommValueError: if there is no built-in backend with the name
+    :return: a new instance of the backend
+    """
+    from didcomm.errors import DIDCommValueError
+
+    if name not in _BACKENDS:
+        raise DIDCommValueError(
+            f"Unknown crypto backend `{name}`, expected one of {list(_BACKENDS)}"
+        )
+    module_name, class_name = _BACKENDS[name]
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,435 @@
+"""
+Crypto backend calling `cryptography` primitives directly.
+
+It implements the algorithms used by DIDComm:
+    - ECDH-ES+A256KW and ECDH-1PU+A256KW key agreement with X25519, P-256, P-384, P-521 and secp256k1 keys
+    - A256CBC-HS512, A256GCM and XC20P content encryption (XC20P by PyNaCl if it's installed, pycryptodomex otherwise)
+    - EdDSA (Ed25519), ES256 and ES256K signatures
+
+Other algorithms, key types and JWE layouts (for example, `epk` in a per-recipient header)
+are delegated to the Authlib backend.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import struct
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from authlib.common.encoding import urlsafe_b64decode, urlsafe_b64encode
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+    encode_dss_signature,
+)
+from cryptography.hazmat.primitives.asymmetric.x25519 import (
+    X25519PrivateKey,
+    X25519PublicKey,
+)
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.keywrap import aes_key_unwrap, aes_key_wrap
+
+from didcomm.common.types import DID_URL, JSON_OBJ
+from didcomm.core.crypto.authlib_backend import AuthlibCryptoBackend
+from didcomm.core.crypto.backend import CryptoBackend
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.ephemeral_keys import get_ephemeral_key_pool
+from didcomm.core.jwe import ZIP_DEFLATE, deflate_compress, deflate_decompress
+from didcomm.core.types import Key
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+
+try:
+    from nacl import bindings as nacl_bindings
+except ImportError:  # pragma: no cover - PyNaCl is optional
+    nacl_bindings = None
+
+if TYPE_CHECKING:
+    from authlib.jose.rfc7517 import AsymmetricKey
+
+_KEY_AGREEMENT_ALGS = {
+    # alg -> (key wrapping key size in bits, whether it's ECDH-1PU)
+    "ECDH-ES+A256KW": (256, False),
+    "ECDH-1PU+A256KW": (256, True),
+}
+# enc -> (CEK size in bytes, IV size in bytes)
+_CONTENT_ENCS = {
+    "A256CBC-HS512": (64, 16),
+    "A256GCM": (32, 12),
+    "XC20P": (32, 24),
+}
+_EC_CURVES = {
+    "P-256": ec.SECP256R1(),
+    "P-384": ec.SECP384R1(),
+    "P-521": ec.SECP521R1(),
+    "secp256k1": ec.SECP256K1(),
+}
+_KEY_AGREEMENT_CURVES = {"X25519", *_EC_CURVES}
+# JWS alg -> curve of the key
+_SIGN_ALGS = {"EdDSA": "Ed25519", "ES256": "P-256", "ES256K": "secp256k1"}
+
+
+class CryptographyCryptoBackend(CryptoBackend):
+    """
+    Backend calling `cryptography` primitives directly, the Authlib backend is used for anything else.
+    """
+
+    name = "cryptography"
+
+    def __init__(self):
+        self._fallback = AuthlibCryptoBackend()
+
+    def encrypt(
+        self,
+        protected: dict,
+        to: List[Key],
+        payload: bytes,
+        sender: Optional[Key] = None,
+    ) -> JSON_OBJ:
+        alg, enc = protected.get("alg"), protected.get("enc")
+        crv = _crv(to[0].key) if to else None
+        keys = [to_key.key for to_key in to] + ([sender.key] if sender else [])
+        if (
+            not _supports_encryption(alg, enc, protected)
+            or crv not in _KEY_AGREEMENT_CURVES
+            or any(_crv(key) != crv for key in keys)
+        ):
+            return self._fallback.encrypt(protected, to, payload, sender)
+
+        key_size, is_1pu = _KEY_AGREEMENT_ALGS[alg]
+        cek_size, iv_size = _CONTENT_ENCS[enc]
+
+        epk = _generate_ephemeral_key(to[0].key)
+        protected = dict(protected, epk=_public_jwk(epk.public_key(), crv))
+        protected_segment = _b64encode(_json_dumps(protected))
+
+        if protected.get("zip") == ZIP_DEFLATE:
+            payload = deflate_compress(payload)
+        cek = os.urandom(cek_size)
+        iv = os.urandom(iv_size)
+        ciphertext, tag = _encrypt_content(
+            enc, cek, iv, payload, protected_segment.encode("ascii")
+        )
+
+        # ECDH-1PU in key wrapping mode binds the tag to the key agreement
+        fixed_info = _fixed_info(protected, key_size, tag if is_1pu else None)
+        sender_private_key = sender.key.get_private_key() if is_1pu else None
+        recipients = []
+        for to_key in to:
+            public_key = to_key.key.get_public_key()
+            shared_key = _exchange(epk, public_key)
+            if is_1pu:
+                shared_key += _exchange(sender_private_key, public_key)
+            kek = _concat_kdf(shared_key, fixed_info, key_size)
+            recipients.append(
+                {
+                    "header": {"kid": to_key.kid},
+                    "encrypted_key": _b64encode(aes_key_wrap(kek, cek)),
+                }
+            )
+
+        return {
+            "protected": protected_segment,
+            "recipients": recipients,
+            "iv": _b64encode(iv),
+            "ciphertext": _b64encode(ciphertext),
+            "tag": _b64encode(tag),
+        }
+
+    def decrypt(
+        self,
+        jwe: JSON_OBJ,
+        to: Key,
+        sender_key: Optional[AsymmetricKey] = None,
+        max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
+    ) -> Tuple[bytes, dict]:
+        protected = json.loads(urlsafe_b64decode(jwe["protected"].encode()))
+        alg, enc = protected.get("alg"), protected.get("enc")
+        crv = _crv(to.key)
+        if (
+            not _supports_encryption(alg, enc, protected)
+            or "unprotected" in jwe
+            or not isinstance(protected.get("epk"), dict)
+            or crv not in _KEY_AGREEMENT_CURVES
+            or (sender_key is not None and _crv(sender_key) != crv)
+        ):
+            return self._fallback.decrypt(jwe, to, sender_key, max_decompressed_size)
+
+        key_size, is_1pu = _KEY_AGREEMENT_ALGS[alg]
+        if is_1pu and sender_key is None:
+            raise ValueError("Sender key is required for ECDH-1PU")
+        iv = urlsafe_b64decode(jwe["iv"].encode())
+        ciphertext = urlsafe_b64decode(jwe["ciphertext"].encode())
+        tag = urlsafe_b64decode(jwe["tag"].encode())
+
+        private_key = to.key.get_private_key()
+        shared_key = _exchange(private_key, _import_public_jwk(protected["epk"], crv))
+        if is_1pu:
+            shared_key += _exchange(private_key, sender_key.get_public_key())
+        kek = _concat_kdf(
+            shared_key,
+            _fixed_info(protected, key_size, tag if is_1pu else None),
+            key_size,
+        )
+
+        recipients = jwe["recipients"]
+        matching = [r for r in recipients if r.get("header", {}).get("kid") == to.kid]
+        cek = _unwrap_cek(kek, matching or recipients)
+
+        aad = jwe["protected"]
+        if "aad" in jwe:
+            aad += "." + jwe["aad"]
+        payload = _decrypt_content(enc, cek, iv, ciphertext, tag, aad.encode("ascii"))
+        if protected.get("zip") == ZIP_DEFLATE:
+            payload = deflate_decompress(payload, max_decompressed_size)
+        return payload, protected
+
+    def sign(
+        self, protected: dict, kid: DID_URL, payload: bytes, key: AsymmetricKey
+    ) -> JSON_OBJ:
+        alg = protected.get("alg")
+        if _SIGN_ALGS.get(alg) != _crv(key):
+            return self._fallback.sign(protected, kid, payload, key)
+
+        protected_segment = _b64encode(_json_dumps(protected))
+        payload_segment = _b64encode(payload)
+        signing_input = f"{protected_segment}.{payload_segment}".encode("ascii")
+        signature = _sign(alg, key.get_private_key(), signing_input)
+        return {
+            "payload": payload_segment,
+            "signatures": [
+                {
+                    "protected": protected_segment,
+                    "signature": _b64encode(signature),
+                    "header": {"kid": kid},
+                }
+            ],
+        }
+
+    def verify(self, jws: JSON_OBJ, key: AsymmetricKey) -> bytes:
+        signatures = jws.get("signatures")
+        if not isinstance(signatures, list) or not all(
+            isinstance(s, dict) and isinstance(s.get("protected"), str)
+            for s in signatures
+        ):
+            return self._fallback.verify(jws, key)
+        headers = [
+            json.loads(urlsafe_b64decode(s["protected"].encode())) for s in signatures
+        ]
+        if any(
+            "crit" in h or _SIGN_ALGS.get(h.get("alg")) != _crv(key) for h in headers
+        ):
+            return self._fallback.verify(jws, key)
+        if not signatures:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_SIGNATURE)
+
+        payload_segment = jws["payload"]
+        public_key = key.get_public_key()
+        for header, signature in zip(headers, signatures):
+            signing_input = f"{signature['protected']}.{payload_segment}".encode(
+                "ascii"
+            )
+            if not _verify(
+                header["alg"],
+                public_key,
+                signing_input,
+                urlsafe_b64decode(signature["signature"].encode()),
+            ):
+                raise MalformedMessageError(MalformedMessageCode.INVALID_SIGNATURE)
+        return urlsafe_b64decode(payload_segment.encode())
+
+
+def _supports_encryption(alg, enc, protected: dict) -> bool:
+    if alg not in _KEY_AGREEMENT_ALGS or enc not in _CONTENT_ENCS:
+        return False
+    # ECDH-1PU in key wrapping mode is defined for AES-CBC-HMAC content encryption only
+    if _KEY_AGREEMENT_ALGS[alg][1] and not enc.startswith("A256CBC"):
+        return False
+    return protected.get("zip") in (None, ZIP_DEFLATE) and "crit" not in protected
+
+
+def _crv(key: AsymmetricKey) -> Optional[str]:
+    try:
+        return key["crv"]
+    except (KeyError, TypeError):
+        return None
+
+
+def _b64encode(data: bytes) -> str:
+    return urlsafe_b64encode(data).decode("ascii")
+
+
+def _json_dumps(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _generate_ephemeral_key(recipient_key: AsymmetricKey):
+    pool = get_ephemeral_key_pool()
+    if pool is not None:
+        return pool.generate(recipient_key).get_private_key()
+    crv = _crv(recipient_key)
+    if crv == "X25519":
+        return X25519PrivateKey.generate()
+    return ec.generate_private_key(_EC_CURVES[crv])
+
+
+def _public_jwk(public_key, crv: str) -> dict:
+    # the same members (and their order) as Authlib puts into `epk`
+    if isinstance(public_key, X25519PublicKey):
+        return {
+            "crv": crv,
+            "x": _b64encode(public_key.public_bytes_raw()),
+            "kty": "OKP",
+        }
+    numbers = public_key.public_numbers()
+    size = (public_key.curve.key_size + 7) // 8
+    return {
+        "crv": crv,
+        "x": _b64encode(numbers.x.to_bytes(size, "big")),
+        "y": _b64encode(numbers.y.to_bytes(size, "big")),
+        "kty": "EC",
+    }
+
+
+def _import_public_jwk(jwk: dict, crv: str):
+    if jwk.get("crv") != crv:
+        raise ValueError(f"Ephemeral key curve doesn't match recipient key curve {crv}")
+    if crv == "X25519":
+        return X25519PublicKey.from_public_bytes(urlsafe_b64decode(jwk["x"].encode()))
+    x = int.from_bytes(urlsafe_b64decode(jwk["x"].encode()), "big")
+    y = int.from_bytes(urlsafe_b64decode(jwk["y"].encode()), "big")
+    # the point is checked to be on the curve
+    return ec.EllipticCurvePublicNumbers(x, y, _EC_CURVES[crv]).public_key()
+
+
+def _exchange(private_key, public_key) -> bytes:
+    if isinstance(private_key, X25519PrivateKey):
+        return private_key.exchange(public_key)
+    return private_key.exchange(ec.ECDH(), public_key)
+
+
+def _len_prefixed(data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + data
+
+
+def _fixed_info(protected: dict, key_size: int, tag: Optional[bytes]) -> bytes:
+    # Concat KDF OtherInfo (RFC 7518 4.6.2), ECDH-1PU adds the tag to SuppPubInfo
+    apu = protected.get("apu")
+    apv = protected.get("apv")
+    return (
+        _len_prefixed(protected["alg"].encode())
+        + _len_prefixed(urlsafe_b64decode(apu.encode()) if apu else b"")
+        + _len_prefixed(urlsafe_b64decode(apv.encode()) if apv else b"")
+        + struct.pack(">I", key_size)
+        + (_len_prefixed(tag) if tag is not None else b"")
+    )
+
+
+def _concat_kdf(shared_key: bytes, fixed_info: bytes, key_size: int) -> bytes:
+    length = key_size // 8
+    derived = b""
+    counter = 1
+    while len(derived) < length:
+        derived += hashlib.sha256(
+            struct.pack(">I", counter) + shared_key + fixed_info
+        ).digest()
+        counter += 1
+    return derived[:length]
+
+
+def _unwrap_cek(kek: bytes, recipients: List[dict]) -> bytes:
+    error = None
+    for recipient in recipients:
+        try:
+            return aes_key_unwrap(
+                kek, urlsafe_b64decode(recipient["encrypted_key"].encode())
+            )
+        except Exception as exc:
+            error = exc
+    raise ValueError("Content encryption key can not be unwrapped") from error
+
+
+def _encrypt_content(
+    enc: str, cek: bytes, iv: bytes, plaintext: bytes, aad: bytes
+) -> Tuple[bytes, bytes]:
+    if enc == "A256CBC-HS512":
+        mac_key, enc_key = cek[:32], cek[32:]
+        padder = padding.PKCS7(128).padder()
+        padded = padder.update(plaintext) + padder.finalize()
+        encryptor = Cipher(algorithms.AES(enc_key), modes.CBC(iv)).encryptor()
+        ciphertext = encryptor.update(padded) + encryptor.finalize()
+        return ciphertext, _cbc_hmac_tag(mac_key, aad, iv, ciphertext)
+    if enc == "A256GCM":
+        data = AESGCM(cek).encrypt(iv, plaintext, aad)
+        return data[:-16], data[-16:]
+    if nacl_bindings is not None:
+        data = nacl_bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(
+            plaintext, aad, iv, cek
+        )
+        return data[:-16], data[-16:]
+    from Cryptodome.Cipher import ChaCha20_Poly1305
+
+    cipher = ChaCha20_Poly1305.new(key=cek, nonce=iv)
+    cipher.update(aad)
+    return cipher.encrypt_and_digest(plaintext)
+
+
+def _decrypt_content(
+    enc: str, cek: bytes, iv: bytes, ciphertext: bytes, tag: bytes, aad: bytes
+) -> bytes:
+    if enc == "A256CBC-HS512":
+        mac_key, enc_key = cek[:32], cek[32:]
+        if not hmac.compare_digest(_cbc_hmac_tag(mac_key, aad, iv, ciphertext), tag):
+            raise ValueError("Invalid authentication tag")
+        decryptor = Cipher(algorithms.AES(enc_key), modes.CBC(iv)).decryptor()
+        padded = decryptor.update(ciphertext) + decryptor.finalize()
+        unpadder = padding.PKCS7(128).unpadder()
+        return unpadder.update(padded) + unpadder.finalize()
+    if enc == "A256GCM":
+        return AESGCM(cek).decrypt(iv, ciphertext + tag, aad)
+    if nacl_bindings is not None:
+        return nacl_bindings.crypto_aead_xchacha20poly1305_ietf_decrypt(
+            ciphertext + tag, aad, iv, cek
+        )
+    from Cryptodome.Cipher import ChaCha20_Poly1305
+
+    cipher = ChaCha20_Poly1305.new(key=cek, nonce=iv)
+    cipher.update(aad)
+    return cipher.decrypt_and_verify(ciphertext, tag)
+
+
+def _cbc_hmac_tag(mac_key: bytes, aad: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+    al = struct.pack(">Q", len(aad) * 8)
+    return hmac.new(mac_key, aad + iv + ciphertext + al, hashlib.sha512).digest()[:32]
+
+
+def _sign(alg: str, private_key, signing_input: bytes) -> bytes:
+    if alg == "EdDSA":
+        return private_key.sign(signing_input)
+    r, s = decode_dss_signature(
+        private_key.sign(signing_input, ec.ECDSA(hashes.SHA256()))
+    )
+    size = (private_key.curve.key_size + 7) // 8
+    return r.to_bytes(size, "big") + s.to_bytes(size, "big")
+
+
+def _verify(alg: str, public_key, signing_input: bytes, signature: bytes) -> bool:
+    try:
+        if alg == "EdDSA":
+            public_key.verify(signature, signing_input)
+            return True
+        size = (public_key.curve.key_size + 7) // 8
+        if len(signature) != 2 * size:
+            return False
+        r = int.from_bytes(signature[:size], "big")
+        s = int.from_bytes(signature[size:], "big")
+        public_key.verify(
+            encode_dss_signature(r, s), signing_input, ec.ECDSA(hashes.SHA256())
+        )
+        return True
+    except InvalidSignature:
+        return False
@@ -3,3 +3,7 @@ from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg
 
 DEF_ENC_ALG_AUTH: AuthCryptAlg = AuthCryptAlg.A256CBC_HS512_ECDH_1PU_A256KW
 DEF_ENC_ALG_ANON: AnonCryptAlg = AnonCryptAlg.XC20P_ECDH_ES_A256KW
+# plaintexts of at least this size are compressed if compression is enabled
+DEF_COMPRESS_MIN_SIZE: int = 1024
+# decompressed plaintexts larger than this are rejected to protect against decompression bombs
+DEF_MAX_DECOMPRESSED_SIZE: int = 16 * 1024 * 1024
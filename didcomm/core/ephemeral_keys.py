@@ -0,0 +1,240 @@
+"""
+A pool of pre-generated ephemeral keys for ECDH-ES and ECDH-1PU key agreement.
+
+Every anoncrypt and authcrypt pack generates an ephemeral key pair. The pool moves that work off the critical path:
+keys are generated by a background thread while the application is idle and handed out by `take`.
+
+    pool = enable_ephemeral_key_pool(curves=["X25519"], size=64)
+    ...
+    disable_ephemeral_key_pool()
+
+A key is never handed out twice: it's removed from the pool when it's taken, the pool keeps no other reference to it,
+and keys inherited by a forked child process are discarded (the child refills its pool itself).
+If the pool of the required curve is empty, a key is generated on the calling thread as it is done without the pool.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from authlib.jose import ECKey, OKPKey
+from authlib.jose.rfc7517 import AsymmetricKey
+
+DEFAULT_CURVES = ("X25519", "P-256", "P-384", "P-521")
+DEFAULT_POOL_SIZE = 32
+DEFAULT_REFILL_IDLE_S = 0.01
+
+_KEY_TYPES = {
+    "X25519": OKPKey,
+    "X448": OKPKey,
+    "P-256": ECKey,
+    "P-384": ECKey,
+    "P-521": ECKey,
+    "secp256k1": ECKey,
+}
+
+_pool: Optional[EphemeralKeyPool] = None
+_pools: weakref.WeakSet = weakref.WeakSet()
+
+
+def enable_ephemeral_key_pool(
+    curves: Iterable[str] = DEFAULT_CURVES,
+    size: int = DEFAULT_POOL_SIZE,
+    refill_idle_s: float = DEFAULT_REFILL_IDLE_S,
+) -> EphemeralKeyPool:
+    """
+    Starts a pool used by anoncrypt and authcrypt packing. A previously enabled pool is stopped.
+
+    :param curves: curves of the recipient keys to pre-generate ephemeral keys for
+    :param size: number of keys kept ready per curve
+    :param refill_idle_s: the pool is refilled once no key has been taken for this time
+    :return: the started pool
+    """
+    global _pool
+    disable_ephemeral_key_pool()
+    pool = EphemeralKeyPool(curves, size, refill_idle_s)
+    pool.start()
+    _pool = pool
+    return pool
+
+
+def disable_ephemeral_key_pool():
+    """
+    Stops the pool, ephemeral keys are generated on every pack again.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.stop()
+
+
+def get_ephemeral_key_pool() -> Optional[EphemeralKeyPool]:
+    """
+    :return: the enabled pool or None
+    """
+    return _pool
+
+
+class EphemeralKeyPool:
+    """
+    Keeps up to `size` pre-generated private keys per curve, refilled by a background daemon thread.
+
+    The thread refills the pool only when no key has been taken for `refill_idle_s`:
+    key generation holds the GIL, so refilling during a burst of packs would delay the packs instead of speeding them up.
+    """
+
+    def __init__(
+        self,
+        curves: Iterable[str] = DEFAULT_CURVES,
+        size: int = DEFAULT_POOL_SIZE,
+        refill_idle_s: float = DEFAULT_REFILL_IDLE_S,
+    ):
+        """
+        :param curves: curves of the recipient keys to pre-generate ephemeral keys for
+        :param size: number of keys kept ready per curve
+        :param refill_idle_s: the pool is refilled once no key has been taken for this time
+        """
+        curves = list(curves)
+        unsupported = [crv for crv in curves if crv not in _KEY_TYPES]
+        if unsupported:
+            raise ValueError(f"Unsupported curves: {unsupported}")
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.size = size
+        self.refill_idle_s = refill_idle_s
+        self.hits = 0
+        self.misses = 0
+        self._keys: Dict[str, Deque[AsymmetricKey]] = {crv: deque() for crv in curves}
+        self._cond = threading.Condition()
+        self._running = False
+        self._restart_after_fork = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_take = 0.0
+        _pools.add(self)
+
+    def start(self):
+        """
+        Starts the background thread filling the pool.
+        """
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._fill, name="didcomm-ephemeral-keys", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and drops the generated keys.
+        """
+        with self._cond:
+            self._running = False
+            thread, self._thread = self._thread, None
+            for keys in self._keys.values():
+                keys.clear()
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self) -> EphemeralKeyPool:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def available(self, crv: str) -> int:
+        """
+        :param crv: curve
+        :return: number of ready keys of the curve
+        """
+        keys = self._keys.get(crv)
+        return len(keys) if keys is not None else 0
+
+    def take(self, crv: str) -> Optional[AsymmetricKey]:
+        """
+        Removes a ready key of the curve from the pool.
+
+        :param crv: curve
+        :return: the key or None if there is no ready key
+        """
+        if self._restart_after_fork:
+            self._restart_after_fork = False
+            self.start()
+        with self._cond:
+            keys = self._keys.get(crv)
+            if keys is None:
+                return None
+            self._last_take = time.monotonic()
+            if not keys:
+                self.misses += 1
+                return None
+            self.hits += 1
+            key = keys.popleft()
+            self._cond.notify()
+            return key
+
+    def generate(self, recipient_key: AsymmetricKey) -> AsymmetricKey:
+        """
+        Returns an ephemeral private key for key agreement with the given recipient key:
+        a ready one or a new one if the pool is empty.
+
+        :param recipient_key: recipient public key
+        :return: ephemeral private key of the same type and curve
+        """
+        crv = recipient_key["crv"]
+        key = None
+        if type(recipient_key) is _KEY_TYPES.get(crv):
+            key = self.take(crv)
+        if key is None:
+            key = recipient_key.generate_key(crv, is_private=True)
+        return key
+
+    def _after_fork_in_child(self):
+        # Keys generated before fork are shared with the parent process, they must not be used.
+        # The lock may have been held by the (not existing anymore) fill thread, so it's replaced.
+        self._cond = threading.Condition()
+        for keys in self._keys.values():
+            keys.clear()
+        self._restart_after_fork = self._running
+        self._running = False
+        self._thread = None
+
+    def _fill(self):
+        while True:
+            with self._cond:
+                crv = None
+                while self._running and crv is None:
+                    idle = time.monotonic() - self._last_take
+                    if idle < self.refill_idle_s:
+                        self._cond.wait(self.refill_idle_s - idle)
+                        continue
+                    crv = next(
+                        (c for c, keys in self._keys.items() if len(keys) < self.size),
+                        None,
+                    )
+                    if crv is None:
+                        self._cond.wait()
+                if not self._running or self._thread is not threading.current_thread():
+                    return
+            key = _KEY_TYPES[crv].generate_key(crv, is_private=True)
+            # JWK fields of the key are computed lazily, they are needed for the `epk` header
+            key.load_dict_key()
+            with self._cond:
+                if self._running and self._thread is threading.current_thread():
+                    self._keys[crv].append(key)
+
+
+def _after_fork_in_child():
+    for pool in list(_pools):
+        pool._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
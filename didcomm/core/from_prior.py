@@ -6,6 +6,12 @@ from authlib.jose.errors import BadSignatureError
 
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_URL
+from didcomm.core.from_prior_cache import (
+    claims_digest,
+    get_from_prior_jwt_cache,
+    get_verified_from_prior_cache,
+    verification_method_fingerprint,
+)
 from didcomm.core.keys.sign_keys_selector import find_signing_key, find_verification_key
 from didcomm.core.utils import (
     extract_key,
@@ -18,6 +24,7 @@ from didcomm.errors import (
     MalformedMessageCode,
     DIDCommValueError,
 )
+from didcomm.tracing import span
 
 
 async def pack_from_prior_in_place(
@@ -64,6 +71,15 @@ async def pack_from_prior_in_place(
     issuer_did_or_kid = issuer_kid or from_prior["iss"]
 
     secret = await find_signing_key(issuer_did_or_kid, resolvers_config)
+
+    cache = get_from_prior_jwt_cache()
+    claims = claims_digest(from_prior) if cache is not None else None
+    if claims is not None:
+        from_prior_jwt = cache.get(claims, secret)
+        if from_prior_jwt is not None:
+            message["from_prior"] = from_prior_jwt
+            return secret.kid
+
     private_key = extract_key(
         secret, align_kid=True
     )  # kid within key must have proper value because JsonWebToken.encode writes its value to JWT's header kid field
@@ -71,7 +87,11 @@ async def pack_from_prior_in_place(
 
     header = {"alg": alg.value}
 
-    message["from_prior"] = to_unicode(jwt.encode(header, from_prior, private_key))
+    with span("jwt.sign", alg=alg.value):
+        message["from_prior"] = to_unicode(jwt.encode(header, from_prior, private_key))
+
+    if claims is not None:
+        cache.put(claims, secret, message["from_prior"])
 
     return secret.kid
 
@@ -104,10 +124,20 @@ async def unpack_from_prior_in_place(
     issuer_kid = __extract_from_prior_kid(from_prior_jwt)
 
     verification_method = await find_verification_key(issuer_kid, resolvers_config)
+
+    cache = get_verified_from_prior_cache()
+    if cache is not None:
+        key_fingerprint = verification_method_fingerprint(verification_method)
+        claims = cache.get(from_prior_jwt, key_fingerprint)
+        if claims is not None:
+            message["from_prior"] = claims
+            return issuer_kid
+
     public_key = extract_key(verification_method)
 
     try:
-        message["from_prior"] = jwt.decode(to_bytes(from_prior_jwt), public_key)
+        with span("jwt.verify"):
+            message["from_prior"] = jwt.decode(to_bytes(from_prior_jwt), public_key)
     except BadSignatureError as exc:
         raise MalformedMessageError(
             MalformedMessageCode.INVALID_SIGNATURE,
@@ -118,6 +148,9 @@ async def unpack_from_prior_in_place(
             MalformedMessageCode.INVALID_MESSAGE, "from_prior value is invalid"
         ) from exc
 
+    if cache is not None:
+        cache.put(from_prior_jwt, issuer_kid, key_fingerprint, message["from_prior"])
+
     return issuer_kid
 
 
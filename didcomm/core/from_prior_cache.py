@@ -0,0 +1,311 @@
+"""
+Caches of from_prior JWTs.
+
+After a DID rotation the same from_prior is attached to every message, so
+    - the JWT signed by `pack_from_prior_in_place` is cached and reused instead of being signed for every pack;
+    - the JWT verified by `unpack_from_prior_in_place` can be cached, and a repeated JWT is not verified again.
+
+The cache of signed JWTs is enabled by default, the cache of verified JWTs is enabled on demand.
+They can be resized or disabled:
+
+    enable_from_prior_jwt_cache(max_size=256)
+    enable_verified_from_prior_cache(max_size=256)
+    ...
+    disable_from_prior_jwt_cache()
+    disable_verified_from_prior_cache()
+
+A signed JWT is keyed by a digest of the claims and the issuer key ID, and it holds a fingerprint of the secret
+the JWT has been signed with. The issuer secret is still looked up in the secrets resolver for every pack,
+and an entry signed with a different secret (the key has been replaced in the secrets resolver) is re-signed.
+
+A verified JWT is keyed by the exact JWT, and it holds a fingerprint of the issuer verification method
+the JWT has been verified with. The issuer DID Doc is resolved for every unpack,
+and the cached claims are returned only if the resolved issuer key has the same fingerprint,
+so only the signature verification is saved. A JWT is not kept after its `exp` claim.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from didcomm.common.types import DID_URL
+from didcomm.secrets.secrets_resolver import Secret
+
+if TYPE_CHECKING:
+    from pydid import VerificationMethod
+
+DEFAULT_MAX_SIZE = 1024
+
+
+class FromPriorJwtCache:
+    """
+    Bounded LRU cache of signed from_prior JWTs. Thread-safe.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        :param max_size: max number of cached JWTs, the least recently used one is evicted
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (claims digest, issuer kid) -> (secret fingerprint, JWT)
+        self._entries: OrderedDict[
+            Tuple[bytes, DID_URL], Tuple[bytes, str]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, claims: bytes, secret: Secret) -> Optional[str]:
+        """
+        :param claims: digest of the from_prior claims (see `claims_digest`)
+        :param secret: issuer secret the JWT is to be signed with
+        :return: the cached JWT, None if there is no JWT signed with the secret for the claims
+        """
+        key = (claims, secret.kid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != secret_fingerprint(secret):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, claims: bytes, secret: Secret, jwt: str):
+        """
+        Caches a JWT.
+
+        :param claims: digest of the from_prior claims (see `claims_digest`)
+        :param secret: issuer secret the JWT has been signed with
+        :param jwt: the JWT
+        """
+        key = (claims, secret.kid)
+        with self._lock:
+            self._entries[key] = (secret_fingerprint(secret), jwt)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kid: Optional[DID_URL] = None):
+        """
+        Drops JWTs signed with the given key, or all JWTs.
+
+        :param kid: optional issuer key ID
+        """
+        with self._lock:
+            if kid is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[1] == kid]:
+                del self._entries[key]
+
+
+@dataclass(frozen=True)
+class _VerifiedJwt:
+    issuer_kid: DID_URL
+    key_fingerprint: bytes
+    claims: dict
+    expires_at: Optional[float]
+
+
+class VerifiedFromPriorCache:
+    """
+    Bounded LRU cache of verified from_prior JWTs. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param max_size: max number of cached JWTs, the least recently used one is evicted
+        :param clock: source of wall-clock time (seconds), `exp` claims are compared with it
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _VerifiedJwt] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, jwt: str, key_fingerprint: bytes) -> Optional[dict]:
+        """
+        :param jwt: from_prior JWT
+        :param key_fingerprint: fingerprint of the issuer verification method resolved for the JWT
+            (see `verification_method_fingerprint`)
+        :return: a copy of the JWT claims, None if the JWT must be verified
+        """
+        with self._lock:
+            entry = self._entries.get(jwt)
+            if entry is not None and (
+                entry.expires_at is not None and self._clock() >= entry.expires_at
+            ):
+                del self._entries[jwt]
+                entry = None
+            if entry is None or key_fingerprint != entry.key_fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jwt)
+            self.hits += 1
+            return copy.deepcopy(entry.claims)
+
+    def put(self, jwt: str, issuer_kid: DID_URL, key_fingerprint: bytes, claims: dict):
+        """
+        Caches a verified JWT. A JWT with an expired or invalid `exp` claim is not cached.
+
+        :param jwt: from_prior JWT
+        :param issuer_kid: ID of the issuer key the JWT has been verified with
+        :param key_fingerprint: fingerprint of the issuer verification method (see `verification_method_fingerprint`)
+        :param claims: the JWT claims
+        """
+        expires_at = claims.get("exp")
+        if expires_at is not None and (
+            isinstance(expires_at, bool) or not isinstance(expires_at, (int, float))
+        ):
+            return
+        with self._lock:
+            now = self._clock()
+            if expires_at is not None and now >= expires_at:
+                return
+            self._entries[jwt] = _VerifiedJwt(
+                issuer_kid, key_fingerprint, copy.deepcopy(claims), expires_at
+            )
+            self._entries.move_to_end(jwt)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kid: Optional[DID_URL] = None):
+        """
+        Drops JWTs verified with the given key, or all JWTs.
+
+        :param kid: optional issuer key ID
+        """
+        with self._lock:
+            if kid is None:
+                self._entries.clear()
+                return
+            for jwt in [
+                jwt for jwt, entry in self._entries.items() if entry.issuer_kid == kid
+            ]:
+                del self._entries[jwt]
+
+
+_cache: Optional[FromPriorJwtCache] = FromPriorJwtCache()
+_verified_cache: Optional[VerifiedFromPriorCache] = None
+
+
+def enable_from_prior_jwt_cache(max_size: int = DEFAULT_MAX_SIZE) -> FromPriorJwtCache:
+    """
+    Replaces the cache used by from_prior packing with a new empty one.
+
+    :param max_size: max number of cached JWTs
+    :return: the new cache
+    """
+    global _cache
+    _cache = FromPriorJwtCache(max_size)
+    return _cache
+
+
+def disable_from_prior_jwt_cache():
+    """
+    Disables the cache, from_prior is signed on every pack.
+    """
+    global _cache
+    _cache = None
+
+
+def get_from_prior_jwt_cache() -> Optional[FromPriorJwtCache]:
+    """
+    :return: the enabled cache or None
+    """
+    return _cache
+
+
+def enable_verified_from_prior_cache(
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> VerifiedFromPriorCache:
+    """
+    Enables the cache used by from_prior unpacking, or replaces it with a new empty one.
+
+    :param max_size: max number of cached JWTs
+    :return: the new cache
+    """
+    global _verified_cache
+    _verified_cache = VerifiedFromPriorCache(max_size)
+    return _verified_cache
+
+
+def disable_verified_from_prior_cache():
+    """
+    Disables the cache (the default), from_prior is verified on every unpack.
+    """
+    global _verified_cache
+    _verified_cache = None
+
+
+def get_verified_from_prior_cache() -> Optional[VerifiedFromPriorCache]:
+    """
+    :return: the enabled cache or None
+    """
+    return _verified_cache
+
+
+def claims_digest(claims: dict) -> Optional[bytes]:
+    """
+    :param claims: from_prior claims
+    :return: SHA-256 digest of the claims, None if they are not JSON serializable
+    """
+    try:
+        # the member order is kept as it's kept in the signed JWT
+        data = json.dumps(claims, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(data.encode()).digest()
+
+
+def secret_fingerprint(secret: Secret) -> bytes:
+    """
+    :return: SHA-256 digest of the secret type and verification material
+    """
+    material = secret.verification_material
+    data = json.dumps(
+        [str(secret.type), material.format.name, material.value],
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(data.encode()).digest()
+
+
+_KEY_MATERIAL_FIELDS = ("public_key_jwk", "public_key_base58", "public_key_multibase")
+
+
+def verification_method_fingerprint(verification_method: VerificationMethod) -> bytes:
+    """
+    :return: SHA-256 digest of the verification method type and public key material
+        (read the same way for `pydid.VerificationMethod` and `VerificationMethodCompact`)
+    """
+    data = json.dumps(
+        [str(verification_method.type)]
+        + [getattr(verification_method, field, None) for field in _KEY_MATERIAL_FIELDS],
+        separators=(",", ":"),
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(data.encode()).digest()
@@ -0,0 +1,88 @@
+import copy
+import zlib
+from typing import Optional
+
+from authlib.jose import JsonWebEncryption
+from authlib.jose.drafts import register_jwe_draft
+from authlib.jose.rfc7518.jwe_zips import DeflateZipAlgorithm
+
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
+from didcomm.core.ephemeral_keys import EphemeralKeyPool, get_ephemeral_key_pool
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+
+# ECDH-1PU key agreement and XC20P content encryption are Authlib drafts which must be registered explicitly.
+# Their backends are heavy to import, so they are registered only when encryption modules are imported.
+register_jwe_draft(JsonWebEncryption)
+
+# RFC 7516 `zip` header value of DEFLATE compression
+ZIP_DEFLATE = "DEF"
+
+
+def deflate_compress(data: bytes) -> bytes:
+    """
+    :param data: plaintext
+    :return: raw DEFLATE (RFC 1951) compressed data as required by `"zip": "DEF"`
+    """
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def deflate_decompress(data: bytes, max_size: int) -> bytes:
+    """
+    :param data: raw DEFLATE compressed data
+    :param max_size: max size of decompressed data
+    :raises MalformedMessageError: with `DECOMPRESSED_TOO_LARGE` code if decompressed data exceeds `max_size`
+    :raises ValueError: if compressed data is invalid
+    :return: decompressed data
+    """
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    # one byte more than allowed is enough to know that the limit is exceeded
+    value = decompressor.decompress(data, max_size + 1)
+    if len(value) > max_size:
+        raise MalformedMessageError(MalformedMessageCode.DECOMPRESSED_TOO_LARGE)
+    if not decompressor.eof:
+        raise ValueError("Compressed data is truncated")
+    return value
+
+
+class _LimitedDeflateZipAlgorithm(DeflateZipAlgorithm):
+    # Authlib's DEFLATE has a fixed limit of decompressed size (250 KB) which is too small for DIDComm attachments.
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+
+    def decompress(self, s: bytes) -> bytes:
+        return deflate_decompress(s, self._max_size)
+
+
+class _JsonWebEncryption(JsonWebEncryption):
+    # Plugs the ephemeral key pool and the DEFLATE limit into Authlib JWE.
+    # Authlib algorithms are shared singletons, so they are customized as (cheap, shallow) copies.
+    def __init__(self, pool: Optional[EphemeralKeyPool], max_decompressed_size: int):
+        super().__init__()
+        self._pool = pool
+        self._zip = _LimitedDeflateZipAlgorithm(max_decompressed_size)
+
+    def get_header_alg(self, header):
+        alg = super().get_header_alg(header)
+        if self._pool is None or not hasattr(alg, "_generate_ephemeral_key"):
+            return alg
+        # Takes ephemeral keys of ECDH-ES and ECDH-1PU from the pool instead of generating them.
+        pooled = copy.copy(alg)
+        pooled._generate_ephemeral_key = self._pool.generate
+        return pooled
+
+    def get_header_zip(self, header):
+        zip_alg = super().get_header_zip(header)
+        if zip_alg is not None and zip_alg.name == ZIP_DEFLATE:
+            return self._zip
+        return zip_alg
+
+
+def json_web_encryption(
+    max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
+) -> JsonWebEncryption:
+    """
+    :param max_decompressed_size: max size of a decompressed (`"zip": "DEF"`) plaintext
+    :return: JWE serializer using the enabled ephemeral key pool if any
+    """
+    return _JsonWebEncryption(get_ephemeral_key_pool(), max_decompressed_size)
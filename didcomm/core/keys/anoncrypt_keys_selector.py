@@ -3,6 +3,7 @@ from typing import List, AsyncGenerator, Any
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DID_URL, DID
 from didcomm.core.utils import get_did_and_optionally_kid, are_keys_compatible
+from didcomm.core.resolvers import resolve_did_doc, find_secret, find_secret_ids
 from didcomm.did_doc.did_doc import VerificationMethod
 from didcomm.errors import (
     DIDDocNotResolvedError,
@@ -30,7 +31,7 @@ async def find_anoncrypt_pack_recipient_public_keys(
 async def find_anoncrypt_unpack_recipient_private_keys(
     to_kids: List[DID_URL], resolvers_config: ResolversConfig
 ) -> AsyncGenerator[Secret, Any]:
-    secret_ids = await resolvers_config.secrets_resolver.get_keys(to_kids)
+    secret_ids = await find_secret_ids(resolvers_config, to_kids)
     if not secret_ids:
         raise DIDUrlNotFoundError(
             f"No secrets are found in secrets resolver for DID URLs: {to_kids}"
@@ -38,7 +39,7 @@ async def find_anoncrypt_unpack_recipient_private_keys(
 
     found = False
     for secret_id in secret_ids:
-        secret = await resolvers_config.secrets_resolver.get_key(secret_id)
+        secret = await find_secret(resolvers_config, secret_id)
         if secret is None:
             raise SecretNotFoundError(
                 f"Secret `{secret_id}` is not found in secrets resolver"
@@ -55,11 +56,11 @@ async def find_anoncrypt_unpack_recipient_private_keys(
 async def _find_anoncrypt_pack_recipient_public_keys_by_kid(
     to_did: DID, to_kid: DID_URL, resolvers_config: ResolversConfig
 ) -> List[VerificationMethod]:
-    did_doc = await resolvers_config.did_resolver.resolve(to_did)
+    did_doc = await resolve_did_doc(resolvers_config, to_did)
     if did_doc is None:
         raise DIDDocNotResolvedError(to_did)
 
-    if not did_doc.key_agreement or to_kid not in did_doc.key_agreement:
+    if not did_doc.has_key_agreement(to_kid):
         raise DIDUrlNotFoundError(
             f"DID URL `{to_kid}` is not found in keyAgreement verification relationships of DID `{to_did}`"
         )
@@ -74,7 +75,7 @@ async def _find_anoncrypt_pack_recipient_public_keys_by_kid(
 async def _find_anoncrypt_pack_recipient_public_keys_by_did(
     to_did: DID, resolvers_config: ResolversConfig
 ) -> List[VerificationMethod]:
-    did_doc = await resolvers_config.did_resolver.resolve(to_did)
+    did_doc = await resolve_did_doc(resolvers_config, to_did)
     if did_doc is None:
         raise DIDDocNotResolvedError(to_did)
 
@@ -3,7 +3,9 @@ from typing import List, AsyncGenerator, Any
 
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DID_URL
+from didcomm.core.concurrency import gather
 from didcomm.core.utils import get_did_and_optionally_kid, get_did, are_keys_compatible
+from didcomm.core.resolvers import resolve_did_doc, find_secret, find_secret_ids
 from didcomm.did_doc.did_doc import VerificationMethod
 from didcomm.errors import (
     DIDDocNotResolvedError,
@@ -35,7 +37,15 @@ async def find_authcrypt_pack_sender_and_recipient_keys(
     to_did, to_kid = get_did_and_optionally_kid(to_did_or_kid)
 
     if frm_kid is None:
-        sender_did_doc = await resolvers_config.did_resolver.resolve(frm_did)
+        # sender and recipient DID Docs are independent, so they are resolved concurrently
+        sender_did_doc, recipient_did_doc = await gather(
+            resolve_did_doc(resolvers_config, frm_did),
+            resolve_did_doc(resolvers_config, to_did),
+        )
+    else:
+        recipient_did_doc = await resolve_did_doc(resolvers_config, to_did)
+
+    if frm_kid is None:
         if sender_did_doc is None:
             raise DIDDocNotResolvedError(frm_did)
         if not sender_did_doc.key_agreement:
@@ -46,7 +56,6 @@ async def find_authcrypt_pack_sender_and_recipient_keys(
     else:
         sender_kids = [frm_kid]
 
-    recipient_did_doc = await resolvers_config.did_resolver.resolve(to_did)
     if recipient_did_doc is None:
         raise DIDDocNotResolvedError(to_did)
 
@@ -57,7 +66,7 @@ async def find_authcrypt_pack_sender_and_recipient_keys(
             )
         recipient_kids = recipient_did_doc.key_agreement
     else:
-        if to_kid not in recipient_did_doc.key_agreement:
+        if not recipient_did_doc.has_key_agreement(to_kid):
             raise DIDUrlNotFoundError(
                 f"DID URL `{to_kid}` is not found in keyAgreement verification relationships of DID `{to_did}`"
             )
@@ -65,7 +74,7 @@ async def find_authcrypt_pack_sender_and_recipient_keys(
 
     secret_found = False
     for skid in sender_kids:
-        secret = await resolvers_config.secrets_resolver.get_key(skid)
+        secret = await find_secret(resolvers_config, skid)
         if secret is None:
             continue
 
@@ -94,14 +103,14 @@ async def find_authcrypt_pack_sender_and_recipient_keys(
 async def find_authcrypt_unpack_sender_and_recipient_keys(
     frm_kid: DID_URL, to_kids: List[DID_URL], resolvers_config: ResolversConfig
 ) -> AsyncGenerator[AuthcryptUnpackKeys, Any]:
-    secret_ids = await resolvers_config.secrets_resolver.get_keys(to_kids)
+    secret_ids = await find_secret_ids(resolvers_config, to_kids)
     if not secret_ids:
         raise DIDUrlNotFoundError(
             f"No secrets are found in secrets resolver for DID URLs: {to_kids}"
         )
 
     frm_did = get_did(frm_kid)
-    sender_did_doc = await resolvers_config.did_resolver.resolve(frm_did)
+    sender_did_doc = await resolve_did_doc(resolvers_config, frm_did)
     if sender_did_doc is None:
         raise DIDDocNotResolvedError(frm_did)
     if not sender_did_doc.key_agreement:
@@ -114,7 +123,7 @@ async def find_authcrypt_unpack_sender_and_recipient_keys(
 
     found = False
     for secret_id in secret_ids:
-        secret = await resolvers_config.secrets_resolver.get_key(secret_id)
+        secret = await find_secret(resolvers_config, secret_id)
         if secret is None:
             raise SecretNotFoundError(
                 f"Secret `{secret_id}` is not found in secrets resolver"
@@ -1,6 +1,7 @@
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL
 from didcomm.core.utils import is_did_with_uri_fragment
+from didcomm.core.resolvers import resolve_did_doc, find_secret_ids
 
 
 async def has_keys_for_forward_next(
@@ -9,10 +10,10 @@ async def has_keys_for_forward_next(
     if is_did_with_uri_fragment(_next):
         next_kids = [_next]
     else:
-        next_did_doc = await resolvers_config.did_resolver.resolve(_next)
+        next_did_doc = await resolve_did_doc(resolvers_config, _next)
         if next_did_doc is None:
             return False
         next_kids = next_did_doc.key_agreement
 
-    secret_ids = await resolvers_config.secrets_resolver.get_keys(next_kids)
+    secret_ids = await find_secret_ids(resolvers_config, next_kids)
     return len(secret_ids) > 0
@@ -1,6 +1,7 @@
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DID_URL
 from didcomm.core.utils import get_did_and_optionally_kid, get_did
+from didcomm.core.resolvers import resolve_did_doc, find_secret, find_secret_ids
 from didcomm.did_doc.did_doc import VerificationMethod
 from didcomm.errors import (
     DIDDocNotResolvedError,
@@ -25,11 +26,11 @@ async def find_verification_key(
 ) -> VerificationMethod:
     did = get_did(frm_kid)
 
-    did_doc = await resolvers_config.did_resolver.resolve(did)
+    did_doc = await resolve_did_doc(resolvers_config, did)
     if did_doc is None:
         raise DIDDocNotResolvedError(did)
 
-    if frm_kid not in did_doc.authentication:
+    if not did_doc.has_authentication(frm_kid):
         raise DIDUrlNotFoundError(
             f"DID URL `{frm_kid}` is not found in authentication verification relationships of DID `{did}`"
         )
@@ -44,7 +45,7 @@ async def find_verification_key(
 async def _find_signing_key_by_kid(
     frm_kid: DID_URL, resolvers_config: ResolversConfig
 ) -> Secret:
-    secret = await resolvers_config.secrets_resolver.get_key(frm_kid)
+    secret = await find_secret(resolvers_config, frm_kid)
     if secret is None:
         raise SecretNotFoundError(
             f"Secret `{frm_kid}` is not found in secrets resolver"
@@ -56,7 +57,7 @@ async def _find_signing_key_by_kid(
 async def _find_signing_key_by_did(
     frm_did: DID_OR_DID_URL, resolvers_config: ResolversConfig
 ) -> Secret:
-    did_doc = await resolvers_config.did_resolver.resolve(frm_did)
+    did_doc = await resolve_did_doc(resolvers_config, frm_did)
     if did_doc is None:
         raise DIDDocNotResolvedError(frm_did)
 
@@ -65,16 +66,14 @@ async def _find_signing_key_by_did(
             f"No authentication verification relationships are found for DID `{frm_did}`"
         )
 
-    secret_ids = await resolvers_config.secrets_resolver.get_keys(
-        did_doc.authentication
-    )
+    secret_ids = await find_secret_ids(resolvers_config, did_doc.authentication)
     if not secret_ids:
         raise SecretNotFoundError(
             f"No secrets are found in secrets resolver for DID URLs: {did_doc.authentication}"
         )
 
     kid = secret_ids[0]
-    secret = await resolvers_config.secrets_resolver.get_key(kid)
+    secret = await find_secret(resolvers_config, kid)
     if secret is None:
         raise SecretNotFoundError(f"Secret `{kid}` is not found in secrets resolver")
 
@@ -0,0 +1,100 @@
+"""
+Resource limits of unpacking.
+
+The limits are checked on the parsed structure of every layer before the layer is processed
+(before any DID or secret resolution and before decryption or signature verification),
+so a hostile message is rejected at a cost not depending on the work it would cause.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from didcomm.common.types import JSON_OBJ
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+
+DEF_MAX_RECIPIENTS: int = 1024
+DEF_MAX_LAYERS: int = 16
+DEF_MAX_ATTACHMENTS: int = 1024
+DEF_MAX_JSON_DEPTH: int = 64
+
+
+@dataclass(frozen=True)
+class UnpackLimits:
+    """
+    Limits of resources a packed message may require to be unpacked.
+    A limit set to None is not checked.
+
+    Attributes:
+        max_size (int): Max size of the packed message in bytes (of the UTF-8 encoding for a JSON string).
+                        Checked before the message is parsed (while it's read for a stream).
+                        Not checked for a JSON_OBJ. Not checked by default: the size a service accepts
+                        depends on its payloads, and it's usually limited by the transport already.
+        max_recipients (int): Max number of recipients of an encrypted message
+                              (each of them may cause a secret lookup and a decryption attempt). 1024 by default.
+        max_layers (int): Max number of envelopes (anoncrypt, authcrypt, sign) unwrapped by unpack,
+                          Forward messages re-wrapped for the same recipient included. 16 by default.
+        max_attachments (int): Max number of attachments of a plaintext message. 1024 by default.
+        max_json_depth (int): Max nesting depth of JSON objects and arrays of the message and decrypted plaintexts.
+                              64 by default.
+    """
+
+    max_size: Optional[int] = None
+    max_recipients: Optional[int] = DEF_MAX_RECIPIENTS
+    max_layers: Optional[int] = DEF_MAX_LAYERS
+    max_attachments: Optional[int] = DEF_MAX_ATTACHMENTS
+    max_json_depth: Optional[int] = DEF_MAX_JSON_DEPTH
+
+
+def check_size(size: int, limits: UnpackLimits):
+    if limits.max_size is not None and size > limits.max_size:
+        raise MalformedMessageError(MalformedMessageCode.MESSAGE_TOO_LARGE)
+
+
+def check_layers(layers: int, limits: UnpackLimits):
+    if limits.max_layers is not None and layers > limits.max_layers:
+        raise MalformedMessageError(MalformedMessageCode.TOO_MANY_LAYERS)
+
+
+def check_recipients(msg: JSON_OBJ, limits: UnpackLimits):
+    recipients = msg.get("recipients")
+    if (
+        limits.max_recipients is not None
+        and isinstance(recipients, list)
+        and len(recipients) > limits.max_recipients
+    ):
+        raise MalformedMessageError(MalformedMessageCode.TOO_MANY_RECIPIENTS)
+
+
+def check_structure(msg: JSON_OBJ, limits: UnpackLimits):
+    """
+    Checks the number of recipients and attachments and the JSON depth of a parsed message
+    (an envelope or a plaintext). The counts are checked first as it's done in constant time.
+    """
+    check_recipients(msg, limits)
+    attachments = msg.get("attachments")
+    if (
+        limits.max_attachments is not None
+        and isinstance(attachments, list)
+        and len(attachments) > limits.max_attachments
+    ):
+        raise MalformedMessageError(MalformedMessageCode.TOO_MANY_ATTACHMENTS)
+    if limits.max_json_depth is not None and _exceeds_depth(msg, limits.max_json_depth):
+        raise MalformedMessageError(MalformedMessageCode.JSON_TOO_DEEP)
+
+
+def _exceeds_depth(value: Any, max_depth: int) -> bool:
+    # iterative walk: a deeply nested value must not hit the recursion limit
+    stack = [(value, 1)]
+    while stack:
+        value, depth = stack.pop()
+        if depth > max_depth:
+            return True
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            continue
+        for item in value:
+            if isinstance(item, (dict, list)):
+                stack.append((item, depth + 1))
+    return False
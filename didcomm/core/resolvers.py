@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, List, Optional, Union
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.common.types import DID, DID_URL
+from didcomm.core.concurrency import cancel
+from didcomm.did_doc.did_doc import DIDDoc
+from didcomm.did_doc.did_doc_compact import DIDDocCompact
+from didcomm.metrics import record_did_resolution, record_secrets_lookup
+from didcomm.secrets.secrets_resolver import Secret
+from didcomm.tracing import span
+
+
+_prefetch: ContextVar[Optional[DIDDocPrefetch]] = ContextVar(
+    "didcomm_did_doc_prefetch", default=None
+)
+
+
+class DIDDocPrefetch:
+    """
+    Speculative resolution of DID Docs within a single operation (used by unpack).
+
+    A DID seen in a header (for example, `skid` of an authcrypted message) is resolved in the background
+    while the operation continues with other work (secrets lookup, decryption, signature verification);
+    DIDs of a payload which is not verified yet are never prefetched.
+    `resolve_did_doc` called for the DID within the operation awaits the started resolution.
+    Resolutions which have not been used are cancelled when the operation completes:
+
+        async with DIDDocPrefetch(resolvers_config):
+            prefetch_did_doc(resolvers_config, did)
+            ...
+            did_doc = await resolve_did_doc(resolvers_config, did)
+    """
+
+    def __init__(self, resolvers_config: ResolversConfig):
+        self.resolvers_config = resolvers_config
+        self._resolutions: Dict[DID, asyncio.Future] = {}
+        self._token = None
+
+    def prefetch(self, did: DID):
+        if did not in self._resolutions:
+            self._resolutions[did] = asyncio.ensure_future(
+                _resolve_did_doc(self.resolvers_config, did)
+            )
+
+    def get(self, did: DID) -> Optional[asyncio.Future]:
+        return self._resolutions.get(did)
+
+    async def __aenter__(self) -> DIDDocPrefetch:
+        self._token = _prefetch.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        _prefetch.reset(self._token)
+        # exceptions of unused resolutions are not relevant, they are retrieved to be not reported by asyncio
+        await cancel(*self._resolutions.values())
+
+
+def prefetch_did_doc(resolvers_config: ResolversConfig, did: DID):
+    """
+    Starts resolving the DID Doc in the background if it's done within `DIDDocPrefetch`
+    for the same resolvers, does nothing otherwise.
+
+    :param resolvers_config: secrets and DIDDoc resolvers
+    :param did: a DID which is likely to be resolved later within the operation
+    """
+    prefetch = _prefetch.get()
+    if prefetch is not None and prefetch.resolvers_config is resolvers_config:
+        prefetch.prefetch(did)
+
+
+async def resolve_did_doc(
+    resolvers_config: ResolversConfig, did: DID
+) -> Optional[Union[DIDDoc, DIDDocCompact]]:
+    prefetch = _prefetch.get()
+    if prefetch is not None and prefetch.resolvers_config is resolvers_config:
+        resolution = prefetch.get(did)
+        if resolution is not None:
+            return await resolution
+    return await _resolve_did_doc(resolvers_config, did)
+
+
+async def _resolve_did_doc(
+    resolvers_config: ResolversConfig, did: DID
+) -> Optional[Union[DIDDoc, DIDDocCompact]]:
+    resolver = resolvers_config.did_resolver
+    with span("did_resolver.resolve", did=did):
+        start = perf_counter()
+        try:
+            did_doc = await resolver.resolve(did)
+        except Exception:
+            record_did_resolution(resolver, perf_counter() - start, "error")
+            raise
+    record_did_resolution(
+        resolver,
+        perf_counter() - start,
+        "not_found" if did_doc is None else "found",
+    )
+    return did_doc
+
+
+async def find_secret(
+    resolvers_config: ResolversConfig, kid: DID_URL
+) -> Optional[Secret]:
+    resolver = resolvers_config.secrets_resolver
+    with span("secrets_resolver.get_key", kid=kid):
+        start = perf_counter()
+        try:
+            secret = await resolver.get_key(kid)
+        except Exception:
+            record_secrets_lookup(resolver, "get_key", perf_counter() - start, "error")
+            raise
+    record_secrets_lookup(
+        resolver,
+        "get_key",
+        perf_counter() - start,
+        "not_found" if secret is None else "found",
+    )
+    return secret
+
+
+async def find_secret_ids(
+    resolvers_config: ResolversConfig, kids: List[DID_URL]
+) -> List[DID_URL]:
+    resolver = resolvers_config.secrets_resolver
+    with span("secrets_resolver.get_keys", count=len(kids)):
+        start = perf_counter()
+        try:
+            secret_ids = await resolver.get_keys(kids)
+        except Exception:
+            record_secrets_lookup(resolver, "get_keys", perf_counter() - start, "error")
+            raise
+    record_secrets_lookup(
+        resolver,
+        "get_keys",
+        perf_counter() - start,
+        "found" if secret_ids else "not_found",
+    )
+    return secret_ids
@@ -1,4 +1,6 @@
-from authlib.common.encoding import to_bytes, json_dumps, json_loads, to_unicode
+from typing import Union
+
+from authlib.common.encoding import to_bytes, json_dumps, json_loads
 
 from didcomm.common.types import JSON
 from didcomm.errors import MalformedMessageError, MalformedMessageCode
@@ -12,11 +14,51 @@ def dict_to_json(msg: dict) -> JSON:
     return json_dumps(msg)
 
 
-def json_bytes_to_dict(json_bytes: bytes) -> dict:
-    return json_str_to_dict(to_unicode(json_bytes))
+# members of a JWE in the JSON serialization holding base64url strings
+_JWE_BASE64URL_MEMBERS = {"protected", "aad", "iv", "ciphertext", "tag"}
+
+
+def jwe_to_json(jwe: dict) -> JSON:
+    """
+    Serializes a JWE produced by Authlib to the same JSON as `dict_to_json` does.
+
+    Base64url encoded members (the ciphertext in particular) can't contain characters to be escaped,
+    so they are copied as they are instead of being scanned by the JSON encoder.
+    """
+    parts = ["{"]
+    for name, value in jwe.items():
+        if len(parts) > 1:
+            parts.append(",")
+        if name in _JWE_BASE64URL_MEMBERS and isinstance(value, str):
+            parts += ['"', name, '":"', value, '"']
+        else:
+            parts += [json_dumps(name), ":", json_dumps(value)]
+    parts.append("}")
+    return "".join(parts)
+
+
+def jwe_to_json_bytes(jwe: dict) -> bytes:
+    return to_bytes(jwe_to_json(jwe))
+
+
+def utf8_size(value: Union[str, bytes]) -> int:
+    """
+    :return: size in bytes of the UTF-8 encoded string, or of the bytes
+    """
+    # `isascii` doesn't scan a str, so an ASCII string (a packed envelope) is not encoded
+    if isinstance(value, bytes) or value.isascii():
+        return len(value)
+    return len(value.encode("utf-8", "surrogatepass"))
+
+
+def json_bytes_to_dict(json_bytes: Union[bytes, bytearray, memoryview]) -> dict:
+    # `json.loads` decodes bytes itself, only a memoryview needs to be copied
+    if isinstance(json_bytes, memoryview):
+        json_bytes = json_bytes.tobytes()
+    return json_str_to_dict(json_bytes)
 
 
-def json_str_to_dict(json_str: JSON) -> dict:
+def json_str_to_dict(json_str: Union[JSON, bytes, bytearray]) -> dict:
     try:
         json_dict = json_loads(json_str)
     except Exception as exc:
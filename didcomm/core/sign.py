@@ -1,14 +1,13 @@
-from authlib.jose import JsonWebSignature
-from authlib.jose.errors import BadSignatureError
-
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import DID_OR_DID_URL, DIDCommMessageTypes
+from didcomm.core.crypto.backend import get_crypto_backend
 from didcomm.core.keys.sign_keys_selector import find_signing_key, find_verification_key
 from didcomm.core.serialization import dict_to_json_bytes
 from didcomm.core.types import SignResult, UnpackSignResult
 from didcomm.core.utils import extract_key, extract_sign_alg
 from didcomm.core.validation import validate_jws
 from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from didcomm.tracing import span
 
 
 def is_signed(msg: dict) -> bool:
@@ -20,21 +19,16 @@ async def sign(
 ) -> SignResult:
     msg = dict_to_json_bytes(msg)
 
-    jws = JsonWebSignature()
-
     secret = await find_signing_key(sign_frm, resolvers_config)
     private_key = extract_key(secret)
     alg = extract_sign_alg(secret)
 
     protected = {"typ": DIDCommMessageTypes.SIGNED.value, "alg": alg.value}
 
-    header = {"kid": secret.kid}
-
-    header_objs = [{"protected": protected, "header": header}]
-
-    res = jws.serialize_json(header_objs, msg, private_key)
+    with span("jws.sign", alg=alg.value, size=len(msg)):
+        res = get_crypto_backend().sign(protected, secret.kid, msg, private_key)
 
-    return SignResult(msg=res, sign_frm_kid=secret.kid)
+    return SignResult(msg=res, sign_frm_kid=secret.kid, alg=alg)
 
 
 async def unpack_sign(msg: dict, resolvers_config: ResolversConfig) -> UnpackSignResult:
@@ -48,11 +42,11 @@ async def unpack_sign(msg: dict, resolvers_config: ResolversConfig) -> UnpackSig
     alg = extract_sign_alg(sign_frm_verification_method)
 
     try:
-        jws = JsonWebSignature()
-        jws_object = jws.deserialize_json(msg, public_key)
-    except BadSignatureError as exc:
-        raise MalformedMessageError(MalformedMessageCode.INVALID_SIGNATURE) from exc
+        with span("jws.verify", alg=alg.value):
+            payload = get_crypto_backend().verify(msg, public_key)
+    except MalformedMessageError:
+        raise
     except Exception as exc:
         raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE) from exc
 
-    return UnpackSignResult(msg=jws_object.payload, sign_frm_kid=sign_frm_kid, alg=alg)
+    return UnpackSignResult(msg=payload, sign_frm_kid=sign_frm_kid, alg=alg)
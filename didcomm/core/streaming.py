@@ -0,0 +1,269 @@
+"""
+Incremental parsing of packed messages read from a stream or a file.
+
+A packed message is parsed member by member. For a JWE, the `protected` header and `recipients` are parsed first,
+and the message is rejected if no recipient key is found in the secrets resolver
+before the (possibly huge) `ciphertext` is read from the stream.
+This holds if `ciphertext` follows `recipients` in the JSON object as it's done by DIDComm implementations;
+otherwise the whole message is read before the recipients are checked.
+"""
+from __future__ import annotations
+
+import codecs
+import inspect
+import json
+from typing import Any, Optional, Tuple
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.common.types import JSON_OBJ
+from didcomm.core.limits import UnpackLimits, check_recipients
+from didcomm.core.resolvers import find_secret_ids
+from didcomm.core.utils import get_jwe_alg
+from didcomm.core.validation import validate_anoncrypt_jwe, validate_authcrypt_jwe
+from didcomm.errors import (
+    DIDUrlNotFoundError,
+    MalformedMessageError,
+    MalformedMessageCode,
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_VALUE_DELIMITERS = _WHITESPACE + ",}"
+
+
+def is_stream(packed_msg: Any) -> bool:
+    """
+    :return: whether the packed message is a stream or a file (an object with `read` method)
+    """
+    return callable(getattr(packed_msg, "read", None))
+
+
+async def read_packed_msg(
+    stream: Any,
+    resolvers_config: ResolversConfig,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    limits: Optional[UnpackLimits] = None,
+) -> Tuple[JSON_OBJ, int]:
+    """
+    Reads a packed message from a binary stream or file checking JWE recipients before the ciphertext is read.
+
+    :param stream: object with `read(size)` method returning bytes or an awaitable of bytes
+        (a file opened in binary mode, `asyncio.StreamReader`, etc.)
+    :param resolvers_config: secrets and DIDDoc resolvers
+    :param chunk_size: size of chunks read from the stream
+    :param limits: limits of the message size and the number of recipients checked while the message is read
+
+    :raises DIDUrlNotFoundError: If the message is a JWE and there is no secret for any recipient key
+    :raises MalformedMessageError: If the message is not a valid JSON object
+
+    :return: the message and the number of bytes read
+    """
+    limits = limits or UnpackLimits()
+    reader = JsonObjectStreamReader(stream, chunk_size, limits.max_size)
+    head = await reader.read_members(stop_before="ciphertext")
+
+    alg = get_jwe_alg(head)
+    if alg is not None and "recipients" in head and not reader.finished:
+        check_recipients(head, limits)
+        if alg.startswith("ECDH-1PU"):
+            validate_authcrypt_jwe(head)
+        elif alg.startswith("ECDH-ES"):
+            validate_anoncrypt_jwe(head)
+        to_kids = [r["header"]["kid"] for r in head["recipients"]]
+        if not await find_secret_ids(resolvers_config, to_kids):
+            raise DIDUrlNotFoundError(
+                f"No secrets are found in secrets resolver for DID URLs: {to_kids}"
+            )
+
+    return await reader.read_members(), reader.bytes_read
+
+
+class JsonObjectStreamReader:
+    """
+    Parses a JSON object read from a binary stream member by member.
+
+    String values are scanned chunk by chunk as they are read, so a huge string member (a ciphertext)
+    doesn't require the JSON decoder to re-scan it. Other values are expected to be relatively small.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_size: Optional[int] = None,
+    ):
+        """
+        :param stream: object with `read(size)` method returning bytes or an awaitable of bytes
+        :param chunk_size: size of chunks read from the stream
+        :param max_size: optional max number of bytes to read,
+            `MalformedMessageError` with `MESSAGE_TOO_LARGE` code is raised if the stream is longer
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._max_size = max_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+        self._stopped_before: Optional[str] = None
+        self.finished = False
+        self.bytes_read = 0
+        self.members: JSON_OBJ = {}
+
+    async def read_members(self, stop_before: Optional[str] = None) -> JSON_OBJ:
+        """
+        Reads members of the object.
+
+        :param stop_before: optional name of a member; reading stops before its value if it's found
+        :return: all the members read so far
+        """
+        if not self._started:
+            await self._start()
+        if self._stopped_before is not None:
+            name, self._stopped_before = self._stopped_before, None
+            self.members[name] = await self._read_value()
+        while not self.finished:
+            await self._skip_whitespace()
+            if self.members:
+                if await self._peek() == "}":
+                    await self._finish()
+                    break
+                await self._expect(",")
+                await self._skip_whitespace()
+            elif await self._peek() == "}":
+                await self._finish()
+                break
+            name = await self._read_key()
+            if name == stop_before:
+                self._stopped_before = name
+                return self.members
+            self.members[name] = await self._read_value()
+        return self.members
+
+    async def _start(self):
+        self._started = True
+        await self._skip_whitespace()
+        await self._expect("{")
+
+    async def _finish(self):
+        self._pos += 1
+        self.finished = True
+        # only whitespace may follow the object
+        await self._skip_whitespace()
+        if await self._peek() is not None:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+
+    async def _read_key(self) -> str:
+        if await self._peek() != '"':
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+        name = await self._read_string()
+        await self._skip_whitespace()
+        await self._expect(":")
+        await self._skip_whitespace()
+        return name
+
+    async def _read_value(self) -> Any:
+        char = await self._peek()
+        if char is None:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+        if char == '"':
+            return await self._read_string()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._eof:
+                    raise MalformedMessageError(
+                        MalformedMessageCode.INVALID_MESSAGE
+                    ) from exc
+            else:
+                # a number may continue in the next chunk (for example, `1.5` of `1.5e3`)
+                if self._eof or (
+                    end < len(self._buf) and self._buf[end] in _VALUE_DELIMITERS
+                ):
+                    self._pos = end
+                    return value
+            await self._read_chunk(max(self._chunk_size, len(self._buf) - self._pos))
+
+    async def _read_string(self) -> str:
+        # the opening quote is at the current position
+        self._pos += 1
+        parts = []
+        search_from = self._pos
+        while True:
+            end = self._buf.find('"', search_from)
+            if end < 0:
+                # trailing backslashes are kept in the buffer to check if the next quote is escaped
+                keep = len(self._buf)
+                while keep > self._pos and self._buf[keep - 1] == "\\":
+                    keep -= 1
+                parts.append(self._buf[self._pos : keep])
+                self._pos = keep
+                kept = len(self._buf) - keep
+                if not await self._read_chunk():
+                    raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+                search_from = self._pos + kept
+                continue
+            backslashes = 0
+            while (
+                end - backslashes > self._pos
+                and self._buf[end - 1 - backslashes] == "\\"
+            ):
+                backslashes += 1
+            if backslashes % 2:
+                search_from = end + 1
+                continue
+            parts.append(self._buf[self._pos : end])
+            self._pos = end + 1
+            break
+        value = "".join(parts)
+        if "\\" in value:
+            try:
+                value = json.loads(f'"{value}"')
+            except json.JSONDecodeError as exc:
+                raise MalformedMessageError(
+                    MalformedMessageCode.INVALID_MESSAGE
+                ) from exc
+        return value
+
+    async def _skip_whitespace(self):
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not await self._read_chunk():
+                return
+
+    async def _expect(self, char: str):
+        if await self._peek() != char:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
+        self._pos += 1
+
+    async def _peek(self) -> Optional[str]:
+        if self._pos >= len(self._buf) and not await self._read_chunk():
+            return None
+        return self._buf[self._pos]
+
+    async def _read_chunk(self, size: Optional[int] = None) -> bool:
+        if self._eof:
+            return False
+        data = self._stream.read(size or self._chunk_size)
+        if inspect.isawaitable(data):
+            data = await data
+        self.bytes_read += len(data)
+        if self._max_size is not None and self.bytes_read > self._max_size:
+            raise MalformedMessageError(MalformedMessageCode.MESSAGE_TOO_LARGE)
+        try:
+            text = self._decoder.decode(data, final=not data)
+        except UnicodeDecodeError as exc:
+            raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE) from exc
+        if not data:
+            self._eof = True
+        # drop the parsed part of the buffer
+        if self._pos:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        self._buf += text
+        return bool(text) or not self._eof
@@ -1,11 +1,14 @@
-from dataclasses import dataclass
-from typing import List, Optional, Callable
+from __future__ import annotations
 
-from authlib.jose.rfc7517 import AsymmetricKey
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Callable
 
 from didcomm.common.algorithms import SignAlg, AnonCryptAlg, AuthCryptAlg
 from didcomm.common.types import DID_URL, DID_OR_DID_URL
 
+if TYPE_CHECKING:
+    from authlib.jose.rfc7517 import AsymmetricKey
+
 DIDCOMM_ORG_DOMAIN = "didcomm.org"
 
 
@@ -56,6 +59,7 @@ class Key:
 class SignResult:
     msg: dict
     sign_frm_kid: DID_URL
+    alg: Optional[SignAlg] = None
 
 
 @dataclass(frozen=True)
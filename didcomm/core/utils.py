@@ -1,8 +1,10 @@
+from __future__ import annotations
+
 import dataclasses
 import hashlib
 import uuid
 from enum import Enum
-from typing import Union, Optional, Any, List
+from typing import TYPE_CHECKING, Union, Optional, Any, List
 
 import attr
 import base58
@@ -13,8 +15,6 @@ from authlib.common.encoding import (
     to_bytes,
     urlsafe_b64encode,
 )
-from authlib.jose import ECKey, OKPKey
-from authlib.jose.rfc7517 import AsymmetricKey
 
 from didcomm.common.algorithms import SignAlg
 from didcomm.common.types import (
@@ -24,10 +24,16 @@ from didcomm.common.types import (
     DID_URL,
     DID,
 )
+from didcomm.common.utils import search_first_in_iterable
 from didcomm.core.serialization import json_str_to_dict
 from didcomm.did_doc.did_doc import VerificationMethod
+from didcomm.did_doc.did_doc_compact import VerificationMethodCompact
 from didcomm.errors import DIDCommValueError
 from didcomm.secrets.secrets_resolver import Secret
+from didcomm.tracing import span
+
+if TYPE_CHECKING:
+    from authlib.jose.rfc7517 import AsymmetricKey
 
 
 def id_generator_default() -> str:
@@ -42,17 +48,23 @@ def didcomm_id_generator_default(did: Optional[DID_OR_DID_URL] = None) -> str:
 
 
 def extract_key(
-    method: Union[VerificationMethod, Secret], align_kid=False
+    method: Union[VerificationMethod, VerificationMethodCompact, Secret],
+    align_kid=False,
 ) -> AsymmetricKey:
-    if isinstance(method, VerificationMethod):
-        return _extract_key_from_verification_method(method, align_kid)
+    if isinstance(method, Secret):
+        with span("extract_key", kid=method.kid):
+            return _extract_key_from_secret(method, align_kid)
     else:
-        return _extract_key_from_secret(method, align_kid)
+        with span("extract_key", kid=method.id):
+            return _extract_key_from_verification_method(method, align_kid)
 
 
 def _extract_key_from_verification_method(
     verification_method: VerificationMethod, align_kid
 ) -> AsymmetricKey:
+    # Authlib JOSE keys load `cryptography`, so they are imported when a key is extracted first time
+    from authlib.jose import ECKey, OKPKey
+
     if verification_method.type == VerificationMethodType.JSON_WEB_KEY_2020:
         jwk = verification_method.public_key_jwk
 
@@ -143,6 +155,9 @@ _CURVE25519_POINT_SIZE = 32
 
 
 def _extract_key_from_secret(secret: Secret, align_kid) -> AsymmetricKey:
+    # Authlib JOSE keys load `cryptography`, so they are imported when a key is extracted first time
+    from authlib.jose import ECKey, OKPKey
+
     if secret.type == VerificationMethodType.JSON_WEB_KEY_2020:
         if secret.verification_material.format != VerificationMaterialFormat.JWK:
             raise DIDCommValueError(
@@ -277,6 +292,80 @@ def _from_multicodec(value: bytes) -> (_Codec, bytes):
     return codec, value[len(prefix) :]
 
 
+def _to_multicodec(codec: _Codec, value: bytes) -> bytes:
+    return varint.encode(codec.value) + value
+
+
+_PUBLIC_KEY_CODECS = {
+    _Codec.X25519_PUB: "X25519",
+    _Codec.ED25519_PUB: "Ed25519",
+}
+
+
+def decode_public_key_multibase(value: str) -> (str, bytes):
+    """
+    Decodes a base58btc multibase encoded multicodec public key
+    (e.g. `z6Mk...` or `z6LS...`).
+
+    :param value: multibase encoded public key
+    :return: the key curve ("Ed25519" or "X25519") and the raw public key bytes
+    """
+    if not value.startswith("z"):
+        raise DIDCommValueError(
+            f"Multibase keys containing internally Base58 values only are currently supported "
+            f"but got the value: {value}"
+        )
+    try:
+        prefixed_raw_value = base58.b58decode(value[1:])
+    except Exception as exc:
+        raise DIDCommValueError(f"Invalid base58 value: {value}") from exc
+
+    codec, raw_value = _from_multicodec(prefixed_raw_value)
+    if codec not in _PUBLIC_KEY_CODECS:
+        raise DIDCommValueError(
+            f"Multibase value {value} does not contain a supported public key"
+        )
+    return _PUBLIC_KEY_CODECS[codec], raw_value
+
+
+def encode_public_key_multibase(crv: str, raw_value: bytes) -> str:
+    """
+    Encodes a raw public key as a base58btc multibase multicodec value.
+
+    :param crv: the key curve ("Ed25519" or "X25519")
+    :param raw_value: raw public key bytes
+    :return: multibase encoded public key
+    """
+    codec = search_first_in_iterable(
+        _PUBLIC_KEY_CODECS, lambda c: _PUBLIC_KEY_CODECS[c] == crv
+    )
+    if codec is None:
+        raise DIDCommValueError(f"Curve {crv} is not supported")
+    return "z" + to_unicode(base58.b58encode(_to_multicodec(codec, raw_value)))
+
+
+_CURVE25519_P = 2**255 - 19
+
+
+def ed25519_public_key_to_x25519(raw_value: bytes) -> bytes:
+    """
+    Converts a raw Ed25519 public key to the birationally equivalent
+    X25519 public key (u = (1 + y) / (1 - y) mod p).
+
+    :param raw_value: raw Ed25519 public key bytes
+    :return: raw X25519 public key bytes
+    """
+    if len(raw_value) != _CURVE25519_POINT_SIZE:
+        raise DIDCommValueError(
+            f"Ed25519 public key must be {_CURVE25519_POINT_SIZE} bytes long"
+        )
+    y = int.from_bytes(raw_value, "little") & ((1 << 255) - 1)
+    if y >= _CURVE25519_P or y == 1:
+        raise DIDCommValueError("Invalid Ed25519 public key")
+    u = (1 + y) * pow(1 - y, _CURVE25519_P - 2, _CURVE25519_P) % _CURVE25519_P
+    return u.to_bytes(_CURVE25519_POINT_SIZE, "little")
+
+
 def extract_sign_alg(method: Union[VerificationMethod, Secret]) -> SignAlg:
     if method.type == VerificationMethodType.JSON_WEB_KEY_2020:
         if isinstance(method, Secret):
@@ -376,7 +465,7 @@ def _get_crv_for_verification_method(
         VerificationMethodType.X25519_KEY_AGREEMENT_KEY_2019,
     }:
         return _Crv.X25519.value
-    elif key.type is VerificationMethodType.JSON_WEB_KEY_2020:
+    elif key.type == VerificationMethodType.JSON_WEB_KEY_2020:
         jwk = (
             json_str_to_dict(key.verification_material.value)
             if isinstance(key, Secret)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from authlib.common.encoding import to_bytes, urlsafe_b64decode, to_unicode
 
 from didcomm.core.utils import (
@@ -18,7 +20,7 @@ def validate_jws(msg: dict):
         raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
 
 
-def validate_anoncrypt_jwe(msg: dict):
+def validate_anoncrypt_jwe(msg: dict, protected_header: Optional[dict] = None):
     # 1. Validate recipient unprotected header
     if "recipients" not in msg:
         raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
@@ -26,8 +28,9 @@ def validate_anoncrypt_jwe(msg: dict):
         if "header" not in r or "kid" not in r["header"]:
             raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
 
-    # 2. Decode protected header
-    protected_header = _get_protected_header(msg)
+    # 2. Decode protected header (unless it's already decoded by the caller)
+    if protected_header is None:
+        protected_header = _get_protected_header(msg)
 
     # 3. Check apv
     _check_apv(protected_header, msg["recipients"])
@@ -35,7 +38,7 @@ def validate_anoncrypt_jwe(msg: dict):
     return protected_header
 
 
-def validate_authcrypt_jwe(msg: dict):
+def validate_authcrypt_jwe(msg: dict, protected_header: Optional[dict] = None):
     # 1. Validate recipient unprotected header
     if "recipients" not in msg:
         raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
@@ -45,8 +48,9 @@ def validate_authcrypt_jwe(msg: dict):
         if not is_did_with_uri_fragment(r["header"]["kid"]):
             raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE)
 
-    # 2. Decode protected header
-    protected_header = _get_protected_header(msg)
+    # 2. Decode protected header (unless it's already decoded by the caller)
+    if protected_header is None:
+        protected_header = _get_protected_header(msg)
 
     # 3. Check apu
     if "apu" not in protected_header:
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Dict, FrozenSet, List, Union
 
 from pydid import DIDCommService
 from pydid import VerificationMethod
 from pydid.doc import DIDDocument
 
 from didcomm.common.types import DID_URL
-from didcomm.common.utils import search_first_in_iterable
 
 
 class DIDDoc(DIDDocument):
+    """
+    DID Document with constant time lookups of verification methods, DIDComm services
+    and verification relationships.
+
+    The lookups use an index built on first use. The lists of the DID Doc (`verification_method`, `service`,
+    `key_agreement`, `authentication`) must not be modified in place after that,
+    or `invalidate_index` must be called after modifying them. Copies (`copy`, `copy.copy`, `copy.deepcopy`)
+    and unpickled DID Docs build their own index.
+    """
+
+    # lazily built lookup index, see `_get_didcomm_index`
+    _didcomm_index: Optional[_DIDDocIndex] = None
+
     def get_verification_method(self, id: DID_URL) -> Optional[VerificationMethod]:
         """
         Returns the verification method with the given identifier.
@@ -18,11 +31,7 @@ class DIDDoc(DIDDocument):
         :param id: an identifier of a verification method
         :return: the verification method or None of there is no one for the given identifier
         """
-        return (
-            search_first_in_iterable(self.verification_method, lambda x: x.id == id)
-            if self.verification_method
-            else None
-        )
+        return self._get_didcomm_index().verification_methods.get(id)
 
     def get_didcomm_service(self, id: str) -> Optional[DIDCommService]:
         """
@@ -31,8 +40,77 @@ class DIDDoc(DIDDocument):
         :param id: an identifier of a service endpoint
         :return: the service endpoint or None of there is no one for the given identifier
         """
-        return (
-            search_first_in_iterable(self.service, lambda x: x.id == id)
-            if self.service
-            else None
+        return self._get_didcomm_index().services.get(id)
+
+    def has_key_agreement(self, id: DID_URL) -> bool:
+        """
+        Checks whether the given key ID is referenced by the `keyAgreement` verification relationship.
+
+        :param id: an identifier of a verification method
+        :return: True if the key ID is in `keyAgreement` and False otherwise
+        """
+        return id in self._get_didcomm_index().key_agreement
+
+    def has_authentication(self, id: DID_URL) -> bool:
+        """
+        Checks whether the given key ID is referenced by the `authentication` verification relationship.
+
+        :param id: an identifier of a verification method
+        :return: True if the key ID is in `authentication` and False otherwise
+        """
+        return id in self._get_didcomm_index().authentication
+
+    def invalidate_index(self):
+        """
+        Drops the lookup index, so that it's built again on the next lookup.
+        Must be called after the lists of the DID Doc are modified in place.
+        """
+        self._didcomm_index = None
+
+    def copy(self, **kwargs) -> DIDDoc:
+        # pydantic carries private attributes over to the copy,
+        # while `update` may replace the indexed lists
+        did_doc = super().copy(**kwargs)
+        did_doc.invalidate_index()
+        return did_doc
+
+    def __getstate__(self):
+        # used by `copy.copy`, `copy.deepcopy` and pickle
+        state = super().__getstate__()
+        state["__private_attribute_values__"]["_didcomm_index"] = None
+        return state
+
+    def _get_didcomm_index(self) -> _DIDDocIndex:
+        index = self._didcomm_index
+        if index is None:
+            index = self._didcomm_index = _DIDDocIndex.build(self)
+        return index
+
+
+@dataclass(frozen=True)
+class _DIDDocIndex:
+    verification_methods: Dict[str, VerificationMethod]
+    services: Dict[str, DIDCommService]
+    key_agreement: FrozenSet[str]
+    authentication: FrozenSet[str]
+
+    @staticmethod
+    def build(did_doc: DIDDocument) -> _DIDDocIndex:
+        return _DIDDocIndex(
+            verification_methods=_index_by_id(did_doc.verification_method),
+            services=_index_by_id(did_doc.service),
+            key_agreement=_references(did_doc.key_agreement),
+            authentication=_references(did_doc.authentication),
         )
+
+
+def _index_by_id(
+    items: Optional[List],
+) -> Dict[str, Union[VerificationMethod, DIDCommService]]:
+    # pydid rejects documents with conflicting identifiers, so ids are unique here
+    return {item.id: item for item in items or []}
+
+
+def _references(relationship: Optional[List]) -> FrozenSet[str]:
+    # embedded verification methods are not supported, only references are indexed
+    return frozenset(item for item in relationship or [] if isinstance(item, str))
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from typing import Optional, List, Union
+
+from authlib.common.encoding import to_unicode
+
+from didcomm.common.types import DID, DID_URL, JSON, JSON_OBJ, DIDDocServiceTypes
+from didcomm.core.serialization import json_str_to_dict
+from didcomm.errors import DIDCommValueError
+
+# service types which are read by the library (as DIDComm services)
+_DIDCOMM_SERVICE_TYPES = {
+    DIDDocServiceTypes.DID_COMM_MESSAGING.value,
+    "did-communication",
+}
+
+
+class VerificationMethodCompact:
+    """
+    A verification method of `DIDDocCompact`.
+
+    Only the fields the library reads are kept.
+    """
+
+    __slots__ = (
+        "id",
+        "type",
+        "controller",
+        "public_key_jwk",
+        "public_key_base58",
+        "public_key_multibase",
+    )
+
+    def __init__(
+        self,
+        id: DID_URL,
+        type: str,
+        controller: Optional[DID] = None,
+        public_key_jwk: Optional[dict] = None,
+        public_key_base58: Optional[str] = None,
+        public_key_multibase: Optional[str] = None,
+    ):
+        self.id = id
+        self.type = type
+        self.controller = controller
+        self.public_key_jwk = public_key_jwk
+        self.public_key_base58 = public_key_base58
+        self.public_key_multibase = public_key_multibase
+
+    def __eq__(self, other):
+        if not isinstance(other, VerificationMethodCompact):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"VerificationMethodCompact(id={self.id!r}, type={self.type!r})"
+
+
+class DIDCommServiceCompact:
+    """
+    A DIDComm service of `DIDDocCompact`.
+
+    Only the fields the library reads are kept.
+    """
+
+    __slots__ = ("id", "service_endpoint", "routing_keys", "accept")
+
+    def __init__(
+        self,
+        id: str,
+        service_endpoint: str,
+        routing_keys: Optional[List[str]] = None,
+        accept: Optional[List[str]] = None,
+    ):
+        self.id = id
+        self.service_endpoint = service_endpoint
+        self.routing_keys = routing_keys or []
+        self.accept = accept or []
+
+    def __eq__(self, other):
+        if not isinstance(other, DIDCommServiceCompact):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return (
+            f"DIDCommServiceCompact(id={self.id!r}, "
+            f"service_endpoint={self.service_endpoint!r})"
+        )
+
+
+class DIDDocCompact:
+    """
+    A compact DID Doc which can be returned by a `DIDResolver` everywhere `DIDDoc` is accepted.
+
+    Unlike `DIDDoc`, it is not a pydantic model: no model validation is done on construction,
+    and only verification methods, `authentication` and `keyAgreement` relationships and DIDComm services
+    are kept. It is intended to be used by resolvers trusting their source (for example, a cache).
+
+    A DID Doc created by `from_json` is parsed lazily on the first access.
+    """
+
+    __slots__ = (
+        "_source",
+        "_id",
+        "_verification_methods",
+        "_authentication",
+        "_key_agreement",
+        "_services",
+    )
+
+    def __init__(
+        self,
+        id: DID,
+        verification_method: Optional[List[VerificationMethodCompact]] = None,
+        authentication: Optional[List[DID_URL]] = None,
+        key_agreement: Optional[List[DID_URL]] = None,
+        service: Optional[List[DIDCommServiceCompact]] = None,
+    ):
+        self._source = None
+        self._id = id
+        self._verification_methods = {vm.id: vm for vm in verification_method or []}
+        self._authentication = list(authentication or [])
+        self._key_agreement = list(key_agreement or [])
+        self._services = {s.id: s for s in service or []}
+
+    @staticmethod
+    def from_json(did_doc_json: Union[JSON, bytes]) -> DIDDocCompact:
+        """
+        Creates a DID Doc from a JSON DID Doc representation (as defined by DID Core)
+        which is parsed on the first access.
+
+        :param did_doc_json: DID Doc as JSON string
+        :return: the DID Doc
+        """
+        did_doc = DIDDocCompact.__new__(DIDDocCompact)
+        did_doc._source = did_doc_json
+        return did_doc
+
+    @staticmethod
+    def from_dict(did_doc_dict: JSON_OBJ) -> DIDDocCompact:
+        """
+        Creates a DID Doc from a JSON DID Doc representation (as defined by DID Core) parsed to a dict.
+
+        Relative DID URLs are resolved against the DID Doc `id`.
+        Embedded verification methods are added to the DID Doc verification methods.
+
+        :param did_doc_dict: DID Doc as dict
+        :raises DIDCommValueError: if the DID Doc is invalid
+        :return: the DID Doc
+        """
+        try:
+            did = did_doc_dict["id"]
+            verification_methods = [
+                _verification_method_from_dict(did, vm)
+                for vm in did_doc_dict.get("verificationMethod") or []
+            ]
+            authentication = _relationship_from_dict(
+                did, did_doc_dict.get("authentication"), verification_methods
+            )
+            key_agreement = _relationship_from_dict(
+                did, did_doc_dict.get("keyAgreement"), verification_methods
+            )
+            services = [
+                _service_from_dict(did, s)
+                for s in did_doc_dict.get("service") or []
+                if s.get("type") in _DIDCOMM_SERVICE_TYPES
+            ]
+        except DIDCommValueError:
+            raise
+        except Exception as exc:
+            raise DIDCommValueError(f"DID Doc is invalid: {exc}") from exc
+
+        return DIDDocCompact(
+            id=did,
+            verification_method=verification_methods,
+            authentication=authentication,
+            key_agreement=key_agreement,
+            service=services,
+        )
+
+    @property
+    def id(self) -> DID:
+        self._parse_if_needed()
+        return self._id
+
+    @property
+    def verification_method(self) -> List[VerificationMethodCompact]:
+        self._parse_if_needed()
+        return list(self._verification_methods.values())
+
+    @property
+    def authentication(self) -> List[DID_URL]:
+        self._parse_if_needed()
+        return self._authentication
+
+    @property
+    def key_agreement(self) -> List[DID_URL]:
+        self._parse_if_needed()
+        return self._key_agreement
+
+    @property
+    def service(self) -> List[DIDCommServiceCompact]:
+        self._parse_if_needed()
+        return list(self._services.values())
+
+    def get_verification_method(
+        self, id: DID_URL
+    ) -> Optional[VerificationMethodCompact]:
+        """
+        Returns the verification method with the given identifier.
+
+        :param id: an identifier of a verification method
+        :return: the verification method or None of there is no one for the given identifier
+        """
+        self._parse_if_needed()
+        return self._verification_methods.get(id)
+
+    def get_didcomm_service(self, id: str) -> Optional[DIDCommServiceCompact]:
+        """
+        Returns DID Document service endpoint with the given identifier.
+
+        :param id: an identifier of a service endpoint
+        :return: the service endpoint or None of there is no one for the given identifier
+        """
+        self._parse_if_needed()
+        return self._services.get(id)
+
+    def has_key_agreement(self, id: DID_URL) -> bool:
+        """
+        Checks whether the given key ID is referenced by the `keyAgreement` verification relationship.
+
+        :param id: an identifier of a verification method
+        :return: True if the key ID is in `keyAgreement` and False otherwise
+        """
+        # relationships are short, a list scan is cheaper in memory than a set
+        return id in self.key_agreement
+
+    def has_authentication(self, id: DID_URL) -> bool:
+        """
+        Checks whether the given key ID is referenced by the `authentication` verification relationship.
+
+        :param id: an identifier of a verification method
+        :return: True if the key ID is in `authentication` and False otherwise
+        """
+        return id in self.authentication
+
+    def __eq__(self, other):
+        if not isinstance(other, DIDDocCompact):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self._verification_methods == other._verification_methods
+            and self._authentication == other._authentication
+            and self._key_agreement == other._key_agreement
+            and self._services == other._services
+        )
+
+    def __repr__(self):
+        return f"DIDDocCompact(id={self.id!r})"
+
+    def _parse_if_needed(self):
+        if self._source is None:
+            return
+        try:
+            did_doc_dict = json_str_to_dict(to_unicode(self._source))
+        except Exception as exc:
+            raise DIDCommValueError("DID Doc is not a valid JSON") from exc
+        parsed = DIDDocCompact.from_dict(did_doc_dict)
+        self._id = parsed._id
+        self._verification_methods = parsed._verification_methods
+        self._authentication = parsed._authentication
+        self._key_agreement = parsed._key_agreement
+        self._services = parsed._services
+        self._source = None
+
+
+def _absolute(did: DID, did_url: str) -> DID_URL:
+    return did + did_url if did_url.startswith("#") else did_url
+
+
+def _verification_method_from_dict(did: DID, vm: dict) -> VerificationMethodCompact:
+    return VerificationMethodCompact(
+        id=_absolute(did, vm["id"]),
+        type=vm["type"],
+        controller=vm.get("controller"),
+        public_key_jwk=vm.get("publicKeyJwk"),
+        public_key_base58=vm.get("publicKeyBase58"),
+        public_key_multibase=vm.get("publicKeyMultibase"),
+    )
+
+
+def _relationship_from_dict(
+    did: DID, relationship: Optional[list], verification_methods: list
+) -> List[DID_URL]:
+    res = []
+    for item in relationship or []:
+        if isinstance(item, dict):
+            embedded = _verification_method_from_dict(did, item)
+            verification_methods.append(embedded)
+            res.append(embedded.id)
+        else:
+            res.append(_absolute(did, item))
+    return res
+
+
+def _service_from_dict(did: DID, service: dict) -> DIDCommServiceCompact:
+    endpoint = service["serviceEndpoint"]
+    if isinstance(endpoint, list):
+        endpoint = endpoint[0]
+    if isinstance(endpoint, dict):
+        # DIDCommMessaging service endpoint object
+        routing_keys = endpoint.get("routingKeys")
+        accept = endpoint.get("accept")
+        endpoint = endpoint["uri"]
+    else:
+        routing_keys = service.get("routingKeys")
+        accept = service.get("accept")
+    return DIDCommServiceCompact(
+        id=_absolute(did, service["id"]),
+        service_endpoint=endpoint,
+        routing_keys=routing_keys,
+        accept=accept,
+    )
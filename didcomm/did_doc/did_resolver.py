@@ -1,20 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from didcomm.common.types import DID
 from didcomm.did_doc.did_doc import DIDDoc
+from didcomm.did_doc.did_doc_compact import DIDDocCompact
 
 
 class DIDResolver(ABC):
     """DID Resolver to resolver a DID to a DID DOC."""
 
     @abstractmethod
-    async def resolve(self, did: DID) -> Optional[DIDDoc]:
+    async def resolve(self, did: DID) -> Optional[Union[DIDDoc, DIDDocCompact]]:
         """
         Resolves a DID by the given DID or DID URL.
 
         :param did: a DID to be resolved
-        :return: an instance of resolved DID DOC or None if the DID can not be resolved by the given resolver
+        :return: an instance of resolved DID DOC (`DIDDoc` or `DIDDocCompact`)
+                 or None if the DID can not be resolved by the given resolver
         """
         pass
 
@@ -31,7 +33,7 @@ class ChainedDIDResolver(DIDResolver):
     def __init__(self, did_resolvers: List[DIDResolver]):
         self.__did_resolvers = did_resolvers
 
-    async def resolve(self, did: DID) -> Optional[DIDDoc]:
+    async def resolve(self, did: DID) -> Optional[Union[DIDDoc, DIDDocCompact]]:
         """
         Resolves a DID by asking every registered resolver to resolve a DID
         (in the order they are passed to the constructor)
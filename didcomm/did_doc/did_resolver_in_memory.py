@@ -1,13 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from didcomm.common.types import DID
 from didcomm.did_doc.did_doc import DIDDoc
+from didcomm.did_doc.did_doc_compact import DIDDocCompact
 from didcomm.did_doc.did_resolver import DIDResolver
 
 
 class DIDResolverInMemory(DIDResolver):
-    def __init__(self, did_docs: List[DIDDoc]):
+    def __init__(self, did_docs: List[Union[DIDDoc, DIDDocCompact]]):
         self._did_docs = {did_doc.id: did_doc for did_doc in did_docs}
 
-    async def resolve(self, did: DID) -> Optional[DIDDoc]:
+    async def resolve(self, did: DID) -> Optional[Union[DIDDoc, DIDDocCompact]]:
         return self._did_docs.get(did)
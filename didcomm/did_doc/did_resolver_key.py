@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import Optional
+
+from didcomm.common.types import DID, VerificationMethodType
+from didcomm.core.utils import (
+    decode_public_key_multibase,
+    encode_public_key_multibase,
+    ed25519_public_key_to_x25519,
+)
+from didcomm.did_doc.did_doc import DIDDoc, VerificationMethod
+from didcomm.did_doc.did_resolver import DIDResolver
+from didcomm.errors import DIDCommValueError
+
+DID_KEY_PREFIX = "did:key:"
+
+
+class DIDResolverKey(DIDResolver):
+    """
+    Resolves `did:key` DIDs (https://w3c-ccg.github.io/did-method-key/).
+
+    DID Docs are derived from the DID itself, so no I/O is done.
+    Ed25519 and X25519 keys are supported. For Ed25519 keys
+    an X25519 key agreement key is derived as defined by the `did:key` spec.
+
+    Resolved DID Docs are memoized (up to `cache_size` entries),
+    so the same instance is returned for the same DID.
+    """
+
+    def __init__(self, cache_size: Optional[int] = 1024):
+        self._resolve_cached = lru_cache(maxsize=cache_size)(build_did_key_doc)
+
+    async def resolve(self, did: DID) -> Optional[DIDDoc]:
+        if not did.startswith(DID_KEY_PREFIX):
+            return None
+        try:
+            return self._resolve_cached(did)
+        except (DIDCommValueError, ValueError):
+            return None
+
+
+def build_did_key_doc(did: DID) -> DIDDoc:
+    """
+    Builds a DID Doc for the given `did:key` DID.
+
+    :param did: a `did:key` DID
+    :return: the DID Doc
+    """
+    if not did.startswith(DID_KEY_PREFIX):
+        raise DIDCommValueError(f"`{did}` is not a did:key DID")
+
+    multibase = did[len(DID_KEY_PREFIX) :]
+    crv, raw_value = decode_public_key_multibase(multibase)
+
+    verification_methods = []
+    authentication = []
+    key_agreement = []
+
+    if crv == "Ed25519":
+        signing_method = VerificationMethod(
+            id=f"{did}#{multibase}",
+            controller=did,
+            type=VerificationMethodType.ED25519_VERIFICATION_KEY_2020,
+            public_key_multibase=multibase,
+        )
+        verification_methods.append(signing_method)
+        authentication.append(signing_method.id)
+        x25519_multibase = encode_public_key_multibase(
+            "X25519", ed25519_public_key_to_x25519(raw_value)
+        )
+    else:
+        x25519_multibase = multibase
+
+    agreement_method = VerificationMethod(
+        id=f"{did}#{x25519_multibase}",
+        controller=did,
+        type=VerificationMethodType.X25519_KEY_AGREEMENT_KEY_2020,
+        public_key_multibase=x25519_multibase,
+    )
+    verification_methods.append(agreement_method)
+    key_agreement.append(agreement_method.id)
+
+    return DIDDoc(
+        id=did,
+        verification_method=verification_methods,
+        authentication=authentication,
+        assertion_method=list(authentication),
+        key_agreement=key_agreement,
+        service=[],
+    )
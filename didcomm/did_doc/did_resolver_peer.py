@@ -0,0 +1,145 @@
+from functools import lru_cache
+from typing import Optional, List
+
+from authlib.common.encoding import json_loads, to_bytes, urlsafe_b64decode
+
+from didcomm.common.types import DID, VerificationMethodType, DIDDocServiceTypes
+from didcomm.core.utils import decode_public_key_multibase
+from didcomm.did_doc.did_doc import DIDDoc, VerificationMethod, DIDCommService
+from didcomm.did_doc.did_resolver import DIDResolver
+from didcomm.errors import DIDCommValueError
+
+DID_PEER_2_PREFIX = "did:peer:2"
+
+_PURPOSE_KEY_AGREEMENT = "E"
+_PURPOSE_AUTHENTICATION = "V"
+_PURPOSE_ASSERTION = "A"
+_PURPOSE_CAPABILITY_INVOCATION = "I"
+_PURPOSE_CAPABILITY_DELEGATION = "D"
+_PURPOSE_SERVICE = "S"
+
+_KEY_PURPOSES = {
+    _PURPOSE_KEY_AGREEMENT,
+    _PURPOSE_AUTHENTICATION,
+    _PURPOSE_ASSERTION,
+    _PURPOSE_CAPABILITY_INVOCATION,
+    _PURPOSE_CAPABILITY_DELEGATION,
+}
+
+_SERVICE_TYPE_ABBREVIATIONS = {"dm": DIDDocServiceTypes.DID_COMM_MESSAGING.value}
+
+
+class DIDResolverPeer(DIDResolver):
+    """
+    Resolves `did:peer` DIDs of numalgo 2
+    (https://identity.foundation/peer-did-method-spec/#method-2-multiple-inception-key-without-doc).
+
+    DID Docs are derived from the DID itself, so no I/O is done.
+    Ed25519 and X25519 keys and DIDCommMessaging services are supported.
+
+    Resolved DID Docs are memoized (up to `cache_size` entries),
+    so the same instance is returned for the same DID.
+    """
+
+    def __init__(self, cache_size: Optional[int] = 1024):
+        self._resolve_cached = lru_cache(maxsize=cache_size)(build_did_peer_2_doc)
+
+    async def resolve(self, did: DID) -> Optional[DIDDoc]:
+        if not did.startswith(DID_PEER_2_PREFIX):
+            return None
+        try:
+            return self._resolve_cached(did)
+        except (DIDCommValueError, ValueError):
+            return None
+
+
+def build_did_peer_2_doc(did: DID) -> DIDDoc:
+    """
+    Builds a DID Doc for the given `did:peer:2` DID.
+
+    Keys are identified as `#key-1`, `#key-2`, ... in order of appearance,
+    services as `#service`, `#service-1`, ...
+
+    :param did: a `did:peer:2` DID
+    :return: the DID Doc
+    """
+    if not did.startswith(DID_PEER_2_PREFIX + "."):
+        raise DIDCommValueError(f"`{did}` is not a did:peer:2 DID")
+
+    verification_methods = []
+    relationships = {purpose: [] for purpose in _KEY_PURPOSES}
+    services = []
+    # services are numbered across all `S` elements, non-DIDComm services included
+    service_index = 0
+
+    for element in did[len(DID_PEER_2_PREFIX) + 1 :].split("."):
+        if not element:
+            raise DIDCommValueError(f"`{did}` contains an empty element")
+        purpose, value = element[0], element[1:]
+
+        if purpose in _KEY_PURPOSES:
+            crv, _ = decode_public_key_multibase(value)
+            verification_method = VerificationMethod(
+                id=f"{did}#key-{len(verification_methods) + 1}",
+                controller=did,
+                type=VerificationMethodType.X25519_KEY_AGREEMENT_KEY_2020
+                if crv == "X25519"
+                else VerificationMethodType.ED25519_VERIFICATION_KEY_2020,
+                public_key_multibase=value,
+            )
+            verification_methods.append(verification_method)
+            relationships[purpose].append(verification_method.id)
+        elif purpose == _PURPOSE_SERVICE:
+            for entry in _decode_service_entries(did, value):
+                service = _didcomm_service(did, entry, service_index)
+                if service is not None:
+                    services.append(service)
+                service_index += 1
+        else:
+            raise DIDCommValueError(f"Unknown purpose code `{purpose}` in `{did}`")
+
+    return DIDDoc(
+        id=did,
+        verification_method=verification_methods,
+        authentication=relationships[_PURPOSE_AUTHENTICATION],
+        assertion_method=relationships[_PURPOSE_ASSERTION],
+        key_agreement=relationships[_PURPOSE_KEY_AGREEMENT],
+        capability_invocation=relationships[_PURPOSE_CAPABILITY_INVOCATION],
+        capability_delegation=relationships[_PURPOSE_CAPABILITY_DELEGATION],
+        service=services,
+    )
+
+
+def _decode_service_entries(did: DID, value: str) -> List[dict]:
+    try:
+        decoded = json_loads(urlsafe_b64decode(to_bytes(value)))
+    except Exception as exc:
+        raise DIDCommValueError(f"Invalid service encoding in `{did}`") from exc
+
+    entries = decoded if isinstance(decoded, list) else [decoded]
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise DIDCommValueError(f"Invalid service `{entry}` in `{did}`")
+    return entries
+
+
+def _didcomm_service(did: DID, service: dict, index: int) -> Optional[DIDCommService]:
+    service_type = service.get("t", service.get("type"))
+    service_type = _SERVICE_TYPE_ABBREVIATIONS.get(service_type, service_type)
+    if service_type != DIDDocServiceTypes.DID_COMM_MESSAGING.value:
+        # only DIDComm services are relevant for the library
+        return None
+
+    endpoint = service.get("s", service.get("serviceEndpoint"))
+    if isinstance(endpoint, dict):
+        # DIDComm services v2 serialization
+        service = endpoint
+        endpoint = endpoint.get("uri")
+
+    return DIDCommService(
+        id=f"{did}#service" + (f"-{index}" if index else ""),
+        service_endpoint=endpoint,
+        routing_keys=service.get("r", service.get("routingKeys", [])),
+        accept=service.get("a", service.get("accept", [])),
+        recipient_keys=[],
+    )
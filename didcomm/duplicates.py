@@ -0,0 +1,355 @@
+"""
+Detection of duplicate (retransmitted or replayed) packed messages in `unpack`.
+
+Detection is disabled by default. It's enabled by passing a guard in the unpack config:
+
+    guard = DuplicateMessageGuard(window_s=3600)
+    await unpack(resolvers_config, packed_msg, UnpackConfig(duplicate_guard=guard))
+    ...
+    guard.save("duplicates.snapshot")
+
+A message is identified by a SHA-256 digest of its outer envelope (`ciphertext` and `tag` of a JWE, payload and
+signatures of a JWS; plaintext messages are not checked). A repeated message is rejected with `DUPLICATE_MESSAGE`
+malformed message code before any key resolution and cryptographic operation.
+A message is recorded only after it has been unpacked successfully, so an invalid message can't make
+a valid one with the same ciphertext look like a duplicate. While a message is being unpacked, it's rejected as well,
+so concurrent duplicates are not decrypted more than once; if the unpack fails, the message is released and
+can be unpacked again.
+
+Memory is bounded:
+    - the most recent `lru_size` digests are kept exactly in an LRU;
+    - all digests of the time window are kept in Bloom filters of `capacity` entries per window.
+      A message found by the Bloom filters but not by the LRU is a duplicate with probability
+      above `1 - false_positive_rate`. It's rejected as well unless `reject_probable_duplicates` is False.
+
+A message is remembered for at least `window_s` (and at most twice as long).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Set
+
+from didcomm.common.types import JSON_OBJ
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_FALSE_POSITIVE_RATE = 1e-6
+DEFAULT_WINDOW_S = 24 * 60 * 60
+DEFAULT_LRU_SIZE = 10_000
+
+_SNAPSHOT_VERSION = 1
+
+
+def envelope_digest(msg: JSON_OBJ) -> Optional[bytes]:
+    """
+    :param msg: parsed packed message
+    :return: SHA-256 digest identifying an encrypted or signed message, None for a plaintext message
+    """
+    if isinstance(msg.get("ciphertext"), str):
+        data = f"{msg['ciphertext']}.{msg.get('tag', '')}"
+    elif isinstance(msg.get("payload"), str) and isinstance(
+        msg.get("signatures"), list
+    ):
+        signatures = ".".join(
+            str(s.get("signature", "")) if isinstance(s, dict) else ""
+            for s in msg["signatures"]
+        )
+        data = f"{msg['payload']}.{signatures}"
+    else:
+        return None
+    return hashlib.sha256(data.encode()).digest()
+
+
+class _BloomFilter:
+    def __init__(self, bits: int, hashes: int, started: float):
+        self.bits = bits
+        self.hashes = hashes
+        self.started = started
+        self.count = 0
+        self.array = bytearray((bits + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        # double hashing over the (already uniformly distributed) digest
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, digest: bytes):
+        for pos in self._positions(digest):
+            self.array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest)
+        )
+
+
+class DuplicateMessageGuard:
+    """
+    Memory-bounded set of recently unpacked messages: an exact LRU and time-windowed Bloom filters.
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        window_s: float = DEFAULT_WINDOW_S,
+        lru_size: int = DEFAULT_LRU_SIZE,
+        reject_probable_duplicates: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param capacity: expected max number of messages per time window;
+            the Bloom filters are sized to keep `false_positive_rate` at this number (the window is shortened if it's exceeded)
+        :param false_positive_rate: probability of a new message to be found by the Bloom filters
+        :param window_s: time window in seconds a message is remembered for
+        :param lru_size: number of the most recent messages remembered exactly
+        :param reject_probable_duplicates: whether a message found by the Bloom filters but not by the LRU is rejected
+        :param clock: source of wall-clock time (seconds), it's saved in snapshots
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        if window_s <= 0:
+            raise ValueError("window_s must be positive")
+        if lru_size < 0:
+            raise ValueError("lru_size must not be negative")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.window_s = window_s
+        self.lru_size = lru_size
+        self.reject_probable_duplicates = reject_probable_duplicates
+        self.duplicates = 0
+        self.probable_duplicates = 0
+        self._clock = clock
+        # optimal Bloom filter parameters for `capacity` entries and the false positive rate
+        self._bits = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+        self._lock = threading.Lock()
+        # the current generation first
+        self._filters: List[_BloomFilter] = [self._new_filter(clock())]
+        # digest -> time it was recorded
+        self._lru: OrderedDict[bytes, float] = OrderedDict()
+        # digests of the messages being unpacked (checked but not added or released yet)
+        self._pending: Set[bytes] = set()
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        :return: approximate memory used by the Bloom filters and the LRU when they are full
+        """
+        # 2 Bloom filter generations; an LRU entry is a 32 bytes digest (~65 bytes object) and an ordered dict slot
+        return 2 * len(self._filters[0].array) + self.lru_size * 160
+
+    def is_duplicate(self, digest: bytes) -> bool:
+        """
+        :param digest: message digest (see `envelope_digest`)
+        :return: whether the message has been recorded
+        """
+        with self._lock:
+            return self._is_duplicate(digest)
+
+    def add(self, digest: bytes):
+        """
+        Records a message (and ends its unpacking started by `check`).
+
+        :param digest: message digest (see `envelope_digest`)
+        """
+        with self._lock:
+            self._pending.discard(digest)
+            now = self._clock()
+            self._rotate(now)
+            current = self._filters[0]
+            if current.count >= self.capacity:
+                self._filters = [self._new_filter(now), current]
+            self._filters[0].add(digest)
+            if self.lru_size:
+                self._lru[digest] = now
+                self._lru.move_to_end(digest)
+                if len(self._lru) > self.lru_size:
+                    self._lru.popitem(last=False)
+
+    def check(self, msg: JSON_OBJ) -> Optional[bytes]:
+        """
+        Checks a parsed packed message and marks it as being unpacked.
+
+        :param msg: parsed packed message
+        :raises MalformedMessageError: with `DUPLICATE_MESSAGE` code if the message has been recorded
+            or is being unpacked
+        :return: the message digest to be recorded by `add` once the message is unpacked,
+            or to be passed to `release` if unpacking fails (None for a plaintext)
+        """
+        digest = envelope_digest(msg)
+        if digest is None:
+            return None
+        with self._lock:
+            if digest in self._pending:
+                self.duplicates += 1
+                raise MalformedMessageError(MalformedMessageCode.DUPLICATE_MESSAGE)
+            if self._is_duplicate(digest):
+                raise MalformedMessageError(MalformedMessageCode.DUPLICATE_MESSAGE)
+            self._pending.add(digest)
+        return digest
+
+    def release(self, digest: bytes):
+        """
+        Ends unpacking of a message started by `check` without recording it
+        (the message has not been unpacked successfully).
+
+        :param digest: message digest returned by `check`
+        """
+        with self._lock:
+            self._pending.discard(digest)
+
+    def clear(self):
+        """
+        Forgets all recorded messages.
+        """
+        with self._lock:
+            self._filters = [self._new_filter(self._clock())]
+            self._lru.clear()
+
+    def snapshot(self) -> bytes:
+        """
+        :return: serialized state of the guard to be restored by `restore`
+        """
+        with self._lock:
+            self._rotate(self._clock())
+            state = {
+                "version": _SNAPSHOT_VERSION,
+                "capacity": self.capacity,
+                "false_positive_rate": self.false_positive_rate,
+                "window_s": self.window_s,
+                "lru_size": self.lru_size,
+                "filters": [
+                    {
+                        "started": f.started,
+                        "count": f.count,
+                        "bits": base64.b64encode(f.array).decode(),
+                    }
+                    for f in self._filters
+                ],
+                "lru": [
+                    [base64.b64encode(d).decode(), t] for d, t in self._lru.items()
+                ],
+            }
+        return json.dumps(state).encode()
+
+    @classmethod
+    def restore(
+        cls,
+        snapshot: bytes,
+        reject_probable_duplicates: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> DuplicateMessageGuard:
+        """
+        Creates a guard from a snapshot. Generations of the Bloom filters that are out of the time window are dropped.
+
+        :param snapshot: snapshot made by `snapshot`
+        :param reject_probable_duplicates: see the constructor
+        :param clock: see the constructor
+        :raises ValueError: if the snapshot is invalid
+        :return: the guard
+        """
+        try:
+            state = json.loads(snapshot)
+            if state["version"] != _SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {state['version']}")
+            guard = cls(
+                capacity=state["capacity"],
+                false_positive_rate=state["false_positive_rate"],
+                window_s=state["window_s"],
+                lru_size=state["lru_size"],
+                reject_probable_duplicates=reject_probable_duplicates,
+                clock=clock,
+            )
+            filters = []
+            for f in state["filters"]:
+                bloom_filter = _BloomFilter(guard._bits, guard._hashes, f["started"])
+                bloom_filter.count = f["count"]
+                bloom_filter.array = bytearray(base64.b64decode(f["bits"]))
+                if len(bloom_filter.array) != len(guard._filters[0].array):
+                    raise ValueError("Invalid Bloom filter size")
+                filters.append(bloom_filter)
+            lru = OrderedDict((base64.b64decode(d), t) for d, t in state["lru"])
+        except (KeyError, TypeError, json.JSONDecodeError) as exc:
+            raise ValueError("Invalid snapshot") from exc
+        if filters:
+            guard._filters = filters
+            guard._lru = lru
+            guard._rotate(clock())
+        return guard
+
+    def save(self, path: str):
+        """
+        Saves a snapshot to a local file (atomically replacing it).
+
+        :param path: file path
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.snapshot())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        reject_probable_duplicates: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> DuplicateMessageGuard:
+        """
+        Restores a guard from a local file saved by `save`.
+
+        :param path: file path
+        :param reject_probable_duplicates: see the constructor
+        :param clock: see the constructor
+        :return: the guard
+        """
+        with open(path, "rb") as f:
+            return cls.restore(f.read(), reject_probable_duplicates, clock)
+
+    def _is_duplicate(self, digest: bytes) -> bool:
+        self._rotate(self._clock())
+        recorded = self._lru.get(digest)
+        if recorded is not None:
+            if recorded >= self._filters[-1].started:
+                self._lru.move_to_end(digest)
+                self.duplicates += 1
+                return True
+            # out of the time window
+            del self._lru[digest]
+        if not any(digest in f for f in self._filters):
+            return False
+        self.probable_duplicates += 1
+        if self.reject_probable_duplicates:
+            self.duplicates += 1
+            return True
+        return False
+
+    def _new_filter(self, now: float) -> _BloomFilter:
+        return _BloomFilter(self._bits, self._hashes, now)
+
+    def _rotate(self, now: float):
+        current = self._filters[0]
+        if now - current.started < self.window_s:
+            return
+        if now - current.started < 2 * self.window_s:
+            # the current generation becomes the previous one
+            self._filters = [self._new_filter(now), current]
+        else:
+            # everything is out of the window
+            self._filters = [self._new_filter(now)]
+            self._lru.clear()
@@ -39,6 +39,13 @@ class MalformedMessageCode(Enum):
     INVALID_PLAINTEXT = 3
     INVALID_MESSAGE = 4
     NOT_SUPPORTED_FWD_PROTOCOL = 5
+    DECOMPRESSED_TOO_LARGE = 6
+    MESSAGE_TOO_LARGE = 7
+    TOO_MANY_RECIPIENTS = 8
+    TOO_MANY_LAYERS = 9
+    TOO_MANY_ATTACHMENTS = 10
+    JSON_TOO_DEEP = 11
+    DUPLICATE_MESSAGE = 12
 
 
 class MalformedMessageError(DIDCommError):
@@ -58,3 +65,19 @@ class MalformedMessageError(DIDCommError):
                 self.message = "DIDComm message is invalid"
             elif self.code == MalformedMessageCode.NOT_SUPPORTED_FWD_PROTOCOL:
                 self.message = "Not supported Forward protocol"
+            elif self.code == MalformedMessageCode.DECOMPRESSED_TOO_LARGE:
+                self.message = "Decompressed plaintext exceeds the size limit"
+            elif self.code == MalformedMessageCode.MESSAGE_TOO_LARGE:
+                self.message = "DIDComm message exceeds the size limit"
+            elif self.code == MalformedMessageCode.TOO_MANY_RECIPIENTS:
+                self.message = "DIDComm message exceeds the recipients limit"
+            elif self.code == MalformedMessageCode.TOO_MANY_LAYERS:
+                self.message = "DIDComm message exceeds the envelope layers limit"
+            elif self.code == MalformedMessageCode.TOO_MANY_ATTACHMENTS:
+                self.message = "DIDComm message exceeds the attachments limit"
+            elif self.code == MalformedMessageCode.JSON_TOO_DEEP:
+                self.message = "DIDComm message exceeds the JSON nesting depth limit"
+            elif self.code == MalformedMessageCode.DUPLICATE_MESSAGE:
+                self.message = (
+                    "DIDComm message is a duplicate of a recently unpacked one"
+                )
@@ -0,0 +1,619 @@
+"""
+In-process metrics of pack and unpack operations.
+
+Metrics are disabled by default. They are collected into a process-wide registry after `enable_metrics` is called:
+
+    registry = enable_metrics()
+    await pack_encrypted(...)
+    print(registry.snapshot().value("didcomm_operations_total", operation="pack_encrypted",
+                                     envelope="anoncrypt", alg="ECDH-ES+A256KW/XC20P"))
+    print(format_prometheus(registry))
+
+The following metrics are collected:
+    - `didcomm_operations_total` (counter; operation, envelope, alg): successful pack and unpack operations.
+      `envelope` lists the envelope layers from the outermost one, for example `anoncrypt+authcrypt+signed`,
+      `alg` is the algorithm of the outermost layer (`none` for plaintext)
+    - `didcomm_operation_duration_seconds` (histogram; operation): latency of pack and unpack operations
+    - `didcomm_operation_errors_total` (counter; operation, error): failed operations by exception class
+    - `didcomm_malformed_messages_total` (counter; operation, code): `MalformedMessageError` by `MalformedMessageCode`,
+      for example decryption failures are counted with `code="CAN_NOT_DECRYPT"`
+    - `didcomm_bytes_total` (counter; operation, direction): size in bytes of packed messages produced (`out`)
+      and unpacked (`in`, not counted for messages passed as JSON_OBJ); JSON strings are counted UTF-8 encoded
+    - `didcomm_did_resolver_calls_total` (counter; resolver, result), `didcomm_did_resolver_duration_seconds`
+      (histogram; resolver): DID resolution by resolver class, `result` is `found`, `not_found` or `error`
+    - `didcomm_secrets_lookups_total` (counter; resolver, method, result), `didcomm_secrets_lookup_duration_seconds`
+      (histogram; resolver, method): secrets resolver calls by resolver class and method (`get_key` or `get_keys`)
+"""
+from __future__ import annotations
+
+import functools
+import math
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg, SignAlg
+from didcomm.errors import MalformedMessageError
+
+# upper bounds of Prometheus histogram buckets
+LATENCY_BUCKETS_SECONDS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# number of significant bits of a recorded value (in units) kept: a value below 2^bits units is kept exactly,
+# a larger one is represented by the middle of a bucket 2^-(bits-1) of its lower bound wide,
+# so the relative error of a recorded value is below 2^-bits (0.8%)
+_HDR_SIGNIFICANT_BITS = 7
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Enables metrics collection into the given registry (or a new one).
+
+    :param registry: optional registry to collect metrics into
+    :return: the registry metrics are collected into
+    """
+    global _registry
+    _registry = registry or MetricsRegistry()
+    return _registry
+
+
+def disable_metrics():
+    """
+    Disables metrics collection.
+    """
+    global _registry
+    _registry = None
+
+
+def get_metrics_registry() -> Optional[MetricsRegistry]:
+    """
+    :return: the registry metrics are collected into or None if metrics are disabled
+    """
+    return _registry
+
+
+class _HdrHistogram:
+    # A log-linear (HDR-style) histogram: values are scaled to integer units,
+    # the top `_HDR_SIGNIFICANT_BITS` bits of a value select the bucket within its power of two.
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, unit: float):
+        units = max(int(value / unit), 0)
+        shift = max(units.bit_length() - _HDR_SIGNIFICANT_BITS, 0)
+        index = (shift << _HDR_SIGNIFICANT_BITS) | (units >> shift)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @staticmethod
+    def bucket_value(index: int, unit: float) -> float:
+        # the middle of the bucket
+        shift = index >> _HDR_SIGNIFICANT_BITS
+        mantissa = index & ((1 << _HDR_SIGNIFICANT_BITS) - 1)
+        low = mantissa << shift
+        return (low + ((1 << shift) - 1) / 2) * unit
+
+    def snapshot(self, unit: float, buckets: Tuple[float, ...]) -> HistogramSnapshot:
+        values = sorted(
+            (self.bucket_value(index, unit), count)
+            for index, count in self.counts.items()
+        )
+
+        def percentile(pct: float) -> float:
+            rank = max(math.ceil(pct / 100 * self.count), 1)
+            seen = 0
+            for value, count in values:
+                seen += count
+                if seen >= rank:
+                    # bucket values are approximate, keep them within the observed range
+                    return min(max(value, self.min), self.max)
+            return self.max
+
+        cumulative = []
+        for bound in buckets:
+            cumulative.append((bound, sum(c for v, c in values if v <= bound)))
+
+        return HistogramSnapshot(
+            count=self.count,
+            sum=self.sum,
+            min=self.min if self.count else 0.0,
+            max=self.max if self.count else 0.0,
+            p50=percentile(50) if self.count else 0.0,
+            p90=percentile(90) if self.count else 0.0,
+            p99=percentile(99) if self.count else 0.0,
+            p999=percentile(99.9) if self.count else 0.0,
+            buckets=cumulative,
+        )
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """
+    Statistics of a histogram for a single set of label values.
+    Percentiles are approximate: a recorded value has a relative error below 0.8%
+    (and is truncated to the `unit` of the histogram).
+
+    Attributes:
+        count (int): number of observed values
+        sum (float): sum of observed values
+        min (float): minimal observed value
+        max (float): maximal observed value
+        p50 (float): 50th percentile
+        p90 (float): 90th percentile
+        p99 (float): 99th percentile
+        p999 (float): 99.9th percentile
+        buckets (List[Tuple[float, int]]): cumulative counts of values not greater than the bucket upper bounds
+    """
+
+    count: int
+    sum: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+    p999: float
+    buckets: List[Tuple[float, int]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class MetricSnapshot:
+    """
+    A snapshot of a metric.
+
+    Attributes:
+        name (str): metric name
+        type (str): `counter` or `histogram`
+        help (str): metric description
+        labelnames (Tuple[str, ...]): label names
+        samples (Dict[Tuple[str, ...], Union[float, HistogramSnapshot]]): values by label values
+    """
+
+    name: str
+    type: str
+    help: str
+    labelnames: Tuple[str, ...]
+    samples: Dict[Tuple[str, ...], Union[float, HistogramSnapshot]]
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """
+    A snapshot of all metrics of a registry.
+
+    Attributes:
+        metrics (Dict[str, MetricSnapshot]): metrics by name
+    """
+
+    metrics: Dict[str, MetricSnapshot]
+
+    def value(self, name: str, **labels) -> Union[float, HistogramSnapshot, None]:
+        """
+        Returns a sample of a metric.
+
+        :param name: metric name
+        :param labels: values of all the metric labels
+        :return: a counter value or a histogram snapshot, None if nothing has been recorded
+        """
+        metric = self.metrics.get(name)
+        if metric is None:
+            return None
+        return metric.samples.get(tuple(str(labels[n]) for n in metric.labelnames))
+
+    def total(self, name: str, **labels) -> float:
+        """
+        Sums a counter over all samples matching the given label values.
+
+        :param name: counter name
+        :param labels: values of some of the metric labels
+        :return: the sum, 0 if nothing has been recorded
+        """
+        metric = self.metrics.get(name)
+        if metric is None:
+            return 0
+        indexes = {metric.labelnames.index(n): str(v) for n, v in labels.items()}
+        return sum(
+            value
+            for label_values, value in metric.samples.items()
+            if all(label_values[i] == v for i, v in indexes.items())
+        )
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], lock):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = lock
+        self._samples = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing counter.
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Increases the counter.
+
+        :param amount: increment, 1 by default
+        :param labels: values of all the counter labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def _snapshot(self) -> MetricSnapshot:
+        return MetricSnapshot(
+            self.name, self.type, self.help, self.labelnames, dict(self._samples)
+        )
+
+
+class Histogram(_Metric):
+    """
+    A histogram of observed values (latencies, sizes) with bounded memory,
+    recorded values are kept with a relative error below 0.8% (see `HistogramSnapshot`).
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...],
+        lock,
+        unit: float,
+        buckets: Tuple[float, ...],
+    ):
+        super().__init__(name, help, labelnames, lock)
+        self.unit = unit
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        """
+        Records a value.
+
+        :param value: the value
+        :param labels: values of all the histogram labels
+        """
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._samples.get(key)
+            if histogram is None:
+                histogram = self._samples[key] = _HdrHistogram()
+            histogram.record(value, self.unit)
+
+    def _snapshot(self) -> MetricSnapshot:
+        return MetricSnapshot(
+            self.name,
+            self.type,
+            self.help,
+            self.labelnames,
+            {
+                key: histogram.snapshot(self.unit, self.buckets)
+                for key, histogram in self._samples.items()
+            },
+        )
+
+
+class MetricsRegistry:
+    """
+    A registry of counters and histograms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(
+        self, name: str, help: str, labelnames: Tuple[str, ...] = ()
+    ) -> Counter:
+        """
+        Returns the counter with the given name, creates it if needed.
+
+        :param name: metric name
+        :param help: metric description
+        :param labelnames: label names
+        :return: the counter
+        """
+        return self._get_or_create(
+            name, Counter, lambda: Counter(name, help, labelnames, self._lock)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        unit: float = 0.000001,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS_SECONDS,
+    ) -> Histogram:
+        """
+        Returns the histogram with the given name, creates it if needed.
+
+        :param name: metric name
+        :param help: metric description
+        :param labelnames: label names
+        :param unit: resolution of recorded values, microseconds (for values in seconds) by default
+        :param buckets: upper bounds of buckets exposed in Prometheus format, latency buckets in seconds by default
+        :return: the histogram
+        """
+        return self._get_or_create(
+            name,
+            Histogram,
+            lambda: Histogram(name, help, labelnames, self._lock, unit, buckets),
+        )
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        :return: a consistent snapshot of all metrics
+        """
+        with self._lock:
+            return MetricsSnapshot(
+                {name: metric._snapshot() for name, metric in self._metrics.items()}
+            )
+
+    def reset(self):
+        """
+        Removes all the recorded values.
+        """
+        with self._lock:
+            for metric in self._metrics.values():
+                metric._samples.clear()
+
+    def _get_or_create(self, name, cls, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = factory()
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric `{name}` is already registered as {metric.type}")
+        return metric
+
+
+def format_prometheus(source: Union[MetricsRegistry, MetricsSnapshot]) -> str:
+    """
+    Formats metrics in Prometheus text exposition format (version 0.0.4).
+
+    :param source: a registry or a snapshot
+    :return: the metrics as text
+    """
+    snapshot = source.snapshot() if isinstance(source, MetricsRegistry) else source
+    lines = []
+    for name in sorted(snapshot.metrics):
+        metric = snapshot.metrics[name]
+        lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for label_values, value in sorted(metric.samples.items()):
+            labels = list(zip(metric.labelnames, label_values))
+            if metric.type == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for bound, count in value.buckets:
+                bucket_labels = _format_labels(labels + [("le", _format_value(bound))])
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(labels + [("le", "+Inf")])
+            lines.append(f"{name}_bucket{inf_labels} {value.count}")
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}"
+            )
+            lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+# ======================================
+# recording helpers used by the library
+# ======================================
+
+
+def _operations_total(registry: MetricsRegistry) -> Counter:
+    return registry.counter(
+        "didcomm_operations_total",
+        "Successful pack and unpack operations",
+        ("operation", "envelope", "alg"),
+    )
+
+
+def _bytes_total(registry: MetricsRegistry) -> Counter:
+    return registry.counter(
+        "didcomm_bytes_total",
+        "Size of packed (out) and unpacked (in) messages in bytes",
+        ("operation", "direction"),
+    )
+
+
+def record_operation(
+    operation: str,
+    enc_alg_anon: Optional[AnonCryptAlg] = None,
+    enc_alg_auth: Optional[AuthCryptAlg] = None,
+    sign_alg: Optional[SignAlg] = None,
+    bytes_in: Optional[int] = None,
+    bytes_out: Optional[int] = None,
+):
+    """
+    Records a successful pack or unpack operation.
+    The envelope is described by the algorithms of its layers, a plaintext message has none of them.
+
+    :param operation: operation name, for example `pack_encrypted`
+    :param enc_alg_anon: optional algorithm of the anoncrypt layer
+    :param enc_alg_auth: optional algorithm of the authcrypt layer
+    :param sign_alg: optional algorithm of the signed layer
+    :param bytes_in: optional size of the input message in bytes (UTF-8 encoded for a JSON string)
+    :param bytes_out: optional size of the output message in bytes (UTF-8 encoded for a JSON string)
+    """
+    registry = _registry
+    if registry is None:
+        return
+    layers = [
+        (envelope, alg)
+        for envelope, alg in (
+            ("anoncrypt", enc_alg_anon),
+            ("authcrypt", enc_alg_auth),
+            ("signed", sign_alg),
+        )
+        if alg is not None
+    ]
+    if layers:
+        envelope = "+".join(layer for layer, _ in layers)
+        outer_alg = layers[0][1].value
+        alg = outer_alg if isinstance(outer_alg, str) else "/".join(outer_alg)
+    else:
+        envelope, alg = "plaintext", "none"
+    _operations_total(registry).inc(operation=operation, envelope=envelope, alg=alg)
+    if bytes_in is not None:
+        _bytes_total(registry).inc(bytes_in, operation=operation, direction="in")
+    if bytes_out is not None:
+        _bytes_total(registry).inc(bytes_out, operation=operation, direction="out")
+
+
+def measured(operation: str):
+    """
+    Decorates an async pack or unpack function to record its latency and failures.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            registry = _registry
+            if registry is None:
+                return await func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as exc:
+                _record_error(registry, operation, exc)
+                raise
+            finally:
+                registry.histogram(
+                    "didcomm_operation_duration_seconds",
+                    "Latency of pack and unpack operations",
+                    ("operation",),
+                ).observe(perf_counter() - start, operation=operation)
+
+        return wrapper
+
+    return decorator
+
+
+def _record_error(registry: MetricsRegistry, operation: str, exc: Exception):
+    registry.counter(
+        "didcomm_operation_errors_total",
+        "Failed pack and unpack operations by exception class",
+        ("operation", "error"),
+    ).inc(operation=operation, error=type(exc).__name__)
+    if isinstance(exc, MalformedMessageError):
+        registry.counter(
+            "didcomm_malformed_messages_total",
+            "Malformed messages by MalformedMessageCode",
+            ("operation", "code"),
+        ).inc(operation=operation, code=exc.code.name)
+
+
+def record_did_resolution(resolver: Any, duration: float, result: str):
+    """
+    Records a DID resolver call.
+
+    :param resolver: the resolver, its class name is used as the label
+    :param duration: call latency in seconds
+    :param result: `found`, `not_found` or `error`
+    """
+    registry = _registry
+    if registry is None:
+        return
+    resolver_name = type(resolver).__name__
+    registry.counter(
+        "didcomm_did_resolver_calls_total",
+        "DID resolver calls",
+        ("resolver", "result"),
+    ).inc(resolver=resolver_name, result=result)
+    registry.histogram(
+        "didcomm_did_resolver_duration_seconds",
+        "Latency of DID resolver calls",
+        ("resolver",),
+    ).observe(duration, resolver=resolver_name)
+
+
+def record_secrets_lookup(resolver: Any, method: str, duration: float, result: str):
+    """
+    Records a secrets resolver call.
+
+    :param resolver: the resolver, its class name is used as the label
+    :param method: `get_key` or `get_keys`
+    :param duration: call latency in seconds
+    :param result: `found`, `not_found` or `error`
+    """
+    registry = _registry
+    if registry is None:
+        return
+    resolver_name = type(resolver).__name__
+    registry.counter(
+        "didcomm_secrets_lookups_total",
+        "Secrets resolver calls",
+        ("resolver", "method", "result"),
+    ).inc(resolver=resolver_name, method=method, result=result)
+    registry.histogram(
+        "didcomm_secrets_lookup_duration_seconds",
+        "Latency of secrets resolver calls",
+        ("resolver", "method"),
+    ).observe(duration, resolver=resolver_name, method=method)
@@ -2,31 +2,43 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Optional, List, Union
+from typing import Optional, List, Tuple, Union
 
 from didcomm.common.algorithms import AuthCryptAlg, AnonCryptAlg
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import JSON, JSON_OBJ, DID_OR_DID_URL, DID_URL
-from didcomm.core.anoncrypt import anoncrypt, find_keys_and_anoncrypt
-from didcomm.core.authcrypt import find_keys_and_authcrypt
-from didcomm.core.defaults import DEF_ENC_ALG_AUTH, DEF_ENC_ALG_ANON
-from didcomm.core.serialization import dict_to_json
+from didcomm.core.anoncrypt import anoncrypt, anoncrypt_authcrypted, find_anoncrypt_keys
+from didcomm.core.authcrypt import authcrypt, find_authcrypt_keys
+from didcomm.core.concurrency import gather_in_order
+from didcomm.core.defaults import (
+    DEF_ENC_ALG_AUTH,
+    DEF_ENC_ALG_ANON,
+    DEF_COMPRESS_MIN_SIZE,
+)
+from didcomm.core.serialization import jwe_to_json, jwe_to_json_bytes, utf8_size
 from didcomm.core.sign import sign
-from didcomm.core.types import EncryptResult, SignResult, DIDCommGeneratorType
+from didcomm.core.types import EncryptResult, SignResult, DIDCommGeneratorType, Key
 from didcomm.core.utils import get_did, is_did, didcomm_id_generator_default
 from didcomm.did_doc.did_doc import DIDCommService
 from didcomm.errors import DIDCommValueError
 from didcomm.core.from_prior import pack_from_prior_in_place
 from didcomm.message import Message, Headers
+from didcomm.metrics import measured, record_operation
+from didcomm.profiling import profiled
 from didcomm.protocols.routing.forward import (
     wrap_in_forward,
+    find_forward_keys,
     resolve_did_services_chain,
     ForwardPackResult,
 )
+from didcomm.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
 
+@traced("pack_encrypted")
+@measured("pack_encrypted")
+@profiled("pack_encrypted")
 async def pack_encrypted(
     resolvers_config: ResolversConfig,
     message: Union[Message, JSON_OBJ],
@@ -80,6 +92,11 @@ async def pack_encrypted(
           a private key in the _secrets resolver is found
         - If `sign_frm` is a key ID, then the sender's `authentication` verification method identified by the given key ID is used.
 
+    Independent resolver work is done concurrently: packing `from_prior` and signing,
+    finding the encryption keys, and resolving the recipient's services and the routing keys for forwarding
+    are started at once, so the latency of slow DID and secrets resolvers is the latency of the longest of them.
+    If several of them fail, the error raised is the same as if they were done one by one in that order.
+
     :param resolvers_config: secrets and DIDDoc resolvers
     :param message: The message to be packed into a DIDComm message
     :param to: A target DID or key ID the message will be encrypted for.
@@ -113,64 +130,110 @@ async def pack_encrypted(
         message = message.as_dict()
 
     # 1. validate message
-    __validate(message, to, frm, sign_frm)
+    with span("validate"):
+        __validate(message, to, frm, sign_frm)
 
-    # 3. Pack from_prior in place
-    from_prior_issuer_kid = await pack_from_prior_in_place(
-        message,
-        resolvers_config,
-        pack_params.from_prior_issuer_kid,
+    # 2. pack from_prior and sign, and resolve the recipient concurrently
+    (from_prior_issuer_kid, sign_res), recipient = await gather_in_order(
+        __pack_from_prior_and_sign(resolvers_config, message, sign_frm, pack_params),
+        __resolve_recipient(resolvers_config, to, frm, pack_config, pack_params),
     )
 
-    # 4. sign if needed
-    sign_res = await __sign_if_needed(resolvers_config, message, sign_frm)
-
-    # 5. encrypt
-    encrypt_res = await __encrypt(
+    return await __encrypt_for_recipient(
         resolvers_config,
-        msg=sign_res.msg if sign_res else message,
-        to=to,
-        frm=frm,
-        pack_config=pack_config,
+        message,
+        recipient,
+        sign_res,
+        from_prior_issuer_kid,
+        pack_config,
+        pack_params,
+        "pack_encrypted",
     )
 
-    # 6. protected sender ID if needed
-    encrypt_res_protected = __protected_sender_id_if_needed(encrypt_res, pack_config)
 
-    packed_msg_dict = (
-        encrypt_res_protected.msg if encrypt_res_protected else encrypt_res.msg
-    )
+@traced("pack_encrypted_to_many")
+@measured("pack_encrypted_to_many")
+@profiled("pack_encrypted_to_many")
+async def pack_encrypted_to_many(
+    resolvers_config: ResolversConfig,
+    message: Union[Message, JSON_OBJ],
+    to: List[DID_OR_DID_URL],
+    frm: Optional[DID_OR_DID_URL] = None,
+    sign_frm: Optional[DID_OR_DID_URL] = None,
+    pack_config: Optional[PackEncryptedConfig] = None,
+    pack_params: Optional[PackEncryptedParameters] = None,
+) -> List[PackEncryptedResult]:
+    """
+    Produces `DIDComm Encrypted Message` for each of the given recipients.
 
-    # 7. resolve service information
-    did_services_chain = await resolve_did_services_chain(
-        resolvers_config, to, pack_params.forward_service_id
-    )
+    The result is the same as of `pack_encrypted` called for every recipient,
+    but `from_prior` is packed and the message is signed (if `sign_frm` is set) only once:
+    the same signed message is encrypted (and wrapped into Forward messages if needed) for every recipient.
+    All recipients are resolved concurrently with signing.
+    See `pack_encrypted` for details of encryption, signing and forwarding.
 
-    # 8. do forward if needed
-    fwd_res = await __forward_if_needed(
-        resolvers_config,
-        packed_msg_dict,
-        to,
-        did_services_chain,
-        pack_config,
-        pack_params,
-    )
+    :param resolvers_config: secrets and DIDDoc resolvers
+    :param message: The message to be packed into DIDComm messages
+    :param to: Target DIDs or key IDs the message will be encrypted for, a packed message per each of them.
+               Each of them must match any of `to` header values in Message if the header is set.
+    :param frm: A DID or key ID the sender uses for authenticated encryption.
+                Must match `from` header in Message if the header is set.
+                If not provided - then anonymous encryption is performed.
+    :param sign_frm: An optional DID or key ID the sender uses for signing.
+                     If not provided - then the message will be repudiable and no signature will be added.
+    :param pack_config: Configuration defining how pack needs to be done.
+                        If not specified - default configuration is used.
+    :param pack_params: Optional parameters for pack
 
-    packed_msg = dict_to_json(fwd_res.msg_encrypted.msg if fwd_res else packed_msg_dict)
+    :raises DIDCommValueError: If invalid input is provided (see `pack_encrypted`)
+    :raises DIDDocNotResolvedError: If a DID can not be resolved to a DID Doc.
+    :raises DIDUrlNotFoundError: If a DID URL (for example a key ID) is not found within a DID Doc
+    :raises SecretNotFoundError: If there is no secret for the given DID or DID URL (key ID)
+    :raises IncompatibleCryptoError: If the sender and a target crypto is not compatible
 
-    return PackEncryptedResult(
-        packed_msg=packed_msg,
-        to_kids=encrypt_res.to_kids,
-        from_kid=encrypt_res.from_kid,
-        sign_from_kid=sign_res.sign_frm_kid if sign_res else None,
-        from_prior_issuer_kid=from_prior_issuer_kid,
-        service_metadata=ServiceMetadata(
-            did_services_chain[-1].id, did_services_chain[0].service_endpoint
-        )
-        if did_services_chain
-        else None,
+    :return: Pack results in the order of `to`
+    :rtype: List[PackEncryptedResult]
+    """
+
+    pack_config = pack_config or PackEncryptedConfig()
+    pack_params = pack_params or PackEncryptedParameters()
+
+    if isinstance(message, Message):
+        message = message.as_dict()
+
+    if not isinstance(to, List):
+        raise DIDCommValueError(f"`to` value is not a list: {to}")
+
+    with span("validate", recipients=len(to)):
+        for recipient in to:
+            __validate(message, recipient, frm, sign_frm)
+    if not to:
+        return []
+
+    (from_prior_issuer_kid, sign_res), *recipients = await gather_in_order(
+        __pack_from_prior_and_sign(resolvers_config, message, sign_frm, pack_params),
+        *(
+            __resolve_recipient(
+                resolvers_config, recipient, frm, pack_config, pack_params
+            )
+            for recipient in to
+        ),
     )
 
+    return [
+        await __encrypt_for_recipient(
+            resolvers_config,
+            message,
+            recipient,
+            sign_res,
+            from_prior_issuer_kid,
+            pack_config,
+            pack_params,
+            "pack_encrypted_to_many",
+        )
+        for recipient in recipients
+    ]
+
 
 @dataclass(frozen=True)
 class PackEncryptedResult:
@@ -179,6 +242,7 @@ class PackEncryptedResult:
 
     Attributes:
         packed_msg (str): A packed message as a JSON string ready to be forwarded to the returned 'service_endpoint'
+                          (bytes if `as_bytes` parameter is set)
         service_metadata (ServiceMetadata): An optional service metadata which contains a service endpoint
                                             to be used to transport the 'packed_msg'.
         to_kid (DID_URL): Identifiers (DID URLs) of recipient keys used for message encryption.
@@ -190,7 +254,7 @@ class PackEncryptedResult:
                                          None if the message does not contain from_prior.
     """
 
-    packed_msg: JSON
+    packed_msg: Union[JSON, bytes]
     to_kids: List[DID_URL]
     from_kid: Optional[DID_URL]
     sign_from_kid: Optional[DID_URL]
@@ -233,12 +297,19 @@ class PackEncryptedConfig:
         forward (bool): Whether the packed messages need to be wrapped into
             Forward messages to be sent to Mediators as defined by the Forward
             protocol. True by default.
+        compress (bool): Whether plaintexts of encrypted messages (including protected sender ID
+            and Forward envelopes) need to be compressed with DEFLATE (`"zip": "DEF"` JWE header).
+            False by default.
+        compress_min_size (int): If compression is enabled, only plaintexts of at least this size
+            in bytes are compressed. 1024 by default.
     """
 
     enc_alg_auth: AuthCryptAlg = DEF_ENC_ALG_AUTH
     enc_alg_anon: AnonCryptAlg = DEF_ENC_ALG_ANON
     protect_sender_id: bool = False
     forward: bool = True
+    compress: bool = False
+    compress_min_size: int = DEF_COMPRESS_MIN_SIZE
 
 
 @dataclass
@@ -259,6 +330,8 @@ class PackEncryptedParameters:
         from_prior_issuer_kid (DID_URL): If from_prior is specified in the source message,
             this field can explicitly specify which key to use for signing from_prior
             in the packed message
+        as_bytes (bool): Whether the packed message needs to be returned as UTF-8 encoded JSON bytes
+            (ready to be sent by a transport) instead of a JSON string. False by default.
     """
 
     forward_headers: Optional[Headers] = None
@@ -267,6 +340,7 @@ class PackEncryptedParameters:
         DIDCommGeneratorType
     ] = didcomm_id_generator_default
     from_prior_issuer_kid: Optional[DID_URL] = None
+    as_bytes: bool = False
 
 
 def __validate(
@@ -302,6 +376,16 @@ def __validate(
         )
 
 
+@dataclass(frozen=True)
+class _ResolvedRecipient:
+    to: DID_OR_DID_URL
+    frm: Optional[DID_OR_DID_URL]
+    from_key: Optional[Key]
+    to_keys: List[Key]
+    did_services_chain: List[DIDCommService]
+    forward_keys: Optional[List[List[Key]]]
+
+
 async def __sign_if_needed(
     resolvers_config: ResolversConfig,
     msg: dict,
@@ -312,19 +396,168 @@ async def __sign_if_needed(
     return await sign(msg, sign_frm, resolvers_config)
 
 
-async def __encrypt(
+async def __pack_from_prior_and_sign(
+    resolvers_config: ResolversConfig,
+    message: JSON_OBJ,
+    sign_frm: Optional[DID_OR_DID_URL],
+    pack_params: PackEncryptedParameters,
+) -> Tuple[Optional[DID_URL], Optional[SignResult]]:
+    # from_prior is a part of the signed message, so it's packed first
+    with span("pack_from_prior"):
+        from_prior_issuer_kid = await pack_from_prior_in_place(
+            message,
+            resolvers_config,
+            pack_params.from_prior_issuer_kid,
+        )
+
+    with span("sign", sign_frm=sign_frm):
+        sign_res = await __sign_if_needed(resolvers_config, message, sign_frm)
+
+    return from_prior_issuer_kid, sign_res
+
+
+async def __resolve_recipient(
     resolvers_config: ResolversConfig,
-    msg: dict,
     to: DID_OR_DID_URL,
-    frm: Optional[DID_OR_DID_URL] = None,
-    pack_config: Optional[PackEncryptedConfig] = None,
+    frm: Optional[DID_OR_DID_URL],
+    pack_config: PackEncryptedConfig,
+    pack_params: PackEncryptedParameters,
+) -> _ResolvedRecipient:
+    (from_key, to_keys), (did_services_chain, forward_keys) = await gather_in_order(
+        __find_encryption_keys(resolvers_config, to, frm),
+        __resolve_services_and_forward_keys(
+            resolvers_config, to, pack_config, pack_params
+        ),
+    )
+    return _ResolvedRecipient(
+        to, frm, from_key, to_keys, did_services_chain, forward_keys
+    )
+
+
+async def __find_encryption_keys(
+    resolvers_config: ResolversConfig,
+    to: DID_OR_DID_URL,
+    frm: Optional[DID_OR_DID_URL],
+) -> Tuple[Optional[Key], List[Key]]:
+    with span("find_keys", to=to, frm=frm):
+        if frm is not None:
+            return await find_authcrypt_keys(to, frm, resolvers_config)
+        return None, await find_anoncrypt_keys(to, resolvers_config)
+
+
+async def __resolve_services_and_forward_keys(
+    resolvers_config: ResolversConfig,
+    to: DID_OR_DID_URL,
+    pack_config: PackEncryptedConfig,
+    pack_params: PackEncryptedParameters,
+) -> Tuple[List[DIDCommService], Optional[List[List[Key]]]]:
+    with span("resolve_services", to=to):
+        did_services_chain = await resolve_did_services_chain(
+            resolvers_config, to, pack_params.forward_service_id
+        )
+
+    routing_keys = __routing_keys(did_services_chain, pack_config)
+    if not routing_keys:
+        return did_services_chain, None
+
+    with span("find_forward_keys", routing_keys=len(routing_keys)):
+        forward_keys = await find_forward_keys(resolvers_config, routing_keys)
+    return did_services_chain, forward_keys
+
+
+async def __encrypt_for_recipient(
+    resolvers_config: ResolversConfig,
+    message: JSON_OBJ,
+    recipient: _ResolvedRecipient,
+    sign_res: Optional[SignResult],
+    from_prior_issuer_kid: Optional[DID_URL],
+    pack_config: PackEncryptedConfig,
+    pack_params: PackEncryptedParameters,
+    operation: str,
+) -> PackEncryptedResult:
+    to, frm = recipient.to, recipient.frm
+
+    # 3. encrypt
+    with span("encrypt", to=to, frm=frm):
+        encrypt_res = __encrypt(
+            msg=sign_res.msg if sign_res else message,
+            recipient=recipient,
+            pack_config=pack_config,
+        )
+
+    # 4. protected sender ID if needed
+    with span("protect_sender_id"):
+        encrypt_res_protected = __protected_sender_id_if_needed(
+            encrypt_res, pack_config
+        )
+
+    packed_msg_dict = (
+        encrypt_res_protected.msg if encrypt_res_protected else encrypt_res.msg
+    )
+
+    # 5. do forward if needed
+    did_services_chain = recipient.did_services_chain
+    with span("forward"):
+        fwd_res = await __forward_if_needed(
+            resolvers_config,
+            packed_msg_dict,
+            to,
+            did_services_chain,
+            pack_config,
+            pack_params,
+            recipient.forward_keys,
+        )
+
+    with span("serialize"):
+        packed_msg_dict = fwd_res.msg_encrypted.msg if fwd_res else packed_msg_dict
+        packed_msg = (
+            jwe_to_json_bytes(packed_msg_dict)
+            if pack_params.as_bytes
+            else jwe_to_json(packed_msg_dict)
+        )
+
+    record_operation(
+        operation,
+        enc_alg_anon=pack_config.enc_alg_anon
+        if frm is None or pack_config.protect_sender_id
+        else None,
+        enc_alg_auth=pack_config.enc_alg_auth if frm is not None else None,
+        sign_alg=sign_res.alg if sign_res else None,
+        bytes_out=utf8_size(packed_msg),
+    )
+
+    return PackEncryptedResult(
+        packed_msg=packed_msg,
+        to_kids=encrypt_res.to_kids,
+        from_kid=encrypt_res.from_kid,
+        sign_from_kid=sign_res.sign_frm_kid if sign_res else None,
+        from_prior_issuer_kid=from_prior_issuer_kid,
+        service_metadata=ServiceMetadata(
+            did_services_chain[-1].id, did_services_chain[0].service_endpoint
+        )
+        if did_services_chain
+        else None,
+    )
+
+
+def __encrypt(
+    msg: dict,
+    recipient: _ResolvedRecipient,
+    pack_config: PackEncryptedConfig,
 ) -> EncryptResult:
-    if frm is not None:
-        return await find_keys_and_authcrypt(
-            msg, to, frm, pack_config.enc_alg_auth, resolvers_config
+    if recipient.from_key is not None:
+        return authcrypt(
+            msg,
+            recipient.to_keys,
+            recipient.from_key,
+            pack_config.enc_alg_auth,
+            __compress_min_size(pack_config),
         )
-    return await find_keys_and_anoncrypt(
-        msg, to, pack_config.enc_alg_anon, resolvers_config
+    return anoncrypt(
+        msg,
+        recipient.to_keys,
+        pack_config.enc_alg_anon,
+        __compress_min_size(pack_config),
     )
 
 
@@ -333,11 +566,15 @@ def __protected_sender_id_if_needed(
 ) -> Optional[EncryptResult]:
     if encrypt_result.from_kid is None or not pack_config.protect_sender_id:
         return None
-    return anoncrypt(
-        encrypt_result.msg, encrypt_result.to_keys, pack_config.enc_alg_anon
+    return anoncrypt_authcrypted(
+        encrypt_result, pack_config.enc_alg_anon, __compress_min_size(pack_config)
     )
 
 
+def __compress_min_size(pack_config: PackEncryptedConfig) -> Optional[int]:
+    return pack_config.compress_min_size if pack_config.compress else None
+
+
 async def __forward_if_needed(
     resolvers_config: ResolversConfig,
     packed_msg: JSON_OBJ,
@@ -345,7 +582,28 @@ async def __forward_if_needed(
     did_services_chain: List[DIDCommService],
     pack_config: PackEncryptedConfig,
     pack_params: PackEncryptedParameters,
+    forward_keys: Optional[List[List[Key]]] = None,
 ) -> Optional[ForwardPackResult]:
+    routing_keys = __routing_keys(did_services_chain, pack_config)
+    if not routing_keys:
+        return None
+
+    return await wrap_in_forward(
+        resolvers_config=resolvers_config,
+        packed_msg=packed_msg,
+        to=to,
+        routing_keys=routing_keys,
+        enc_alg_anon=pack_config.enc_alg_anon,
+        headers=pack_params.forward_headers,
+        didcomm_id_generator=pack_params.forward_didcomm_id_generator,
+        compress_min_size=__compress_min_size(pack_config),
+        forward_keys=forward_keys,
+    )
+
+
+def __routing_keys(
+    did_services_chain: List[DIDCommService], pack_config: PackEncryptedConfig
+) -> Optional[List[DID_OR_DID_URL]]:
     if not pack_config.forward:
         logger.debug("forward is turned off")
         return None
@@ -376,12 +634,4 @@ async def __forward_if_needed(
             s.service_endpoint for s in did_services_chain[1:]
         ] + routing_keys
 
-    return await wrap_in_forward(
-        resolvers_config=resolvers_config,
-        packed_msg=packed_msg,
-        to=to,
-        routing_keys=routing_keys,
-        enc_alg_anon=pack_config.enc_alg_anon,
-        headers=pack_params.forward_headers,
-        didcomm_id_generator=pack_params.forward_didcomm_id_generator,
-    )
+    return routing_keys
@@ -5,11 +5,15 @@ from typing import Optional, Union
 
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import JSON, DID_URL, JSON_OBJ
-from didcomm.core.serialization import dict_to_json
+from didcomm.core.serialization import dict_to_json, dict_to_json_bytes, utf8_size
 from didcomm.core.from_prior import pack_from_prior_in_place
 from didcomm.message import Message
+from didcomm.metrics import measured, record_operation
+from didcomm.tracing import span, traced
 
 
+@traced("pack_plaintext")
+@measured("pack_plaintext")
 async def pack_plaintext(
     resolvers_config: ResolversConfig,
     message: Union[Message, JSON_OBJ],
@@ -44,13 +48,21 @@ async def pack_plaintext(
     if isinstance(message, Message):
         message = message.as_dict()
 
-    from_prior_issuer_kid = await pack_from_prior_in_place(
-        message,
-        resolvers_config,
-        pack_params.from_prior_issuer_kid,
-    )
+    with span("pack_from_prior"):
+        from_prior_issuer_kid = await pack_from_prior_in_place(
+            message,
+            resolvers_config,
+            pack_params.from_prior_issuer_kid,
+        )
 
-    packed_msg = dict_to_json(message)
+    with span("serialize"):
+        packed_msg = (
+            dict_to_json_bytes(message)
+            if pack_params.as_bytes
+            else dict_to_json(message)
+        )
+
+    record_operation("pack_plaintext", bytes_out=utf8_size(packed_msg))
 
     return PackPlaintextResult(packed_msg, from_prior_issuer_kid)
 
@@ -61,12 +73,12 @@ class PackPlaintextResult:
     Result of pack operation.
 
     Attributes:
-        packed_msg (str): A packed message as a JSON string
+        packed_msg (str): A packed message as a JSON string (bytes if `as_bytes` parameter is set)
         from_prior_issuer_kid (DID_URL): Identifier (DID URL) of issuer key used for signing from_prior.
                                          None if the message does not contain from_prior.
     """
 
-    packed_msg: JSON
+    packed_msg: Union[JSON, bytes]
     from_prior_issuer_kid: Optional[DID_URL] = None
 
 
@@ -79,6 +91,9 @@ class PackPlaintextParameters:
         from_prior_issuer_kid (DID_URL): If from_prior is specified in the source message,
             this field can explicitly specify which key to use for signing from_prior
             in the packed message
+        as_bytes (bool): Whether the packed message needs to be returned as UTF-8 encoded JSON bytes
+            (ready to be sent by a transport) instead of a JSON string. False by default.
     """
 
     from_prior_issuer_kid: Optional[DID_URL] = None
+    as_bytes: bool = False
@@ -5,14 +5,18 @@ from typing import Optional, Union
 
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import JSON, DID_OR_DID_URL, DID_URL, JSON_OBJ
-from didcomm.core.serialization import dict_to_json
+from didcomm.core.serialization import dict_to_json, dict_to_json_bytes, utf8_size
 from didcomm.core.sign import sign
 from didcomm.core.utils import is_did
 from didcomm.errors import DIDCommValueError
 from didcomm.core.from_prior import pack_from_prior_in_place
 from didcomm.message import Message
+from didcomm.metrics import measured, record_operation
+from didcomm.tracing import span, traced
 
 
+@traced("pack_signed")
+@measured("pack_signed")
 async def pack_signed(
     resolvers_config: ResolversConfig,
     message: Union[Message, JSON_OBJ],
@@ -54,19 +58,32 @@ async def pack_signed(
     """
     pack_params = pack_params or PackSignedParameters()
 
-    __validate(sign_frm)
+    with span("validate"):
+        __validate(sign_frm)
 
     if isinstance(message, Message):
         message = message.as_dict()
 
-    from_prior_issuer_kid = await pack_from_prior_in_place(
-        message,
-        resolvers_config,
-        pack_params.from_prior_issuer_kid,
-    )
+    with span("pack_from_prior"):
+        from_prior_issuer_kid = await pack_from_prior_in_place(
+            message,
+            resolvers_config,
+            pack_params.from_prior_issuer_kid,
+        )
+
+    with span("sign", sign_frm=sign_frm):
+        sign_result = await sign(message, sign_frm, resolvers_config)
 
-    sign_result = await sign(message, sign_frm, resolvers_config)
-    packed_msg = dict_to_json(sign_result.msg)
+    with span("serialize"):
+        packed_msg = (
+            dict_to_json_bytes(sign_result.msg)
+            if pack_params.as_bytes
+            else dict_to_json(sign_result.msg)
+        )
+
+    record_operation(
+        "pack_signed", sign_alg=sign_result.alg, bytes_out=utf8_size(packed_msg)
+    )
 
     return PackSignedResult(
         packed_msg=packed_msg,
@@ -81,13 +98,13 @@ class PackSignedResult:
     Result of pack operation.
 
     Attributes:
-        packed_msg (str): A packed message as a JSON string
+        packed_msg (str): A packed message as a JSON string (bytes if `as_bytes` parameter is set)
         sign_from_kid (DID_URL): Identifier (DID URL) of sender key used for message signing
         from_prior_issuer_kid (DID_URL): Identifier (DID URL) of issuer key used for signing from_prior.
                                          None if the message does not contain from_prior.
     """
 
-    packed_msg: JSON
+    packed_msg: Union[JSON, bytes]
     sign_from_kid: DID_URL
     from_prior_issuer_kid: Optional[DID_URL] = None
 
@@ -101,9 +118,12 @@ class PackSignedParameters:
         from_prior_issuer_kid (DID_URL): If from_prior is specified in the source message,
             this field can explicitly specify which key to use for signing from_prior
             in the packed message
+        as_bytes (bool): Whether the packed message needs to be returned as UTF-8 encoded JSON bytes
+            (ready to be sent by a transport) instead of a JSON string. False by default.
     """
 
     from_prior_issuer_kid: Optional[DID_URL] = None
+    as_bytes: bool = False
 
 
 def __validate(sign_frm: DID_OR_DID_URL):
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from authlib.common.encoding import to_bytes, to_unicode, urlsafe_b64decode
+
+from didcomm.common.algorithms import Algs, AnonCryptAlg, AuthCryptAlg, SignAlg
+from didcomm.common.types import JSON, JSON_OBJ, DID_URL, DIDCommMessageTypes
+from didcomm.core.serialization import json_bytes_to_dict, json_str_to_dict
+from didcomm.core.sign import is_signed
+from didcomm.core.utils import parse_base64url_encoded_json
+from didcomm.core.validation import (
+    validate_anoncrypt_jwe,
+    validate_authcrypt_jwe,
+    validate_jws,
+)
+from didcomm.errors import (
+    DIDCommValueError,
+    MalformedMessageCode,
+    MalformedMessageError,
+)
+
+
+def peek(packed_msg: Union[JSON, JSON_OBJ, bytes, bytearray, memoryview]) -> PeekResult:
+    """
+    Reads the routing metadata of the outermost envelope of a packed DIDComm message:
+    the envelope type, the algorithm, the recipient key IDs, the sender key ID and the signer key ID.
+
+    Neither resolvers nor cryptography are used: the headers are validated
+    the same way as by `unpack`, but nothing is decrypted and no signature is verified,
+    so the result must not be trusted; it can be used to choose a worker or a tenant handling the message,
+    which then unpacks it.
+    The envelopes nested into the outermost one are not visible.
+
+    :param packed_msg: packed DIDComm message as JSON string, UTF-8 encoded JSON bytes or JSON_OBJ
+
+    :raises MalformedMessageError: if the headers of the message are invalid
+
+    :return: the routing metadata
+    """
+    if isinstance(packed_msg, str):
+        packed_msg = json_str_to_dict(packed_msg)
+    elif isinstance(packed_msg, (bytes, bytearray, memoryview)):
+        packed_msg = json_bytes_to_dict(packed_msg)
+    elif not isinstance(packed_msg, dict):
+        # FIXME in python it should be a kind of TypeError instead
+        raise DIDCommValueError(
+            f"unexpected type of packed_message: '{type(packed_msg)}'"
+        )
+
+    # the protected header is decoded once, the same way as by `is_anoncrypted` and `is_authcrypted`
+    protected = _jwe_protected_header(packed_msg)
+    alg = protected.get("alg") if protected is not None else None
+    if not isinstance(alg, str):
+        alg = ""
+
+    if alg.startswith("ECDH-ES"):
+        validate_anoncrypt_jwe(packed_msg, protected)
+        return PeekResult(
+            typ=DIDCommMessageTypes.ENCRYPTED,
+            encrypted_to=_recipient_kids(packed_msg),
+            enc_alg_anon=_enc_alg(AnonCryptAlg, protected),
+        )
+
+    if alg.startswith("ECDH-1PU"):
+        validate_authcrypt_jwe(packed_msg, protected)
+        return PeekResult(
+            typ=DIDCommMessageTypes.ENCRYPTED,
+            encrypted_from=_sender_kid(protected),
+            encrypted_to=_recipient_kids(packed_msg),
+            enc_alg_auth=_enc_alg(AuthCryptAlg, protected),
+        )
+
+    if is_signed(packed_msg):
+        validate_jws(packed_msg)
+        signature = packed_msg["signatures"][0]
+        return PeekResult(
+            typ=DIDCommMessageTypes.SIGNED,
+            sign_from=signature["header"]["kid"],
+            sign_alg=_sign_alg(signature),
+        )
+
+    return PeekResult(typ=DIDCommMessageTypes.PLAINTEXT)
+
+
+@dataclass(frozen=True)
+class PeekResult:
+    """
+    Routing metadata of the outermost envelope of a packed message read by `peek`.
+    The values are read from the headers and are not authenticated.
+
+    Attributes:
+        typ (DIDCommMessageTypes): envelope type: `ENCRYPTED`, `SIGNED` or `PLAINTEXT`
+        encrypted_from (DID_URL): sender key ID (`skid`/`apu`) if the message is authcrypted
+        encrypted_to (List[DID_URL]): recipient key IDs if the message is encrypted
+        sign_from (DID_URL): key ID of the (first) signature if the message is signed
+        enc_alg_auth (AuthCryptAlg): algorithm if the message is authcrypted
+        enc_alg_anon (AnonCryptAlg): algorithm if the message is anoncrypted
+        sign_alg (SignAlg): signature algorithm if the message is signed
+    """
+
+    typ: DIDCommMessageTypes
+    encrypted_from: Optional[DID_URL] = None
+    encrypted_to: Optional[List[DID_URL]] = None
+    sign_from: Optional[DID_URL] = None
+    enc_alg_auth: Optional[AuthCryptAlg] = None
+    enc_alg_anon: Optional[AnonCryptAlg] = None
+    sign_alg: Optional[SignAlg] = None
+
+
+def _jwe_protected_header(msg: dict) -> Optional[dict]:
+    if "ciphertext" not in msg or "protected" not in msg:
+        return None
+    try:
+        protected = parse_base64url_encoded_json(msg["protected"])
+    except Exception:
+        return None
+    return protected if isinstance(protected, dict) else None
+
+
+def _sender_kid(protected: dict) -> DID_URL:
+    # `skid` is optional, if it's present it's checked to be equal to `apu` by the validation
+    if "skid" in protected:
+        return protected["skid"]
+    return to_unicode(urlsafe_b64decode(to_bytes(protected["apu"])))
+
+
+def _recipient_kids(jwe: dict) -> List[DID_URL]:
+    return [r["header"]["kid"] for r in jwe["recipients"]]
+
+
+def _enc_alg(alg_type, protected: dict):
+    try:
+        return alg_type(Algs(alg=protected["alg"], enc=protected["enc"]))
+    except (KeyError, ValueError) as exc:
+        raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE) from exc
+
+
+def _sign_alg(signature: dict) -> SignAlg:
+    try:
+        return SignAlg(parse_base64url_encoded_json(signature["protected"])["alg"])
+    except Exception as exc:
+        raise MalformedMessageError(MalformedMessageCode.INVALID_MESSAGE) from exc
@@ -0,0 +1,287 @@
+"""
+Sampling profiling of pack and unpack operations.
+
+Profiling is disabled by default. After `enable_profiling` is called, every N-th `pack_encrypted` and `unpack` call
+is profiled with `cProfile`:
+
+    profiler = enable_profiling(sample_every=100)
+    ...
+    for hot in profiler.top("unpack", n=10):
+        print(hot)
+    profiler.dump_stats("unpack.pstats", "unpack")
+
+Only one call is profiled at a time (a sampled call starting while another one is profiled is not profiled).
+The work of other asyncio tasks running while the sampled call awaits is included into its profile.
+Profiles of the last `max_samples` sampled calls are kept per entry point.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import os
+import pstats
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional
+
+_profiler: Optional[SamplingProfiler] = None
+
+# function categories for `SamplingProfiler.top`
+CATEGORY_DIDCOMM = "didcomm"
+CATEGORY_AUTHLIB = "authlib"
+CATEGORY_RESOLVER = "resolver"
+CATEGORY_OTHER = "other"
+
+_DIDCOMM_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_RESOLVER_FUNCTIONS = {"resolve", "get_key", "get_keys"}
+
+
+def enable_profiling(
+    sample_every: int = 100, max_samples: int = 100
+) -> SamplingProfiler:
+    """
+    Enables sampling profiling of `pack_encrypted` and `unpack`.
+
+    :param sample_every: every N-th call of an entry point is profiled
+    :param max_samples: number of the latest profiles kept per entry point
+    :return: the profiler
+    """
+    global _profiler
+    _profiler = SamplingProfiler(sample_every, max_samples)
+    return _profiler
+
+
+def disable_profiling():
+    """
+    Disables sampling profiling.
+    """
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """
+    :return: the active profiler or None if profiling is disabled
+    """
+    return _profiler
+
+
+@dataclass(frozen=True)
+class HotFunction:
+    """
+    Aggregated profile of a function.
+
+    Attributes:
+        filename (str): source file
+        lineno (int): line number of the function definition
+        function (str): function name
+        category (str): `authlib`, `resolver` (`resolve`, `get_key` or `get_keys` methods of any resolver),
+            `didcomm` (other functions of the library) or `other`
+        calls (int): number of calls
+        tottime (float): time spent in the function itself in seconds
+        cumtime (float): time spent in the function and the functions it called in seconds
+    """
+
+    filename: str
+    lineno: int
+    function: str
+    category: str
+    calls: int
+    tottime: float
+    cumtime: float
+
+
+class _Profile:
+    # A finished profile in the form accepted by `pstats.Stats`.
+    # `pstats.Stats` takes over and clears `stats` of profiles it's created from, so a copy is given each time.
+    def __init__(self, stats: dict):
+        self._stats = stats
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    @stats.setter
+    def stats(self, value: dict):
+        pass
+
+    def create_stats(self):
+        pass
+
+
+class SamplingProfiler:
+    """
+    Profiles every N-th call of the decorated entry points.
+    """
+
+    def __init__(self, sample_every: int = 100, max_samples: int = 100):
+        """
+        :param sample_every: every N-th call of an entry point is profiled
+        :param max_samples: number of the latest profiles kept per entry point
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be positive")
+        if max_samples < 1:
+            raise ValueError("max_samples must be positive")
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._active = False
+        self._calls: Dict[str, int] = {}
+        self._samples: Dict[str, Deque[_Profile]] = {}
+
+    def calls(self, entry_point: str) -> int:
+        """
+        :param entry_point: entry point name, for example `unpack`
+        :return: number of calls of the entry point since the profiler was created or reset
+        """
+        return self._calls.get(entry_point, 0)
+
+    def samples(self, entry_point: str) -> int:
+        """
+        :param entry_point: entry point name, for example `unpack`
+        :return: number of kept profiles of the entry point
+        """
+        return len(self._samples.get(entry_point, ()))
+
+    def stats(self, entry_point: Optional[str] = None) -> Optional[pstats.Stats]:
+        """
+        Aggregates the kept profiles.
+
+        :param entry_point: optional entry point name, all entry points by default
+        :return: aggregated stats or None if no call has been profiled
+        """
+        with self._lock:
+            entry_points = [entry_point] if entry_point else list(self._samples)
+            profiles = [p for name in entry_points for p in self._samples.get(name, ())]
+        if not profiles:
+            return None
+        return pstats.Stats(*profiles)
+
+    def top(
+        self,
+        entry_point: Optional[str] = None,
+        n: int = 20,
+        sort: str = "tottime",
+        categories: Iterable[str] = (
+            CATEGORY_DIDCOMM,
+            CATEGORY_AUTHLIB,
+            CATEGORY_RESOLVER,
+        ),
+    ) -> List[HotFunction]:
+        """
+        Returns the hottest functions.
+
+        :param entry_point: optional entry point name, all entry points by default
+        :param n: max number of functions
+        :param sort: `tottime`, `cumtime` or `calls`
+        :param categories: categories of the functions to return, `other` functions are excluded by default
+        :return: the functions ordered from the hottest one
+        """
+        if sort not in ("tottime", "cumtime", "calls"):
+            raise ValueError(f"Unsupported sort key: {sort}")
+        stats = self.stats(entry_point)
+        if stats is None:
+            return []
+        categories = set(categories)
+        functions = []
+        for (filename, lineno, function), (
+            _,
+            calls,
+            tottime,
+            cumtime,
+            _,
+        ) in stats.stats.items():
+            category = _categorize(filename, function)
+            if category in categories:
+                functions.append(
+                    HotFunction(
+                        filename, lineno, function, category, calls, tottime, cumtime
+                    )
+                )
+        functions.sort(key=lambda f: getattr(f, sort), reverse=True)
+        return functions[:n]
+
+    def dump_stats(self, path: str, entry_point: Optional[str] = None) -> bool:
+        """
+        Writes the aggregated profiles to a file readable by `pstats` (and tools like snakeviz).
+
+        :param path: file path
+        :param entry_point: optional entry point name, all entry points by default
+        :return: False if no call has been profiled and nothing has been written
+        """
+        stats = self.stats(entry_point)
+        if stats is None:
+            return False
+        stats.dump_stats(path)
+        return True
+
+    def reset(self):
+        """
+        Removes all the kept profiles and resets call counters.
+        """
+        with self._lock:
+            self._calls.clear()
+            self._samples.clear()
+
+    def _start(self, entry_point: str) -> Optional[cProfile.Profile]:
+        with self._lock:
+            count = self._calls.get(entry_point, 0)
+            self._calls[entry_point] = count + 1
+            if count % self.sample_every or self._active:
+                return None
+            self._active = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler (or a debugger) is active
+            with self._lock:
+                self._active = False
+            return None
+        return profile
+
+    def _finish(self, entry_point: str, profile: cProfile.Profile):
+        profile.disable()
+        profile.create_stats()
+        with self._lock:
+            self._active = False
+            samples = self._samples.get(entry_point)
+            if samples is None:
+                samples = self._samples[entry_point] = deque(maxlen=self.max_samples)
+            samples.append(_Profile(profile.stats))
+
+
+def profiled(entry_point: str):
+    """
+    Decorates an async function to profile its sampled calls.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return await func(*args, **kwargs)
+            profile = profiler._start(entry_point)
+            if profile is None:
+                return await func(*args, **kwargs)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                profiler._finish(entry_point, profile)
+
+        return wrapper
+
+    return decorator
+
+
+def _categorize(filename: str, function: str) -> str:
+    if f"{os.sep}authlib{os.sep}" in filename:
+        return CATEGORY_AUTHLIB
+    if function in _RESOLVER_FUNCTIONS:
+        return CATEGORY_RESOLVER
+    if filename.startswith(_DIDCOMM_DIR):
+        return CATEGORY_DIDCOMM
+    return CATEGORY_OTHER
@@ -4,7 +4,7 @@ from copy import deepcopy
 import logging
 import attr
 from dataclasses import dataclass
-from typing import List, Union, Optional, Dict
+from typing import BinaryIO, List, Union, Optional, Dict
 from packaging.specifiers import SpecifierSet
 from enum import Enum
 
@@ -25,19 +25,41 @@ from didcomm.common.types import (
 from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.algorithms import AnonCryptAlg
 from didcomm.message import GenericMessage, Headers, Attachment, AttachmentDataJson
-from didcomm.core.types import EncryptResult, DIDCommGeneratorType, DIDCOMM_ORG_DOMAIN
-from didcomm.core.defaults import DEF_ENC_ALG_ANON
+from didcomm.core.types import (
+    EncryptResult,
+    DIDCommGeneratorType,
+    DIDCOMM_ORG_DOMAIN,
+    Key,
+)
+from didcomm.core.defaults import DEF_ENC_ALG_ANON, DEF_MAX_DECOMPRESSED_SIZE
 from didcomm.core.validators import (
     validator__instance_of,
     validator__didcomm_protocol_mturi,
     validator__did_or_did_url,
 )
 from didcomm.core.serialization import (
+    json_bytes_to_dict,
     json_str_to_dict,
+    utf8_size,
+)
+from didcomm.core.anoncrypt import (
+    anoncrypt,
+    find_anoncrypt_keys,
+    unpack_anoncrypt,
+)
+from didcomm.core.concurrency import gather
+from didcomm.core.limits import (
+    UnpackLimits,
+    check_size,
+    check_structure,
 )
-from didcomm.core.anoncrypt import find_keys_and_anoncrypt, unpack_anoncrypt
-from didcomm.core.utils import get_did, is_did_or_did_url
+from didcomm.core.streaming import is_stream, read_packed_msg
+from didcomm.duplicates import DuplicateMessageGuard
+from didcomm.core.utils import get_did, is_did_or_did_url, is_did_with_uri_fragment
+from didcomm.core.resolvers import resolve_did_doc
 from didcomm.did_doc.did_doc import DIDCommService
+from didcomm.metrics import measured
+from didcomm.tracing import span, traced
 
 
 logger = logging.getLogger(__name__)
@@ -131,7 +153,7 @@ async def find_did_service(
     resolvers_config: ResolversConfig, to: DID_OR_DID_URL, service_id: str = None
 ) -> Optional[DIDCommService]:
     to_did = get_did(to)
-    did_doc = await resolvers_config.did_resolver.resolve(to_did)
+    did_doc = await resolve_did_doc(resolvers_config, to_did)
 
     if did_doc is None:
         raise DIDDocNotResolvedError(to_did)
@@ -204,6 +226,38 @@ async def resolve_did_services_chain(
     return res
 
 
+async def find_forward_keys(
+    resolvers_config: ResolversConfig, routing_keys: List[DID_OR_DID_URL]
+) -> List[List[Key]]:
+    """
+    Finds the keys Forward messages are encrypted for by `wrap_in_forward`.
+
+    :param resolvers_config: secrets and DIDDoc resolvers
+    :param routing_keys: list of routing keys
+
+    :raises DIDDocNotResolvedError: If a DID can not be resolved to a DID Doc.
+    :raises DIDUrlNotFoundError: If a DID URL (for example a key ID) is not found within a DID Doc
+
+    :return: public keys of every routing key in the order of `routing_keys`
+    """
+    # all routing keys are resolved concurrently, a routing key repeated on several hops is resolved once
+    unique_routing_keys = list(dict.fromkeys(routing_keys))
+    keys = dict(
+        zip(
+            unique_routing_keys,
+            await gather(
+                *(
+                    find_anoncrypt_keys(routing_key, resolvers_config)
+                    for routing_key in unique_routing_keys
+                )
+            ),
+        )
+    )
+    return [keys[routing_key] for routing_key in routing_keys]
+
+
+@traced("wrap_in_forward")
+@measured("wrap_in_forward")
 async def wrap_in_forward(
     resolvers_config: ResolversConfig,
     packed_msg: JSON_OBJ,
@@ -212,12 +266,17 @@ async def wrap_in_forward(
     enc_alg_anon: Optional[AnonCryptAlg] = DEF_ENC_ALG_ANON,
     headers: Optional[Headers] = None,
     didcomm_id_generator: Optional[DIDCommGeneratorType] = None,
+    compress_min_size: Optional[int] = None,
+    forward_keys: Optional[List[List[Key]]] = None,
 ) -> Optional[ForwardPackResult]:
     """
     Resolves recipient DID DOC Service and Builds Forward envelops if needed.
 
     Wraps the given packed DIDComm message in Forward messages for every routing key.
 
+    The keys of all routing keys are resolved concurrently before wrapping (see `find_forward_keys`),
+    so the latency of the DID resolver is paid once regardless of the number of routing keys.
+
     :param resolvers_config: secrets and DIDDoc resolvers
     :param packed_msg: the message to be wrapped in Forward messages
     :param to: recipient's DID (DID URL)
@@ -228,7 +287,13 @@ async def wrap_in_forward(
     :param didcomm_id_generator: (Callable), optional callable to use
         for forward messages ``id`` generation, ``didcomm_id_generator_default``
         is used by default
+    :param compress_min_size: if set, Forward plaintexts of at least this size in bytes are compressed
+        with DEFLATE (`"zip": "DEF"` JWE header)
+    :param forward_keys: optional keys of the routing keys found in advance by `find_forward_keys`,
+        they are resolved by the DID resolver if not set
 
+    :raises DIDCommValueError: If `forward_keys` don't match `routing_keys`: there must be keys
+        for each routing key, and their IDs must be of the routing key DID (or equal to the routing key DID URL)
     :raises DIDDocNotResolvedError: If a DID can not be resolved to a DID Doc.
     :raises DIDUrlNotFoundError: If a DID URL (for example a key ID) is not found within a DID Doc
     :raises SecretNotFoundError: If there is no secret for the given DID or DID URL (key ID)
@@ -243,9 +308,17 @@ async def wrap_in_forward(
         logger.debug("No routing keys found: skipping forward wrapping")
         return None
 
+    if forward_keys is None:
+        with span("find_forward_keys", routing_keys=len(routing_keys)):
+            forward_keys = await find_forward_keys(resolvers_config, routing_keys)
+    else:
+        _check_forward_keys(forward_keys, routing_keys)
+
     # wrap forward msgs in reversed order so the message to final
     # recipient 'to' will be the innermost one
-    for _to, _next in zip(routing_keys[::-1], (routing_keys[1:] + [to])[::-1]):
+    for i, (_to, _next) in enumerate(
+        zip(routing_keys[::-1], (routing_keys[1:] + [to])[::-1])
+    ):
         fwd_attach = Attachment(data=AttachmentDataJson(packed_msg))
 
         fwd_msg = ForwardMessage(
@@ -256,9 +329,13 @@ async def wrap_in_forward(
             **headers,
         )
 
-        fwd_msg_encrypted = await find_keys_and_anoncrypt(
-            fwd_msg.as_dict(), _to, enc_alg_anon, resolvers_config
-        )
+        with span("encrypt", to=_to):
+            fwd_msg_encrypted = anoncrypt(
+                fwd_msg.as_dict(),
+                forward_keys[-1 - i],
+                enc_alg_anon,
+                compress_min_size,
+            )
 
         packed_msg = fwd_msg_encrypted.msg
 
@@ -267,16 +344,51 @@ async def wrap_in_forward(
     return ForwardPackResult(fwd_msg, fwd_msg_encrypted)
 
 
+def _check_forward_keys(
+    forward_keys: List[List[Key]], routing_keys: List[DID_OR_DID_URL]
+):
+    if len(forward_keys) != len(routing_keys):
+        raise DIDCommValueError(
+            f"forward_keys must be found for each of {len(routing_keys)} routing keys "
+            f"but got {len(forward_keys)}"
+        )
+    for routing_key, keys in zip(routing_keys, forward_keys):
+        if not keys:
+            raise DIDCommValueError(f"forward_keys of `{routing_key}` are empty")
+        for key in keys:
+            if not _is_key_of(key.kid, routing_key):
+                raise DIDCommValueError(
+                    f"forward key `{key.kid}` doesn't belong to routing key `{routing_key}`"
+                )
+
+
+def _is_key_of(kid: DID_URL, routing_key: DID_OR_DID_URL) -> bool:
+    if is_did_with_uri_fragment(routing_key):
+        return kid == routing_key
+    return get_did(kid) == routing_key
+
+
+@traced("unpack_forward")
+@measured("unpack_forward")
 async def unpack_forward(
     resolvers_config: ResolversConfig,
-    packed_msg: Union[JSON, JSON_OBJ],
+    packed_msg: Union[JSON, JSON_OBJ, bytes, bytearray, memoryview, BinaryIO],
     decrypt_by_all_keys: bool,
+    max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE,
+    limits: Optional[UnpackLimits] = None,
+    duplicate_guard: Optional[DuplicateMessageGuard] = None,
 ) -> ForwardResult:
     """
     Can be called by a Mediator who expects a Forward message to be unpacked
 
     :param resolvers_config: secrets and DIDDoc resolvers
-    :param packed_msg: a Forward message as JSON string to be unpacked
+    :param packed_msg: a Forward message as JSON string, UTF-8 encoded JSON bytes or JSON_OBJ to be unpacked.
+        It can also be a binary stream or file parsed incrementally (see `unpack`).
+    :param decrypt_by_all_keys: whether the message must be decryptable by all keys resolved by the secrets resolver
+    :param max_decompressed_size: max size in bytes of a compressed (`"zip": "DEF"`) plaintext after decompression
+    :param limits: limits checked before the message is processed (see `UnpackConfig.limits`).
+        Default limits are used if not specified.
+    :param duplicate_guard: optional guard rejecting a recently unpacked message (see `UnpackConfig.duplicate_guard`)
 
     :raises DIDDocNotResolvedError: If a DID can not be resolved to a DID Doc.
     :raises DIDUrlNotFoundError: If a DID URL (for example a key ID) is not found within a DID Doc
@@ -286,26 +398,55 @@ async def unpack_forward(
 
     :return: Forward plaintext
     """
+    limits = limits or UnpackLimits()
     if isinstance(packed_msg, str):
-        msg_as_dict = json_str_to_dict(packed_msg)
+        size = utf8_size(packed_msg)
+        check_size(size, limits)
+        with span("parse", size=size):
+            msg_as_dict = json_str_to_dict(packed_msg)
+    elif isinstance(packed_msg, (bytes, bytearray, memoryview)):
+        check_size(memoryview(packed_msg).nbytes, limits)
+        with span("parse", size=memoryview(packed_msg).nbytes):
+            msg_as_dict = json_bytes_to_dict(packed_msg)
     elif isinstance(packed_msg, dict):
         msg_as_dict = packed_msg
+    elif is_stream(packed_msg):
+        with span("parse"):
+            msg_as_dict, _ = await read_packed_msg(
+                packed_msg, resolvers_config, limits=limits
+            )
     else:
         # FIXME in python it should be a kind of TypeError instead
         raise DIDCommValueError(
             f"unexpected type of packed_message: '{type(packed_msg)}'"
         )
-
-    fwd_unpack_res = await unpack_anoncrypt(
-        msg_as_dict, resolvers_config, decrypt_by_all_keys
-    )
+    check_structure(msg_as_dict, limits)
+    digest = duplicate_guard.check(msg_as_dict) if duplicate_guard else None
 
     try:
-        fwd_msg = ForwardMessage.from_json(fwd_unpack_res.msg)
-    except DIDCommValueError as exc:
-        raise MalformedMessageError(MalformedMessageCode.INVALID_PLAINTEXT) from exc
+        with span("unpack_anoncrypt"):
+            fwd_unpack_res = await unpack_anoncrypt(
+                msg_as_dict,
+                resolvers_config,
+                decrypt_by_all_keys,
+                max_decompressed_size,
+            )
+
+        with span("deserialize"):
+            try:
+                fwd_msg = ForwardMessage.from_json(fwd_unpack_res.msg)
+            except DIDCommValueError as exc:
+                raise MalformedMessageError(
+                    MalformedMessageCode.INVALID_PLAINTEXT
+                ) from exc
+    except BaseException:
+        if digest is not None:
+            duplicate_guard.release(digest)
+        raise
 
     forwarded_msg_dict = fwd_msg.forwarded_msg
+    if digest is not None:
+        duplicate_guard.add(digest)
 
     logger.debug(
         f"unpacked Forward: forwarded msg {forwarded_msg_dict}, to_kids"
@@ -0,0 +1,203 @@
+"""
+Secrets resolver routing key IDs to per-tenant secrets resolvers.
+
+A service hosting many tenants (each with its own secrets backend) registers tenants by the DIDs they own
+or DID prefixes, and provides a loader creating the secrets resolver of a tenant:
+
+    async def load_tenant(tenant_id: str) -> SecretsResolver:
+        return await connect_to_kms(tenant_id)
+
+    router = SecretsResolverRouter(load_tenant, idle_ttl_s=600, max_loaded=1000)
+    router.add_tenant("acme", ["did:web:acme.example.com", "did:peer:2.Ez6LS..."])
+    resolvers_config = ResolversConfig(secrets_resolver=router, did_resolver=did_resolver)
+
+A key ID is routed by its DID through a hash index of the registered prefixes:
+a prefix matches a DID if it's equal to the DID or to its part before a colon
+(`did:web:example.com` matches `did:web:example.com:users:alice`), and the longest matching prefix wins.
+So a lookup costs a dict lookup per colon-separated segment of the DID regardless of the number of tenants.
+
+Tenant resolvers are loaded on first use (concurrent lookups of a tenant share a single load)
+and evicted when they have not been used for `idle_ttl_s` or when more than `max_loaded` are loaded.
+`get_keys` looks up the key IDs of different tenants concurrently, in one batch per tenant.
+
+The router is meant to be used from a single event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from didcomm.common.types import DID_URL
+from didcomm.core.concurrency import gather
+from didcomm.secrets.secrets_resolver import Secret, SecretsResolver
+
+DEFAULT_IDLE_TTL_S = 10 * 60.0
+DEFAULT_MAX_LOADED = 1024
+
+
+@dataclass
+class _LoadedTenant:
+    resolver: SecretsResolver
+    last_used: float
+
+
+class SecretsResolverRouter(SecretsResolver):
+    """
+    Routes secrets lookups to per-tenant secrets resolvers by DID prefixes.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[SecretsResolver]],
+        idle_ttl_s: float = DEFAULT_IDLE_TTL_S,
+        max_loaded: int = DEFAULT_MAX_LOADED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param loader: creates the secrets resolver of a tenant by the tenant ID
+        :param idle_ttl_s: time in seconds after which a tenant resolver which has not been used is evicted
+        :param max_loaded: max number of loaded tenant resolvers, the least recently used one is evicted
+        :param clock: source of monotonic time (seconds)
+        """
+        if idle_ttl_s <= 0:
+            raise ValueError("idle_ttl_s must be positive")
+        if max_loaded < 1:
+            raise ValueError("max_loaded must be positive")
+        self.idle_ttl_s = idle_ttl_s
+        self.max_loaded = max_loaded
+        self.loads = 0
+        self.evictions = 0
+        self._loader = loader
+        self._clock = clock
+        # prefix -> tenant ID, and tenant ID -> its prefixes
+        self._prefixes: Dict[str, str] = {}
+        self._tenant_prefixes: Dict[str, Set[str]] = {}
+        self._loaded: OrderedDict[str, _LoadedTenant] = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """
+        :return: number of loaded tenant resolvers
+        """
+        return len(self._loaded)
+
+    def add_tenant(self, tenant_id: str, prefixes: Iterable[str]):
+        """
+        Routes key IDs of DIDs matching the given prefixes to the tenant.
+        A prefix already routed to another tenant is re-routed.
+
+        :param tenant_id: ID of the tenant passed to the loader
+        :param prefixes: DIDs or DID prefixes owned by the tenant
+        """
+        prefixes = [prefix.rstrip(":") for prefix in prefixes]
+        for prefix in prefixes:
+            if not prefix or "#" in prefix:
+                raise ValueError(f"invalid DID prefix: '{prefix}'")
+        for prefix in prefixes:
+            previous = self._prefixes.get(prefix)
+            if previous is not None and previous != tenant_id:
+                self._tenant_prefixes[previous].discard(prefix)
+            self._prefixes[prefix] = tenant_id
+            self._tenant_prefixes.setdefault(tenant_id, set()).add(prefix)
+
+    def remove_tenant(self, tenant_id: str):
+        """
+        Removes the routes of the tenant and evicts its resolver.
+
+        :param tenant_id: ID of the tenant
+        """
+        for prefix in self._tenant_prefixes.pop(tenant_id, ()):
+            del self._prefixes[prefix]
+        self._loaded.pop(tenant_id, None)
+
+    def route(self, did_or_kid: str) -> Optional[str]:
+        """
+        :param did_or_kid: DID or key ID
+        :return: ID of the tenant owning the DID, None if no tenant prefix matches it
+        """
+        did = did_or_kid.partition("#")[0]
+        end = len(did)
+        while end > 0:
+            tenant_id = self._prefixes.get(did[:end])
+            if tenant_id is not None:
+                return tenant_id
+            end = did.rfind(":", 0, end)
+        return None
+
+    def evict_idle(self):
+        """
+        Evicts tenant resolvers which have not been used for `idle_ttl_s`.
+        It's done on every lookup as well, so calling it is needed only to free memory
+        when there are no lookups.
+        """
+        idle_since = self._clock() - self.idle_ttl_s
+        # the least recently used tenants come first
+        while self._loaded:
+            tenant_id, tenant = next(iter(self._loaded.items()))
+            if tenant.last_used > idle_since:
+                break
+            del self._loaded[tenant_id]
+            self.evictions += 1
+
+    async def get_key(self, kid: DID_URL) -> Optional[Secret]:
+        tenant_id = self.route(kid)
+        if tenant_id is None:
+            return None
+        resolver = await self._resolver(tenant_id)
+        return await resolver.get_key(kid)
+
+    async def get_keys(self, kids: List[DID_URL]) -> List[DID_URL]:
+        batches: Dict[str, List[DID_URL]] = {}
+        for kid in kids:
+            tenant_id = self.route(kid)
+            if tenant_id is not None:
+                batches.setdefault(tenant_id, []).append(kid)
+        if not batches:
+            return []
+        found = set()
+        for found_kids in await gather(
+            *(
+                self._get_tenant_keys(tenant_id, batch)
+                for tenant_id, batch in batches.items()
+            )
+        ):
+            found.update(found_kids)
+        return [kid for kid in dict.fromkeys(kids) if kid in found]
+
+    async def _get_tenant_keys(
+        self, tenant_id: str, kids: List[DID_URL]
+    ) -> List[DID_URL]:
+        resolver = await self._resolver(tenant_id)
+        return await resolver.get_keys(kids)
+
+    async def _resolver(self, tenant_id: str) -> SecretsResolver:
+        self.evict_idle()
+        tenant = self._loaded.get(tenant_id)
+        if tenant is not None:
+            tenant.last_used = self._clock()
+            self._loaded.move_to_end(tenant_id)
+            return tenant.resolver
+
+        loading = self._loading.get(tenant_id)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load(tenant_id))
+            self._loading[tenant_id] = loading
+        # a cancelled lookup must not cancel the load shared with other lookups
+        return await asyncio.shield(loading)
+
+    async def _load(self, tenant_id: str) -> SecretsResolver:
+        try:
+            resolver = await self._loader(tenant_id)
+        finally:
+            self._loading.pop(tenant_id, None)
+        self.loads += 1
+        # the tenant may have been removed while it was being loaded
+        if self._tenant_prefixes.get(tenant_id):
+            self._loaded[tenant_id] = _LoadedTenant(resolver, self._clock())
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+                self.evictions += 1
+        return resolver
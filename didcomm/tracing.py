@@ -0,0 +1,262 @@
+"""
+Stage-level tracing of pack and unpack operations.
+
+Tracing is disabled by default. It's enabled for the current context (and asyncio tasks created from it)
+by `use_tracer` or `set_tracer`:
+
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await pack_encrypted(...)
+    print(tracer.spans)
+
+The following spans are emitted:
+    - operations: `pack_encrypted`, `pack_signed`, `pack_plaintext`, `unpack`, `wrap_in_forward`, `unpack_forward`
+    - stages of the operations: `validate`, `pack_from_prior`, `sign`, `encrypt`, `protect_sender_id`,
+      `resolve_services`, `forward`, `serialize`, `parse`, `unpack_anoncrypt`, `unpack_authcrypt`,
+      `unpack_sign`, `unpack_from_prior`, `deserialize`
+    - leaf stages: `did_resolver.resolve`, `secrets_resolver.get_key`, `secrets_resolver.get_keys`,
+      `extract_key`, `jwe.encrypt`, `jwe.decrypt`, `jws.sign`, `jws.verify`, `jwt.sign`, `jwt.verify`
+"""
+from __future__ import annotations
+
+import functools
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, ContextManager, Dict, List, Optional
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("didcomm_tracer", default=None)
+
+
+class Span(ABC):
+    """
+    A span started by a `Tracer`.
+    """
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: Any):
+        """
+        Sets an attribute of the span.
+
+        :param key: attribute name
+        :param value: attribute value
+        """
+        pass
+
+
+class Tracer(ABC):
+    """
+    Receives timed spans for the stages of pack and unpack operations.
+    """
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> ContextManager[Span]:
+        """
+        Starts a span. The span ends when the returned context manager exits.
+        If the stage fails, the exception is propagated through the context manager.
+
+        :param name: stage name
+        :param attributes: stage attributes (DIDs, key IDs, algorithms, sizes); None values are omitted
+        :return: a context manager returning the started span
+        """
+        pass
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Token:
+    """
+    Sets the tracer for the current context.
+
+    :param tracer: the tracer or None to disable tracing
+    :return: a token which can be passed to `reset_tracer` to restore the previous tracer
+    """
+    return _tracer.set(tracer)
+
+
+def reset_tracer(token: Token):
+    """
+    Restores the tracer which was set before the `set_tracer` call returning the given token.
+
+    :param token: a token returned by `set_tracer`
+    """
+    _tracer.reset(token)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    :return: the tracer of the current context or None if tracing is disabled
+    """
+    return _tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Optional[Tracer]):
+    """
+    Sets the tracer for the duration of the `with` block.
+
+    :param tracer: the tracer or None to disable tracing
+    """
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+def span(name: str, **attributes) -> ContextManager[Span]:
+    """
+    Starts a span with the tracer of the current context.
+    Returns a shared no-op span if tracing is disabled.
+
+    :param name: stage name
+    :param attributes: stage attributes
+    :return: a context manager returning the started span
+    """
+    tracer = _tracer.get()
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_span(
+        name, {k: v for k, v in attributes.items() if v is not None}
+    )
+
+
+def traced(name: str):
+    """
+    Decorates an async function to run it within a span.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _tracer.get() is None:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _NoSpan(Span):
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> Span:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+@dataclass
+class RecordedSpan(Span):
+    """
+    A span recorded by `InMemoryTracer`.
+
+    Attributes:
+        name (str): stage name
+        attributes (Dict[str, Any]): stage attributes
+        parent (RecordedSpan): optional enclosing span
+        start_ns (int): start time in nanoseconds (`time.perf_counter_ns`)
+        end_ns (int): end time in nanoseconds, None if the span is not finished yet
+        exception (BaseException): optional exception the stage failed with
+    """
+
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    parent: Optional[RecordedSpan] = field(default=None, repr=False, compare=False)
+    start_ns: int = 0
+    end_ns: Optional[int] = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        return None if self.end_ns is None else self.end_ns - self.start_ns
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class InMemoryTracer(Tracer):
+    """
+    A tracer keeping all the spans in memory. Intended for tests and local diagnostics.
+    """
+
+    def __init__(self):
+        self.spans: List[RecordedSpan] = []
+        self._current: ContextVar[Optional[RecordedSpan]] = ContextVar(
+            "didcomm_in_memory_tracer_span", default=None
+        )
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any]):
+        recorded = RecordedSpan(
+            name=name,
+            attributes=dict(attributes),
+            parent=self._current.get(),
+            start_ns=perf_counter_ns(),
+        )
+        self.spans.append(recorded)
+        token = self._current.set(recorded)
+        try:
+            yield recorded
+        except BaseException as exc:
+            recorded.exception = exc
+            raise
+        finally:
+            recorded.end_ns = perf_counter_ns()
+            self._current.reset(token)
+
+    def find(self, name: str) -> List[RecordedSpan]:
+        """
+        :param name: stage name
+        :return: recorded spans with the given name in the order they were started
+        """
+        return [s for s in self.spans if s.name == name]
+
+    def children(self, parent: Optional[RecordedSpan]) -> List[RecordedSpan]:
+        """
+        :param parent: a recorded span or None for the root spans
+        :return: recorded spans directly enclosed by the given span
+        """
+        return [s for s in self.spans if s.parent is parent]
+
+    def clear(self):
+        self.spans.clear()
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    An adapter to an OpenTelemetry-style tracer, for example `opentelemetry.trace.get_tracer(__name__)`.
+
+    Only `start_as_current_span(name, attributes=...)` is required from the wrapped tracer,
+    so the library does not depend on OpenTelemetry packages.
+    """
+
+    def __init__(self, tracer, name_prefix: str = "didcomm."):
+        """
+        :param tracer: an OpenTelemetry-style tracer
+        :param name_prefix: prefix added to span names
+        """
+        self._tracer = tracer
+        self._name_prefix = name_prefix
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> ContextManager[Span]:
+        return self._tracer.start_as_current_span(
+            self._name_prefix + name,
+            attributes={k: _otel_attribute(v) for k, v in attributes.items()},
+        )
+
+
+def _otel_attribute(value: Any) -> Any:
+    # OpenTelemetry attributes are primitives or sequences of primitives
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return str(value)
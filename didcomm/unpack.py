@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, Optional, List, Union
+from typing import Any, BinaryIO, Callable, Optional, List, Union
 
 from authlib.common.encoding import to_unicode
 
@@ -10,22 +10,39 @@ from didcomm.common.resolvers import ResolversConfig
 from didcomm.common.types import JWS, JSON, JSON_OBJ, DID_URL
 from didcomm.core.anoncrypt import unpack_anoncrypt, is_anoncrypted
 from didcomm.core.authcrypt import is_authcrypted, unpack_authcrypt
+from didcomm.core.defaults import DEF_MAX_DECOMPRESSED_SIZE
 from didcomm.core.from_prior import unpack_from_prior_in_place
 from didcomm.core.keys.forward_next_keys_selector import has_keys_for_forward_next
+from didcomm.core.limits import (
+    UnpackLimits,
+    check_layers,
+    check_size,
+    check_structure,
+)
+from didcomm.core.resolvers import DIDDocPrefetch
 from didcomm.core.serialization import (
     json_bytes_to_dict,
     json_str_to_dict,
     dict_to_json_bytes,
+    utf8_size,
 )
 from didcomm.core.sign import is_signed, unpack_sign
+from didcomm.core.streaming import is_stream, read_packed_msg
+from didcomm.duplicates import DuplicateMessageGuard
 from didcomm.errors import DIDCommValueError
 from didcomm.message import Message
+from didcomm.metrics import measured, record_operation
+from didcomm.profiling import profiled
 from didcomm.protocols.routing.forward import is_forward, ForwardMessage
+from didcomm.tracing import span, traced
 
 
+@traced("unpack")
+@measured("unpack")
+@profiled("unpack")
 async def unpack(
     resolvers_config: ResolversConfig,
-    packed_msg: Union[JSON, JSON_OBJ],
+    packed_msg: Union[JSON, JSON_OBJ, bytes, bytearray, memoryview, BinaryIO],
     unpack_config: Optional[UnpackConfig] = None,
     deserializer: Callable[[JSON_OBJ], Any] = Message.from_dict,
 ) -> UnpackResult:
@@ -33,7 +50,12 @@ async def unpack(
     Unpacks the packed DIDComm message by doing decryption and verifying the signatures.
 
     :param resolvers_config: secrets and DIDDoc resolvers
-    :param packed_msg: packed DIDComm message as JSON string of JSON_OBJ to be unpacked
+    :param packed_msg: packed DIDComm message as JSON string, UTF-8 encoded JSON bytes (as received from a transport)
+        or JSON_OBJ to be unpacked.
+        It can also be a binary stream or file (an object with `read(size)` method returning bytes
+        or an awaitable of bytes): then the message is parsed incrementally,
+        and an encrypted message not addressed to any key of the secrets resolver is rejected
+        before its ciphertext is read.
     :param unpack_config: configuration for unpack. Default parameters are used if not specified.
     :param deserializer: callable taking a json object and deserializes to desired message type. If not specified, defaults to returning a dictionary.
 
@@ -45,16 +67,35 @@ async def unpack(
     :return: the message, metadata, and optionally a JWS if the message has been signed.
     """
     unpack_config = unpack_config or UnpackConfig()
+    limits = unpack_config.limits
 
+    bytes_in = None
     if isinstance(packed_msg, str):
-        packed_msg = json_str_to_dict(packed_msg)
+        bytes_in = utf8_size(packed_msg)
+        check_size(bytes_in, limits)
+        with span("parse", size=bytes_in):
+            packed_msg = json_str_to_dict(packed_msg)
+    elif isinstance(packed_msg, (bytes, bytearray, memoryview)):
+        bytes_in = memoryview(packed_msg).nbytes
+        check_size(bytes_in, limits)
+        with span("parse", size=bytes_in):
+            packed_msg = json_bytes_to_dict(packed_msg)
     elif isinstance(packed_msg, dict):
         pass
+    elif is_stream(packed_msg):
+        with span("parse"):
+            packed_msg, bytes_in = await read_packed_msg(
+                packed_msg, resolvers_config, limits=limits
+            )
     else:
         # FIXME in python it should be a kind of TypeError instead
         raise DIDCommValueError(
             f"unexpected type of packed_message: '{type(packed_msg)}'"
         )
+    check_structure(packed_msg, limits)
+
+    guard = unpack_config.duplicate_guard
+    digest = guard.check(packed_msg) if guard is not None else None
 
     metadata = Metadata(
         encrypted=False,
@@ -63,10 +104,29 @@ async def unpack(
         anonymous_sender=False,
     )
 
-    return await _do_unpack(
-        resolvers_config, packed_msg, unpack_config, metadata, deserializer
+    # DIDs seen in headers are resolved speculatively, concurrently with decryption and verification
+    try:
+        async with DIDDocPrefetch(resolvers_config):
+            result = await _do_unpack(
+                resolvers_config, packed_msg, unpack_config, metadata, deserializer
+            )
+    except BaseException:
+        if digest is not None:
+            guard.release(digest)
+        raise
+    if digest is not None:
+        guard.add(digest)
+
+    record_operation(
+        "unpack",
+        enc_alg_anon=metadata.enc_alg_anon,
+        enc_alg_auth=metadata.enc_alg_auth,
+        sign_alg=metadata.sign_alg,
+        bytes_in=bytes_in,
     )
 
+    return result
+
 
 async def _do_unpack(
     resolvers_config: ResolversConfig,
@@ -74,18 +134,26 @@ async def _do_unpack(
     unpack_config: UnpackConfig,
     metadata: Metadata,
     deserializer: Callable[[JSON_OBJ], Any],
+    layers: int = 0,
 ) -> UnpackResult:
-    msg = dict_to_json_bytes(packed_msg)
+    limits = unpack_config.limits
+    # the serialized message is needed only if it's a signed one (see below)
+    msg = None
     msg_as_dict = packed_msg
 
     if is_anoncrypted(msg_as_dict):
-        unwrap_anoncrypt_result = await unpack_anoncrypt(
-            msg_as_dict,
-            resolvers_config,
-            decrypt_by_all_keys=unpack_config.expect_decrypt_by_all_keys,
-        )
-        msg = unwrap_anoncrypt_result.msg
-        msg_as_dict = json_bytes_to_dict(msg)
+        layers += 1
+        check_layers(layers, limits)
+        with span("unpack_anoncrypt"):
+            unwrap_anoncrypt_result = await unpack_anoncrypt(
+                msg_as_dict,
+                resolvers_config,
+                decrypt_by_all_keys=unpack_config.expect_decrypt_by_all_keys,
+                max_decompressed_size=unpack_config.max_decompressed_size,
+            )
+            msg = unwrap_anoncrypt_result.msg
+            msg_as_dict = json_bytes_to_dict(msg)
+            check_structure(msg_as_dict, limits)
 
         metadata.encrypted = True
         metadata.anonymous_sender = True
@@ -102,16 +170,22 @@ async def _do_unpack(
                     unpack_config,
                     metadata,
                     deserializer,
+                    layers,
                 )
 
     if is_authcrypted(msg_as_dict):
-        unwrap_authcrypt_result = await unpack_authcrypt(
-            msg_as_dict,
-            resolvers_config,
-            decrypt_by_all_keys=unpack_config.expect_decrypt_by_all_keys,
-        )
-        msg = unwrap_authcrypt_result.msg
-        msg_as_dict = json_bytes_to_dict(msg)
+        layers += 1
+        check_layers(layers, limits)
+        with span("unpack_authcrypt"):
+            unwrap_authcrypt_result = await unpack_authcrypt(
+                msg_as_dict,
+                resolvers_config,
+                decrypt_by_all_keys=unpack_config.expect_decrypt_by_all_keys,
+                max_decompressed_size=unpack_config.max_decompressed_size,
+            )
+            msg = unwrap_authcrypt_result.msg
+            msg_as_dict = json_bytes_to_dict(msg)
+            check_structure(msg_as_dict, limits)
 
         metadata.encrypted = True
         metadata.authenticated = True
@@ -120,10 +194,16 @@ async def _do_unpack(
         metadata.enc_alg_auth = unwrap_authcrypt_result.alg
 
     if is_signed(msg_as_dict):
-        unwrap_sign_result = await unpack_sign(msg_as_dict, resolvers_config)
-        metadata.signed_message = to_unicode(msg)
-        msg = unwrap_sign_result.msg
-        msg_as_dict = json_bytes_to_dict(msg)
+        layers += 1
+        check_layers(layers, limits)
+        with span("unpack_sign"):
+            unwrap_sign_result = await unpack_sign(msg_as_dict, resolvers_config)
+            if msg is None:
+                msg = dict_to_json_bytes(msg_as_dict)
+            metadata.signed_message = to_unicode(msg)
+            msg = unwrap_sign_result.msg
+            msg_as_dict = json_bytes_to_dict(msg)
+            check_structure(msg_as_dict, limits)
 
         metadata.non_repudiation = True
         metadata.authenticated = True
@@ -132,12 +212,14 @@ async def _do_unpack(
 
     if msg_as_dict.get("from_prior") is not None:
         metadata.from_prior_jwt = msg_as_dict["from_prior"]
-    from_prior_issuer_kid = await unpack_from_prior_in_place(
-        msg_as_dict, resolvers_config
-    )
+    with span("unpack_from_prior"):
+        from_prior_issuer_kid = await unpack_from_prior_in_place(
+            msg_as_dict, resolvers_config
+        )
     metadata.from_prior_issuer_kid = from_prior_issuer_kid
 
-    message = deserializer(msg_as_dict)
+    with span("deserialize"):
+        message = deserializer(msg_as_dict)
 
     return UnpackResult(message=message, metadata=metadata)
 
@@ -210,7 +292,22 @@ class UnpackConfig:
                                            wrapping a message packed for the given recipient,
                                            then both Forward and packed messages are unpacked automatically,
                                            and the unpacked message will be returned instead of unpacked Forward.
+        max_decompressed_size (int): Max size in bytes of a compressed (`"zip": "DEF"`) plaintext after
+                                     decompression. Larger plaintexts are rejected with `DECOMPRESSED_TOO_LARGE`
+                                     malformed message code. 16 MiB by default.
+        limits (UnpackLimits): Limits of the message size, number of recipients, envelope layers, attachments
+                               and JSON depth checked before the message (every its layer) is processed.
+                               A message exceeding a limit is rejected with the corresponding malformed message code
+                               (`MESSAGE_TOO_LARGE`, `TOO_MANY_RECIPIENTS`, `TOO_MANY_LAYERS`,
+                               `TOO_MANY_ATTACHMENTS`, `JSON_TOO_DEEP`).
+        duplicate_guard (DuplicateMessageGuard): Optional guard rejecting a message that has been unpacked
+                                                 recently with `DUPLICATE_MESSAGE` malformed message code
+                                                 before any resolver call and cryptographic operation.
+                                                 Not set by default.
     """
 
     expect_decrypt_by_all_keys: bool = False
     unwrap_re_wrapping_forward: bool = True
+    max_decompressed_size: int = DEF_MAX_DECOMPRESSED_SIZE
+    limits: UnpackLimits = UnpackLimits()
+    duplicate_guard: Optional[DuplicateMessageGuard] = None
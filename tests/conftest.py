@@ -1,6 +1,7 @@
 import pytest
 
 from didcomm.common.resolvers import ResolversConfig
+from didcomm.core.crypto.backend import set_crypto_backend
 from tests.test_vectors.did_doc.mock_did_resolver import (
     MockDIDResolverAllInSecrets,
     MockDIDResolverWithNonSecrets,
@@ -17,6 +18,18 @@ from tests.test_vectors.secrets.mock_secrets_resolver_charlie_rotated_to_alice i
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--crypto-backend",
+        default=None,
+        help="crypto backend used by all tests: authlib (default) or cryptography",
+    )
+
+
+def pytest_configure(config):
+    set_crypto_backend(config.getoption("--crypto-backend"))
+
+
 @pytest.fixture()
 def did_resolver_all_in_secrets():
     return MockDIDResolverAllInSecrets()
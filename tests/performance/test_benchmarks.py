@@ -0,0 +1,243 @@
+import json
+
+import pytest
+
+from benchmarks.cli import main
+from benchmarks.compare import compare_results
+from benchmarks.matrix import build_matrix, format_table
+from benchmarks.runner import BenchmarkResult, RunConfig, percentile
+from benchmarks.suite import Benchmark, build_suite, run_suite
+from didcomm import get_crypto_backend
+
+RUN_CONFIG = RunConfig(iterations=2, min_iterations=1, warmup=0)
+
+
+def _result(name, p50_ms, p99_ms, **params):
+    return BenchmarkResult(
+        name=name,
+        params=params,
+        samples=10,
+        p50_ms=p50_ms,
+        p99_ms=p99_ms,
+        mean_ms=p50_ms,
+        ops_per_sec=1000 / p50_ms,
+    )
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+
+
+def test_result_from_samples():
+    result = BenchmarkResult.from_samples(
+        "op", {"payload_bytes": 100}, [3_000_000, 1_000_000, 2_000_000]
+    )
+    assert result.id == "op[payload_bytes=100]"
+    assert result.samples == 3
+    assert result.p50_ms == 2.0
+    assert result.p99_ms == 3.0
+    assert result.ops_per_sec == 500.0
+    assert BenchmarkResult.from_dict(result.as_dict()) == result
+
+
+def test_compare_results():
+    baseline = [
+        _result("pack", 1.0, 2.0, payload_bytes=100),
+        _result("unpack", 1.0, 2.0),
+        _result("removed", 1.0, 2.0),
+    ]
+    current = [
+        _result("pack", 1.05, 2.5, payload_bytes=100),
+        _result("unpack", 0.5, 1.0),
+        _result("added", 1.0, 2.0),
+    ]
+
+    comparisons, missing, new = compare_results(baseline, current, threshold_pct=10)
+
+    regressions = [(c.id, c.metric) for c in comparisons if c.regression]
+    assert regressions == [("pack[payload_bytes=100]", "p99_ms")]
+    assert len(comparisons) == 4
+    assert missing == ["removed"]
+    assert new == ["added"]
+
+
+@pytest.mark.asyncio
+async def test_run_suite():
+    suite = build_suite(
+        payload_sizes=[100], recipient_keys_counts=[2], forward_depths=[2]
+    )
+    results = await run_suite(suite, RUN_CONFIG)
+
+    assert [r.id for r in results] == [b.id for b in suite]
+    assert {r.name for r in results} >= {
+        "pack_plaintext",
+        "unpack_signed",
+        "pack_encrypted_auth_protected",
+        "unpack_encrypted_anon_signed",
+        "peek_encrypted_auth",
+        "wrap_in_forward",
+        "unpack_forward",
+    }
+    assert all(r.samples == 2 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_run_suite_with_resolver_latency():
+    suite = build_suite(
+        payload_sizes=[100],
+        recipient_keys_counts=[1],
+        forward_depths=[3],
+        resolver_latency_ms=20,
+    )
+    assert all(b.params["resolver_latency_ms"] == 20 for b in suite)
+
+    [result] = await run_suite(suite, RUN_CONFIG, "^wrap_in_forward")
+    assert (
+        result.id
+        == "wrap_in_forward[depth=3,payload_bytes=1000,resolver_latency_ms=20]"
+    )
+    # DID Docs of all 3 mediators are resolved concurrently
+    assert 20 <= result.p50_ms < 50
+
+
+@pytest.mark.asyncio
+async def test_run_suite_reports_failed_benchmark_and_continues():
+    async def failing_setup():
+        raise ValueError("payload is too long")
+
+    [passing] = build_suite(payload_sizes=[100])[:1]
+    suite = [Benchmark("failing", {"payload_bytes": 100}, failing_setup), passing]
+    results = await run_suite(suite, RUN_CONFIG)
+
+    assert [r.id for r in results] == [b.id for b in suite]
+    assert results[0].failed
+    assert results[0].error == "ValueError: payload is too long"
+    assert results[0].samples == 0
+    assert BenchmarkResult.from_dict(results[0].as_dict()) == results[0]
+    assert not results[1].failed
+    assert results[1].samples == 2
+
+
+def test_compare_results_skips_failed():
+    baseline = [_result("pack", 1.0, 2.0), _result("unpack", 1.0, 2.0)]
+    current = [
+        BenchmarkResult.from_error("pack", {}, ValueError()),
+        _result("unpack", 1.0, 2.0),
+    ]
+
+    comparisons, missing, new = compare_results(baseline, current)
+
+    assert {c.id for c in comparisons} == {"unpack"}
+    assert missing == []
+    assert new == []
+
+
+def test_cli_run_with_crypto_backend(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    backend = get_crypto_backend()
+    argv = ["run", "--quick", "--iterations", "1", "-k", "^unpack_signed"]
+
+    assert main(argv + ["--crypto-backend", "cryptography", "-o", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert results["meta"]["crypto_backend"] == "cryptography"
+    assert not any("error" in r for r in results["results"])
+    # the backend is restored after the run
+    assert get_crypto_backend() is backend
+
+
+def test_cli_run_and_compare(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    argv = ["run", "--quick", "--iterations", "1", "-k", "^pack_plaintext"]
+
+    assert main(argv + ["-o", str(baseline)]) == 0
+    assert main(argv + ["-o", str(current)]) == 0
+    assert len(json.loads(baseline.read_text())["results"]) == 2
+
+    # a huge threshold never flags a regression
+    assert main(["compare", str(baseline), str(current), "-t", "1000000"]) == 0
+
+    slower = json.loads(current.read_text())
+    for result in slower["results"]:
+        result["p50_ms"] *= 10
+        result["p99_ms"] *= 10
+    current.write_text(json.dumps(slower))
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_run_matrix():
+    matrix = build_matrix(payload_sizes=[100], curves=["X25519", "secp256k1"])
+    results = await run_suite(matrix, RUN_CONFIG)
+
+    # 3 anoncrypt and 1 authcrypt algorithms with 2 curves, 3 signature algorithms
+    assert len(results) == (4 * 2 + 3) * 2
+    assert len({r.id for r in results}) == len(results)
+    assert {(r.params["alg"], r.params["curve"]) for r in results} >= {
+        ("ECDH-ES+A256KW", "secp256k1"),
+        ("ECDH-1PU+A256KW", "X25519"),
+        ("EdDSA", "Ed25519"),
+        ("ES256", "P-256"),
+        ("ES256K", "secp256k1"),
+    }
+    for r in results:
+        assert r.sizes["overhead_bytes"] == (
+            r.sizes["packed_bytes"] - r.sizes["plaintext_bytes"]
+        )
+        assert r.sizes["overhead_bytes"] > 0
+        assert BenchmarkResult.from_dict(r.as_dict()) == r
+
+    table = format_table(results).splitlines()
+    assert len(table) == len(results) + 1
+    assert "overhead B" in table[0]
+
+
+def test_format_table_with_failed():
+    results = [
+        _result("pack_signed", 1.0, 2.0, alg="EdDSA", payload_bytes=100),
+        BenchmarkResult.from_error(
+            "unpack_signed", {"alg": "EdDSA", "payload_bytes": 100}, ValueError()
+        ),
+    ]
+
+    table = format_table(results).splitlines()
+
+    assert len(table) == 3
+    assert "failed" not in table[1]
+    assert table[2].split() == ["unpack_signed", "EdDSA", "100", "failed"]
+
+
+def test_cli_matrix(tmp_path, capsys):
+    output = tmp_path / "matrix.json"
+    argv = ["matrix", "--quick", "--iterations", "1", "--curves", "P-256"]
+
+    assert main(argv + ["-k", "ES256,", "-o", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert [r["name"] for r in results] == ["pack_signed", "unpack_signed"] * 2
+    assert all(r["sizes"]["packed_bytes"] > 0 for r in results)
+    assert "ES256" in capsys.readouterr().out
+
+
+def test_cli_matrix_with_crypto_backend(tmp_path):
+    output = tmp_path / "matrix.json"
+    argv = ["matrix", "--quick", "--iterations", "1", "--curves", "X25519"]
+
+    assert (
+        main(
+            argv
+            + ["-k", "EdDSA", "--crypto-backend", "cryptography", "-o", str(output)]
+        )
+        == 0
+    )
+
+    results = json.loads(output.read_text())
+    assert results["meta"]["crypto_backend"] == "cryptography"
+    assert len(results["results"]) == 4
+    assert not any("error" in r for r in results["results"])
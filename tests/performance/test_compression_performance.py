@@ -0,0 +1,106 @@
+import random
+from time import perf_counter_ns
+
+import pytest
+
+from benchmarks.runner import percentile
+from didcomm import (
+    Message,
+    PackEncryptedConfig,
+    pack_encrypted,
+    unpack,
+    unpack_forward,
+)
+from didcomm.errors import MalformedMessageError
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+
+PAYLOAD_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+WORDS = ["alpha", "beta", "gamma", "delta", "status", "active", "pending", "note"]
+
+
+@pytest.fixture()
+def resolvers_config_alice(resolvers_config_alice_with_non_secrets):
+    return resolvers_config_alice_with_non_secrets
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_with_non_secrets):
+    return resolvers_config_bob_with_non_secrets
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+def _message(payload_size: int) -> Message:
+    # JSON records looking like an application payload (compressed ~5-10x)
+    rnd = random.Random(payload_size)
+    items = []
+    size = 0
+    while size < payload_size:
+        item = {
+            "id": rnd.randrange(10**9),
+            "name": " ".join(rnd.choice(WORDS) for _ in range(3)),
+            "status": rnd.choice(WORDS),
+            "amount": round(rnd.random() * 1000, 2),
+        }
+        items.append(item)
+        size += 90
+    return Message(
+        id="1234567890",
+        type="http://example.com/protocols/benchmark/1.0/payload",
+        frm=ALICE_DID,
+        to=[BOB_DID],
+        body={"items": items},
+    )
+
+
+def _samples(payload_size: int) -> int:
+    return max(3, min(50, 10_000_000 // payload_size))
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload_size", PAYLOAD_SIZES)
+@pytest.mark.parametrize("compress", [False, True])
+async def test_pack_forward_unpack(
+    payload_size,
+    compress,
+    resolvers_config_alice,
+    resolvers_config_bob,
+    resolvers_config_mediator1,
+):
+    message = _message(payload_size)
+    pack_config = PackEncryptedConfig(compress=compress)
+    samples = []
+    for _ in range(_samples(payload_size)):
+        start = perf_counter_ns()
+        pack_result = await pack_encrypted(
+            resolvers_config_alice,
+            message,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            pack_config=pack_config,
+        )
+        try:
+            forward = await unpack_forward(
+                resolvers_config_mediator1, pack_result.packed_msg, False
+            )
+            await unpack(resolvers_config_bob, forward.forwarded_msg)
+        except MalformedMessageError:
+            # Authlib rejects JWE segments longer than 256000 characters
+            samples = None
+            break
+        samples.append((perf_counter_ns() - start) / 1_000_000)
+    print(
+        f"\nbenchmark of pack_encrypted + unpack_forward + unpack"
+        f" [{payload_size} bytes, compress={compress}]:"
+        f" wire {len(pack_result.packed_msg):>9} bytes, "
+        + (
+            f"p50 {percentile(sorted(samples), 50):9.3f} ms,"
+            f" p99 {percentile(sorted(samples), 99):9.3f} ms"
+            if samples
+            else "can't be unpacked"
+        )
+    )
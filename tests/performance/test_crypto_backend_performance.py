@@ -0,0 +1,75 @@
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm.common.types import DIDCommMessageTypes
+from didcomm.core.crypto.backend import create_crypto_backend
+from didcomm.core.types import Key
+from didcomm.core.utils import calculate_apv, extract_key
+from tests.test_vectors.utils import (
+    KeyAgreementCurveType,
+    Person,
+    get_auth_secrets,
+    get_key_agreement_secrets,
+)
+
+SAMPLES = 500
+PAYLOAD = b"x" * 1024
+
+
+def _us(operation) -> float:
+    for _ in range(10):
+        operation()
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        operation()
+    return (perf_counter_ns() - start) / SAMPLES / 1e3
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.parametrize(
+    "curve",
+    [
+        KeyAgreementCurveType.X25519,
+        KeyAgreementCurveType.P256,
+        KeyAgreementCurveType.P384,
+        KeyAgreementCurveType.P521,
+    ],
+)
+@pytest.mark.parametrize("enc", ["A256CBC-HS512", "A256GCM", "XC20P"])
+def test_anoncrypt_performance_by_backend(curve, enc):
+    secret = get_key_agreement_secrets(Person.BOB, curve)[0]
+    to = [Key(kid=secret.kid, key=extract_key(secret))]
+    protected = {
+        "typ": DIDCommMessageTypes.ENCRYPTED.value,
+        "alg": "ECDH-ES+A256KW",
+        "enc": enc,
+        "apv": calculate_apv([secret.kid]),
+    }
+    print()
+    for name in ["authlib", "cryptography"]:
+        backend = create_crypto_backend(name)
+        jwe = backend.encrypt(protected, to, PAYLOAD)
+        encrypt_us = _us(lambda: backend.encrypt(protected, to, PAYLOAD))
+        decrypt_us = _us(lambda: backend.decrypt(jwe, to[0]))
+        print(
+            f"{curve.name:>7} {enc:>14} {name:>13}:"
+            f" encrypt {encrypt_us:9.1f} us, decrypt {decrypt_us:9.1f} us"
+        )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.parametrize("secret", get_auth_secrets(Person.ALICE), ids=lambda s: s.kid)
+def test_sign_performance_by_backend(secret):
+    key = extract_key(secret)
+    alg = {"Ed25519": "EdDSA", "P-256": "ES256", "secp256k1": "ES256K"}[key["crv"]]
+    protected = {"typ": DIDCommMessageTypes.SIGNED.value, "alg": alg}
+    print()
+    for name in ["authlib", "cryptography"]:
+        backend = create_crypto_backend(name)
+        jws = backend.sign(protected, secret.kid, PAYLOAD, key)
+        sign_us = _us(lambda: backend.sign(protected, secret.kid, PAYLOAD, key))
+        verify_us = _us(lambda: backend.verify(jws, key))
+        print(
+            f"{alg:>7} {name:>13}: sign {sign_us:9.1f} us, verify {verify_us:9.1f} us"
+        )
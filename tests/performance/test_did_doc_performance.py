@@ -0,0 +1,75 @@
+import gc
+import tracemalloc
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm import DIDDoc, DIDDocCompact
+from tests.test_vectors.did_doc import DID_DOC_BOB_WITH_NO_SECRETS
+
+DOCS_COUNT = 100000
+
+CONSTRUCTORS = {
+    "DIDDoc.deserialize": DIDDoc.deserialize,
+    "DIDDocCompact.from_dict": DIDDocCompact.from_dict,
+    "DIDDocCompact.from_json": DIDDocCompact.from_json,
+}
+
+
+def _did_doc_sources(count, as_json):
+    did_doc_json = DID_DOC_BOB_WITH_NO_SECRETS.to_json()
+    # unique DIDs so that every document is a separate object
+    return [
+        did_doc_json.replace("did:example:bob", f"did:example:bob{i}")
+        if as_json
+        else DIDDoc.from_json(
+            did_doc_json.replace("did:example:bob", f"did:example:bob{i}")
+        ).serialize()
+        for i in range(count)
+    ]
+
+
+def dump_res(constructor_name, count, time_in_ms, memory_in_bytes):
+    print(
+        f"\nbenchmark of '{constructor_name}' [{count} docs]:"
+        f" {time_in_ms:9.3f} ms, {time_in_ms * 1000 / count:7.3f} us/doc,"
+        f" {memory_in_bytes / 2 ** 20:8.1f} MiB, {memory_in_bytes / count:8.1f} B/doc"
+    )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.parametrize("constructor_name", CONSTRUCTORS.keys())
+def test_did_doc_construction(constructor_name):
+    constructor = CONSTRUCTORS[constructor_name]
+    sources = _did_doc_sources(DOCS_COUNT, constructor_name.endswith("from_json"))
+
+    start = perf_counter_ns()
+    did_docs = [constructor(source) for source in sources]
+    end = perf_counter_ns()
+    del did_docs
+
+    # tracing slows down allocations, so memory is measured in a separate pass
+    gc.collect()
+    tracemalloc.start()
+    did_docs = [constructor(source) for source in sources]
+    # memory held by the constructed docs (excluding the sources)
+    memory_in_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    dump_res(constructor_name, len(did_docs), (end - start) / 1000000, memory_in_bytes)
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+def test_did_doc_compact_lazy_parse_on_first_lookup():
+    sources = _did_doc_sources(DOCS_COUNT, as_json=True)
+    did_docs = [DIDDocCompact.from_json(source) for source in sources]
+    kid = DID_DOC_BOB_WITH_NO_SECRETS.key_agreement[0].replace(
+        "did:example:bob", "did:example:bob0"
+    )
+
+    start = perf_counter_ns()
+    for did_doc in did_docs:
+        did_doc.has_key_agreement(kid)
+    end = perf_counter_ns()
+
+    dump_res("DIDDocCompact first lookup", len(did_docs), (end - start) / 1000000, 0)
@@ -0,0 +1,60 @@
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm import (
+    DuplicateMessageGuard,
+    PackEncryptedConfig,
+    UnpackConfig,
+    pack_encrypted,
+    unpack,
+)
+from didcomm.errors import MalformedMessageError
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+SAMPLES = 200
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_duplicate_rejection_vs_unpack(
+    resolvers_config_alice_with_non_secrets, resolvers_config_bob_with_non_secrets
+):
+    packed_msg = (
+        await pack_encrypted(
+            resolvers_config_alice_with_non_secrets,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            sign_frm=ALICE_DID,
+            pack_config=PackEncryptedConfig(forward=False, protect_sender_id=True),
+        )
+    ).packed_msg
+
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        await unpack(resolvers_config_bob_with_non_secrets, packed_msg)
+    unpack_us = (perf_counter_ns() - start) / SAMPLES / 1e3
+
+    guard = DuplicateMessageGuard()
+    unpack_config = UnpackConfig(duplicate_guard=guard)
+    await unpack(resolvers_config_bob_with_non_secrets, packed_msg, unpack_config)
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        try:
+            await unpack(
+                resolvers_config_bob_with_non_secrets, packed_msg, unpack_config
+            )
+        except MalformedMessageError:
+            pass
+    duplicate_us = (perf_counter_ns() - start) / SAMPLES / 1e3
+
+    print()
+    print(f"guard memory: {guard.memory_bytes / 2**20:.2f} MiB")
+    print(f"unpack: {unpack_us:.1f} us, duplicate rejected: {duplicate_us:.1f} us")
@@ -0,0 +1,72 @@
+import asyncio
+from time import perf_counter_ns
+
+import pytest
+
+from benchmarks.runner import percentile
+from didcomm import (
+    PackEncryptedConfig,
+    disable_ephemeral_key_pool,
+    enable_ephemeral_key_pool,
+    pack_encrypted,
+)
+from tests.test_vectors.common import ALICE_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+BURSTS = 20
+BURST_SIZE = 32
+# idle time between bursts letting the pool refill
+IDLE_S = 0.3
+
+RECIPIENTS = {
+    "X25519": "did:example:bob#key-x25519-1",
+    "P-256": "did:example:bob#key-p256-1",
+    "P-384": "did:example:bob#key-p384-1",
+    "P-521": "did:example:bob#key-p521-1",
+}
+
+
+async def _bursty_pack(resolvers_config, to, frm):
+    pack_config = PackEncryptedConfig(forward=False)
+    samples = []
+    for _ in range(BURSTS):
+        for _ in range(BURST_SIZE):
+            start = perf_counter_ns()
+            await pack_encrypted(
+                resolvers_config, TEST_MESSAGE, to=to, frm=frm, pack_config=pack_config
+            )
+            samples.append((perf_counter_ns() - start) / 1_000_000)
+        await asyncio.sleep(IDLE_S)
+    return sorted(samples)
+
+
+def dump_res(crv, mode, pooled, samples):
+    print(
+        f"\nbenchmark of bursty '{mode}' pack_encrypted [{crv}, pool={pooled}]:"
+        f" p50 {percentile(samples, 50):7.3f} ms, p99 {percentile(samples, 99):7.3f} ms"
+        f" ({len(samples)} packs in bursts of {BURST_SIZE})"
+    )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("crv", RECIPIENTS.keys())
+@pytest.mark.parametrize("mode", ["anoncrypt", "authcrypt"])
+async def test_bursty_pack_with_ephemeral_key_pool(
+    crv, mode, resolvers_config_alice_all_in_secrets
+):
+    if mode == "authcrypt" and crv == "P-384":
+        pytest.skip("Alice has no P-384 keys")
+    to = RECIPIENTS[crv]
+    frm = ALICE_DID if mode == "authcrypt" else None
+
+    samples = await _bursty_pack(resolvers_config_alice_all_in_secrets, to, frm)
+    dump_res(crv, mode, False, samples)
+
+    enable_ephemeral_key_pool(curves=[crv], size=BURST_SIZE)
+    try:
+        await asyncio.sleep(IDLE_S)
+        samples = await _bursty_pack(resolvers_config_alice_all_in_secrets, to, frm)
+    finally:
+        disable_ephemeral_key_pool()
+    dump_res(crv, mode, True, samples)
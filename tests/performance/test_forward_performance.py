@@ -0,0 +1,64 @@
+from time import perf_counter
+
+import pytest
+
+from benchmarks.identities import generate_identity, resolvers_config
+from didcomm import PackEncryptedConfig, pack_encrypted, wrap_in_forward
+from didcomm.core.anoncrypt import find_anoncrypt_keys
+from didcomm.core.serialization import json_str_to_dict
+
+RESOLVER_LATENCY_S = 0.01
+SAMPLES = 20
+RECIPIENT_DID = "did:example:recipient"
+MEDIATOR_DID = "did:example:mediator{}"
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("depth", [1, 2, 3, 5])
+async def test_wrap_in_forward_with_resolver_latency(depth):
+    recipient = generate_identity(RECIPIENT_DID)
+    mediators = [generate_identity(MEDIATOR_DID.format(i)) for i in range(depth)]
+    config = resolvers_config(
+        recipient, *mediators, resolver_latency_s=RESOLVER_LATENCY_S
+    )
+    packed = await pack_encrypted(
+        config,
+        {"id": "1", "type": "benchmark", "body": {}},
+        to=RECIPIENT_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    packed_msg = json_str_to_dict(packed.packed_msg)
+    routing_keys = [mediator.did_doc.key_agreement[0] for mediator in mediators]
+
+    async def sequential():
+        # routing keys resolved one by one, as a hop-by-hop wrapping does
+        forward_keys = [
+            await find_anoncrypt_keys(routing_key, config)
+            for routing_key in routing_keys
+        ]
+        await wrap_in_forward(
+            config,
+            packed_msg,
+            to=RECIPIENT_DID,
+            routing_keys=routing_keys,
+            forward_keys=forward_keys,
+        )
+
+    async def concurrent():
+        await wrap_in_forward(
+            config, packed_msg, to=RECIPIENT_DID, routing_keys=routing_keys
+        )
+
+    timings = {}
+    for name, sample in [("sequential", sequential), ("concurrent", concurrent)]:
+        start = perf_counter()
+        for _ in range(SAMPLES):
+            await sample()
+        timings[name] = (perf_counter() - start) / SAMPLES * 1000
+
+    print(
+        f"\nwrap_in_forward, {depth} routing keys, {RESOLVER_LATENCY_S * 1000:.0f} ms resolver latency:"
+        f" {timings['sequential']:.1f} ms resolved one by one,"
+        f" {timings['concurrent']:.1f} ms resolved concurrently"
+    )
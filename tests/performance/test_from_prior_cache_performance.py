@@ -0,0 +1,89 @@
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm import (
+    PackEncryptedConfig,
+    disable_from_prior_jwt_cache,
+    disable_verified_from_prior_cache,
+    enable_from_prior_jwt_cache,
+    enable_verified_from_prior_cache,
+    pack_encrypted,
+    pack_plaintext,
+    unpack,
+)
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import (
+    TEST_MESSAGE_FROM_PRIOR,
+    TEST_MESSAGE_FROM_PRIOR_MINIMAL,
+)
+
+SAMPLES = 500
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+async def _pack_us(resolvers_config) -> float:
+    pack_config = PackEncryptedConfig(forward=False)
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        await pack_encrypted(
+            resolvers_config,
+            TEST_MESSAGE_FROM_PRIOR,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            pack_config=pack_config,
+        )
+    return (perf_counter_ns() - start) / SAMPLES / 1e3
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_pack_with_from_prior_jwt_cache(
+    resolvers_config_charlie_rotated_to_alice,
+):
+    disable_from_prior_jwt_cache()
+    try:
+        uncached_us = await _pack_us(resolvers_config_charlie_rotated_to_alice)
+    finally:
+        enable_from_prior_jwt_cache()
+    cached_us = await _pack_us(resolvers_config_charlie_rotated_to_alice)
+    print(
+        f"\npack_encrypted with from_prior: {uncached_us:.1f} us without the JWT cache,"
+        f" {cached_us:.1f} us with it"
+    )
+
+
+async def _unpack_us(resolvers_config, packed_msg) -> float:
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        await unpack(resolvers_config, packed_msg)
+    return (perf_counter_ns() - start) / SAMPLES / 1e3
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_unpack_with_verified_from_prior_cache(
+    resolvers_config_charlie_rotated_to_alice, resolvers_config_bob_with_non_secrets
+):
+    # TEST_MESSAGE_FROM_PRIOR has expired `exp`, so it would not be cached
+    pack_result = await pack_plaintext(
+        resolvers_config_charlie_rotated_to_alice, TEST_MESSAGE_FROM_PRIOR_MINIMAL
+    )
+    uncached_us = await _unpack_us(
+        resolvers_config_bob_with_non_secrets, pack_result.packed_msg
+    )
+    enable_verified_from_prior_cache()
+    try:
+        cached_us = await _unpack_us(
+            resolvers_config_bob_with_non_secrets, pack_result.packed_msg
+        )
+    finally:
+        disable_verified_from_prior_cache()
+    print(
+        f"\nunpack with from_prior: {uncached_us:.1f} us without the verified JWT cache,"
+        f" {cached_us:.1f} us with it"
+    )
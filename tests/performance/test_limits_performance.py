@@ -0,0 +1,66 @@
+import json
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm import (
+    PackEncryptedConfig,
+    UnpackConfig,
+    UnpackLimits,
+    pack_encrypted,
+    unpack,
+)
+from didcomm.errors import MalformedMessageError
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+SAMPLES = 100
+# max_size is not limited by default
+UNPACK_CONFIG = UnpackConfig(limits=UnpackLimits(max_size=10_000_000))
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+async def _rejection_us(resolvers_config, packed_msg) -> float:
+    start = perf_counter_ns()
+    for _ in range(SAMPLES):
+        try:
+            await unpack(resolvers_config, packed_msg, UNPACK_CONFIG)
+        except MalformedMessageError:
+            pass
+        else:
+            raise AssertionError("the message must be rejected")
+    return (perf_counter_ns() - start) / SAMPLES / 1e3
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_rejection_cost_of_oversized_messages(
+    resolvers_config_alice_with_non_secrets, resolvers_config_bob_with_non_secrets
+):
+    packed_msg = (
+        await pack_encrypted(
+            resolvers_config_alice_with_non_secrets,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+    ).packed_msg
+    msg = json.loads(packed_msg)
+
+    print()
+    print(f"{'input':>24} {'rejection us':>14}")
+    for size in [20_000_000, 50_000_000, 100_000_000]:
+        oversized = packed_msg.encode() + b" " * size
+        us = await _rejection_us(resolvers_config_bob_with_non_secrets, oversized)
+        print(f"{len(oversized):>18} bytes {us:>14.2f}")
+
+    for copies in [1_000, 10_000, 100_000]:
+        recipients = msg["recipients"] * copies
+        oversized = dict(msg, recipients=recipients)
+        us = await _rejection_us(resolvers_config_bob_with_non_secrets, oversized)
+        print(f"{len(recipients):>13} recipients {us:>14.2f}")
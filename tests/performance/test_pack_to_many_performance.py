@@ -0,0 +1,68 @@
+from time import perf_counter
+
+import pytest
+
+from benchmarks.identities import generate_identity, resolvers_config
+from didcomm import (
+    Message,
+    PackEncryptedConfig,
+    pack_encrypted,
+    pack_encrypted_to_many,
+)
+
+SENDER_DID = "did:example:sender"
+RECIPIENT_DID = "did:example:recipient{}"
+RECIPIENTS_COUNTS = [1, 10, 100, 1000]
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sign_crv", ["Ed25519", "secp256k1"])
+async def test_pack_encrypted_to_many_throughput(sign_crv):
+    sender = generate_identity(SENDER_DID, authentication_crv=sign_crv)
+    recipients = [
+        generate_identity(RECIPIENT_DID.format(i))
+        for i in range(max(RECIPIENTS_COUNTS))
+    ]
+    config = resolvers_config(sender, *recipients)
+    message = Message(
+        id="1234567890",
+        type="http://example.com/protocols/benchmark/1.0/payload",
+        frm=SENDER_DID,
+        body={"payload": "a" * 1000},
+    )
+    pack_config = PackEncryptedConfig(forward=False)
+
+    print()
+    for count in RECIPIENTS_COUNTS:
+        to = [r.did for r in recipients[:count]]
+
+        start = perf_counter()
+        for recipient in to:
+            await pack_encrypted(
+                config,
+                message,
+                to=recipient,
+                frm=SENDER_DID,
+                sign_frm=SENDER_DID,
+                pack_config=pack_config,
+            )
+        per_recipient_s = perf_counter() - start
+
+        start = perf_counter()
+        await pack_encrypted_to_many(
+            config,
+            message,
+            to=to,
+            frm=SENDER_DID,
+            sign_frm=SENDER_DID,
+            pack_config=pack_config,
+        )
+        to_many_s = perf_counter() - start
+
+        print(
+            f"{sign_crv:>9} {count:>5} recipients:"
+            f" pack_encrypted {count / per_recipient_s:8.1f} msgs/s,"
+            f" pack_encrypted_to_many {count / to_many_s:8.1f} msgs/s"
+            f" (x{per_recipient_s / to_many_s:.2f})"
+        )
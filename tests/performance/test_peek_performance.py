@@ -0,0 +1,52 @@
+from time import perf_counter
+
+import pytest
+
+from didcomm import Message, PackEncryptedConfig, pack_encrypted, peek, unpack
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+
+PAYLOAD_SIZES = [1_000, 100_000]
+SAMPLES = 200
+
+
+def _message(payload_size):
+    return Message(
+        id="1234567890",
+        type="http://example.com/protocols/benchmark/1.0/payload",
+        frm=ALICE_DID,
+        to=[BOB_DID],
+        body={"payload": "a" * payload_size},
+    )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload_size", PAYLOAD_SIZES)
+async def test_peek_vs_unpack(
+    payload_size,
+    resolvers_config_alice_with_non_secrets,
+    resolvers_config_bob_with_non_secrets,
+):
+    packed = await pack_encrypted(
+        resolvers_config_alice_with_non_secrets,
+        _message(payload_size),
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+
+    start = perf_counter()
+    for _ in range(SAMPLES):
+        peek(packed.packed_msg)
+    peek_us = (perf_counter() - start) / SAMPLES * 1_000_000
+
+    start = perf_counter()
+    for _ in range(SAMPLES):
+        await unpack(resolvers_config_bob_with_non_secrets, packed.packed_msg)
+    unpack_us = (perf_counter() - start) / SAMPLES * 1_000_000
+
+    print(
+        f"\nauthcrypted and signed message [{payload_size} bytes]:"
+        f" peek {peek_us:.1f} us, unpack {unpack_us:.1f} us ({unpack_us / peek_us:.0f}x)"
+    )
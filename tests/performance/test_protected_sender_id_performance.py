@@ -0,0 +1,90 @@
+from time import perf_counter_ns
+
+import pytest
+
+from benchmarks.runner import percentile
+from didcomm import Message, PackEncryptedConfig, pack_encrypted
+from didcomm.common.algorithms import AnonCryptAlg
+from didcomm.core.anoncrypt import anoncrypt, anoncrypt_authcrypted
+from didcomm.core.authcrypt import find_keys_and_authcrypt
+from didcomm.core.serialization import dict_to_json, jwe_to_json
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+
+PAYLOAD_SIZES = [1_000, 100_000, 1_000_000]
+SAMPLES = 50
+
+
+def _message(payload_size):
+    return Message(
+        id="1234567890",
+        type="http://example.com/protocols/benchmark/1.0/payload",
+        frm=ALICE_DID,
+        to=[BOB_DID],
+        body={"payload": "a" * payload_size},
+    )
+
+
+def _protect_and_serialize_reserializing(authcrypt_result, alg):
+    return dict_to_json(
+        anoncrypt(authcrypt_result.msg, authcrypt_result.to_keys, alg).msg
+    )
+
+
+def _protect_and_serialize_fused(authcrypt_result, alg):
+    return jwe_to_json(anoncrypt_authcrypted(authcrypt_result, alg).msg)
+
+
+def dump_res(name, payload_size, samples):
+    samples = sorted(samples)
+    print(
+        f"\nbenchmark of {name} [{payload_size} bytes]:"
+        f" p50 {percentile(samples, 50):8.3f} ms, p99 {percentile(samples, 99):8.3f} ms"
+    )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload_size", PAYLOAD_SIZES)
+@pytest.mark.parametrize(
+    "protect",
+    [_protect_and_serialize_reserializing, _protect_and_serialize_fused],
+)
+async def test_protect_sender_id(
+    payload_size, protect, resolvers_config_alice_all_in_secrets
+):
+    alg = AnonCryptAlg.XC20P_ECDH_ES_A256KW
+    authcrypt_result = await find_keys_and_authcrypt(
+        _message(payload_size).as_dict(),
+        BOB_DID,
+        ALICE_DID,
+        PackEncryptedConfig().enc_alg_auth,
+        resolvers_config_alice_all_in_secrets,
+    )
+    samples = []
+    for _ in range(SAMPLES):
+        start = perf_counter_ns()
+        protect(authcrypt_result, alg)
+        samples.append((perf_counter_ns() - start) / 1_000_000)
+    dump_res(protect.__name__.strip("_"), payload_size, samples)
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("payload_size", PAYLOAD_SIZES)
+async def test_pack_encrypted_protect_sender_id(
+    payload_size, resolvers_config_alice_all_in_secrets
+):
+    message = _message(payload_size)
+    pack_config = PackEncryptedConfig(protect_sender_id=True, forward=False)
+    samples = []
+    for _ in range(SAMPLES):
+        start = perf_counter_ns()
+        await pack_encrypted(
+            resolvers_config_alice_all_in_secrets,
+            message,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            pack_config=pack_config,
+        )
+        samples.append((perf_counter_ns() - start) / 1_000_000)
+    dump_res("pack_encrypted with protect_sender_id", payload_size, samples)
@@ -0,0 +1,60 @@
+from time import perf_counter
+
+import pytest
+
+from didcomm import Secret, SecretsResolverInMemory, SecretsResolverRouter
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.common.types import (
+    VerificationMaterial,
+    VerificationMaterialFormat,
+    VerificationMethodType,
+)
+from tests.unit.common import ResolversLatency
+
+TENANTS_COUNT = 50_000
+LOOKUP_TENANTS = 5
+LATENCY_S = 0.02
+SAMPLES = 10_000
+
+
+def _secret(tenant: int) -> Secret:
+    return Secret(
+        kid=f"did:web:tenant{tenant}.example.com#key-1",
+        type=VerificationMethodType.JSON_WEB_KEY_2020,
+        verification_material=VerificationMaterial(
+            format=VerificationMaterialFormat.JWK, value="{}"
+        ),
+    )
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_route_with_many_tenants():
+    latency = ResolversLatency(LATENCY_S)
+
+    async def load(tenant_id):
+        secrets_resolver = SecretsResolverInMemory([_secret(int(tenant_id))])
+        return latency.wrap(ResolversConfig(secrets_resolver, None)).secrets_resolver
+
+    router = SecretsResolverRouter(load)
+    for tenant in range(TENANTS_COUNT):
+        router.add_tenant(str(tenant), [f"did:web:tenant{tenant}.example.com"])
+
+    kid = _secret(TENANTS_COUNT - 1).kid
+    start = perf_counter()
+    for _ in range(SAMPLES):
+        router.route(kid)
+    route_us = (perf_counter() - start) / SAMPLES * 1_000_000
+
+    kids = [_secret(tenant).kid for tenant in range(LOOKUP_TENANTS)]
+    # the first lookup loads the tenants
+    await router.get_keys(kids)
+    start = perf_counter()
+    assert await router.get_keys(kids) == kids
+    get_keys_ms = (perf_counter() - start) * 1000
+
+    print(
+        f"\n{TENANTS_COUNT} tenants: route {route_us:.2f} us;"
+        f" get_keys for {LOOKUP_TENANTS} tenants with {LATENCY_S * 1000:.0f} ms latency"
+        f" {get_keys_ms:.1f} ms (one by one: {LOOKUP_TENANTS * LATENCY_S * 1000:.0f} ms)"
+    )
@@ -0,0 +1,49 @@
+import importlib
+
+import didcomm
+from benchmarks.startup import import_times, loaded_modules, measure_startup
+
+HEAVY_DEPENDENCIES = {"authlib", "pydid", "pydantic", "attr", "base58", "varint"}
+
+
+def _top_level_packages(modules):
+    return {m.split(".")[0] for m in modules}
+
+
+def test_import_didcomm_does_not_load_dependencies():
+    loaded = loaded_modules("import didcomm")
+    assert not _top_level_packages(loaded) & HEAVY_DEPENDENCIES
+    assert not {m for m in loaded if m.startswith("didcomm.")}
+
+
+def test_message_does_not_load_crypto():
+    loaded = loaded_modules("from didcomm import Message")
+    assert "didcomm.message" in loaded
+    assert not {m for m in loaded if m.startswith("authlib.jose")}
+    assert "didcomm.pack_encrypted" not in loaded
+
+
+def test_exports_are_resolved_lazily():
+    assert set(didcomm.__all__) <= set(dir(didcomm))
+    for name in didcomm.__all__:
+        assert getattr(didcomm, name) is not None
+    # submodules named like the functions they export do not shadow them
+    importlib.import_module("didcomm.unpack")
+    assert callable(didcomm.unpack)
+    assert didcomm.unpack.__module__ == "didcomm.unpack"
+
+
+def test_startup_benchmark():
+    times = import_times("import didcomm")
+    assert "didcomm" in times
+
+    [import_didcomm, pack_encrypted] = measure_startup(
+        {
+            "import_didcomm": "import didcomm",
+            "pack_encrypted": "from didcomm import pack_encrypted",
+        },
+        runs=3,
+    )
+    assert import_didcomm.id == "startup[target=import_didcomm]"
+    # the package itself is an order of magnitude cheaper than the API it exports
+    assert import_didcomm.p50_ms * 5 < pack_encrypted.p50_ms
@@ -0,0 +1,72 @@
+import base64
+import io
+import json
+import tracemalloc
+from time import perf_counter_ns
+
+import pytest
+
+from didcomm import unpack
+from didcomm.core.utils import calculate_apv
+from didcomm.errors import DIDUrlNotFoundError
+
+KID = "did:example:unknown#key-x25519-1"
+CIPHERTEXT_SIZES = [1_000_000, 10_000_000, 50_000_000]
+
+
+def _envelope(ciphertext_size: int) -> bytes:
+    # an anoncrypted envelope addressed to a key unknown to Bob
+    protected = {
+        "typ": "application/didcomm-encrypted+json",
+        "alg": "ECDH-ES+A256KW",
+        "enc": "XC20P",
+        "apv": calculate_apv([KID]),
+        "epk": {"kty": "OKP", "crv": "X25519", "x": "a" * 43},
+    }
+    protected = base64.urlsafe_b64encode(json.dumps(protected).encode()).decode()
+    return json.dumps(
+        {
+            "protected": protected.rstrip("="),
+            "recipients": [
+                {
+                    "header": {"kid": KID},
+                    "encrypted_key": "a" * 54,
+                }
+            ],
+            "iv": "a" * 32,
+            "ciphertext": "a" * ciphertext_size,
+            "tag": "a" * 22,
+        }
+    ).encode()
+
+
+async def _measure(resolvers_config, make_input):
+    tracemalloc.start()
+    start = perf_counter_ns()
+    try:
+        await unpack(resolvers_config, make_input())
+    except DIDUrlNotFoundError:
+        pass
+    elapsed_ms = (perf_counter_ns() - start) / 1e6
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 2**20
+
+
+@pytest.mark.skip(reason="disabled to skip on CI")
+@pytest.mark.asyncio
+async def test_reject_unknown_recipient_stream_vs_bytes(
+    resolvers_config_bob_with_non_secrets,
+):
+    print()
+    print(f"{'ciphertext':>12} {'input':>8} {'time ms':>10} {'peak MiB':>10}")
+    for size in CIPHERTEXT_SIZES:
+        data = _envelope(size)
+        for name, make_input in [
+            ("bytes", lambda: data),
+            ("stream", lambda: io.BytesIO(data)),
+        ]:
+            elapsed_ms, peak_mib = await _measure(
+                resolvers_config_bob_with_non_secrets, make_input
+            )
+            print(f"{size:>12} {name:>8} {elapsed_ms:>10.2f} {peak_mib:>10.2f}")
@@ -1,8 +1,14 @@
+import asyncio
 import copy
+from typing import List, Optional
 
 from authlib.common.encoding import json_loads
 
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.common.types import DID, DID_URL
 from didcomm.core.utils import parse_base64url_encoded_json
+from didcomm.did_doc.did_resolver import DIDResolver
+from didcomm.secrets.secrets_resolver import Secret, SecretsResolver
 from didcomm.unpack import unpack, Metadata
 from tests.test_vectors.common import TTestVector
 from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
@@ -37,3 +43,57 @@ async def check_unpack_test_vector(test_vector: TTestVector, resolvers_config):
     unpack_result = await unpack(resolvers_config, test_vector.value)
     assert unpack_result.message == TEST_MESSAGE
     assert unpack_result.metadata == test_vector.metadata
+
+
+class ResolversLatency:
+    """
+    Injects latency into DID and secrets resolvers
+    and tracks how many of their calls are in flight at once.
+    """
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def wrap(self, resolvers_config: ResolversConfig) -> ResolversConfig:
+        return ResolversConfig(
+            secrets_resolver=_SlowSecretsResolver(
+                resolvers_config.secrets_resolver, self
+            ),
+            did_resolver=_SlowDIDResolver(resolvers_config.did_resolver, self),
+        )
+
+    async def delay(self, call: str):
+        self.calls.append(call)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_s)
+        finally:
+            self.in_flight -= 1
+
+
+class _SlowDIDResolver(DIDResolver):
+    def __init__(self, did_resolver: DIDResolver, latency: ResolversLatency):
+        self._did_resolver = did_resolver
+        self._latency = latency
+
+    async def resolve(self, did: DID):
+        await self._latency.delay(f"resolve {did}")
+        return await self._did_resolver.resolve(did)
+
+
+class _SlowSecretsResolver(SecretsResolver):
+    def __init__(self, secrets_resolver: SecretsResolver, latency: ResolversLatency):
+        self._secrets_resolver = secrets_resolver
+        self._latency = latency
+
+    async def get_key(self, kid: DID_URL) -> Optional[Secret]:
+        await self._latency.delay(f"get_key {kid}")
+        return await self._secrets_resolver.get_key(kid)
+
+    async def get_keys(self, kids: List[DID_URL]) -> List[DID_URL]:
+        await self._latency.delay(f"get_keys {kids}")
+        return await self._secrets_resolver.get_keys(kids)
@@ -0,0 +1,227 @@
+import pytest
+from authlib.common.encoding import to_unicode, urlsafe_b64encode
+
+from didcomm.common.types import DIDCommMessageTypes
+from didcomm.core.crypto.backend import (
+    create_crypto_backend,
+    get_crypto_backend,
+    set_crypto_backend,
+)
+from didcomm.core.jwe import ZIP_DEFLATE
+from didcomm.core.types import Key
+from didcomm.core.utils import calculate_apv, extract_key
+from didcomm.errors import (
+    DIDCommValueError,
+    MalformedMessageError,
+    MalformedMessageCode,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_anon_encrypted import (
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_ANON,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_auth_encrypted import (
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_signed import (
+    TEST_SIGNED_DIDCOMM_MESSAGE,
+)
+from tests.test_vectors.utils import (
+    KeyAgreementCurveType,
+    Person,
+    get_auth_secrets,
+    get_key_agreement_secrets,
+)
+from tests.unit.common import check_unpack_test_vector
+
+BACKENDS = ["authlib", "cryptography"]
+CURVES = [
+    KeyAgreementCurveType.X25519,
+    KeyAgreementCurveType.P256,
+    KeyAgreementCurveType.P384,
+    KeyAgreementCurveType.P521,
+]
+ANON_ENCS = ["A256CBC-HS512", "A256GCM", "XC20P"]
+PAYLOAD = b'{"id":"1234567890","body":{"messagespecificattribute":"and its value"}}'
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = get_crypto_backend()
+    yield set_crypto_backend(request.param)
+    set_crypto_backend(previous)
+
+
+@pytest.fixture()
+def fast_backend():
+    backend = create_crypto_backend("cryptography")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Authlib fallback must not be used")
+
+    backend._fallback.encrypt = fail
+    backend._fallback.decrypt = fail
+    backend._fallback.sign = fail
+    backend._fallback.verify = fail
+    return backend
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_all_in_secrets):
+    return resolvers_config_bob_all_in_secrets
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_all_in_secrets):
+    return did_resolver_all_in_secrets
+
+
+def _keys(secrets):
+    return [Key(kid=s.kid, key=extract_key(s)) for s in secrets]
+
+
+def _protected(alg, enc, to, frm=None, zip=False):
+    protected = {
+        "typ": DIDCommMessageTypes.ENCRYPTED.value,
+        "alg": alg,
+        "enc": enc,
+        "apv": calculate_apv([k.kid for k in to]),
+    }
+    if frm is not None:
+        protected["apu"] = _b64(frm.kid)
+        protected["skid"] = frm.kid
+    if zip:
+        protected["zip"] = ZIP_DEFLATE
+    return protected
+
+
+def _b64(value: str) -> str:
+    return to_unicode(urlsafe_b64encode(value.encode()))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "test_vector",
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_ANON
+    + TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH
+    + TEST_SIGNED_DIDCOMM_MESSAGE,
+)
+async def test_unpack_spec_test_vectors(backend, test_vector, resolvers_config_bob):
+    await check_unpack_test_vector(test_vector, resolvers_config_bob)
+
+
+@pytest.mark.parametrize("decrypt_backend", BACKENDS)
+@pytest.mark.parametrize("encrypt_backend", BACKENDS)
+@pytest.mark.parametrize("enc", ANON_ENCS)
+@pytest.mark.parametrize("curve", CURVES)
+def test_anoncrypt_interoperability(curve, enc, encrypt_backend, decrypt_backend):
+    to = _keys(get_key_agreement_secrets(Person.BOB, curve))
+    jwe = create_crypto_backend(encrypt_backend).encrypt(
+        _protected("ECDH-ES+A256KW", enc, to), to, PAYLOAD
+    )
+    for to_key in to:
+        payload, protected = create_crypto_backend(decrypt_backend).decrypt(jwe, to_key)
+        assert payload == PAYLOAD
+        assert protected["enc"] == enc
+
+
+@pytest.mark.parametrize("decrypt_backend", BACKENDS)
+@pytest.mark.parametrize("encrypt_backend", BACKENDS)
+@pytest.mark.parametrize(
+    "curve",
+    [
+        KeyAgreementCurveType.X25519,
+        KeyAgreementCurveType.P256,
+        KeyAgreementCurveType.P521,
+    ],
+)
+def test_authcrypt_interoperability(curve, encrypt_backend, decrypt_backend):
+    frm = _keys(get_key_agreement_secrets(Person.ALICE, curve))[0]
+    to = _keys(get_key_agreement_secrets(Person.BOB, curve))
+    jwe = create_crypto_backend(encrypt_backend).encrypt(
+        _protected("ECDH-1PU+A256KW", "A256CBC-HS512", to, frm), to, PAYLOAD, frm
+    )
+    for to_key in to:
+        payload, _ = create_crypto_backend(decrypt_backend).decrypt(
+            jwe, to_key, sender_key=frm.key
+        )
+        assert payload == PAYLOAD
+
+
+@pytest.mark.parametrize("verify_backend", BACKENDS)
+@pytest.mark.parametrize("sign_backend", BACKENDS)
+@pytest.mark.parametrize("secret", get_auth_secrets(Person.ALICE), ids=lambda s: s.kid)
+def test_sign_interoperability(secret, sign_backend, verify_backend):
+    key = extract_key(secret)
+    alg = {"Ed25519": "EdDSA", "P-256": "ES256", "secp256k1": "ES256K"}[key["crv"]]
+    jws = create_crypto_backend(sign_backend).sign(
+        {"typ": DIDCommMessageTypes.SIGNED.value, "alg": alg}, secret.kid, PAYLOAD, key
+    )
+    assert jws["signatures"][0]["header"] == {"kid": secret.kid}
+    assert create_crypto_backend(verify_backend).verify(jws, key) == PAYLOAD
+
+
+@pytest.mark.parametrize("enc", ANON_ENCS)
+@pytest.mark.parametrize("curve", CURVES)
+def test_cryptography_backend_does_not_fall_back(fast_backend, curve, enc):
+    to = _keys(get_key_agreement_secrets(Person.BOB, curve))
+    jwe = fast_backend.encrypt(
+        _protected("ECDH-ES+A256KW", enc, to, zip=True), to, PAYLOAD
+    )
+    assert fast_backend.decrypt(jwe, to[-1])[0] == PAYLOAD
+
+    frm = _keys(get_auth_secrets(Person.ALICE))[0]
+    jws = fast_backend.sign(
+        {"typ": DIDCommMessageTypes.SIGNED.value, "alg": "EdDSA"},
+        frm.kid,
+        PAYLOAD,
+        frm.key,
+    )
+    assert fast_backend.verify(jws, frm.key) == PAYLOAD
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+def test_invalid_signature(backend_name):
+    secret = get_auth_secrets(Person.ALICE)[0]
+    key = extract_key(secret)
+    backend = create_crypto_backend(backend_name)
+    jws = backend.sign(
+        {"typ": DIDCommMessageTypes.SIGNED.value, "alg": "EdDSA"},
+        secret.kid,
+        PAYLOAD,
+        key,
+    )
+    jws["payload"] = _b64('{"id":"tampered"}')
+    with pytest.raises(MalformedMessageError) as exc_info:
+        backend.verify(jws, key)
+    assert exc_info.value.code == MalformedMessageCode.INVALID_SIGNATURE
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+def test_decompressed_too_large(backend_name):
+    to = _keys(get_key_agreement_secrets(Person.BOB, KeyAgreementCurveType.X25519))
+    backend = create_crypto_backend(backend_name)
+    payload = b"0" * 10_000
+    jwe = backend.encrypt(
+        _protected("ECDH-ES+A256KW", "XC20P", to, zip=True), to, payload
+    )
+    assert backend.decrypt(jwe, to[0])[0] == payload
+    with pytest.raises(MalformedMessageError) as exc_info:
+        backend.decrypt(jwe, to[0], max_decompressed_size=1000)
+    assert exc_info.value.code == MalformedMessageCode.DECOMPRESSED_TOO_LARGE
+
+
+def test_set_crypto_backend():
+    previous = get_crypto_backend()
+    try:
+        assert set_crypto_backend("cryptography").name == "cryptography"
+        assert get_crypto_backend().name == "cryptography"
+        backend = create_crypto_backend("authlib")
+        assert set_crypto_backend(backend) is backend
+        assert get_crypto_backend() is backend
+        assert set_crypto_backend().name == "authlib"
+    finally:
+        set_crypto_backend(previous)
+
+
+def test_unknown_crypto_backend():
+    with pytest.raises(DIDCommValueError):
+        create_crypto_backend("unknown")
@@ -0,0 +1,134 @@
+import copy
+import pickle
+
+import pytest
+
+from didcomm import VerificationMethod, VerificationMethodType
+from tests.test_vectors.did_doc.did_doc_alice import DID_DOC_ALICE_WITH_NO_SECRETS
+from tests.unit.conftest import build_did_doc, build_didcomm_service
+
+
+def _verification_method(id):
+    return VerificationMethod(
+        id=id,
+        controller="did:example:1",
+        type=VerificationMethodType.JSON_WEB_KEY_2020,
+        public_key_jwk={
+            "kty": "OKP",
+            "crv": "X25519",
+            "x": "GDTrI66K0pFfO54tlCSvfjjNapIs44dzpneBgyx0S3E",
+        },
+    )
+
+
+def test_get_verification_method():
+    did_doc = DID_DOC_ALICE_WITH_NO_SECRETS
+    for vm in did_doc.verification_method:
+        assert did_doc.get_verification_method(vm.id) is vm
+    assert did_doc.get_verification_method("did:example:alice#unknown") is None
+
+
+def test_get_didcomm_service():
+    service = build_didcomm_service()
+    did_doc = build_did_doc(service=[service])
+    assert did_doc.get_didcomm_service(service.id) == service
+    assert did_doc.get_didcomm_service("did:example:1#unknown") is None
+
+
+def test_relationships():
+    did_doc = build_did_doc(
+        key_agreement=["did:example:1#key-1"],
+        authentication=["did:example:1#key-2"],
+        verification_method=[
+            _verification_method("did:example:1#key-1"),
+            _verification_method("did:example:1#key-2"),
+        ],
+    )
+    assert did_doc.has_key_agreement("did:example:1#key-1")
+    assert not did_doc.has_key_agreement("did:example:1#key-2")
+    assert did_doc.has_authentication("did:example:1#key-2")
+    assert not did_doc.has_authentication("did:example:1#key-1")
+
+
+def test_empty_did_doc():
+    did_doc = build_did_doc()
+    assert did_doc.get_verification_method("did:example:1#key-1") is None
+    assert did_doc.get_didcomm_service("did:example:1#service") is None
+    assert not did_doc.has_key_agreement("did:example:1#key-1")
+    assert not did_doc.has_authentication("did:example:1#key-1")
+
+
+def test_index_is_built_once_and_not_serialized():
+    did_doc = copy.deepcopy(DID_DOC_ALICE_WITH_NO_SECRETS)
+    did_doc.get_verification_method(did_doc.verification_method[0].id)
+    index = did_doc._didcomm_index
+    assert index is not None
+    did_doc.has_key_agreement(did_doc.verification_method[0].id)
+    assert did_doc._didcomm_index is index
+    assert did_doc == DID_DOC_ALICE_WITH_NO_SECRETS
+    assert "_didcomm_index" not in did_doc.serialize()
+
+
+def test_index_is_rebuilt_for_copy_with_update():
+    did_doc = build_did_doc(
+        verification_method=[_verification_method("did:example:1#key-1")],
+        key_agreement=["did:example:1#key-1"],
+    )
+    assert did_doc.has_key_agreement("did:example:1#key-1")
+
+    updated = did_doc.copy(
+        update={
+            "verification_method": [_verification_method("did:example:1#key-2")],
+            "key_agreement": ["did:example:1#key-2"],
+        }
+    )
+    assert updated.get_verification_method("did:example:1#key-1") is None
+    assert updated.get_verification_method("did:example:1#key-2") is not None
+    assert not updated.has_key_agreement("did:example:1#key-1")
+    assert updated.has_key_agreement("did:example:1#key-2")
+    # the original DID Doc is not affected
+    assert did_doc.has_key_agreement("did:example:1#key-1")
+
+
+def test_index_is_rebuilt_after_invalidate():
+    did_doc = build_did_doc(
+        verification_method=[_verification_method("did:example:1#key-1")],
+    )
+    assert did_doc.get_verification_method("did:example:1#key-2") is None
+
+    did_doc.verification_method[0] = _verification_method("did:example:1#key-2")
+    did_doc.authentication.append("did:example:1#key-2")
+    # the lists are not checked for changes on lookups
+    assert did_doc.get_verification_method("did:example:1#key-2") is None
+    assert not did_doc.has_authentication("did:example:1#key-2")
+
+    did_doc.invalidate_index()
+    assert did_doc.get_verification_method("did:example:1#key-1") is None
+    assert did_doc.get_verification_method("did:example:1#key-2") is not None
+    assert did_doc.has_authentication("did:example:1#key-2")
+
+
+@pytest.mark.parametrize(
+    "copy_did_doc",
+    [
+        copy.copy,
+        copy.deepcopy,
+        lambda did_doc: did_doc.copy(),
+        lambda did_doc: did_doc.copy(deep=True),
+        lambda did_doc: pickle.loads(pickle.dumps(did_doc)),
+    ],
+)
+def test_index_is_not_copied(copy_did_doc):
+    did_doc = build_did_doc(
+        verification_method=[_verification_method("did:example:1#key-1")],
+    )
+    assert did_doc.get_verification_method("did:example:1#key-1") is not None
+
+    copied = copy_did_doc(did_doc)
+
+    assert copied._didcomm_index is None
+    assert copied == did_doc
+    assert copied.get_verification_method("did:example:1#key-1") is (
+        copied.verification_method[0]
+    )
+    assert did_doc._didcomm_index is not None
@@ -0,0 +1,184 @@
+import pytest
+
+from didcomm import (
+    DIDDocCompact,
+    DIDResolverInMemory,
+    ResolversConfig,
+    pack_encrypted,
+    PackEncryptedConfig,
+    unpack,
+)
+from didcomm.errors import DIDCommValueError
+from didcomm.protocols.routing.forward import unpack_forward
+from tests.test_vectors.common import ALICE_DID, BOB_DID, CHARLIE_DID
+from tests.test_vectors.did_doc import (
+    DID_DOC_ALICE_WITH_NO_SECRETS,
+    DID_DOC_BOB_WITH_NO_SECRETS,
+    DID_DOC_CHARLIE,
+    DID_DOC_MEDIATOR1,
+    DID_DOC_MEDIATOR2,
+)
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+DID_DOCS = [
+    DID_DOC_ALICE_WITH_NO_SECRETS,
+    DID_DOC_BOB_WITH_NO_SECRETS,
+    DID_DOC_CHARLIE,
+    DID_DOC_MEDIATOR1,
+    DID_DOC_MEDIATOR2,
+]
+
+
+@pytest.fixture()
+def did_resolver_compact():
+    return DIDResolverInMemory(
+        [DIDDocCompact.from_json(did_doc.to_json()) for did_doc in DID_DOCS]
+    )
+
+
+def _resolvers_config(secrets_resolver, did_resolver):
+    return ResolversConfig(secrets_resolver=secrets_resolver, did_resolver=did_resolver)
+
+
+@pytest.mark.parametrize("did_doc", DID_DOCS)
+def test_from_dict_is_equivalent_to_did_doc(did_doc):
+    compact = DIDDocCompact.from_dict(did_doc.serialize())
+
+    assert compact.id == did_doc.id
+    assert compact.authentication == did_doc.authentication
+    assert compact.key_agreement == did_doc.key_agreement
+    assert [vm.id for vm in compact.verification_method] == [
+        vm.id for vm in did_doc.verification_method
+    ]
+    for vm in did_doc.verification_method:
+        compact_vm = compact.get_verification_method(vm.id)
+        assert compact_vm.type == vm.type
+        assert compact_vm.public_key_jwk == vm.public_key_jwk
+        assert compact_vm.public_key_multibase == getattr(
+            vm, "public_key_multibase", None
+        )
+        assert compact.has_key_agreement(vm.id) == did_doc.has_key_agreement(vm.id)
+        assert compact.has_authentication(vm.id) == did_doc.has_authentication(vm.id)
+    for service in did_doc.service or []:
+        compact_service = compact.get_didcomm_service(service.id)
+        assert compact_service.service_endpoint == service.service_endpoint
+        assert compact_service.routing_keys == service.routing_keys
+        assert compact_service.accept == service.accept
+
+
+def test_from_json_is_lazy():
+    did_doc = DIDDocCompact.from_json(b"not a json")
+    with pytest.raises(DIDCommValueError):
+        did_doc.key_agreement
+
+
+def test_from_json_equals_from_dict():
+    assert DIDDocCompact.from_json(
+        DID_DOC_BOB_WITH_NO_SECRETS.to_json()
+    ) == DIDDocCompact.from_dict(DID_DOC_BOB_WITH_NO_SECRETS.serialize())
+
+
+def test_relative_ids_and_embedded_methods():
+    did_doc = DIDDocCompact.from_dict(
+        {
+            "id": "did:example:1",
+            "verificationMethod": [
+                {
+                    "id": "#key-1",
+                    "type": "JsonWebKey2020",
+                    "controller": "did:example:1",
+                    "publicKeyJwk": {"kty": "OKP", "crv": "X25519", "x": "abc"},
+                }
+            ],
+            "keyAgreement": ["#key-1"],
+            "authentication": [
+                {
+                    "id": "did:example:1#key-2",
+                    "type": "JsonWebKey2020",
+                    "controller": "did:example:1",
+                    "publicKeyJwk": {"kty": "OKP", "crv": "Ed25519", "x": "abc"},
+                }
+            ],
+            "service": [
+                {
+                    "id": "#didcomm-1",
+                    "type": "DIDCommMessaging",
+                    "serviceEndpoint": {
+                        "uri": "https://example.com",
+                        "accept": ["didcomm/v2"],
+                        "routingKeys": ["did:example:mediator#key-1"],
+                    },
+                },
+                {
+                    "id": "#linked-domain",
+                    "type": "LinkedDomains",
+                    "serviceEndpoint": "https://example.com",
+                },
+            ],
+        }
+    )
+    assert did_doc.key_agreement == ["did:example:1#key-1"]
+    assert did_doc.authentication == ["did:example:1#key-2"]
+    assert did_doc.get_verification_method("did:example:1#key-1") is not None
+    assert did_doc.get_verification_method("did:example:1#key-2") is not None
+    assert [s.id for s in did_doc.service] == ["did:example:1#didcomm-1"]
+    service = did_doc.get_didcomm_service("did:example:1#didcomm-1")
+    assert service.service_endpoint == "https://example.com"
+    assert service.accept == ["didcomm/v2"]
+    assert service.routing_keys == ["did:example:mediator#key-1"]
+
+
+def test_from_dict_invalid():
+    with pytest.raises(DIDCommValueError):
+        DIDDocCompact.from_dict({"verificationMethod": []})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frm", [None, ALICE_DID])
+@pytest.mark.parametrize("sign_frm", [None, ALICE_DID])
+@pytest.mark.parametrize("protect_sender_id", [True, False])
+async def test_pack_unpack_with_compact_did_docs(
+    frm,
+    sign_frm,
+    protect_sender_id,
+    did_resolver_compact,
+    secrets_resolver_alice,
+    secrets_resolver_bob,
+):
+    pack_result = await pack_encrypted(
+        _resolvers_config(secrets_resolver_alice, did_resolver_compact),
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=frm,
+        sign_frm=sign_frm,
+        pack_config=PackEncryptedConfig(
+            protect_sender_id=protect_sender_id, forward=False
+        ),
+    )
+    unpack_result = await unpack(
+        _resolvers_config(secrets_resolver_bob, did_resolver_compact),
+        pack_result.packed_msg,
+    )
+    assert unpack_result.message == TEST_MESSAGE
+    assert unpack_result.metadata.encrypted_to == pack_result.to_kids
+    assert unpack_result.metadata.encrypted_from == pack_result.from_kid
+    assert unpack_result.metadata.sign_from == pack_result.sign_from_kid
+
+
+@pytest.mark.asyncio
+async def test_forward_with_compact_did_docs(
+    did_resolver_compact, secrets_resolver_alice, secrets_resolver_mediator2
+):
+    pack_result = await pack_encrypted(
+        _resolvers_config(secrets_resolver_alice, did_resolver_compact),
+        dict(TEST_MESSAGE.as_dict(), to=[CHARLIE_DID]),
+        to=CHARLIE_DID,
+    )
+    assert pack_result.service_metadata.service_endpoint == "http://example.com/path"
+
+    forward_result = await unpack_forward(
+        _resolvers_config(secrets_resolver_mediator2, did_resolver_compact),
+        pack_result.packed_msg,
+        True,
+    )
+    assert forward_result.forward_msg.body.next == "did:example:mediator1#key-x25519-1"
@@ -0,0 +1,125 @@
+import pytest
+from authlib.common.encoding import urlsafe_b64decode, to_bytes
+
+from didcomm import (
+    DIDResolverKey,
+    Message,
+    ResolversConfig,
+    SecretsResolverInMemory,
+    pack_encrypted,
+    pack_signed,
+    unpack,
+)
+from didcomm.common.types import VerificationMethodType
+from didcomm.core.utils import encode_public_key_multibase
+from didcomm.secrets.secrets_util import (
+    jwk_to_secret,
+    generate_ed25519_keys_as_jwk_dict,
+    generate_x25519_keys_as_jwk_dict,
+)
+
+DID_KEY_ED25519 = "did:key:z6MkhaXgBZDvotDkL5257faiztiGiC2QtKLGpbnnEGta2doK"
+DID_KEY_ED25519_X25519_KID = (
+    DID_KEY_ED25519 + "#z6LSj72tK8brWgZja8NLRwPigth2T9QRiG1uH9oKZuKjdh9p"
+)
+
+
+def _did_key_with_secret(private_jwk: dict):
+    multibase = encode_public_key_multibase(
+        private_jwk["crv"], urlsafe_b64decode(to_bytes(private_jwk["x"]))
+    )
+    did = f"did:key:{multibase}"
+    private_jwk["kid"] = f"{did}#{multibase}"
+    return did, jwk_to_secret(private_jwk)
+
+
+def _message(frm, to):
+    return Message(
+        id="1234567890",
+        type="http://example.com/protocols/lets_do_lunch/1.0/proposal",
+        frm=frm,
+        to=[to],
+        body={"messagespecificattribute": "and its value"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_ed25519_did_key():
+    did_doc = await DIDResolverKey().resolve(DID_KEY_ED25519)
+
+    ed25519_kid = f"{DID_KEY_ED25519}#{DID_KEY_ED25519[len('did:key:'):]}"
+    assert did_doc.id == DID_KEY_ED25519
+    assert did_doc.authentication == [ed25519_kid]
+    assert did_doc.key_agreement == [DID_KEY_ED25519_X25519_KID]
+    assert (
+        did_doc.get_verification_method(ed25519_kid).type
+        == VerificationMethodType.ED25519_VERIFICATION_KEY_2020
+    )
+    assert (
+        did_doc.get_verification_method(DID_KEY_ED25519_X25519_KID).type
+        == VerificationMethodType.X25519_KEY_AGREEMENT_KEY_2020
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_x25519_did_key():
+    did = "did:key:z6LSj72tK8brWgZja8NLRwPigth2T9QRiG1uH9oKZuKjdh9p"
+    did_doc = await DIDResolverKey().resolve(did)
+    assert did_doc.authentication == []
+    assert did_doc.key_agreement == [
+        did + "#z6LSj72tK8brWgZja8NLRwPigth2T9QRiG1uH9oKZuKjdh9p"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resolve_is_memoized():
+    resolver = DIDResolverKey()
+    assert await resolver.resolve(DID_KEY_ED25519) is await resolver.resolve(
+        DID_KEY_ED25519
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "did",
+    [
+        "did:example:alice",
+        "did:key:",
+        "did:key:6MkhaXgBZDvotDkL5257faiztiGiC2QtKLGpbnnEGta2doK",
+        "did:key:z0000",
+    ],
+)
+async def test_resolve_unsupported(did):
+    assert await DIDResolverKey().resolve(did) is None
+
+
+@pytest.mark.asyncio
+async def test_pack_unpack_with_did_key():
+    bob_did, bob_secret = _did_key_with_secret(generate_x25519_keys_as_jwk_dict()[0])
+    alice_did, alice_secret = _did_key_with_secret(
+        generate_ed25519_keys_as_jwk_dict()[0]
+    )
+    did_resolver = DIDResolverKey()
+    resolvers_config_alice = ResolversConfig(
+        SecretsResolverInMemory([alice_secret]), did_resolver
+    )
+    resolvers_config_bob = ResolversConfig(
+        SecretsResolverInMemory([bob_secret]), did_resolver
+    )
+
+    message = _message(alice_did, bob_did)
+
+    pack_result = await pack_encrypted(
+        resolvers_config_alice, message, to=bob_did, sign_frm=alice_did
+    )
+    assert pack_result.to_kids == [bob_secret.kid]
+    assert pack_result.sign_from_kid == alice_secret.kid
+
+    unpack_result = await unpack(resolvers_config_bob, pack_result.packed_msg)
+    assert unpack_result.message == message
+    assert unpack_result.metadata.encrypted_to == [bob_secret.kid]
+    assert unpack_result.metadata.sign_from == alice_secret.kid
+
+    pack_result = await pack_signed(resolvers_config_alice, message, alice_did)
+    unpack_result = await unpack(resolvers_config_bob, pack_result.packed_msg)
+    assert unpack_result.message == message
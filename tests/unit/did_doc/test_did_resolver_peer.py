@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from authlib.common.encoding import to_unicode, urlsafe_b64encode
+
+from didcomm import DIDResolverPeer
+from didcomm.common.types import VerificationMethodType
+from didcomm.protocols.routing.forward import resolve_did_services_chain
+from didcomm.common.resolvers import ResolversConfig
+
+DID_PEER_2 = (
+    "did:peer:2"
+    ".Ez6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc"
+    ".Vz6MkqRYqQiSgvZQdnBytw86Qbs2ZWUkGv22od935YF4s8M7V"
+    ".Vz6MkgoLTnTypo3tDRwCkZXSccTPHRLhF4ZnjhueYAFpEX6vg"
+    ".SeyJ0IjoiZG0iLCJzIjoiaHR0cHM6Ly9leGFtcGxlLmNvbS9lbmRwb2ludCIsInIiOlsiZGlkOmV4YW1wbGU6c29tZW1lZGlhdG9yI3NvbWVrZXkiXSwiYSI6WyJkaWRjb21tL3YyIiwiZGlkY29tbS9haXAyO2Vudj1yZmM1ODciXX0"
+)
+
+DID_PEER_2_KEY = ".Ez6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc"
+
+
+def _service_element(services) -> str:
+    return ".S" + to_unicode(urlsafe_b64encode(json.dumps(services).encode()))
+
+
+@pytest.mark.asyncio
+async def test_resolve_did_peer_2():
+    did_doc = await DIDResolverPeer().resolve(DID_PEER_2)
+
+    assert did_doc.id == DID_PEER_2
+    assert did_doc.key_agreement == [DID_PEER_2 + "#key-1"]
+    assert did_doc.authentication == [DID_PEER_2 + "#key-2", DID_PEER_2 + "#key-3"]
+
+    key_agreement_method = did_doc.get_verification_method(DID_PEER_2 + "#key-1")
+    assert (
+        key_agreement_method.type
+        == VerificationMethodType.X25519_KEY_AGREEMENT_KEY_2020
+    )
+    assert (
+        key_agreement_method.public_key_multibase
+        == "z6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc"
+    )
+    assert (
+        did_doc.get_verification_method(DID_PEER_2 + "#key-2").type
+        == VerificationMethodType.ED25519_VERIFICATION_KEY_2020
+    )
+
+    service = did_doc.get_didcomm_service(DID_PEER_2 + "#service")
+    assert service.service_endpoint == "https://example.com/endpoint"
+    assert service.routing_keys == ["did:example:somemediator#somekey"]
+    assert service.accept == ["didcomm/v2", "didcomm/aip2;env=rfc587"]
+
+
+@pytest.mark.asyncio
+async def test_resolve_did_peer_2_service_chain(mocker):
+    resolvers_config = ResolversConfig(mocker.Mock(), DIDResolverPeer())
+    services = await resolve_did_services_chain(resolvers_config, DID_PEER_2)
+    assert [s.id for s in services] == [DID_PEER_2 + "#service"]
+
+
+@pytest.mark.asyncio
+async def test_resolve_did_peer_2_services_are_numbered_across_elements():
+    did = (
+        "did:peer:2"
+        + DID_PEER_2_KEY
+        + _service_element([{"t": "other"}, {"t": "dm", "s": "https://a.example"}])
+        + _service_element({"t": "dm", "s": "https://b.example"})
+    )
+    did_doc = await DIDResolverPeer().resolve(did)
+
+    assert [(s.id, s.service_endpoint) for s in did_doc.service] == [
+        (did + "#service-1", "https://a.example"),
+        (did + "#service-2", "https://b.example"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resolve_is_memoized():
+    resolver = DIDResolverPeer()
+    assert await resolver.resolve(DID_PEER_2) is await resolver.resolve(DID_PEER_2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "did",
+    [
+        "did:example:alice",
+        "did:peer:0z6MkqRYqQiSgvZQdnBytw86Qbs2ZWUkGv22od935YF4s8M7V",
+        "did:peer:2",
+        "did:peer:2..Ez6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc",
+        "did:peer:2.Xz6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc",
+        "did:peer:2.Ez6LSbysY2xFMRpGMhb7tFTLMpeuPRaqaWM1yECx2AtzE3KCc.S!!!",
+        "did:peer:2" + DID_PEER_2_KEY + _service_element([1]),
+        "did:peer:2" + DID_PEER_2_KEY + _service_element("dm"),
+        "did:peer:2" + DID_PEER_2_KEY + _service_element([{"t": "dm"}, None]),
+    ],
+)
+async def test_resolve_unsupported(did):
+    assert await DIDResolverPeer().resolve(did) is None
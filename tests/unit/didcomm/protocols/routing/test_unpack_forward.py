@@ -2,7 +2,7 @@ import pytest
 
 from didcomm.errors import MalformedMessageError
 from didcomm.common.types import DID
-from didcomm.core.defaults import DEF_ENC_ALG_ANON
+from didcomm.core.defaults import DEF_ENC_ALG_ANON, DEF_MAX_DECOMPRESSED_SIZE
 from didcomm.core.types import UnpackAnoncryptResult
 from didcomm.core.serialization import dict_to_json_bytes, dict_to_json
 from didcomm.protocols.routing import forward
@@ -48,7 +48,7 @@ async def test_unpack_forward__unpack_anoncrypt_callspec(
 ):
     # to make the logic here: we just check the callspec
     unpack_anoncrypt_mock.side_effect = TypeError
-    callspec = (any_msg_dict, resolvers_config_mock, True)
+    callspec = (any_msg_dict, resolvers_config_mock, True, DEF_MAX_DECOMPRESSED_SIZE)
     try:
         await unpack_forward(resolvers_config_mock, any_msg_json, True)
     except TypeError:
@@ -2,7 +2,8 @@ import pytest
 import dataclasses
 
 from didcomm.common.types import DID, DIDCommMessageProtocolTypes
-from didcomm.core.types import EncryptResult
+from didcomm.core.types import EncryptResult, Key
+from didcomm.errors import DIDCommValueError
 from didcomm.protocols.routing import forward
 from didcomm.protocols.routing.forward import (
     wrap_in_forward,
@@ -36,10 +37,10 @@ def encrypt_result2(
 
 
 @pytest.fixture
-def find_keys_and_anoncrypt_mock(
+def anoncrypt_mock(
     mocker, encrypt_result1: EncryptResult, encrypt_result2: EncryptResult
 ):
-    mock = mocker.patch.object(forward, "find_keys_and_anoncrypt")
+    mock = mocker.patch.object(forward, "anoncrypt")
     # will help for cases with multiple routing keys (multiple calls)
     side_effect = (encrypt_result1, encrypt_result2)
     mock.side_effect = side_effect
@@ -48,6 +49,16 @@ def find_keys_and_anoncrypt_mock(
     return mock
 
 
+@pytest.fixture
+def find_anoncrypt_keys_mock(mocker):
+    async def find_anoncrypt_keys(to, resolvers_config):
+        return [f"key of {to}"]
+
+    return mocker.patch.object(
+        forward, "find_anoncrypt_keys", side_effect=find_anoncrypt_keys
+    )
+
+
 @pytest.fixture
 def callspec(resolvers_config_mock, did1, did2, did3):
     return dict(
@@ -71,7 +82,9 @@ async def test_wrap_in_forward__no_routing_keys(callspec):
 
 
 @pytest.mark.asyncio
-async def test_wrap_in_forward__forward_message_callspec(mocker, callspec):
+async def test_wrap_in_forward__forward_message_callspec(
+    mocker, find_anoncrypt_keys_mock, callspec
+):
     # TODO use autospec=True need to explore why it doesn"t work
     #      (stats for calls is not callected)
     att_mock = mocker.patch.object(forward, "Attachment")
@@ -96,7 +109,14 @@ async def test_wrap_in_forward__forward_message_callspec(mocker, callspec):
 @pytest.mark.asyncio
 @pytest.mark.parametrize("routing_keys_num", range(1, 3), ids=["simple", "recursive"])
 async def test_wrap_in_forward__return(
-    mocker, did1, did2, did3, find_keys_and_anoncrypt_mock, callspec, routing_keys_num
+    mocker,
+    did1,
+    did2,
+    did3,
+    anoncrypt_mock,
+    find_anoncrypt_keys_mock,
+    callspec,
+    routing_keys_num,
 ):
     routing_keys = [did1, did2][:routing_keys_num]
     tos = routing_keys[::-1]
@@ -116,7 +136,8 @@ async def test_wrap_in_forward__return(
 
     res = await wrap_in_forward(**callspec)
 
-    assert find_keys_and_anoncrypt_mock.call_count == len(routing_keys)
+    assert find_anoncrypt_keys_mock.call_count == len(routing_keys)
+    assert anoncrypt_mock.call_count == len(routing_keys)
 
     for i, (_to, _next) in enumerate(zip(tos, nexts)):
         assert fw_mock.call_args_list[i] == mocker.call(
@@ -126,16 +147,105 @@ async def test_wrap_in_forward__return(
             attachments=[att_mock_side_effect[i]],
             **callspec["headers"],
         )
-        assert find_keys_and_anoncrypt_mock.call_args_list[i] == mocker.call(
+        assert anoncrypt_mock.call_args_list[i] == mocker.call(
             fw_mock_side_effect[i].as_dict.return_value,
-            _to,
+            [f"key of {_to}"],
             callspec["enc_alg_anon"],
-            callspec["resolvers_config"],
+            None,
         )
 
     assert isinstance(res, ForwardPackResult)
     assert res.msg == fw_mock_side_effect[routing_keys_num - 1]
-    assert (
-        res.msg_encrypted
-        == find_keys_and_anoncrypt_mock._side_effect[routing_keys_num - 1]
+    assert res.msg_encrypted == anoncrypt_mock._side_effect[routing_keys_num - 1]
+
+
+@pytest.mark.asyncio
+async def test_wrap_in_forward__routing_keys_resolved_once(
+    mocker, did1, did2, anoncrypt_mock, find_anoncrypt_keys_mock, callspec
+):
+    callspec["routing_keys"] = [did1, did2, did1]
+    anoncrypt_mock.side_effect = None
+    anoncrypt_mock.return_value = EncryptResult(msg={}, to_kids=[], to_keys=[])
+    mocker.patch.object(forward, "ForwardMessage")
+
+    await wrap_in_forward(**callspec)
+
+    assert sorted(c.args[0] for c in find_anoncrypt_keys_mock.call_args_list) == sorted(
+        [did1, did2]
     )
+    assert [c.args[1] for c in anoncrypt_mock.call_args_list] == [
+        [f"key of {did1}"],
+        [f"key of {did2}"],
+        [f"key of {did1}"],
+    ]
+
+
+def _key(kid):
+    return Key(kid=kid, key=None)
+
+
+@pytest.mark.asyncio
+async def test_wrap_in_forward__forward_keys(
+    mocker, did1, did2, anoncrypt_mock, find_anoncrypt_keys_mock, callspec
+):
+    mocker.patch.object(forward, "ForwardMessage")
+    keys1 = [_key(f"{did1}#key-1")]
+    keys2 = [_key(f"{did2}#key-1"), _key(f"{did2}#key-2")]
+    callspec["forward_keys"] = [keys1, keys2]
+
+    await wrap_in_forward(**callspec)
+
+    assert find_anoncrypt_keys_mock.call_count == 0
+    assert [c.args[1] for c in anoncrypt_mock.call_args_list] == [keys2, keys1]
+
+
+@pytest.mark.asyncio
+async def test_wrap_in_forward__forward_keys_of_routing_key_did_url(
+    mocker, did1, did2, anoncrypt_mock, find_anoncrypt_keys_mock, callspec
+):
+    mocker.patch.object(forward, "ForwardMessage")
+    callspec["routing_keys"] = [f"{did1}#key-1", did2]
+    callspec["forward_keys"] = [[_key(f"{did1}#key-1")], [_key(f"{did2}#key-1")]]
+
+    await wrap_in_forward(**callspec)
+
+    assert anoncrypt_mock.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "forward_kids",
+    [
+        [],
+        [["did:example:1#key-1"]],
+        [["did:example:1#key-1"], ["did:example:2#key-1"], ["did:example:3#key-1"]],
+        # same length but keys of other DIDs
+        [["did:example:2#key-1"], ["did:example:1#key-1"]],
+        [["did:example:1#key-1"], ["did:example:2#key-1", "did:example:3#key-1"]],
+        [["did:example:1#key-1"], []],
+    ],
+)
+async def test_wrap_in_forward__forward_keys_mismatch(
+    anoncrypt_mock, find_anoncrypt_keys_mock, callspec, forward_kids
+):
+    callspec["forward_keys"] = [[_key(kid) for kid in kids] for kids in forward_kids]
+
+    with pytest.raises(DIDCommValueError):
+        await wrap_in_forward(**callspec)
+
+    assert find_anoncrypt_keys_mock.call_count == 0
+    assert anoncrypt_mock.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_wrap_in_forward__forward_keys_not_of_routing_key_did_url(
+    anoncrypt_mock, find_anoncrypt_keys_mock, callspec, did1, did2
+):
+    callspec["routing_keys"] = [f"{did1}#key-1", did2]
+    callspec["forward_keys"] = [[_key(f"{did1}#key-2")], [_key(f"{did2}#key-1")]]
+
+    with pytest.raises(DIDCommValueError):
+        await wrap_in_forward(**callspec)
+
+    assert find_anoncrypt_keys_mock.call_count == 0
+    assert anoncrypt_mock.call_count == 0
@@ -0,0 +1,319 @@
+import asyncio
+import copy
+import hashlib
+import json
+
+import pytest
+
+from didcomm import (
+    DuplicateMessageGuard,
+    PackEncryptedConfig,
+    UnpackConfig,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+    unpack_forward,
+)
+from didcomm.duplicates import envelope_digest
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+from tests.unit.common import ResolversLatency
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _digest(i: int) -> bytes:
+    return hashlib.sha256(str(i).encode()).digest()
+
+
+@pytest.fixture()
+def resolvers_config_alice(resolvers_config_alice_with_non_secrets):
+    return resolvers_config_alice_with_non_secrets
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_with_non_secrets):
+    return resolvers_config_bob_with_non_secrets
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+def test_lru_duplicates_are_exact():
+    guard = DuplicateMessageGuard(
+        capacity=10,
+        false_positive_rate=0.5,
+        lru_size=10,
+        reject_probable_duplicates=False,
+    )
+    for i in range(10):
+        assert not guard.is_duplicate(_digest(i))
+        guard.add(_digest(i))
+    assert all(guard.is_duplicate(_digest(i)) for i in range(10))
+    assert not any(guard.is_duplicate(_digest(i)) for i in range(10, 100))
+    assert guard.duplicates == 10
+
+
+def test_bloom_filters_beyond_lru():
+    guard = DuplicateMessageGuard(capacity=1000, false_positive_rate=1e-3, lru_size=10)
+    for i in range(1000):
+        guard.add(_digest(i))
+    assert all(guard.is_duplicate(_digest(i)) for i in range(1000))
+
+    false_positives = sum(guard.is_duplicate(_digest(i)) for i in range(1000, 11000))
+    assert false_positives < 50
+    assert guard.probable_duplicates == 990 + false_positives
+
+
+def test_probable_duplicates_not_rejected():
+    guard = DuplicateMessageGuard(lru_size=1, reject_probable_duplicates=False)
+    guard.add(_digest(1))
+    guard.add(_digest(2))
+    assert not guard.is_duplicate(_digest(1))
+    assert guard.is_duplicate(_digest(2))
+    assert guard.probable_duplicates == 1
+
+
+def test_time_window():
+    clock = _Clock()
+    guard = DuplicateMessageGuard(window_s=100, clock=clock)
+    guard.add(_digest(1))
+    clock.now += 150
+    guard.add(_digest(2))
+    # remembered for at least the window
+    assert guard.is_duplicate(_digest(1))
+    clock.now += 110
+    assert not guard.is_duplicate(_digest(1))
+    assert guard.is_duplicate(_digest(2))
+    clock.now += 300
+    assert not guard.is_duplicate(_digest(2))
+
+
+def test_capacity_exceeded_rotates_filters():
+    guard = DuplicateMessageGuard(capacity=10, false_positive_rate=1e-3, lru_size=0)
+    for i in range(25):
+        guard.add(_digest(i))
+    assert not any(guard.is_duplicate(_digest(i)) for i in range(10))
+    assert all(guard.is_duplicate(_digest(i)) for i in range(10, 25))
+
+
+def test_memory_bytes():
+    small = DuplicateMessageGuard(capacity=1000, false_positive_rate=1e-2)
+    large = DuplicateMessageGuard(capacity=1000, false_positive_rate=1e-6)
+    assert small.memory_bytes < large.memory_bytes
+    assert (
+        DuplicateMessageGuard(capacity=100_000, lru_size=0).memory_bytes < 1024 * 1024
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"capacity": 0},
+        {"false_positive_rate": 0},
+        {"false_positive_rate": 1},
+        {"window_s": 0},
+        {"lru_size": -1},
+    ],
+)
+def test_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        DuplicateMessageGuard(**kwargs)
+
+
+def test_snapshot_restore(tmp_path):
+    clock = _Clock()
+    guard = DuplicateMessageGuard(capacity=100, window_s=100, lru_size=5, clock=clock)
+    for i in range(20):
+        guard.add(_digest(i))
+    path = str(tmp_path / "guard.snapshot")
+    guard.save(path)
+
+    restored = DuplicateMessageGuard.load(path, clock=clock)
+    assert restored.capacity == 100
+    assert restored.window_s == 100
+    assert restored.lru_size == 5
+    assert all(restored.is_duplicate(_digest(i)) for i in range(20))
+    assert not restored.is_duplicate(_digest(20))
+    assert restored.snapshot() == guard.snapshot()
+
+    clock.now += 1000
+    assert not DuplicateMessageGuard.restore(
+        guard.snapshot(), clock=clock
+    ).is_duplicate(_digest(1))
+
+
+@pytest.mark.parametrize(
+    "snapshot", [b"", b"{}", json.dumps({"version": 2}).encode(), b"[]"]
+)
+def test_restore_invalid_snapshot(snapshot):
+    with pytest.raises(ValueError):
+        DuplicateMessageGuard.restore(snapshot)
+
+
+def test_envelope_digest():
+    jwe = {"protected": "p", "ciphertext": "c", "tag": "t", "iv": "i"}
+    assert envelope_digest(jwe) == envelope_digest(dict(jwe, protected="other"))
+    assert envelope_digest(jwe) != envelope_digest(dict(jwe, tag="other"))
+    jws = {"payload": "p", "signatures": [{"signature": "s", "protected": "x"}]}
+    assert envelope_digest(jws) is not None
+    assert envelope_digest(jws) != envelope_digest(
+        dict(jws, signatures=[{"signature": "other"}])
+    )
+    assert envelope_digest({"id": "1", "body": {}}) is None
+
+
+def test_check_rejects_message_being_unpacked():
+    guard = DuplicateMessageGuard()
+    msg = {"ciphertext": "abc", "tag": "def"}
+
+    digest = guard.check(msg)
+    with pytest.raises(MalformedMessageError) as exc_info:
+        guard.check(msg)
+    assert exc_info.value.code == MalformedMessageCode.DUPLICATE_MESSAGE
+    assert not guard.is_duplicate(digest)
+
+    # a failed unpack is not recorded
+    guard.release(digest)
+    assert guard.check(msg) == digest
+
+    guard.add(digest)
+    with pytest.raises(MalformedMessageError):
+        guard.check(msg)
+    assert guard.duplicates == 2
+
+
+@pytest.mark.asyncio
+async def test_unpack_rejects_duplicates(resolvers_config_alice, resolvers_config_bob):
+    guard = DuplicateMessageGuard()
+    unpack_config = UnpackConfig(duplicate_guard=guard)
+    packed_msgs = [
+        (await pack_signed(resolvers_config_alice, TEST_MESSAGE, ALICE_DID)).packed_msg,
+        (
+            await pack_encrypted(
+                resolvers_config_alice,
+                TEST_MESSAGE,
+                to=BOB_DID,
+                frm=ALICE_DID,
+                pack_config=PackEncryptedConfig(forward=False),
+            )
+        ).packed_msg,
+    ]
+    for packed_msg in packed_msgs:
+        await unpack(resolvers_config_bob, packed_msg, unpack_config)
+        with pytest.raises(MalformedMessageError) as exc_info:
+            await unpack(resolvers_config_bob, packed_msg, unpack_config)
+        assert exc_info.value.code == MalformedMessageCode.DUPLICATE_MESSAGE
+    assert guard.duplicates == 2
+
+    # plaintext messages are not checked
+    packed_msg = (await pack_plaintext(resolvers_config_bob, TEST_MESSAGE)).packed_msg
+    await unpack(resolvers_config_bob, packed_msg, unpack_config)
+    await unpack(resolvers_config_bob, packed_msg, unpack_config)
+
+
+@pytest.mark.asyncio
+async def test_unpack_records_only_unpacked_messages(
+    resolvers_config_alice, resolvers_config_bob
+):
+    guard = DuplicateMessageGuard()
+    unpack_config = UnpackConfig(duplicate_guard=guard)
+    packed_msg = (
+        await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+    ).packed_msg
+
+    # the same ciphertext and tag with a tampered iv
+    tampered = json.loads(packed_msg)
+    tampered["iv"] = tampered["iv"][::-1]
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack(resolvers_config_bob, copy.deepcopy(tampered), unpack_config)
+    assert exc_info.value.code == MalformedMessageCode.CAN_NOT_DECRYPT
+
+    await unpack(resolvers_config_bob, packed_msg, unpack_config)
+
+
+@pytest.mark.asyncio
+async def test_unpack_forward_rejects_duplicates(
+    resolvers_config_alice, resolvers_config_mediator1
+):
+    guard = DuplicateMessageGuard()
+    pack_result = await pack_encrypted(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+    await unpack_forward(
+        resolvers_config_mediator1, pack_result.packed_msg, True, duplicate_guard=guard
+    )
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack_forward(
+            resolvers_config_mediator1,
+            pack_result.packed_msg,
+            True,
+            duplicate_guard=guard,
+        )
+    assert exc_info.value.code == MalformedMessageCode.DUPLICATE_MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_unpack_rejects_concurrent_duplicates(
+    resolvers_config_alice, resolvers_config_bob
+):
+    guard = DuplicateMessageGuard()
+    unpack_config = UnpackConfig(duplicate_guard=guard)
+    packed_msg = (
+        await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+    ).packed_msg
+    latency = ResolversLatency(0.01)
+    resolvers_config = latency.wrap(resolvers_config_bob)
+
+    results = await asyncio.gather(
+        unpack(resolvers_config, packed_msg, unpack_config),
+        unpack(resolvers_config, packed_msg, unpack_config),
+        return_exceptions=True,
+    )
+
+    assert results[0].message == TEST_MESSAGE
+    assert isinstance(results[1], MalformedMessageError)
+    assert results[1].code == MalformedMessageCode.DUPLICATE_MESSAGE
+    # the duplicate is rejected before the recipient secrets are looked up
+    assert len([c for c in latency.calls if c.startswith("get_keys")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_unpack_forward_rejects_concurrent_duplicates(
+    resolvers_config_alice, resolvers_config_mediator1
+):
+    guard = DuplicateMessageGuard()
+    pack_result = await pack_encrypted(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+    resolvers_config = ResolversLatency(0.01).wrap(resolvers_config_mediator1)
+
+    results = await asyncio.gather(
+        *(
+            unpack_forward(
+                resolvers_config, pack_result.packed_msg, True, duplicate_guard=guard
+            )
+            for _ in range(2)
+        ),
+        return_exceptions=True,
+    )
+
+    assert results[0].forwarded_msg is not None
+    assert isinstance(results[1], MalformedMessageError)
+    assert results[1].code == MalformedMessageCode.DUPLICATE_MESSAGE
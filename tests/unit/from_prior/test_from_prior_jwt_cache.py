@@ -0,0 +1,160 @@
+import importlib
+
+import pytest
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.core.from_prior import (
+    pack_from_prior_in_place,
+    unpack_from_prior_in_place,
+)
+from didcomm.core.from_prior_cache import (
+    FromPriorJwtCache,
+    claims_digest,
+    disable_from_prior_jwt_cache,
+    enable_from_prior_jwt_cache,
+    get_from_prior_jwt_cache,
+)
+from didcomm.secrets.secrets_resolver_in_memory import SecretsResolverInMemory
+from didcomm.secrets.secrets_util import (
+    generate_ed25519_keys_as_jwk_dict,
+    jwk_to_secret,
+)
+from tests.test_vectors.common import ALICE_DID, CHARLIE_DID
+from tests.test_vectors.secrets.mock_secrets_resolver_charlie import (
+    CHARLIE_SECRET_AUTH_KEY_ED25519,
+)
+
+from_prior_module = importlib.import_module("didcomm.core.from_prior")
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+@pytest.fixture()
+def cache():
+    previous = get_from_prior_jwt_cache()
+    yield enable_from_prior_jwt_cache(max_size=2)
+    if previous is None:
+        disable_from_prior_jwt_cache()
+    else:
+        enable_from_prior_jwt_cache(previous.max_size)
+
+
+@pytest.fixture()
+def jwt_encode(mocker):
+    return mocker.spy(from_prior_module.jwt, "encode")
+
+
+def _message(**claims):
+    return {
+        "id": "1234567890",
+        "from": ALICE_DID,
+        "from_prior": dict({"iss": CHARLIE_DID, "sub": ALICE_DID}, **claims),
+    }
+
+
+async def _pack(resolvers_config, **claims) -> str:
+    message = _message(**claims)
+    kid = await pack_from_prior_in_place(message, resolvers_config, None)
+    assert kid == CHARLIE_SECRET_AUTH_KEY_ED25519.kid
+    return message["from_prior"]
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_signed_once(
+    cache, jwt_encode, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    assert await _pack(resolvers_config_charlie_rotated_to_alice, jti="1") == jwt
+    assert jwt_encode.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    message = {"from_prior": jwt}
+    await unpack_from_prior_in_place(message, resolvers_config_charlie_rotated_to_alice)
+    assert message["from_prior"] == _message(jti="1")["from_prior"]
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_signed_for_other_claims(
+    cache, jwt_encode, resolvers_config_charlie_rotated_to_alice
+):
+    jwt1 = await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    jwt2 = await _pack(resolvers_config_charlie_rotated_to_alice, jti="2")
+    assert jwt1 != jwt2
+    assert jwt_encode.call_count == 2
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_signed_again_if_secret_changed(
+    cache, jwt_encode, resolvers_config_charlie_rotated_to_alice, did_resolver
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+
+    private_jwk, _ = generate_ed25519_keys_as_jwk_dict()
+    new_secret = jwk_to_secret(
+        dict(private_jwk, kid=CHARLIE_SECRET_AUTH_KEY_ED25519.kid)
+    )
+    resolvers_config = ResolversConfig(
+        secrets_resolver=SecretsResolverInMemory([new_secret]),
+        did_resolver=did_resolver,
+    )
+    new_jwt = await _pack(resolvers_config)
+    assert new_jwt != jwt
+    assert await _pack(resolvers_config) == new_jwt
+    assert jwt_encode.call_count == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_jwt_is_evicted(
+    cache, jwt_encode, resolvers_config_charlie_rotated_to_alice
+):
+    for jti in ["1", "2", "1", "3", "1", "2"]:
+        await _pack(resolvers_config_charlie_rotated_to_alice, jti=jti)
+    # "2" was evicted by "3"
+    assert jwt_encode.call_count == 4
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate(cache, jwt_encode, resolvers_config_charlie_rotated_to_alice):
+    await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    cache.invalidate("did:example:charlie#key-2")
+    await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    assert jwt_encode.call_count == 1
+
+    cache.invalidate(CHARLIE_SECRET_AUTH_KEY_ED25519.kid)
+    assert len(cache) == 0
+    await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    cache.invalidate()
+    await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+    assert jwt_encode.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache(
+    cache, jwt_encode, resolvers_config_charlie_rotated_to_alice
+):
+    disable_from_prior_jwt_cache()
+    assert get_from_prior_jwt_cache() is None
+    await _pack(resolvers_config_charlie_rotated_to_alice)
+    await _pack(resolvers_config_charlie_rotated_to_alice)
+    assert jwt_encode.call_count == 2
+
+
+def test_claims_digest():
+    assert claims_digest({"iss": "a", "sub": "b"}) == claims_digest(
+        {"iss": "a", "sub": "b"}
+    )
+    assert claims_digest({"iss": "a", "sub": "b"}) != claims_digest(
+        {"iss": "a", "sub": "c"}
+    )
+    assert claims_digest({"iss": object()}) is None
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        FromPriorJwtCache(max_size=0)
@@ -0,0 +1,264 @@
+import importlib
+
+import pytest
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.common.types import VerificationMethodType
+from didcomm.core.from_prior import (
+    pack_from_prior_in_place,
+    unpack_from_prior_in_place,
+)
+from didcomm.core.from_prior_cache import (
+    VerifiedFromPriorCache,
+    disable_verified_from_prior_cache,
+    enable_verified_from_prior_cache,
+    get_verified_from_prior_cache,
+)
+from didcomm.did_doc.did_doc import DIDDoc, VerificationMethod
+from didcomm.did_doc.did_doc_compact import DIDDocCompact, VerificationMethodCompact
+from didcomm.did_doc.did_resolver_in_memory import DIDResolverInMemory
+from didcomm.errors import MalformedMessageError
+from tests.test_vectors.common import ALICE_DID, CHARLIE_DID
+from tests.test_vectors.did_doc.did_doc_charlie import CHARLIE_AUTH_METHOD_25519
+from tests.test_vectors.secrets.mock_secrets_resolver_charlie import (
+    CHARLIE_SECRET_AUTH_KEY_ED25519,
+)
+
+from_prior_module = importlib.import_module("didcomm.core.from_prior")
+from_prior_cache_module = importlib.import_module("didcomm.core.from_prior_cache")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
+
+
+@pytest.fixture()
+def clock():
+    return _Clock()
+
+
+@pytest.fixture()
+def cache(mocker, clock):
+    cache = VerifiedFromPriorCache(max_size=2, clock=clock)
+    mocker.patch.object(from_prior_cache_module, "_verified_cache", cache)
+    return cache
+
+
+@pytest.fixture()
+def jwt_decode(mocker):
+    return mocker.spy(from_prior_module.jwt, "decode")
+
+
+@pytest.fixture()
+def find_verification_key(mocker):
+    return mocker.spy(from_prior_module, "find_verification_key")
+
+
+async def _pack(resolvers_config, **claims) -> str:
+    message = {
+        "id": "1234567890",
+        "from": ALICE_DID,
+        "from_prior": dict({"iss": CHARLIE_DID, "sub": ALICE_DID}, **claims),
+    }
+    await pack_from_prior_in_place(message, resolvers_config, None)
+    return message["from_prior"]
+
+
+async def _unpack(resolvers_config, jwt: str) -> dict:
+    message = {"from_prior": jwt}
+    kid = await unpack_from_prior_in_place(message, resolvers_config)
+    assert kid == CHARLIE_SECRET_AUTH_KEY_ED25519.kid
+    return message["from_prior"]
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_verified_once(
+    cache, jwt_decode, find_verification_key, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice, jti="1")
+
+    claims = await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert claims == {"iss": CHARLIE_DID, "sub": ALICE_DID, "jti": "1"}
+    claims["sub"] = "modified"
+    assert await _unpack(resolvers_config_charlie_rotated_to_alice, jwt) == {
+        "iss": CHARLIE_DID,
+        "sub": ALICE_DID,
+        "jti": "1",
+    }
+
+    assert jwt_decode.call_count == 1
+    # the issuer key is resolved for every unpack
+    assert find_verification_key.call_count == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_verified_again_if_key_changed(
+    cache, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+
+    rotated_key_did_doc = DIDDoc(
+        id=CHARLIE_DID,
+        authentication=[CHARLIE_AUTH_METHOD_25519.id],
+        verification_method=[
+            VerificationMethod(
+                id=CHARLIE_AUTH_METHOD_25519.id,
+                controller=CHARLIE_DID,
+                type=VerificationMethodType.JSON_WEB_KEY_2020,
+                public_key_jwk=dict(
+                    CHARLIE_AUTH_METHOD_25519.public_key_jwk,
+                    x="tjOTPcs4OEMNrmn2ScYZDS-aCCbRFhJCaSmgfiW6zyQ",
+                ),
+            )
+        ],
+    )
+    resolvers_config = ResolversConfig(
+        secrets_resolver=resolvers_config_charlie_rotated_to_alice.secrets_resolver,
+        did_resolver=DIDResolverInMemory(did_docs=[rotated_key_did_doc]),
+    )
+
+    with pytest.raises(MalformedMessageError):
+        await _unpack(resolvers_config, jwt)
+    assert jwt_decode.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_verified_again_if_compact_key_changed(
+    cache, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    def resolvers_config(x: str) -> ResolversConfig:
+        did_doc = DIDDocCompact(
+            id=CHARLIE_DID,
+            authentication=[CHARLIE_AUTH_METHOD_25519.id],
+            verification_method=[
+                VerificationMethodCompact(
+                    id=CHARLIE_AUTH_METHOD_25519.id,
+                    type=VerificationMethodType.JSON_WEB_KEY_2020,
+                    controller=CHARLIE_DID,
+                    public_key_jwk=dict(CHARLIE_AUTH_METHOD_25519.public_key_jwk, x=x),
+                )
+            ],
+        )
+        return ResolversConfig(
+            secrets_resolver=resolvers_config_charlie_rotated_to_alice.secrets_resolver,
+            did_resolver=DIDResolverInMemory(did_docs=[did_doc]),
+        )
+
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+    await _unpack(resolvers_config(CHARLIE_AUTH_METHOD_25519.public_key_jwk["x"]), jwt)
+    await _unpack(resolvers_config(CHARLIE_AUTH_METHOD_25519.public_key_jwk["x"]), jwt)
+    assert jwt_decode.call_count == 1
+
+    with pytest.raises(MalformedMessageError):
+        await _unpack(
+            resolvers_config("tjOTPcs4OEMNrmn2ScYZDS-aCCbRFhJCaSmgfiW6zyQ"), jwt
+        )
+    assert jwt_decode.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_not_cached_after_exp(
+    cache, clock, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice, exp=clock.now + 5)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 1
+
+    clock.now += 5
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 3
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_jwt_with_invalid_exp_is_not_cached(
+    cache, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice, exp="never")
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_jwt_is_evicted(
+    cache, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    jwts = {
+        jti: await _pack(resolvers_config_charlie_rotated_to_alice, jti=jti)
+        for jti in ["1", "2", "3"]
+    }
+    for jti in ["1", "2", "1", "3", "1", "2"]:
+        await _unpack(resolvers_config_charlie_rotated_to_alice, jwts[jti])
+    # "2" was evicted by "3"
+    assert jwt_decode.call_count == 4
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate(cache, jwt_decode, resolvers_config_charlie_rotated_to_alice):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    cache.invalidate("did:example:charlie#key-2")
+    assert len(cache) == 1
+    cache.invalidate(CHARLIE_SECRET_AUTH_KEY_ED25519.kid)
+    assert len(cache) == 0
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    cache.invalidate()
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_jwt_is_not_cached(
+    cache, resolvers_config_charlie_rotated_to_alice
+):
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+    header, payload, signature = jwt.split(".")
+    tampered = ".".join([header, payload, signature[:-4] + "AAAA"])
+    for _ in range(2):
+        with pytest.raises(MalformedMessageError):
+            await _unpack(resolvers_config_charlie_rotated_to_alice, tampered)
+    assert len(cache) == 0
+
+
+def test_cache_is_disabled_by_default():
+    assert get_verified_from_prior_cache() is None
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache(
+    mocker, jwt_decode, resolvers_config_charlie_rotated_to_alice
+):
+    mocker.patch.object(from_prior_cache_module, "_verified_cache", None)
+    jwt = await _pack(resolvers_config_charlie_rotated_to_alice)
+
+    enable_verified_from_prior_cache(max_size=2)
+    assert get_verified_from_prior_cache().max_size == 2
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 1
+
+    disable_verified_from_prior_cache()
+    assert get_verified_from_prior_cache() is None
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    await _unpack(resolvers_config_charlie_rotated_to_alice, jwt)
+    assert jwt_decode.call_count == 3
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        VerifiedFromPriorCache(max_size=0)
@@ -0,0 +1,126 @@
+import json
+import time
+
+import pytest
+from authlib.common.encoding import urlsafe_b64decode, to_bytes
+from authlib.jose import ECKey, OKPKey
+
+from didcomm import (
+    EphemeralKeyPool,
+    PackEncryptedConfig,
+    disable_ephemeral_key_pool,
+    enable_ephemeral_key_pool,
+    pack_encrypted,
+    unpack,
+)
+from didcomm.core.ephemeral_keys import get_ephemeral_key_pool
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+CURVES = ["X25519", "P-256", "P-384", "P-521"]
+
+
+def _wait_filled(pool, curves, timeout=10):
+    deadline = time.monotonic() + timeout
+    while any(pool.available(crv) < pool.size for crv in curves):
+        assert time.monotonic() < deadline, "the pool has not been filled"
+        time.sleep(0.01)
+
+
+def _epk(packed_msg):
+    protected = json.loads(packed_msg)["protected"]
+    return json.loads(urlsafe_b64decode(to_bytes(protected + "==")))["epk"]
+
+
+@pytest.fixture()
+def pool():
+    pool = enable_ephemeral_key_pool(curves=CURVES, size=4)
+    _wait_filled(pool, CURVES)
+    yield pool
+    disable_ephemeral_key_pool()
+
+
+def test_pool_is_disabled_by_default():
+    assert get_ephemeral_key_pool() is None
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        EphemeralKeyPool(curves=["Ed25519"])
+    with pytest.raises(ValueError):
+        EphemeralKeyPool(size=0)
+
+
+def test_keys_are_taken_once_and_refilled():
+    with EphemeralKeyPool(curves=["X25519", "P-256"], size=3) as pool:
+        _wait_filled(pool, ["X25519", "P-256"])
+        keys = [pool.take("X25519") for _ in range(3)]
+        assert all(isinstance(key, OKPKey) for key in keys)
+        assert len({key.as_json(is_private=True) for key in keys}) == 3
+        assert isinstance(pool.take("P-256"), ECKey)
+        assert pool.take("P-384") is None
+        assert pool.hits == 4
+
+        _wait_filled(pool, ["X25519", "P-256"])
+        refilled = [pool.take("X25519") for _ in range(3)]
+        assert not {k.as_json(is_private=True) for k in keys} & {
+            k.as_json(is_private=True) for k in refilled
+        }
+
+    assert pool.available("X25519") == 0
+
+
+def test_generate_falls_back_when_empty():
+    pool = EphemeralKeyPool(curves=["X25519"])
+    recipient_key = OKPKey.generate_key("X25519")
+    key = pool.generate(recipient_key)
+    assert isinstance(key, OKPKey) and key["crv"] == "X25519"
+    assert pool.misses == 1
+
+    p384_key = ECKey.generate_key("P-384")
+    assert pool.generate(p384_key)["crv"] == "P-384"
+    # curves out of the pool are not counted
+    assert pool.misses == 1
+
+
+def test_keys_inherited_by_forked_child_are_dropped():
+    with EphemeralKeyPool(curves=["X25519"], size=2) as pool:
+        _wait_filled(pool, ["X25519"])
+        pool._after_fork_in_child()
+        assert pool.available("X25519") == 0
+        assert pool.take("X25519") is None
+        # the fill thread is restarted on the first take
+        _wait_filled(pool, ["X25519"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "to, frm",
+    [
+        (BOB_DID, None),
+        ("did:example:bob#key-p256-1", None),
+        ("did:example:bob#key-p384-1", None),
+        ("did:example:bob#key-p521-1", None),
+        (BOB_DID, ALICE_DID),
+        ("did:example:bob#key-p256-1", ALICE_DID),
+        ("did:example:bob#key-p521-1", ALICE_DID),
+    ],
+)
+async def test_pack_with_pool(
+    pool, to, frm, resolvers_config_alice, resolvers_config_bob
+):
+    epks = []
+    for _ in range(6):
+        pack_result = await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=to,
+            frm=frm,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+        epks.append(json.dumps(_epk(pack_result.packed_msg), sort_keys=True))
+        unpack_result = await unpack(resolvers_config_bob, pack_result.packed_msg)
+        assert unpack_result.message == TEST_MESSAGE
+
+    assert len(set(epks)) == len(epks)
+    assert pool.hits > 0
@@ -0,0 +1,254 @@
+import json
+
+import pytest
+
+from didcomm import (
+    MetricsRegistry,
+    PackEncryptedConfig,
+    disable_metrics,
+    enable_metrics,
+    format_prometheus,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+)
+from didcomm.errors import MalformedMessageError
+from didcomm.metrics import get_metrics_registry
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+
+@pytest.fixture()
+def registry():
+    registry = enable_metrics()
+    yield registry
+    disable_metrics()
+
+
+def test_metrics_are_disabled_by_default():
+    assert get_metrics_registry() is None
+
+
+def test_counter():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("method",))
+    counter.inc(method="get")
+    counter.inc(2, method="get")
+    counter.inc(method="post")
+
+    assert registry.counter("requests_total", "Requests", ("method",)) is counter
+    snapshot = registry.snapshot()
+    assert snapshot.value("requests_total", method="get") == 3
+    assert snapshot.value("requests_total", method="put") is None
+    assert snapshot.total("requests_total") == 4
+
+    registry.reset()
+    assert registry.snapshot().total("requests_total") == 0
+
+    with pytest.raises(ValueError):
+        registry.histogram("requests_total", "Requests")
+
+
+def test_histogram_percentiles():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency")
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+
+    stats = registry.snapshot().value("latency_seconds")
+    assert stats.count == 1000
+    assert stats.sum == pytest.approx(500.5)
+    assert stats.min == 0.001
+    assert stats.max == 1.0
+    assert stats.p50 == pytest.approx(0.5, rel=0.008)
+    assert stats.p90 == pytest.approx(0.9, rel=0.008)
+    assert stats.p99 == pytest.approx(0.99, rel=0.008)
+    assert stats.p999 == pytest.approx(0.999, rel=0.008)
+    assert dict(stats.buckets)[0.1] == pytest.approx(100, abs=2)
+    assert dict(stats.buckets)[10.0] == 1000
+
+
+def test_histogram_memory_is_bounded():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("size_bytes", "Size", unit=1)
+    for size in range(1_000_000):
+        histogram.observe(size)
+    [hdr] = histogram._samples.values()
+    assert len(hdr.counts) < 2000
+
+
+def test_format_prometheus():
+    registry = MetricsRegistry()
+    registry.counter("ops_total", "Operations", ("op",)).inc(op='pack "x"')
+    registry.histogram("op_seconds", "Latency", buckets=(0.1, 1.0)).observe(0.5)
+
+    assert format_prometheus(registry) == (
+        "# HELP op_seconds Latency\n"
+        "# TYPE op_seconds histogram\n"
+        'op_seconds_bucket{le="0.1"} 0\n'
+        'op_seconds_bucket{le="1"} 1\n'
+        'op_seconds_bucket{le="+Inf"} 1\n'
+        "op_seconds_sum 0.5\n"
+        "op_seconds_count 1\n"
+        "# HELP ops_total Operations\n"
+        "# TYPE ops_total counter\n"
+        'ops_total{op="pack \\"x\\""} 1\n'
+    )
+    assert format_prometheus(MetricsRegistry()) == ""
+
+
+@pytest.mark.asyncio
+async def test_pack_and_unpack_metrics(
+    registry, resolvers_config_alice, resolvers_config_bob
+):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(protect_sender_id=True, forward=False),
+    )
+    await unpack(resolvers_config_bob, pack_result.packed_msg)
+    packed_signed = await pack_signed(
+        resolvers_config_alice, TEST_MESSAGE, sign_frm=ALICE_DID
+    )
+    await pack_plaintext(resolvers_config_alice, TEST_MESSAGE)
+
+    snapshot = registry.snapshot()
+    envelope = "anoncrypt+authcrypt+signed"
+    assert (
+        snapshot.value(
+            "didcomm_operations_total",
+            operation="pack_encrypted",
+            envelope=envelope,
+            alg="ECDH-ES+A256KW/XC20P",
+        )
+        == 1
+    )
+    assert (
+        snapshot.value(
+            "didcomm_operations_total",
+            operation="unpack",
+            envelope=envelope,
+            alg="ECDH-ES+A256KW/XC20P",
+        )
+        == 1
+    )
+    assert (
+        snapshot.value(
+            "didcomm_operations_total",
+            operation="pack_signed",
+            envelope="signed",
+            alg="EdDSA",
+        )
+        == 1
+    )
+    assert (
+        snapshot.value(
+            "didcomm_operations_total",
+            operation="pack_plaintext",
+            envelope="plaintext",
+            alg="none",
+        )
+        == 1
+    )
+
+    packed_size = len(pack_result.packed_msg)
+    assert snapshot.value(
+        "didcomm_bytes_total", operation="unpack", direction="in"
+    ) == len(pack_result.packed_msg)
+    assert snapshot.total("didcomm_bytes_total", direction="out") == (
+        packed_size
+        + len(packed_signed.packed_msg)
+        + snapshot.value(
+            "didcomm_bytes_total", operation="pack_plaintext", direction="out"
+        )
+    )
+
+    duration = snapshot.value(
+        "didcomm_operation_duration_seconds", operation="pack_encrypted"
+    )
+    assert duration.count == 1 and duration.sum > 0
+
+    assert (
+        snapshot.total(
+            "didcomm_did_resolver_calls_total", resolver="MockDIDResolverAllInSecrets"
+        )
+        > 0
+    )
+    assert (
+        snapshot.total(
+            "didcomm_secrets_lookups_total", method="get_key", result="found"
+        )
+        > 0
+    )
+    assert snapshot.total("didcomm_secrets_lookups_total", method="get_keys") > 0
+    assert "didcomm_did_resolver_duration_seconds_bucket" in format_prometheus(snapshot)
+
+
+@pytest.mark.asyncio
+async def test_unpack_failure_metrics(
+    registry, resolvers_config_alice, resolvers_config_bob
+):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    packed_msg = json.loads(pack_result.packed_msg)
+    packed_msg["tag"] = packed_msg["tag"][::-1]
+    registry.reset()
+
+    with pytest.raises(MalformedMessageError):
+        await unpack(resolvers_config_bob, packed_msg)
+
+    snapshot = registry.snapshot()
+    assert (
+        snapshot.value(
+            "didcomm_operation_errors_total",
+            operation="unpack",
+            error="MalformedMessageError",
+        )
+        == 1
+    )
+    assert (
+        snapshot.value(
+            "didcomm_malformed_messages_total",
+            operation="unpack",
+            code="CAN_NOT_DECRYPT",
+        )
+        == 1
+    )
+    assert snapshot.total("didcomm_operations_total") == 0
+    assert (
+        snapshot.value("didcomm_operation_duration_seconds", operation="unpack").count
+        == 1
+    )
+
+
+@pytest.fixture()
+def resolvers_config_alice(resolvers_config_alice_all_in_secrets):
+    return resolvers_config_alice_all_in_secrets
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_all_in_secrets):
+    return resolvers_config_bob_all_in_secrets
+
+
+@pytest.mark.asyncio
+async def test_bytes_are_counted_utf8_encoded(registry, resolvers_config_alice):
+    message = TEST_MESSAGE.as_dict()
+    message["body"] = {"text": "é" * 100}
+    pack_result = await pack_plaintext(resolvers_config_alice, message)
+    size = len(pack_result.packed_msg.encode())
+    assert size == len(pack_result.packed_msg) + 100
+
+    await unpack(resolvers_config_alice, pack_result.packed_msg)
+
+    snapshot = registry.snapshot()
+    assert snapshot.total("didcomm_bytes_total", direction="out") == size
+    assert snapshot.total("didcomm_bytes_total", direction="in") == size
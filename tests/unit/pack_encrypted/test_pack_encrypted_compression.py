@@ -0,0 +1,140 @@
+import pytest
+from authlib.common.encoding import json_loads, to_bytes, urlsafe_b64decode
+
+from didcomm import (
+    Message,
+    PackEncryptedConfig,
+    UnpackConfig,
+    pack_encrypted,
+    unpack,
+    unpack_forward,
+)
+from didcomm.core.serialization import json_str_to_dict
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+
+
+def _message(payload_size: int) -> Message:
+    return Message(
+        id="1234567890",
+        type="my-protocol/1.0",
+        frm=ALICE_DID,
+        to=[BOB_DID],
+        body={"items": [{"index": i, "name": "item"} for i in range(payload_size)]},
+    )
+
+
+def _protected(packed_msg) -> dict:
+    if isinstance(packed_msg, str):
+        packed_msg = json_str_to_dict(packed_msg)
+    return json_loads(urlsafe_b64decode(to_bytes(packed_msg["protected"])))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frm", [None, ALICE_DID])
+@pytest.mark.parametrize("protect_sender_id", [False, True])
+async def test_compressed(
+    frm, protect_sender_id, resolvers_config_alice, resolvers_config_bob
+):
+    message = _message(1000)
+    pack_config = PackEncryptedConfig(
+        protect_sender_id=protect_sender_id, forward=False
+    )
+    uncompressed = await pack_encrypted(
+        resolvers_config_alice, message, to=BOB_DID, frm=frm, pack_config=pack_config
+    )
+    pack_config.compress = True
+    compressed = await pack_encrypted(
+        resolvers_config_alice, message, to=BOB_DID, frm=frm, pack_config=pack_config
+    )
+
+    assert "zip" not in _protected(uncompressed.packed_msg)
+    assert _protected(compressed.packed_msg)["zip"] == "DEF"
+    assert len(compressed.packed_msg) < len(uncompressed.packed_msg) / 5
+
+    unpack_result = await unpack(resolvers_config_bob, compressed.packed_msg)
+    assert unpack_result.message == message
+    assert unpack_result.metadata.encrypted
+
+
+@pytest.mark.asyncio
+async def test_compress_min_size(resolvers_config_alice):
+    pack_config = PackEncryptedConfig(
+        forward=False, compress=True, compress_min_size=100_000
+    )
+    small = await pack_encrypted(
+        resolvers_config_alice, _message(10), to=BOB_DID, pack_config=pack_config
+    )
+    large = await pack_encrypted(
+        resolvers_config_alice, _message(10_000), to=BOB_DID, pack_config=pack_config
+    )
+    assert "zip" not in _protected(small.packed_msg)
+    assert _protected(large.packed_msg)["zip"] == "DEF"
+
+
+@pytest.mark.asyncio
+async def test_compressed_forward(
+    resolvers_config_alice, resolvers_config_bob, resolvers_config_mediator1
+):
+    message = _message(1000)
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        message,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(compress=True, compress_min_size=0),
+    )
+    assert _protected(pack_result.packed_msg)["zip"] == "DEF"
+
+    forward = await unpack_forward(
+        resolvers_config_mediator1, pack_result.packed_msg, True
+    )
+    assert _protected(forward.forwarded_msg)["zip"] == "DEF"
+
+    unpack_result = await unpack(resolvers_config_bob, forward.forwarded_msg)
+    assert unpack_result.message == message
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frm", [None, ALICE_DID])
+async def test_decompressed_too_large(
+    frm, resolvers_config_alice, resolvers_config_bob
+):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        _message(10_000),
+        to=BOB_DID,
+        frm=frm,
+        pack_config=PackEncryptedConfig(forward=False, compress=True),
+    )
+    for expect_decrypt_by_all_keys in [False, True]:
+        with pytest.raises(MalformedMessageError) as exc_info:
+            await unpack(
+                resolvers_config_bob,
+                pack_result.packed_msg,
+                UnpackConfig(
+                    expect_decrypt_by_all_keys=expect_decrypt_by_all_keys,
+                    max_decompressed_size=10_000,
+                ),
+            )
+        assert exc_info.value.code == MalformedMessageCode.DECOMPRESSED_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_forward_decompressed_too_large(
+    resolvers_config_alice, resolvers_config_mediator1
+):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        _message(10_000),
+        to=BOB_DID,
+        pack_config=PackEncryptedConfig(compress=True),
+    )
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack_forward(
+            resolvers_config_mediator1,
+            pack_result.packed_msg,
+            False,
+            max_decompressed_size=10_000,
+        )
+    assert exc_info.value.code == MalformedMessageCode.DECOMPRESSED_TOO_LARGE
@@ -0,0 +1,138 @@
+from time import perf_counter
+
+import pytest
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.did_doc.did_resolver_in_memory import DIDResolverInMemory
+from didcomm.errors import DIDDocNotResolvedError, SecretNotFoundError
+from didcomm.pack_encrypted import (
+    PackEncryptedConfig,
+    pack_encrypted,
+    pack_encrypted_to_many,
+)
+from didcomm.secrets.secrets_resolver_in_memory import SecretsResolverInMemory
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.did_doc.did_doc_alice import DID_DOC_ALICE_WITH_NO_SECRETS
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+from tests.unit.common import ResolversLatency
+
+LATENCY_S = 0.02
+
+BOB_RECIPIENTS = [
+    BOB_DID,
+    "did:example:bob#key-x25519-2",
+    "did:example:bob#key-p256-1",
+    "did:example:bob#key-p521-2",
+]
+
+
+def _without_packed_msg(pack_result):
+    return dict(vars(pack_result), packed_msg=None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("protect_sender_id", [False, True])
+async def test_pack_encrypted_resolves_concurrently(
+    protect_sender_id, resolvers_config_alice
+):
+    latency = ResolversLatency(LATENCY_S)
+    pack_config = PackEncryptedConfig(protect_sender_id=protect_sender_id)
+
+    start = perf_counter()
+    result = await pack_encrypted(
+        latency.wrap(resolvers_config_alice),
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=pack_config,
+    )
+    elapsed_s = perf_counter() - start
+
+    # signing, encryption keys lookup, services and routing keys resolution overlap
+    assert latency.max_in_flight >= 3
+    assert elapsed_s < len(latency.calls) * LATENCY_S * 0.6
+    assert result.service_metadata is not None
+
+    expected = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=pack_config,
+    )
+    assert _without_packed_msg(result) == _without_packed_msg(expected)
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_resolves_recipients_concurrently(
+    resolvers_config_alice,
+):
+    single = ResolversLatency(LATENCY_S)
+    await pack_encrypted(
+        single.wrap(resolvers_config_alice),
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+    )
+
+    latency = ResolversLatency(LATENCY_S)
+    start = perf_counter()
+    results = await pack_encrypted_to_many(
+        latency.wrap(resolvers_config_alice),
+        TEST_MESSAGE,
+        to=BOB_RECIPIENTS,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+    )
+    elapsed_s = perf_counter() - start
+
+    assert len(results) == len(BOB_RECIPIENTS)
+    assert latency.max_in_flight >= len(BOB_RECIPIENTS)
+    assert len(latency.calls) > len(single.calls) * 2
+    assert elapsed_s < len(single.calls) * LATENCY_S
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_cancels_resolution_on_error(resolvers_config_alice):
+    latency = ResolversLatency(LATENCY_S)
+    # Bob's DID Doc can not be resolved
+    resolvers_config = ResolversConfig(
+        secrets_resolver=resolvers_config_alice.secrets_resolver,
+        did_resolver=DIDResolverInMemory(did_docs=[DID_DOC_ALICE_WITH_NO_SECRETS]),
+    )
+
+    with pytest.raises(DIDDocNotResolvedError):
+        await pack_encrypted(
+            latency.wrap(resolvers_config),
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            sign_frm=ALICE_DID,
+        )
+    # signing was still in progress when the resolution failed, it has been completed
+    assert latency.max_in_flight >= 2
+    assert latency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_raises_signing_error_first():
+    latency = ResolversLatency(LATENCY_S)
+    # Alice's secrets are not available, and Bob's DID Doc can not be resolved
+    resolvers_config = ResolversConfig(
+        secrets_resolver=SecretsResolverInMemory(secrets=[]),
+        did_resolver=DIDResolverInMemory(did_docs=[DID_DOC_ALICE_WITH_NO_SECRETS]),
+    )
+
+    # the resolution of Bob's DID Doc fails first, but the error is the same as with sequential packing
+    with pytest.raises(SecretNotFoundError):
+        await pack_encrypted(
+            latency.wrap(resolvers_config),
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            sign_frm=ALICE_DID,
+        )
+    assert latency.in_flight == 0
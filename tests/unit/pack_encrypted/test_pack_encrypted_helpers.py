@@ -103,6 +103,8 @@ async def test_forward_if_needed__single_service(wrap_in_forward_mock, test_data
         enc_alg_anon=test_data.pack_config.enc_alg_anon,
         headers=test_data.pack_params.forward_headers,
         didcomm_id_generator=test_data.pack_params.forward_didcomm_id_generator,
+        compress_min_size=None,
+        forward_keys=None,
     )
 
 
@@ -134,4 +136,6 @@ async def test_forward_if_needed__multiple_services(
         enc_alg_anon=test_data.pack_config.enc_alg_anon,
         headers=test_data.pack_params.forward_headers,
         didcomm_id_generator=test_data.pack_params.forward_didcomm_id_generator,
+        compress_min_size=None,
+        forward_keys=None,
     )
@@ -0,0 +1,149 @@
+import importlib
+
+import pytest
+
+from didcomm.errors import DIDCommValueError
+from didcomm.pack_encrypted import (
+    PackEncryptedConfig,
+    PackEncryptedParameters,
+    pack_encrypted,
+    pack_encrypted_to_many,
+)
+from didcomm.unpack import unpack
+from tests.test_vectors.common import ALICE_DID, BOB_DID, CHARLIE_DID
+from tests.test_vectors.didcomm_messages.messages import (
+    TEST_MESSAGE,
+    TEST_MESSAGE_FROM_PRIOR,
+)
+from tests.test_vectors.secrets.mock_secrets_resolver_charlie import (
+    CHARLIE_SECRET_AUTH_KEY_ED25519,
+)
+
+# `didcomm.pack_encrypted` attribute is the function re-exported by the package
+pack_encrypted_module = importlib.import_module("didcomm.pack_encrypted")
+
+BOB_RECIPIENTS = [
+    BOB_DID,
+    "did:example:bob#key-x25519-2",
+    "did:example:bob#key-p256-1",
+    "did:example:bob#key-p521-2",
+]
+
+
+def _without_packed_msg(pack_result):
+    return dict(vars(pack_result), packed_msg=None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frm", [None, ALICE_DID])
+@pytest.mark.parametrize("protect_sender_id", [False, True])
+async def test_pack_encrypted_to_many_equals_pack_encrypted(
+    frm, protect_sender_id, resolvers_config_alice, resolvers_config_bob
+):
+    # Ed25519 signatures are deterministic, so signed messages must be the same
+    pack_config = PackEncryptedConfig(
+        protect_sender_id=protect_sender_id, forward=False
+    )
+
+    results = await pack_encrypted_to_many(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_RECIPIENTS,
+        frm=frm,
+        sign_frm=ALICE_DID,
+        pack_config=pack_config,
+    )
+
+    assert len(results) == len(BOB_RECIPIENTS)
+    for to, result in zip(BOB_RECIPIENTS, results):
+        expected = await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=to,
+            frm=frm,
+            sign_frm=ALICE_DID,
+            pack_config=pack_config,
+        )
+        assert _without_packed_msg(result) == _without_packed_msg(expected)
+
+        unpack_result = await unpack(resolvers_config_bob, result.packed_msg)
+        expected_unpack_result = await unpack(resolvers_config_bob, expected.packed_msg)
+        assert unpack_result.message == TEST_MESSAGE
+        assert unpack_result.metadata == expected_unpack_result.metadata
+        assert unpack_result.metadata.non_repudiation
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_forward(resolvers_config_alice):
+    results = await pack_encrypted_to_many(
+        resolvers_config_alice, TEST_MESSAGE, to=BOB_RECIPIENTS, frm=ALICE_DID
+    )
+    for to, result in zip(BOB_RECIPIENTS, results):
+        expected = await pack_encrypted(
+            resolvers_config_alice, TEST_MESSAGE, to=to, frm=ALICE_DID
+        )
+        assert result.service_metadata is not None
+        assert _without_packed_msg(result) == _without_packed_msg(expected)
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_signs_once(
+    mocker, resolvers_config_charlie_rotated_to_alice, resolvers_config_bob
+):
+    sign = mocker.spy(pack_encrypted_module, "sign")
+    pack_from_prior = mocker.spy(pack_encrypted_module, "pack_from_prior_in_place")
+
+    results = await pack_encrypted_to_many(
+        resolvers_config_charlie_rotated_to_alice,
+        TEST_MESSAGE_FROM_PRIOR,
+        to=BOB_RECIPIENTS,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+        pack_params=PackEncryptedParameters(
+            from_prior_issuer_kid=CHARLIE_SECRET_AUTH_KEY_ED25519.kid
+        ),
+    )
+
+    assert sign.call_count == 1
+    assert pack_from_prior.call_count == 1
+    from_prior_jwts = set()
+    for result in results:
+        assert result.from_prior_issuer_kid == CHARLIE_SECRET_AUTH_KEY_ED25519.kid
+        unpack_result = await unpack(resolvers_config_bob, result.packed_msg)
+        assert unpack_result.message == TEST_MESSAGE_FROM_PRIOR
+        from_prior_jwts.add(unpack_result.metadata.from_prior_jwt)
+    assert len(from_prior_jwts) == 1
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_no_recipients(mocker, resolvers_config_alice):
+    sign = mocker.spy(pack_encrypted_module, "sign")
+    assert (
+        await pack_encrypted_to_many(
+            resolvers_config_alice, TEST_MESSAGE, to=[], sign_frm=ALICE_DID
+        )
+        == []
+    )
+    assert sign.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_to_is_not_list(resolvers_config_alice):
+    with pytest.raises(DIDCommValueError):
+        await pack_encrypted_to_many(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_to_many_validates_all_recipients_before_signing(
+    mocker, resolvers_config_alice
+):
+    sign = mocker.spy(pack_encrypted_module, "sign")
+    with pytest.raises(DIDCommValueError):
+        await pack_encrypted_to_many(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=[BOB_DID, CHARLIE_DID],
+            sign_frm=ALICE_DID,
+        )
+    assert sign.call_count == 0
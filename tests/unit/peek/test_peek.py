@@ -0,0 +1,125 @@
+import copy
+
+import pytest
+from authlib.common.encoding import json_dumps, json_loads
+
+from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg
+from didcomm.common.types import DIDCommMessageTypes
+from didcomm.errors import DIDCommValueError, MalformedMessageError
+from didcomm.peek import PeekResult, peek
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_anon_encrypted import (
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_ANON,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_auth_encrypted import (
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_P256,
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_P521,
+    TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_plaintext import (
+    TEST_PLAINTEXT_DIDCOMM_MESSAGE_SIMPLE,
+)
+from tests.test_vectors.didcomm_messages.spec.spec_test_vectors_signed import (
+    TEST_SIGNED_DIDCOMM_MESSAGE,
+)
+
+
+@pytest.mark.parametrize("test_vector", TEST_ENCRYPTED_DIDCOMM_MESSAGE_ANON)
+def test_peek_anoncrypted(test_vector):
+    assert peek(test_vector.value) == PeekResult(
+        typ=DIDCommMessageTypes.ENCRYPTED,
+        encrypted_to=test_vector.metadata.encrypted_to,
+        enc_alg_anon=test_vector.metadata.enc_alg_anon,
+    )
+
+
+@pytest.mark.parametrize(
+    "packed_msg, frm, to",
+    [
+        (
+            TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519,
+            "did:example:alice#key-x25519-1",
+            [
+                "did:example:bob#key-x25519-1",
+                "did:example:bob#key-x25519-2",
+                "did:example:bob#key-x25519-3",
+                "did:example:bob#key-x25519-4",
+            ],
+        ),
+        (
+            TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_P256,
+            "did:example:alice#key-p256-1",
+            ["did:example:bob#key-p256-1", "did:example:bob#key-p256-2"],
+        ),
+    ],
+)
+def test_peek_authcrypted(packed_msg, frm, to):
+    assert peek(packed_msg) == PeekResult(
+        typ=DIDCommMessageTypes.ENCRYPTED,
+        encrypted_from=frm,
+        encrypted_to=to,
+        enc_alg_auth=AuthCryptAlg.A256CBC_HS512_ECDH_1PU_A256KW,
+    )
+
+
+def test_peek_shows_outermost_envelope_only():
+    # authcrypted and signed message encrypted again to protect the sender ID
+    assert peek(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_P521) == PeekResult(
+        typ=DIDCommMessageTypes.ENCRYPTED,
+        encrypted_to=["did:example:bob#key-p521-1", "did:example:bob#key-p521-2"],
+        enc_alg_anon=AnonCryptAlg.XC20P_ECDH_ES_A256KW,
+    )
+
+
+@pytest.mark.parametrize("test_vector", TEST_SIGNED_DIDCOMM_MESSAGE)
+def test_peek_signed(test_vector):
+    assert peek(test_vector.value) == PeekResult(
+        typ=DIDCommMessageTypes.SIGNED,
+        sign_from=test_vector.metadata.sign_from,
+        sign_alg=test_vector.metadata.sign_alg,
+    )
+
+
+def test_peek_plaintext():
+    assert peek(TEST_PLAINTEXT_DIDCOMM_MESSAGE_SIMPLE) == PeekResult(
+        typ=DIDCommMessageTypes.PLAINTEXT
+    )
+
+
+def test_peek_bytes_and_dict():
+    expected = peek(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519)
+    assert peek(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519.encode()) == expected
+    assert (
+        peek(memoryview(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519.encode()))
+        == expected
+    )
+    assert peek(json_loads(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519)) == expected
+
+
+def test_peek_invalid_headers():
+    msg = json_loads(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519)
+    # recipients do not match apv
+    msg["recipients"] = msg["recipients"][1:]
+    with pytest.raises(MalformedMessageError):
+        peek(msg)
+
+    msg = json_loads(TEST_SIGNED_DIDCOMM_MESSAGE[0].value)
+    del msg["signatures"][0]["header"]
+    with pytest.raises(MalformedMessageError):
+        peek(msg)
+
+    msg = json_loads(TEST_SIGNED_DIDCOMM_MESSAGE[0].value)
+    msg["signatures"][0]["protected"] = "e30"  # {}
+    with pytest.raises(MalformedMessageError):
+        peek(json_dumps(msg))
+
+
+def test_peek_does_not_modify_message():
+    msg = json_loads(TEST_ENCRYPTED_DIDCOMM_MESSAGE_AUTH_X25519)
+    expected = copy.deepcopy(msg)
+    peek(msg)
+    assert msg == expected
+
+
+def test_peek_unexpected_type():
+    with pytest.raises(DIDCommValueError):
+        peek(1)
@@ -0,0 +1,122 @@
+import pstats
+
+import pytest
+
+from didcomm import (
+    PackEncryptedConfig,
+    SamplingProfiler,
+    disable_profiling,
+    enable_profiling,
+    pack_encrypted,
+    unpack,
+)
+from didcomm.profiling import get_profiler
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+
+@pytest.fixture()
+def profiler():
+    profiler = enable_profiling(sample_every=2, max_samples=3)
+    yield profiler
+    disable_profiling()
+
+
+async def _pack_and_unpack(resolvers_config_alice, resolvers_config_bob):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    await unpack(resolvers_config_bob, pack_result.packed_msg)
+
+
+def test_profiling_is_disabled_by_default():
+    assert get_profiler() is None
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        SamplingProfiler(sample_every=0)
+    with pytest.raises(ValueError):
+        SamplingProfiler(max_samples=0)
+
+
+@pytest.mark.asyncio
+async def test_every_nth_call_is_profiled(
+    profiler, resolvers_config_alice, resolvers_config_bob
+):
+    for _ in range(5):
+        await _pack_and_unpack(resolvers_config_alice, resolvers_config_bob)
+
+    assert profiler.calls("pack_encrypted") == 5
+    assert profiler.calls("unpack") == 5
+    # calls 1, 3 and 5 are profiled
+    assert profiler.samples("pack_encrypted") == 3
+    assert profiler.samples("unpack") == 3
+
+
+@pytest.mark.asyncio
+async def test_samples_are_bounded(
+    profiler, resolvers_config_alice, resolvers_config_bob
+):
+    for _ in range(10):
+        await _pack_and_unpack(resolvers_config_alice, resolvers_config_bob)
+
+    assert profiler.samples("unpack") == 3
+    profiler.reset()
+    assert profiler.calls("unpack") == 0
+    assert profiler.samples("unpack") == 0
+    assert profiler.top() == []
+    assert profiler.stats() is None
+
+
+@pytest.mark.asyncio
+async def test_top(profiler, resolvers_config_alice, resolvers_config_bob):
+    await _pack_and_unpack(resolvers_config_alice, resolvers_config_bob)
+
+    top = profiler.top("unpack", n=1000)
+    assert top
+    assert len(profiler.top("unpack", n=3)) == 3
+    assert [f.tottime for f in top] == sorted((f.tottime for f in top), reverse=True)
+    categories = {f.category for f in top}
+    assert categories == {"didcomm", "authlib", "resolver"}
+    assert "unpack_authcrypt" in {f.function for f in top if f.category == "didcomm"}
+    assert {"resolve", "get_key"} <= {
+        f.function for f in top if f.category == "resolver"
+    }
+
+    by_cumtime = profiler.top(sort="cumtime", categories=["didcomm"])
+    assert all(f.category == "didcomm" for f in by_cumtime)
+    assert [f.cumtime for f in by_cumtime] == sorted(
+        (f.cumtime for f in by_cumtime), reverse=True
+    )
+    with pytest.raises(ValueError):
+        profiler.top(sort="unknown")
+
+
+@pytest.mark.asyncio
+async def test_dump_stats(
+    profiler, tmp_path, resolvers_config_alice, resolvers_config_bob
+):
+    path = tmp_path / "unpack.pstats"
+    assert not profiler.dump_stats(str(path), "unpack")
+
+    await _pack_and_unpack(resolvers_config_alice, resolvers_config_bob)
+
+    assert profiler.dump_stats(str(path), "unpack")
+    stats = pstats.Stats(str(path))
+    assert any(func == "unpack_authcrypt" for _, _, func in stats.stats)
+    assert not any(func == "find_keys_and_authcrypt" for _, _, func in stats.stats)
+
+
+@pytest.fixture()
+def resolvers_config_alice(resolvers_config_alice_all_in_secrets):
+    return resolvers_config_alice_all_in_secrets
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_all_in_secrets):
+    return resolvers_config_bob_all_in_secrets
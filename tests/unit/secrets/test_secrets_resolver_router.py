@@ -0,0 +1,258 @@
+import asyncio
+
+import pytest
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.pack_encrypted import PackEncryptedConfig, pack_encrypted
+from didcomm.secrets.secrets_resolver_router import SecretsResolverRouter
+from didcomm.unpack import unpack
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+from tests.test_vectors.secrets.mock_secrets_resolver_alice import (
+    MockSecretsResolverAlice,
+)
+from tests.test_vectors.secrets.mock_secrets_resolver_bob import (
+    BOB_SECRET_KEY_AGREEMENT_KEY_P256_1,
+    BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1,
+    BOB_SECRET_KEY_AGREEMENT_KEY_X25519_2,
+    MockSecretsResolverBob,
+)
+from tests.unit.common import ResolversLatency
+
+ALICE_KID = f"{ALICE_DID}#key-x25519-1"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Loader:
+    def __init__(self, latency_s: float = 0):
+        self.latency_s = latency_s
+        self.loaded = []
+        self.resolvers = {
+            "alice": MockSecretsResolverAlice(),
+            "bob": MockSecretsResolverBob(),
+        }
+
+    async def __call__(self, tenant_id: str):
+        self.loaded.append(tenant_id)
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if tenant_id not in self.resolvers:
+            raise KeyError(tenant_id)
+        return self.resolvers[tenant_id]
+
+
+@pytest.fixture()
+def clock():
+    return _Clock()
+
+
+@pytest.fixture()
+def loader():
+    return _Loader()
+
+
+@pytest.fixture()
+def router(loader, clock):
+    router = SecretsResolverRouter(loader, idle_ttl_s=10, max_loaded=2, clock=clock)
+    router.add_tenant("alice", [ALICE_DID])
+    router.add_tenant("bob", [BOB_DID])
+    return router
+
+
+def test_route():
+    router = SecretsResolverRouter(_Loader())
+    router.add_tenant("example", ["did:example"])
+    router.add_tenant("bob", ["did:example:bob", "did:web:bob.example.com:"])
+
+    assert router.route("did:example:alice#key-1") == "example"
+    assert router.route("did:example:bob#key-1") == "bob"
+    assert router.route("did:example:bob") == "bob"
+    assert router.route("did:example:bobby#key-1") == "example"
+    assert router.route("did:web:bob.example.com:users:1#key-1") == "bob"
+    assert router.route("did:web:bob.example.com.evil#key-1") is None
+    assert router.route("did:web") is None
+    assert router.route("") is None
+
+    # the prefix is re-routed
+    router.add_tenant("example-bob", ["did:example:bob"])
+    assert router.route("did:example:bob#key-1") == "example-bob"
+    router.remove_tenant("bob")
+    assert router.route("did:example:bob#key-1") == "example-bob"
+    assert router.route("did:web:bob.example.com:users:1#key-1") is None
+
+
+@pytest.mark.asyncio
+async def test_get_key(router, loader):
+    assert len(router) == 0
+    assert (
+        await router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid)
+        == BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1
+    )
+    assert await router.get_key(f"{BOB_DID}#unknown") is None
+    assert await router.get_key("did:example:unknown#key-1") is None
+    # tenants are loaded on first use only
+    assert loader.loaded == ["bob"]
+    assert len(router) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_keys(router, loader):
+    kids = [
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_2.kid,
+        ALICE_KID,
+        "did:example:unknown#key-1",
+        f"{BOB_DID}#unknown",
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid,
+        ALICE_KID,
+    ]
+    assert await router.get_keys(kids) == [
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_2.kid,
+        ALICE_KID,
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid,
+    ]
+    assert sorted(loader.loaded) == ["alice", "bob"]
+    assert await router.get_keys(["did:example:unknown#key-1"]) == []
+    assert await router.get_keys([]) == []
+    assert router.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_looked_up_concurrently():
+    latency = ResolversLatency(0.02)
+    resolvers = {"alice": MockSecretsResolverAlice(), "bob": MockSecretsResolverBob()}
+
+    async def load_slow_tenant(tenant_id):
+        config = ResolversConfig(
+            secrets_resolver=resolvers[tenant_id], did_resolver=None
+        )
+        return latency.wrap(config).secrets_resolver
+
+    router = SecretsResolverRouter(load_slow_tenant)
+    router.add_tenant("alice", [ALICE_DID])
+    router.add_tenant("bob", [BOB_DID])
+
+    kids = [
+        ALICE_KID,
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid,
+        BOB_SECRET_KEY_AGREEMENT_KEY_P256_1.kid,
+    ]
+    assert await router.get_keys(kids) == kids
+    # one batch per tenant
+    assert sorted(latency.calls) == [
+        f"get_keys {[ALICE_KID]}",
+        f"get_keys {kids[1:]}",
+    ]
+    assert latency.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_load(clock):
+    loader = _Loader(latency_s=0.01)
+    router = SecretsResolverRouter(loader, clock=clock)
+    router.add_tenant("bob", [BOB_DID])
+
+    secrets = await asyncio.gather(
+        router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid),
+        router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_2.kid),
+        router.get_keys([BOB_SECRET_KEY_AGREEMENT_KEY_P256_1.kid]),
+    )
+
+    assert secrets == [
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1,
+        BOB_SECRET_KEY_AGREEMENT_KEY_X25519_2,
+        [BOB_SECRET_KEY_AGREEMENT_KEY_P256_1.kid],
+    ]
+    assert loader.loaded == ["bob"]
+
+
+@pytest.mark.asyncio
+async def test_idle_tenants_are_evicted(router, loader, clock):
+    await router.get_key(ALICE_KID)
+    clock.now += 5
+    await router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid)
+    clock.now += 5
+
+    # Alice has been idle for 10 s
+    router.evict_idle()
+    assert len(router) == 1
+    assert router.evictions == 1
+
+    await router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid)
+    await router.get_key(ALICE_KID)
+    assert loader.loaded == ["alice", "bob", "alice"]
+
+    clock.now += 10
+    router.evict_idle()
+    assert len(router) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_tenant_is_evicted(router, loader):
+    router.add_tenant("charlie", ["did:example:charlie"])
+    loader.resolvers["charlie"] = MockSecretsResolverAlice()
+
+    await router.get_key(ALICE_KID)
+    await router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid)
+    await router.get_key(ALICE_KID)
+    await router.get_key("did:example:charlie#key-1")
+    # Bob has been evicted by Charlie
+    assert len(router) == 2
+    await router.get_key(ALICE_KID)
+    await router.get_key(BOB_SECRET_KEY_AGREEMENT_KEY_X25519_1.kid)
+    assert loader.loaded == ["alice", "bob", "charlie", "bob"]
+
+
+@pytest.mark.asyncio
+async def test_removed_tenant_is_evicted(router, loader):
+    await router.get_key(ALICE_KID)
+    router.remove_tenant("alice")
+    assert len(router) == 0
+    assert await router.get_key(ALICE_KID) is None
+    assert loader.loaded == ["alice"]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_retried(router, loader):
+    router.add_tenant("unknown", ["did:example:unknown"])
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            await router.get_key("did:example:unknown#key-1")
+    assert loader.loaded == ["unknown", "unknown"]
+    assert len(router) == 0
+
+
+@pytest.mark.asyncio
+async def test_unpack_with_router(
+    resolvers_config_alice_with_non_secrets, did_resolver_with_non_secrets, router
+):
+    packed = await pack_encrypted(
+        resolvers_config_alice_with_non_secrets,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    resolvers_config = ResolversConfig(
+        secrets_resolver=router, did_resolver=did_resolver_with_non_secrets
+    )
+    unpack_result = await unpack(resolvers_config, packed.packed_msg)
+    assert unpack_result.message == TEST_MESSAGE
+
+
+def test_invalid_parameters(loader):
+    with pytest.raises(ValueError):
+        SecretsResolverRouter(loader, idle_ttl_s=0)
+    with pytest.raises(ValueError):
+        SecretsResolverRouter(loader, max_loaded=0)
+    with pytest.raises(ValueError):
+        SecretsResolverRouter(loader).add_tenant("alice", ["did:example:alice#key-1"])
+    with pytest.raises(ValueError):
+        SecretsResolverRouter(loader).add_tenant("alice", [":"])
@@ -0,0 +1,78 @@
+import pytest
+
+from didcomm.common.algorithms import AnonCryptAlg, AuthCryptAlg
+from didcomm.core.anoncrypt import anoncrypt_authcrypted
+from didcomm.core.authcrypt import authcrypt
+from didcomm.core.jwe import json_web_encryption
+from didcomm.core.serialization import (
+    dict_to_json,
+    dict_to_json_bytes,
+    jwe_to_json,
+    jwe_to_json_bytes,
+    json_str_to_dict,
+)
+from didcomm.core.types import Key
+from didcomm.core.utils import extract_key
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+from tests.test_vectors.utils import (
+    Person,
+    KeyAgreementCurveType,
+    get_key_agreement_methods_in_secrets,
+    get_key_agreement_secrets,
+)
+
+
+def _keys(person: Person):
+    return [
+        Key(kid=vm.id, key=extract_key(vm))
+        for vm in get_key_agreement_methods_in_secrets(
+            person, KeyAgreementCurveType.X25519
+        )
+    ]
+
+
+def _sender_key():
+    secret = get_key_agreement_secrets(Person.ALICE, KeyAgreementCurveType.X25519)[0]
+    return Key(kid=secret.kid, key=extract_key(secret))
+
+
+@pytest.fixture
+def authcrypt_result():
+    return authcrypt(
+        TEST_MESSAGE.as_dict(),
+        _keys(Person.BOB),
+        _sender_key(),
+        AuthCryptAlg.A256CBC_HS512_ECDH_1PU_A256KW,
+    )
+
+
+def test_jwe_to_json_same_as_dict_to_json(authcrypt_result):
+    assert jwe_to_json(authcrypt_result.msg) == dict_to_json(authcrypt_result.msg)
+    assert jwe_to_json_bytes(authcrypt_result.msg) == dict_to_json_bytes(
+        authcrypt_result.msg
+    )
+
+
+def test_jwe_to_json_escapes_other_members():
+    jwe = {
+        "protected": "eyJhbGciOiJ",
+        "unprotected": {"note": 'quote " and ünïcode'},
+        "recipients": [{"header": {"kid": "did:example:bob#key-1"}}],
+        "ciphertext": "abc",
+    }
+    assert jwe_to_json(jwe) == dict_to_json(jwe)
+    assert json_str_to_dict(jwe_to_json(jwe)) == jwe
+    assert jwe_to_json({}) == "{}"
+
+
+def test_anoncrypt_authcrypted(authcrypt_result):
+    res = anoncrypt_authcrypted(authcrypt_result, AnonCryptAlg.XC20P_ECDH_ES_A256KW)
+    assert res.to_kids == authcrypt_result.to_kids
+    assert res.to_keys is authcrypt_result.to_keys
+    assert res.from_kid is None
+
+    bob_secret = get_key_agreement_secrets(Person.BOB, KeyAgreementCurveType.X25519)[0]
+    decrypted = json_web_encryption().deserialize_json(
+        res.msg, (bob_secret.kid, extract_key(bob_secret))
+    )
+    assert decrypted["payload"] == dict_to_json_bytes(authcrypt_result.msg)
@@ -0,0 +1,259 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+from didcomm import (
+    InMemoryTracer,
+    OpenTelemetryTracer,
+    PackEncryptedConfig,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+    unpack_forward,
+    use_tracer,
+)
+from didcomm.errors import MalformedMessageError
+from didcomm.tracing import get_tracer, reset_tracer, set_tracer, span
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+
+def _names(spans):
+    return [s.name for s in spans]
+
+
+def _descendants(tracer, parent):
+    res = []
+    for child in tracer.children(parent):
+        res.append(child)
+        res.extend(_descendants(tracer, child))
+    return res
+
+
+@pytest.mark.asyncio
+async def test_tracing_is_disabled_by_default(resolvers_config_alice):
+    tracer = InMemoryTracer()
+    assert get_tracer() is None
+    with span("stage") as s:
+        s.set_attribute("key", "value")
+
+    with use_tracer(tracer):
+        assert get_tracer() is tracer
+    assert get_tracer() is None
+
+    await pack_plaintext(resolvers_config_alice, TEST_MESSAGE)
+    assert tracer.spans == []
+
+
+@pytest.mark.asyncio
+async def test_set_and_reset_tracer(resolvers_config_alice):
+    tracer = InMemoryTracer()
+    token = set_tracer(tracer)
+    try:
+        await pack_plaintext(resolvers_config_alice, TEST_MESSAGE)
+    finally:
+        reset_tracer(token)
+    assert get_tracer() is None
+    assert _names(tracer.spans) == ["pack_plaintext", "pack_from_prior", "serialize"]
+
+
+@pytest.mark.asyncio
+async def test_pack_encrypted_stages(resolvers_config_alice):
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            sign_frm=ALICE_DID,
+            pack_config=PackEncryptedConfig(protect_sender_id=True),
+        )
+
+    [root] = tracer.children(None)
+    assert root.name == "pack_encrypted"
+    names = _names(tracer.children(root))
+    # resolver work is done concurrently, so the order of these stages is not defined
+    assert names[0] == "validate"
+    assert sorted(names[1:6]) == [
+        "find_forward_keys",
+        "find_keys",
+        "pack_from_prior",
+        "resolve_services",
+        "sign",
+    ]
+    assert names.index("pack_from_prior") < names.index("sign")
+    assert names.index("resolve_services") < names.index("find_forward_keys")
+    assert names[6:] == ["encrypt", "protect_sender_id", "forward", "serialize"]
+    assert all(s.end_ns is not None and s.duration_ns >= 0 for s in tracer.spans)
+    assert all(s.exception is None for s in tracer.spans)
+
+    [find_keys] = tracer.find("find_keys")
+    assert find_keys.attributes == {"to": BOB_DID, "frm": ALICE_DID}
+    assert {
+        "did_resolver.resolve",
+        "secrets_resolver.get_key",
+        "extract_key",
+    } <= set(_names(_descendants(tracer, find_keys)))
+
+    encrypt = tracer.children(root)[6]
+    assert encrypt.attributes == {"to": BOB_DID, "frm": ALICE_DID}
+    assert _names(_descendants(tracer, encrypt)) == ["jwe.encrypt"]
+
+    [sign] = tracer.find("sign")
+    assert "jws.sign" in _names(_descendants(tracer, sign))
+
+    [forward] = tracer.find("forward")
+    [wrap_in_forward] = tracer.children(forward)
+    assert wrap_in_forward.name == "wrap_in_forward"
+    assert _names(tracer.children(wrap_in_forward)) == ["encrypt"]
+    assert tracer.children(wrap_in_forward)[0].attributes == {
+        "to": "did:example:mediator1#key-x25519-1"
+    }
+    assert tracer.find("jwe.encrypt")[-1].attributes["alg"] == "ECDH-ES+A256KW"
+
+
+@pytest.mark.asyncio
+async def test_pack_signed_stages(resolvers_config_alice):
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await pack_signed(resolvers_config_alice, TEST_MESSAGE, sign_frm=ALICE_DID)
+
+    [root] = tracer.children(None)
+    assert root.name == "pack_signed"
+    assert _names(tracer.children(root)) == [
+        "validate",
+        "pack_from_prior",
+        "sign",
+        "serialize",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unpack_stages(resolvers_config_alice, resolvers_config_bob):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(protect_sender_id=True, forward=False),
+    )
+
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await unpack(resolvers_config_bob, pack_result.packed_msg)
+
+    [root] = tracer.children(None)
+    assert root.name == "unpack"
+    assert _names(tracer.children(root)) == [
+        "parse",
+        "unpack_anoncrypt",
+        "unpack_authcrypt",
+        "unpack_sign",
+        "unpack_from_prior",
+        "deserialize",
+    ]
+    assert "jwe.decrypt" in _names(tracer.children(tracer.find("unpack_anoncrypt")[0]))
+    assert "jws.verify" in _names(tracer.children(tracer.find("unpack_sign")[0]))
+
+
+@pytest.mark.asyncio
+async def test_unpack_forward_stages(
+    resolvers_config_alice, resolvers_config_mediator1
+):
+    pack_result = await pack_encrypted(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await unpack_forward(resolvers_config_mediator1, pack_result.packed_msg, True)
+
+    [root] = tracer.children(None)
+    assert root.name == "unpack_forward"
+    assert _names(tracer.children(root)) == [
+        "parse",
+        "unpack_anoncrypt",
+        "deserialize",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_records_exception(resolvers_config_bob):
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        with pytest.raises(MalformedMessageError):
+            await unpack(
+                resolvers_config_bob,
+                {"protected": "eyJhbGciOiJFQ0RILUVTK0EyNTZLVyJ9", "ciphertext": "x"},
+            )
+
+    [root] = tracer.children(None)
+    assert isinstance(root.exception, MalformedMessageError)
+    assert isinstance(
+        tracer.find("unpack_anoncrypt")[0].exception, MalformedMessageError
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_have_separate_roots(resolvers_config_alice):
+    tracer = InMemoryTracer()
+    with use_tracer(tracer):
+        await asyncio.gather(
+            pack_signed(resolvers_config_alice, TEST_MESSAGE, sign_frm=ALICE_DID),
+            pack_signed(resolvers_config_alice, TEST_MESSAGE, sign_frm=ALICE_DID),
+        )
+
+    roots = tracer.children(None)
+    assert _names(roots) == ["pack_signed", "pack_signed"]
+    for root in roots:
+        assert _names(tracer.children(root)) == [
+            "validate",
+            "pack_from_prior",
+            "sign",
+            "serialize",
+        ]
+
+
+class _OpenTelemetryTracerStub:
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        self.spans.append((name, attributes))
+        yield object()
+
+
+@pytest.mark.asyncio
+async def test_open_telemetry_tracer(resolvers_config_alice):
+    otel_tracer = _OpenTelemetryTracerStub()
+    with use_tracer(OpenTelemetryTracer(otel_tracer)):
+        await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+
+    names = [name for name, _ in otel_tracer.spans]
+    assert names[0] == "didcomm.pack_encrypted"
+    assert "didcomm.did_resolver.resolve" in names
+    assert ("didcomm.encrypt", {"to": BOB_DID, "frm": ALICE_DID}) in otel_tracer.spans
+
+
+@pytest.fixture()
+def resolvers_config_alice(resolvers_config_alice_with_non_secrets):
+    return resolvers_config_alice_with_non_secrets
+
+
+@pytest.fixture()
+def resolvers_config_bob(resolvers_config_bob_with_non_secrets):
+    return resolvers_config_bob_with_non_secrets
+
+
+@pytest.fixture()
+def did_resolver(did_resolver_with_non_secrets):
+    return did_resolver_with_non_secrets
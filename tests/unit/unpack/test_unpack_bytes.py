@@ -0,0 +1,92 @@
+import pytest
+
+from didcomm import (
+    PackEncryptedConfig,
+    PackEncryptedParameters,
+    PackPlaintextParameters,
+    PackSignedParameters,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+    unpack_forward,
+)
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+BYTES_TYPES = [bytes, bytearray, memoryview]
+
+
+async def _pack_all(resolvers_config_alice, as_bytes):
+    return [
+        await pack_plaintext(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            pack_params=PackPlaintextParameters(as_bytes=as_bytes),
+        ),
+        await pack_signed(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            sign_frm=ALICE_DID,
+            pack_params=PackSignedParameters(as_bytes=as_bytes),
+        ),
+        await pack_encrypted(
+            resolvers_config_alice,
+            TEST_MESSAGE,
+            to=BOB_DID,
+            frm=ALICE_DID,
+            sign_frm=ALICE_DID,
+            pack_config=PackEncryptedConfig(protect_sender_id=True, forward=False),
+            pack_params=PackEncryptedParameters(as_bytes=as_bytes),
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pack_as_bytes(resolvers_config_alice):
+    for pack_result in await _pack_all(resolvers_config_alice, as_bytes=True):
+        assert isinstance(pack_result.packed_msg, bytes)
+        pack_result.packed_msg.decode("utf-8")
+    for pack_result in await _pack_all(resolvers_config_alice, as_bytes=False):
+        assert isinstance(pack_result.packed_msg, str)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bytes_type", BYTES_TYPES)
+async def test_unpack_bytes(bytes_type, resolvers_config_alice, resolvers_config_bob):
+    for pack_result in await _pack_all(resolvers_config_alice, as_bytes=True):
+        packed_msg = pack_result.packed_msg
+        unpack_bytes = await unpack(resolvers_config_bob, bytes_type(packed_msg))
+        unpack_str = await unpack(resolvers_config_bob, packed_msg.decode("utf-8"))
+        assert unpack_bytes.message == TEST_MESSAGE
+        assert unpack_bytes == unpack_str
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bytes_type", BYTES_TYPES)
+async def test_unpack_forward_bytes(
+    bytes_type, resolvers_config_alice, resolvers_config_mediator1
+):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        pack_params=PackEncryptedParameters(as_bytes=True),
+    )
+    forward_bytes = await unpack_forward(
+        resolvers_config_mediator1, bytes_type(pack_result.packed_msg), True
+    )
+    forward_str = await unpack_forward(
+        resolvers_config_mediator1, pack_result.packed_msg.decode("utf-8"), True
+    )
+    assert forward_bytes.forwarded_msg == forward_str.forwarded_msg
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bytes_type", BYTES_TYPES)
+@pytest.mark.parametrize("packed_msg", [b"", b"[1]", b'{"a":', b'{"\xff": 1}'])
+async def test_unpack_invalid_bytes(bytes_type, packed_msg, resolvers_config_bob):
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack(resolvers_config_bob, bytes_type(packed_msg))
+    assert exc_info.value.code == MalformedMessageCode.INVALID_MESSAGE
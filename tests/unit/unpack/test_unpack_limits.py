@@ -0,0 +1,240 @@
+import copy
+import io
+import json
+
+import pytest
+import pytest_asyncio
+
+from didcomm import (
+    Attachment,
+    AttachmentDataJson,
+    PackEncryptedConfig,
+    ResolversConfig,
+    UnpackConfig,
+    UnpackLimits,
+    pack_encrypted,
+    pack_plaintext,
+    unpack,
+    unpack_forward,
+)
+from didcomm.did_doc.did_resolver import DIDResolver
+from didcomm.errors import MalformedMessageError, MalformedMessageCode
+from didcomm.secrets.secrets_resolver import SecretsResolver
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+
+class _FailingResolver(SecretsResolver, DIDResolver):
+    async def get_key(self, kid):
+        raise AssertionError("secrets resolver must not be called")
+
+    async def get_keys(self, kids):
+        raise AssertionError("secrets resolver must not be called")
+
+    async def resolve(self, did):
+        raise AssertionError("DID resolver must not be called")
+
+
+FAILING_RESOLVERS_CONFIG = ResolversConfig(
+    secrets_resolver=_FailingResolver(), did_resolver=_FailingResolver()
+)
+
+
+def _nested(depth: int):
+    value = {}
+    for _ in range(depth - 1):
+        value = {"a": value}
+    return value
+
+
+async def _assert_rejected(
+    packed_msg,
+    code: MalformedMessageCode,
+    limits: UnpackLimits = UnpackLimits(),
+    resolvers_config=FAILING_RESOLVERS_CONFIG,
+):
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack(resolvers_config, packed_msg, UnpackConfig(limits=limits))
+    assert exc_info.value.code == code
+
+
+@pytest_asyncio.fixture()
+async def authcrypted_msg(resolvers_config_alice):
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False, protect_sender_id=True),
+    )
+    return pack_result.packed_msg
+
+
+@pytest.mark.asyncio
+async def test_max_size(authcrypted_msg):
+    limits = UnpackLimits(max_size=len(authcrypted_msg) - 1)
+    for packed_msg in [
+        authcrypted_msg,
+        authcrypted_msg.encode(),
+        io.BytesIO(authcrypted_msg.encode()),
+    ]:
+        await _assert_rejected(
+            packed_msg, MalformedMessageCode.MESSAGE_TOO_LARGE, limits
+        )
+
+
+@pytest.mark.asyncio
+async def test_max_size_of_json_string_is_counted_in_utf8_bytes(
+    resolvers_config_alice,
+):
+    message = copy.deepcopy(TEST_MESSAGE)
+    message.body = {"text": "\u00e9" * 100}
+    packed_msg = (await pack_plaintext(resolvers_config_alice, message)).packed_msg
+    size = len(packed_msg.encode())
+    assert size == len(packed_msg) + 100
+
+    await _assert_rejected(
+        packed_msg,
+        MalformedMessageCode.MESSAGE_TOO_LARGE,
+        UnpackLimits(max_size=size - 1),
+    )
+    unpack_result = await unpack(
+        resolvers_config_alice,
+        packed_msg,
+        UnpackConfig(limits=UnpackLimits(max_size=size)),
+    )
+    assert unpack_result.message == message
+
+
+def test_max_size_is_not_checked_by_default():
+    assert UnpackLimits().max_size is None
+
+
+@pytest.mark.asyncio
+async def test_max_recipients(authcrypted_msg):
+    msg = json.loads(authcrypted_msg)
+    msg["recipients"] = msg["recipients"] * 10_000
+    await _assert_rejected(msg, MalformedMessageCode.TOO_MANY_RECIPIENTS)
+    await _assert_rejected(
+        authcrypted_msg,
+        MalformedMessageCode.TOO_MANY_RECIPIENTS,
+        UnpackLimits(max_recipients=1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_max_recipients_stream(authcrypted_msg):
+    msg = json.loads(authcrypted_msg)
+    msg["recipients"] = msg["recipients"] * 10_000
+    await _assert_rejected(
+        io.BytesIO(json.dumps(msg).encode()), MalformedMessageCode.TOO_MANY_RECIPIENTS
+    )
+
+
+@pytest.mark.asyncio
+async def test_max_layers(authcrypted_msg, resolvers_config_bob):
+    # anoncrypt(authcrypt(sign(plaintext)))
+    await _assert_rejected(
+        authcrypted_msg,
+        MalformedMessageCode.TOO_MANY_LAYERS,
+        UnpackLimits(max_layers=2),
+        resolvers_config_bob,
+    )
+    unpack_result = await unpack(
+        resolvers_config_bob,
+        authcrypted_msg,
+        UnpackConfig(limits=UnpackLimits(max_layers=3)),
+    )
+    assert unpack_result.message == TEST_MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_max_attachments(resolvers_config_alice):
+    message = copy.deepcopy(TEST_MESSAGE)
+    message.attachments = [
+        Attachment(id=str(i), data=AttachmentDataJson(json={})) for i in range(3)
+    ]
+    packed_msg = (await pack_plaintext(resolvers_config_alice, message)).packed_msg
+    await _assert_rejected(
+        packed_msg,
+        MalformedMessageCode.TOO_MANY_ATTACHMENTS,
+        UnpackLimits(max_attachments=2),
+    )
+
+
+@pytest.mark.asyncio
+async def test_max_json_depth_plaintext():
+    msg = {
+        "id": "1234567890",
+        "typ": "application/didcomm-plain+json",
+        "type": "http://example.com/protocols/lets_do_lunch/1.0/proposal",
+        "body": _nested(100),
+    }
+    await _assert_rejected(msg, MalformedMessageCode.JSON_TOO_DEEP)
+    await _assert_rejected(json.dumps(msg), MalformedMessageCode.JSON_TOO_DEEP)
+
+
+@pytest.mark.asyncio
+async def test_max_json_depth_checked_in_decrypted_plaintext(
+    resolvers_config_alice, resolvers_config_bob
+):
+    message = copy.deepcopy(TEST_MESSAGE)
+    message.body = _nested(10)
+    packed_msg = (
+        await pack_encrypted(
+            resolvers_config_alice,
+            message,
+            to=BOB_DID,
+            pack_config=PackEncryptedConfig(forward=False),
+        )
+    ).packed_msg
+    await _assert_rejected(
+        packed_msg,
+        MalformedMessageCode.JSON_TOO_DEEP,
+        UnpackLimits(max_json_depth=10),
+        resolvers_config_bob,
+    )
+    unpack_result = await unpack(
+        resolvers_config_bob,
+        packed_msg,
+        UnpackConfig(limits=UnpackLimits(max_json_depth=11)),
+    )
+    assert unpack_result.message == message
+
+
+@pytest.mark.asyncio
+async def test_limits_disabled(resolvers_config_alice):
+    message = copy.deepcopy(TEST_MESSAGE)
+    message.body = _nested(100)
+    packed_msg = (await pack_plaintext(resolvers_config_alice, message)).packed_msg
+    limits = UnpackLimits(
+        max_size=None,
+        max_recipients=None,
+        max_layers=None,
+        max_attachments=None,
+        max_json_depth=None,
+    )
+    unpack_result = await unpack(
+        resolvers_config_alice, packed_msg, UnpackConfig(limits=limits)
+    )
+    assert unpack_result.message == message
+
+
+@pytest.mark.asyncio
+async def test_unpack_forward_limits(resolvers_config_alice):
+    pack_result = await pack_encrypted(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+    msg = json.loads(pack_result.packed_msg)
+    msg["recipients"] = msg["recipients"] * 10_000
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack_forward(FAILING_RESOLVERS_CONFIG, msg, True)
+    assert exc_info.value.code == MalformedMessageCode.TOO_MANY_RECIPIENTS
+
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await unpack_forward(
+            FAILING_RESOLVERS_CONFIG,
+            pack_result.packed_msg,
+            True,
+            limits=UnpackLimits(max_size=100),
+        )
+    assert exc_info.value.code == MalformedMessageCode.MESSAGE_TOO_LARGE
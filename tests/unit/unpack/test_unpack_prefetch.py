@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+from didcomm.common.resolvers import ResolversConfig
+from didcomm.core.resolvers import DIDDocPrefetch, prefetch_did_doc, resolve_did_doc
+from didcomm.errors import (
+    DIDUrlNotFoundError,
+    MalformedMessageCode,
+    MalformedMessageError,
+)
+from didcomm.pack_encrypted import PackEncryptedConfig, pack_encrypted
+from didcomm.pack_signed import pack_signed
+from didcomm.unpack import unpack
+from tests.test_vectors.common import ALICE_DID, BOB_DID, CHARLIE_DID
+from tests.test_vectors.didcomm_messages.messages import (
+    TEST_MESSAGE,
+    TEST_MESSAGE_FROM_PRIOR_MINIMAL,
+)
+from tests.unit.common import ResolversLatency
+
+LATENCY_S = 0.02
+
+
+def _resolutions(latency: ResolversLatency, did: str) -> int:
+    return latency.calls.count(f"resolve {did}")
+
+
+@pytest.mark.asyncio
+async def test_authcrypt_sender_is_resolved_with_secrets_lookup(
+    resolvers_config_alice, resolvers_config_bob
+):
+    packed = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        sign_frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    latency = ResolversLatency(LATENCY_S)
+
+    unpack_result = await unpack(latency.wrap(resolvers_config_bob), packed.packed_msg)
+
+    assert unpack_result.message == TEST_MESSAGE
+    assert unpack_result.metadata.authenticated
+    assert unpack_result.metadata.non_repudiation
+    assert latency.max_in_flight >= 2
+    # the sender DID Doc resolved for authcrypt is reused to verify the signature
+    assert _resolutions(latency, ALICE_DID) == 1
+
+
+@pytest.mark.asyncio
+async def test_from_prior_issuer_is_resolved_after_signature_is_verified(
+    resolvers_config_charlie_rotated_to_alice, resolvers_config_bob
+):
+    packed = await pack_signed(
+        resolvers_config_charlie_rotated_to_alice,
+        TEST_MESSAGE_FROM_PRIOR_MINIMAL,
+        sign_frm=ALICE_DID,
+    )
+    latency = ResolversLatency(LATENCY_S)
+
+    unpack_result = await unpack(latency.wrap(resolvers_config_bob), packed.packed_msg)
+
+    assert unpack_result.message == TEST_MESSAGE_FROM_PRIOR_MINIMAL
+    assert unpack_result.metadata.from_prior_issuer_kid is not None
+    # the unverified payload is not scanned for DIDs to resolve
+    assert latency.calls == [f"resolve {ALICE_DID}", f"resolve {CHARLIE_DID}"]
+    assert latency.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_from_prior_issuer_is_not_resolved_for_forged_signature(
+    resolvers_config_charlie_rotated_to_alice, resolvers_config_bob
+):
+    packed = await pack_signed(
+        resolvers_config_charlie_rotated_to_alice,
+        TEST_MESSAGE_FROM_PRIOR_MINIMAL,
+        sign_frm=ALICE_DID,
+    )
+    jws = json.loads(packed.packed_msg)
+    signature = jws["signatures"][0]["signature"]
+    jws["signatures"][0]["signature"] = ("A" if signature[0] != "A" else "B") + (
+        signature[1:]
+    )
+    latency = ResolversLatency(LATENCY_S)
+
+    with pytest.raises(MalformedMessageError) as e:
+        await unpack(latency.wrap(resolvers_config_bob), jws)
+
+    assert e.value.code == MalformedMessageCode.INVALID_SIGNATURE
+    assert _resolutions(latency, CHARLIE_DID) == 0
+    assert latency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_from_prior_like_body_is_not_resolved(
+    resolvers_config_charlie_rotated_to_alice, resolvers_config_bob
+):
+    with_from_prior = await pack_signed(
+        resolvers_config_charlie_rotated_to_alice,
+        TEST_MESSAGE_FROM_PRIOR_MINIMAL,
+        sign_frm=ALICE_DID,
+    )
+    unpacked = await unpack(resolvers_config_bob, with_from_prior.packed_msg)
+    message = TEST_MESSAGE.as_dict()
+    message["body"] = {"from_prior": unpacked.metadata.from_prior_jwt}
+    packed = await pack_signed(
+        resolvers_config_charlie_rotated_to_alice, message, sign_frm=ALICE_DID
+    )
+    latency = ResolversLatency(LATENCY_S)
+
+    unpack_result = await unpack(latency.wrap(resolvers_config_bob), packed.packed_msg)
+
+    assert unpack_result.metadata.from_prior_issuer_kid is None
+    assert _resolutions(latency, CHARLIE_DID) == 0
+
+
+@pytest.mark.asyncio
+async def test_unused_prefetch_is_cancelled_on_error(
+    resolvers_config_alice, resolvers_config_bob
+):
+    packed = await pack_encrypted(
+        resolvers_config_alice,
+        TEST_MESSAGE,
+        to=BOB_DID,
+        frm=ALICE_DID,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    latency = ResolversLatency(LATENCY_S)
+    # the message is not addressed to Alice
+    with pytest.raises(DIDUrlNotFoundError):
+        await unpack(latency.wrap(resolvers_config_alice), packed.packed_msg)
+
+    assert _resolutions(latency, ALICE_DID) == 1
+    assert latency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_used_for_same_resolvers_only(resolvers_config_bob):
+    latency = ResolversLatency(LATENCY_S)
+    resolvers_config = latency.wrap(resolvers_config_bob)
+    other_resolvers_config = ResolversConfig(
+        secrets_resolver=resolvers_config.secrets_resolver,
+        did_resolver=resolvers_config.did_resolver,
+    )
+
+    # no prefetch outside of the scope
+    prefetch_did_doc(resolvers_config, ALICE_DID)
+    assert latency.calls == []
+
+    async with DIDDocPrefetch(resolvers_config):
+        prefetch_did_doc(resolvers_config, ALICE_DID)
+        prefetch_did_doc(resolvers_config, ALICE_DID)
+        prefetch_did_doc(other_resolvers_config, BOB_DID)
+        assert (await resolve_did_doc(resolvers_config, ALICE_DID)).id == ALICE_DID
+        assert (await resolve_did_doc(resolvers_config, ALICE_DID)).id == ALICE_DID
+        assert (await resolve_did_doc(other_resolvers_config, ALICE_DID)).id == (
+            ALICE_DID
+        )
+
+    assert latency.calls == [f"resolve {ALICE_DID}", f"resolve {ALICE_DID}"]
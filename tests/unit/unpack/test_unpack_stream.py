@@ -0,0 +1,172 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from didcomm import (
+    Message,
+    PackEncryptedConfig,
+    pack_encrypted,
+    pack_plaintext,
+    pack_signed,
+    unpack,
+    unpack_forward,
+)
+from didcomm.core.streaming import JsonObjectStreamReader
+from didcomm.errors import (
+    DIDUrlNotFoundError,
+    MalformedMessageError,
+    MalformedMessageCode,
+)
+from tests.test_vectors.common import ALICE_DID, BOB_DID
+from tests.test_vectors.didcomm_messages.messages import TEST_MESSAGE
+
+CHUNK_SIZES = [1, 2, 7, 64, 100_000]
+
+
+class _CountingStream(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _async_stream(data: bytes) -> asyncio.StreamReader:
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {},
+        {"ciphertext": "A" * 10_000, "tag": "abc"},
+        {"a": 'x\\"y\\\\', "b": [1, 2, {"c": None}], "t": True, "u": "ünï€😀", "e": ""},
+        {"n": 12345678901234567890, "x": -1.5e10, "y": [1.25e3], "z": 0},
+    ],
+)
+async def test_json_object_stream_reader(obj, indent, chunk_size):
+    data = json.dumps(obj, indent=indent, ensure_ascii=False).encode()
+    reader = JsonObjectStreamReader(io.BytesIO(data), chunk_size)
+    assert await reader.read_members() == obj
+    assert reader.finished
+    assert reader.bytes_read == len(data)
+
+
+@pytest.mark.asyncio
+async def test_json_object_stream_reader_stop_before():
+    data = b'{"protected":"p","recipients":[1],"ciphertext":"CCC","tag":"t"}'
+    reader = JsonObjectStreamReader(io.BytesIO(data), 8)
+    assert await reader.read_members(stop_before="ciphertext") == {
+        "protected": "p",
+        "recipients": [1],
+    }
+    assert not reader.finished
+    assert await reader.read_members() == {
+        "protected": "p",
+        "recipients": [1],
+        "ciphertext": "CCC",
+        "tag": "t",
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[]",
+        b"\xff",
+        b'{"a":1',
+        b'{"a":1}x',
+        b'{"a" 1}',
+        b'{"a":1,}',
+        b'{"a":1 "b":2}',
+        b'{"a":"x',
+        b"{a:1}",
+        b'{"a":tru}',
+    ],
+)
+async def test_json_object_stream_reader_invalid(data, chunk_size):
+    with pytest.raises(MalformedMessageError) as exc_info:
+        await JsonObjectStreamReader(io.BytesIO(data), chunk_size).read_members()
+    assert exc_info.value.code == MalformedMessageCode.INVALID_MESSAGE
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("async_stream", [False, True])
+async def test_unpack_stream(
+    async_stream, resolvers_config_alice, resolvers_config_bob
+):
+    packed_msgs = [
+        (await pack_plaintext(resolvers_config_alice, TEST_MESSAGE)).packed_msg,
+        (await pack_signed(resolvers_config_alice, TEST_MESSAGE, ALICE_DID)).packed_msg,
+        (
+            await pack_encrypted(
+                resolvers_config_alice,
+                TEST_MESSAGE,
+                to=BOB_DID,
+                frm=ALICE_DID,
+                pack_config=PackEncryptedConfig(forward=False),
+            )
+        ).packed_msg,
+    ]
+    for packed_msg in packed_msgs:
+        data = packed_msg.encode()
+        stream = _async_stream(data) if async_stream else io.BytesIO(data)
+        unpack_result = await unpack(resolvers_config_bob, stream)
+        assert unpack_result == await unpack(resolvers_config_bob, packed_msg)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frm", [None, ALICE_DID])
+async def test_unpack_stream_not_addressed_to_us_rejected_before_ciphertext(
+    frm, resolvers_config_alice
+):
+    message = Message(
+        id="1234567890",
+        type="my-protocol/1.0",
+        body={"payload": "a" * 1_000_000},
+    )
+    pack_result = await pack_encrypted(
+        resolvers_config_alice,
+        message,
+        to=BOB_DID,
+        frm=frm,
+        pack_config=PackEncryptedConfig(forward=False),
+    )
+    data = pack_result.packed_msg.encode()
+    stream = _CountingStream(data)
+
+    with pytest.raises(DIDUrlNotFoundError):
+        await unpack(resolvers_config_alice, stream)
+    assert stream.bytes_read < data.index(b'"ciphertext"') + 64 * 1024 < len(data)
+
+
+@pytest.mark.asyncio
+async def test_unpack_forward_stream(
+    resolvers_config_alice, resolvers_config_mediator1
+):
+    pack_result = await pack_encrypted(resolvers_config_alice, TEST_MESSAGE, to=BOB_DID)
+    forward = await unpack_forward(
+        resolvers_config_mediator1, io.BytesIO(pack_result.packed_msg.encode()), True
+    )
+    assert (
+        forward.forwarded_msg
+        == (
+            await unpack_forward(
+                resolvers_config_mediator1, pack_result.packed_msg, True
+            )
+        ).forwarded_msg
+    )
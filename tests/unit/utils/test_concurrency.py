@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from didcomm.core.concurrency import cancel, gather, gather_in_order
+from didcomm.tracing import InMemoryTracer, span, use_tracer
+
+
+async def _value(value, delay_s=None):
+    if delay_s is not None:
+        await asyncio.sleep(delay_s)
+    return value
+
+
+async def _fail(delay_s=None):
+    if delay_s is not None:
+        await asyncio.sleep(delay_s)
+    raise ValueError("failed")
+
+
+@pytest.mark.asyncio
+async def test_gather_results_order():
+    assert await gather() == []
+    assert await gather(_value(1)) == [1]
+    assert await gather(
+        _value(1, 0.02), _value(2), _value(3, 0.01), asyncio.sleep(0, 4), _value(5)
+    ) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_gather_is_concurrent():
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await gather(*(_value(i, 0.05) for i in range(10)))
+    assert loop.time() - start < 0.25
+
+
+@pytest.mark.asyncio
+async def test_gather_cancels_others_on_error():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(ValueError):
+        await gather(slow(), _fail(0.01), slow())
+    assert cancelled == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_gather_closes_not_started_coroutines_on_error():
+    not_started = _value(2)
+    with pytest.raises(TypeError):
+        await gather(_value(1), "not awaitable", not_started)
+    with pytest.raises(RuntimeError):
+        not_started.send(None)
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_results_order():
+    assert await gather_in_order() == []
+    assert await gather_in_order(
+        _value(1, 0.02), _value(2), _value(3, 0.01), asyncio.sleep(0, 4)
+    ) == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_gather_in_order_raises_first_error_in_order():
+    class FirstError(Exception):
+        pass
+
+    async def fail_first():
+        await asyncio.sleep(0.02)
+        raise FirstError()
+
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(FirstError):
+        await gather_in_order(_value(1, 0.01), fail_first(), _fail(), slow())
+    assert loop.time() - start < 1
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_cancel():
+    done = asyncio.ensure_future(_value(1))
+    await done
+    failed = asyncio.ensure_future(_fail())
+    pending = asyncio.ensure_future(_value(2, 10))
+    await asyncio.sleep(0)
+
+    await cancel(done, failed, pending)
+    assert done.result() == 1
+    assert isinstance(failed.exception(), ValueError)
+    assert pending.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_gather_keeps_tracing_context():
+    tracer = InMemoryTracer()
+
+    async def traced(name, delay_s):
+        with span(name):
+            await asyncio.sleep(delay_s)
+            with span(f"{name}.child"):
+                pass
+
+    with use_tracer(tracer):
+        with span("root"):
+            await gather(traced("a", 0.02), traced("b", 0.01), traced("c", 0))
+
+    [root] = tracer.children(None)
+    assert sorted(s.name for s in tracer.children(root)) == ["a", "b", "c"]
+    for name in ["a", "b", "c"]:
+        [parent] = tracer.find(name)
+        assert [s.name for s in tracer.children(parent)] == [f"{name}.child"]